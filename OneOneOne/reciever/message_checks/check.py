@@ -1,6 +1,6 @@
 import logging
 
-from builder.pystache_message_builder import PystacheMessageBuilder
+from builder.pystache_message_builder import get_message_builder
 from definitions import TEMPLATE_PATH, XML_PATH
 from utilities.file_utilities import FileUtilities
 from abc import ABC, abstractmethod
@@ -47,5 +47,5 @@ class Check(ABC):
         return self.message_tree.find(self.distribution_envelope + "/itk:payloads", self.namespaces).attrib['count']
 
     def build_error_message(self, error):
-        builder = PystacheMessageBuilder(str(TEMPLATE_PATH), 'base_error_template')
+        builder = get_message_builder(str(TEMPLATE_PATH), 'base_error_template')
         return builder.build_message({"errorMessage": error})
@@ -1,6 +1,6 @@
 import xml.etree.ElementTree as ET
 
-from builder.pystache_message_builder import PystacheMessageBuilder
+from builder.pystache_message_builder import get_message_builder
 from reciever.message_checks.checks import *
 from utilities.file_utilities import FileUtilities
 from definitions import XML_PATH, TEMPLATE_PATH
@@ -14,7 +14,7 @@ check_list = [CheckManifestCountInstances, CheckActionTypes, CheckManifestPayloa
 
 
 def build_error_message(error):
-    builder = PystacheMessageBuilder(str(TEMPLATE_PATH), 'base_error_template')
+    builder = get_message_builder(str(TEMPLATE_PATH), 'base_error_template')
     return builder.build_message({"errorMessage": error})
 
 
@@ -1,7 +1,7 @@
 """Module containing methodology for populating a Gp Summary Upload template"""
 import json
 from pathlib import Path
-from builder.pystache_message_builder import PystacheMessageBuilder
+from builder.pystache_message_builder import get_message_builder
 from scr_definitions import ROOT_DIR
 from typing import Dict, Optional, Callable
 import xml.etree.ElementTree as ET
@@ -18,7 +18,7 @@ class GpSummaryUpload(object):
     interaction_id = "REPC_IN150016UK05"
 
     def __init__(self):
-        self.builder = PystacheMessageBuilder(str(self.summaryCareRecordPath), self.file_template_name)
+        self.builder = get_message_builder(str(self.summaryCareRecordPath), self.file_template_name)
 
     def populate_template_with_file(self, json_file):
         """
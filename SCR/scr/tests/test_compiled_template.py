@@ -0,0 +1,29 @@
+import json
+import unittest
+from pathlib import Path
+
+from builder.compiled_message_builder import CompiledMessageBuilder
+from builder.pystache_message_builder import PystacheMessageBuilder
+from scr_definitions import ROOT_DIR
+from scr.gp_summary_upload import GpSummaryUpload
+
+
+class CompiledTemplateTest(unittest.TestCase):
+    """Checks that the 16UK05 template (and its partials) builds byte-for-byte the same message whether it is
+    compiled or rendered by Pystache."""
+
+    hashFileDir = Path(ROOT_DIR + '/scr/tests/hashes/')
+    template_dir = str(GpSummaryUpload.summaryCareRecordPath)
+
+    def test_compiled_template_matches_pystache(self):
+        pystache_builder = PystacheMessageBuilder(self.template_dir, GpSummaryUpload.file_template_name)
+        compiled_builder = CompiledMessageBuilder(self.template_dir, GpSummaryUpload.file_template_name)
+
+        for hash_file in ['hash16UK05.json', 'extendedHTMLhash.json', 'emptyHtmlHash.json', 'replacementOfhash.json',
+                          'multiReplacementOfhash.json']:
+            with self.subTest(hash_file):
+                with open(str(self.hashFileDir / hash_file)) as file:
+                    input_hash = json.load(file)
+
+                self.assertEqual(pystache_builder.build_message(input_hash),
+                                 compiled_builder.build_message(input_hash))
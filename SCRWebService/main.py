@@ -2,6 +2,7 @@
 import tornado.ioloop
 import tornado.web
 import utilities.integration_adaptors_logger as log
+from comms.http_client_pool import HttpClientPool
 from scr import gp_summary_upload
 from utilities import config, secrets, certs
 
@@ -12,7 +13,7 @@ from message_handling import message_forwarder, message_sender
 logger = log.IntegrationAdaptorsLogger(__name__)
 
 
-def build_app():
+def build_app(client_pool: HttpClientPool):
     interactions = {
         'SCR_GP_SUMMARY_UPLOAD': gp_summary_upload.GpSummaryUpload()
     }
@@ -21,22 +22,36 @@ def build_app():
     certificates = certs.Certs.create_certs_files(definitions.ROOT_DIR,
                                                   ca_certs=secrets.get_secret_config('MHS_CA_CERTS', default=None))
 
-    sender = message_sender.MessageSender(address, ca_certs=certificates.ca_certs_path)
+    sender = message_sender.MessageSender(address, ca_certs=certificates.ca_certs_path, client_pool=client_pool)
     forwarder = message_forwarder.MessageForwarder(interactions, sender)
 
     app = tornado.web.Application([(r"/", summary_care_record.SummaryCareRecord, dict(forwarder=forwarder))])
     return app
 
 
+def start_http_client_pool_metrics(client_pool: HttpClientPool) -> None:
+    """
+    Periodically log the metrics of the HTTP client pool.
+    :param client_pool: The HTTP client pool to log metrics for.
+    """
+    interval = float(config.get_config('HTTP_POOL_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(client_pool.log_metrics, interval * 1000).start()
+
+
 def main():
     config.setup_config('SCR')
     secrets.setup_secret_config("SCR")
     log.configure_logging()
-    app = build_app()
+    client_pool = HttpClientPool.from_config('mhs')
+    app = build_app(client_pool)
     scr_port = config.get_config('PORT', default='80')
     logger.info(f'Starting SCR web service on port {scr_port}')
     app.listen(int(scr_port))
-    tornado.ioloop.IOLoop.current().start()
+    start_http_client_pool_metrics(client_pool)
+    try:
+        tornado.ioloop.IOLoop.current().start()
+    finally:
+        client_pool.close()
 
 
 if __name__ == "__main__":
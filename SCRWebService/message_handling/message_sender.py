@@ -3,6 +3,7 @@ import json
 from typing import Optional
 
 from comms.common_https import CommonHttps
+from comms.http_client_pool import HttpClientPool
 from utilities import integration_adaptors_logger as log
 
 logger = log.IntegrationAdaptorsLogger(__name__)
@@ -11,15 +12,18 @@ logger = log.IntegrationAdaptorsLogger(__name__)
 class MessageSender(object):
     """Facilitates sending messages to from the SCR Adaptor to the MHS with the appropriate headers"""
 
-    def __init__(self, mhs_address: str, ca_certs: str = None):
+    def __init__(self, mhs_address: str, ca_certs: str = None, client_pool: HttpClientPool = None):
         """Initialise a new MessageSender instance.
 
         :param mhs_address: The MHS URL to send requests to.
         :param ca_certs: An optional string containing the path of the certificate authority certificate file to use
         when validating the MHS' certificates.
+        :param client_pool: The HTTP client pool to send requests to the MHS from. If not provided, the shared
+        `AsyncHTTPClient` is used.
         """
         self.mhs_address = mhs_address
         self.ca_certs = ca_certs
+        self.client_pool = client_pool
 
     async def send_message_to_mhs(self, interaction_id: str,
                                   message_body: str,
@@ -40,7 +44,8 @@ class MessageSender(object):
                                                   headers=headers,
                                                   body=json.dumps({'payload': message_body}),
                                                   method='POST',
-                                                  ca_certs=self.ca_certs)
+                                                  ca_certs=self.ca_certs,
+                                                  client_pool=self.client_pool)
         return response.body
 
     def _build_headers(self, interaction_id: str, message_id: Optional[str], correlation_id: Optional[str]):
@@ -0,0 +1,203 @@
+"""A module that defines a MessageBuilder which compiles Mustache templates into native Python functions."""
+import html
+import re
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set
+
+from pystache import parser as pystache_parser
+from pystache.common import TemplateNotFoundError
+from pystache.context import KeyNotFoundError
+from pystache.parsed import ParsedTemplate
+
+import utilities.integration_adaptors_logger as log
+from builder import pystache_message_builder
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+_NOT_FOUND = object()
+_BUILTIN_MODULE = type(0).__module__
+
+
+class _RequiresPystache(Exception):
+    """Raised by a compiled template when it meets something only Pystache can render, such as a lambda."""
+    pass
+
+
+def _get_value(item: Any, key: str) -> Any:
+    if isinstance(item, dict):
+        if key in item:
+            return item[key]
+    elif type(item).__module__ != _BUILTIN_MODULE:
+        try:
+            attr = getattr(item, key)
+        except AttributeError:
+            pass
+        else:
+            return attr() if callable(attr) else attr
+    return _NOT_FOUND
+
+
+def _lookup(stack: List[Any], name: str, parts: Sequence[str]) -> Any:
+    """Resolve a (possibly dotted) name against the context stack, in the same way as a strict Pystache renderer."""
+    if name == '.':
+        if not stack:
+            raise KeyNotFoundError('.', 'empty context stack')
+        return stack[-1]
+
+    for item in reversed(stack):
+        result = _get_value(item, parts[0])
+        if result is not _NOT_FOUND:
+            break
+    else:
+        raise KeyNotFoundError(name, 'first part')
+
+    for part in parts[1:]:
+        result = _get_value(result, part)
+        if result is _NOT_FOUND:
+            raise KeyNotFoundError(name, f'missing {part!r}')
+    return result
+
+
+def _to_str(value: Any) -> str:
+    if callable(value):
+        raise _RequiresPystache()
+    return value if isinstance(value, str) else str(value)
+
+
+def _escape(value: Any) -> str:
+    return str(html.escape(_to_str(value), quote=True))
+
+
+def _literal(value: Any) -> str:
+    return str(_to_str(value))
+
+
+def _section_items(value: Any) -> Iterable[Any]:
+    if not value:
+        return ()
+    if isinstance(value, (str, dict)):
+        return value,
+    try:
+        iter(value)
+    except TypeError:
+        return value,
+    return value
+
+
+def _check_section_item(item: Any) -> None:
+    if callable(item):
+        raise _RequiresPystache()
+
+
+class _TemplateCompiler(object):
+    """Generates the source of a Python function which renders a parsed Mustache template."""
+
+    def __init__(self, load_partial: Callable[[str], str]):
+        self._load_partial = load_partial
+        self._lines: List[str] = []
+        self._partials_in_progress: Set[str] = set()
+
+    def compile(self, parsed_template: ParsedTemplate, name: str) -> Callable[[List[Any]], str]:
+        self._lines = ['def render(_stack):', '    _parts = []', '    _append = _parts.append']
+        self._write_template(parsed_template, 1)
+        self._lines.append("    return ''.join(_parts)")
+
+        namespace = {
+            '_lookup': _lookup,
+            '_escape': _escape,
+            '_literal': _literal,
+            '_section_items': _section_items,
+            '_check_section_item': _check_section_item,
+            '_RequiresPystache': _RequiresPystache
+        }
+        exec(compile('\n'.join(self._lines), f'<compiled template {name}>', 'exec'), namespace)
+        return namespace['render']
+
+    def _write(self, depth: int, line: str):
+        self._lines.append('    ' * depth + line)
+
+    def _write_template(self, parsed_template: ParsedTemplate, depth: int):
+        literal_run: List[str] = []
+        for node in parsed_template._parse_tree:
+            if type(node) is str:
+                literal_run.append(node)
+                continue
+            if literal_run:
+                self._write(depth, f"_append({''.join(literal_run)!r})")
+                literal_run = []
+            self._write_node(node, depth)
+        if literal_run:
+            self._write(depth, f"_append({''.join(literal_run)!r})")
+
+    def _write_node(self, node: Any, depth: int):
+        if isinstance(node, pystache_parser._EscapeNode):
+            self._write(depth, f'_append(_escape({self._lookup_expression(node.key)}))')
+        elif isinstance(node, pystache_parser._LiteralNode):
+            self._write(depth, f'_append(_literal({self._lookup_expression(node.key)}))')
+        elif isinstance(node, pystache_parser._SectionNode):
+            self._write(depth, f'for _item in _section_items({self._lookup_expression(node.key)}):')
+            self._write(depth + 1, '_check_section_item(_item)')
+            self._write(depth + 1, '_stack.append(_item)')
+            self._write_template(node.parsed, depth + 1)
+            self._write(depth + 1, '_stack.pop()')
+        elif isinstance(node, pystache_parser._InvertedNode):
+            self._write(depth, f'if not {self._lookup_expression(node.key)}:')
+            self._write(depth + 1, 'pass')
+            self._write_template(node.parsed_section, depth + 1)
+        elif isinstance(node, pystache_parser._PartialNode):
+            self._write_partial(node, depth)
+        elif not isinstance(node, (pystache_parser._CommentNode, pystache_parser._ChangeNode)):
+            raise TemplateCompilationError(f'Unsupported template node: {node!r}')
+
+    def _write_partial(self, node: Any, depth: int):
+        # Recursive partials (and partials which can't be found) are left for Pystache to handle at render time
+        if node.key in self._partials_in_progress:
+            self._write(depth, 'raise _RequiresPystache()')
+            return
+        try:
+            partial = self._load_partial(node.key)
+        except TemplateNotFoundError:
+            self._write(depth, 'raise _RequiresPystache()')
+            return
+
+        partial = re.sub(pystache_parser.NON_BLANK_RE, node.indent + r'\1', partial)
+        self._partials_in_progress.add(node.key)
+        self._write_template(pystache_parser.parse(partial), depth)
+        self._partials_in_progress.remove(node.key)
+
+    @staticmethod
+    def _lookup_expression(key: str) -> str:
+        return f'_lookup(_stack, {key!r}, {tuple(key.split("."))!r})'
+
+
+class CompiledMessageBuilder(pystache_message_builder.PystacheMessageBuilder):
+    """A PystacheMessageBuilder which compiles its Mustache template (and any partials it uses) into a native Python
+    function, which builds messages by joining strings rather than walking Pystache's parse tree.
+
+    Messages built are identical to those built by a PystacheMessageBuilder, including failing with a
+    `MessageGenerationError` if there are missing tags. Templates are rendered by Pystache instead wherever a
+    compiled function can't be sure of doing the same (for example if a value in the message dictionary is a lambda).
+    """
+
+    def __init__(self, template_dir, template_file):
+        """Create a new CompiledMessageBuilder that uses the specified template file.
+
+        :param template_dir: The directory to load template files from
+        :param template_file: The template file to populate with values.
+        """
+        super().__init__(template_dir, template_file)
+        compiler = _TemplateCompiler(self._renderer.partials.get)
+        self._compiled_template = compiler.compile(self._parsed_template, template_file)
+
+    def _render(self, message_dictionary: Dict[str, Any]) -> str:
+        stack = [] if message_dictionary is None else [message_dictionary]
+        try:
+            return self._compiled_template(stack)
+        except _RequiresPystache:
+            logger.info('Falling back to Pystache to generate message from {TemplateFile}',
+                        fparams={'TemplateFile': self.template_file})
+            return super()._render(message_dictionary)
+
+
+class TemplateCompilationError(Exception):
+    """Raised when a Mustache template can't be compiled into a Python function."""
+    pass
@@ -1,4 +1,7 @@
 """A module that defines a Pystache-based MessageBuilder."""
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
 import pystache
 from pystache import common as pystache_common
 from pystache import context as pystache_context
@@ -21,6 +24,7 @@ class PystacheMessageBuilder(object):
         :param template_file: The template file to populate with values.
         """
         self._renderer = pystache.Renderer(search_dirs=template_dir, missing_tags=pystache_common.MissingTags.strict)
+        self._renderer.partials = _PartialsCache(self._renderer)
         self.template_file = template_file
         raw_template = self._renderer.load_template(template_file)
         self._parsed_template = pystache.parse(raw_template)
@@ -31,13 +35,85 @@ class PystacheMessageBuilder(object):
         :return: A string containing a message suitable for sending to a remote MHS.
         """
         try:
-            return self._renderer.render(self._parsed_template, message_dictionary)
+            return self._render(message_dictionary)
         except pystache_context.KeyNotFoundError as e:
             logger.error('Failed to find {Key} when generating message from {TemplateFile} . {ErrorMessage}',
                          fparams={'Key': e.key, 'TemplateFile': self.template_file, 'ErrorMessage': e})
             raise MessageGenerationError(f'Failed to find key:{e.key} when generating message from'
                                          f' template file:{self.template_file}') from e
 
+    def _render(self, message_dictionary) -> str:
+        return self._renderer.render(self._parsed_template, message_dictionary)
+
+
+class _PartialsCache(object):
+    """A partials loader for a Pystache renderer that loads each partial from the file system only once."""
+
+    def __init__(self, renderer: pystache.Renderer):
+        self._renderer = renderer
+        self._partials: Dict[str, str] = {}
+
+    def get(self, name: str) -> Optional[str]:
+        partial = self._partials.get(name)
+        if partial is None:
+            partial = self._renderer.load_template(name)
+            self._partials[name] = partial
+        return partial
+
+
+_message_builders: Dict[Tuple[str, str], PystacheMessageBuilder] = {}
+_message_builders_lock = threading.Lock()
+_message_builder_class = PystacheMessageBuilder
+
+
+def use_compiled_templates(enabled: bool = True) -> None:
+    """Choose whether the builders handed out by the template registry compile their templates into native Python
+    functions (see `builder.compiled_message_builder`) instead of rendering them through Pystache.
+
+    This is expected to be called once at the start of an application, before any templates are loaded. Any builders
+    already in the registry are discarded.
+    :param enabled: Whether to use compiled templates.
+    """
+    global _message_builder_class
+    from builder import compiled_message_builder
+
+    with _message_builders_lock:
+        _message_builder_class = compiled_message_builder.CompiledMessageBuilder if enabled \
+            else PystacheMessageBuilder
+        _message_builders.clear()
+
+
+def get_message_builder(template_dir: str, template_file: str) -> PystacheMessageBuilder:
+    """Get the process-wide PystacheMessageBuilder for the specified template.
+
+    The template is loaded from disk and parsed the first time it is requested; every later call for the same
+    template directory and file returns the same builder.
+    :param template_dir: The directory to load template files from
+    :param template_file: The template file to populate with values.
+    :return: A PystacheMessageBuilder for the specified template.
+    """
+    key = (str(template_dir), template_file)
+    builder = _message_builders.get(key)
+    if builder is None:
+        with _message_builders_lock:
+            builder = _message_builders.get(key)
+            if builder is None:
+                logger.info('Loading {TemplateFile} from {TemplateDir} into template registry',
+                            fparams={'TemplateFile': template_file, 'TemplateDir': template_dir})
+                builder = _message_builder_class(str(template_dir), template_file)
+                _message_builders[key] = builder
+    return builder
+
+
+def preload_message_builders(template_dir: str, template_files: Iterable[str]) -> None:
+    """Load and parse the specified templates into the process-wide template registry, so that the first messages
+    built from them do not pay the cost of doing so.
+    :param template_dir: The directory to load template files from
+    :param template_files: The template files to load.
+    """
+    for template_file in template_files:
+        get_message_builder(template_dir, template_file)
+
 
 class MessageGenerationError(Exception):
     """
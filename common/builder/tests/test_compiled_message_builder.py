@@ -0,0 +1,71 @@
+import os
+from unittest import TestCase
+
+from builder import compiled_message_builder, pystache_message_builder
+
+TEMPLATES_DIR = "templates"
+TEMPLATE_FILENAME = "features"
+
+
+def _message_dictionary(**overrides):
+    message_dictionary = {
+        'id': '<ID & "1">',
+        'text': "<b>Fish & 'Chips'</b>",
+        'patient': {'name': {'family': 'Smith'}, 'nhs_number': 9000000009},
+        'flag': True,
+        'items': [{'code': 'A'}, {'code': 'B', 'id': 'overridden'}]
+    }
+    message_dictionary.update(overrides)
+    return message_dictionary
+
+
+class TestCompiledMessageBuilder(TestCase):
+    def setUp(self):
+        current_dir = os.path.dirname(__file__)
+        templates_dir = os.path.join(current_dir, TEMPLATES_DIR)
+
+        self.pystache_builder = pystache_message_builder.PystacheMessageBuilder(templates_dir, TEMPLATE_FILENAME)
+        self.compiled_builder = compiled_message_builder.CompiledMessageBuilder(templates_dir, TEMPLATE_FILENAME)
+
+    def assert_same_message(self, message_dictionary):
+        expected = self.pystache_builder.build_message(message_dictionary)
+        actual = self.compiled_builder.build_message(message_dictionary)
+
+        self.assertEqual(expected, actual)
+
+    def test_build_message_matches_pystache(self):
+        sub_tests = [
+            ('all values', _message_dictionary()),
+            ('falsy section', _message_dictionary(flag=False, items=[])),
+            ('non-list section', _message_dictionary(items={'code': 'C'})),
+            ('string section', _message_dictionary(flag='a string')),
+            ('non-string values', _message_dictionary(id=123, text=None, flag=0)),
+        ]
+        for description, message_dictionary in sub_tests:
+            with self.subTest(description):
+                self.assert_same_message(message_dictionary)
+
+    def test_build_message_falls_back_to_pystache_for_lambdas(self):
+        self.assert_same_message(_message_dictionary(text=lambda: '{{id}}'))
+
+    def test_build_message_errors_on_missing_tag(self):
+        sub_tests = [
+            ('missing value', 'text', 'text'),
+            ('missing section', 'flag', 'flag'),
+            ('missing dotted value', 'patient', 'patient.name.family'),
+        ]
+        for description, key_to_remove, expected_key in sub_tests:
+            with self.subTest(description):
+                message_dictionary = _message_dictionary()
+                del message_dictionary[key_to_remove]
+
+                with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError,
+                                            f'Failed to find key:{expected_key} '):
+                    self.compiled_builder.build_message(message_dictionary)
+
+    def test_build_message_errors_on_missing_nested_tag(self):
+        message_dictionary = _message_dictionary(patient={'name': {}, 'nhs_number': 1})
+
+        with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError,
+                                    'Failed to find key:patient.name.family '):
+            self.compiled_builder.build_message(message_dictionary)
@@ -1,7 +1,7 @@
 import os
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from builder import pystache_message_builder
+from builder import pystache_message_builder, compiled_message_builder
 
 TEMPLATES_DIR = "templates"
 TEMPLATE_FILENAME = "test"
@@ -23,3 +23,37 @@ class TestPystacheMessageBuilder(TestCase):
     def test_build_message_errors_on_missing_tag(self):
         with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError, 'Failed to find key'):
             self.builder.build_message({})
+
+
+class TestMessageBuilderRegistry(TestCase):
+    def setUp(self):
+        current_dir = os.path.dirname(__file__)
+        self.templates_dir = os.path.join(current_dir, TEMPLATES_DIR)
+
+    def test_get_message_builder_returns_same_builder_for_same_template(self):
+        first = pystache_message_builder.get_message_builder(self.templates_dir, TEMPLATE_FILENAME)
+        second = pystache_message_builder.get_message_builder(self.templates_dir, TEMPLATE_FILENAME)
+
+        self.assertIs(first, second)
+        self.assertEqual("Hello, world!", second.build_message(dict(to="world")).strip())
+
+    def test_get_message_builder_only_loads_template_once(self):
+        pystache_message_builder.preload_message_builders(self.templates_dir, [TEMPLATE_FILENAME])
+
+        with mock.patch.object(pystache_message_builder, '_message_builder_class') as builder_mock:
+            pystache_message_builder.get_message_builder(self.templates_dir, TEMPLATE_FILENAME)
+
+        builder_mock.assert_not_called()
+
+    def test_use_compiled_templates(self):
+        try:
+            pystache_message_builder.use_compiled_templates()
+            builder = pystache_message_builder.get_message_builder(self.templates_dir, TEMPLATE_FILENAME)
+
+            self.assertIsInstance(builder, compiled_message_builder.CompiledMessageBuilder)
+            self.assertEqual("Hello, world!", builder.build_message(dict(to="world")).strip())
+        finally:
+            pystache_message_builder.use_compiled_templates(False)
+
+        builder = pystache_message_builder.get_message_builder(self.templates_dir, TEMPLATE_FILENAME)
+        self.assertNotIsInstance(builder, compiled_message_builder.CompiledMessageBuilder)
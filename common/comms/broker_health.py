@@ -0,0 +1,136 @@
+"""This module defines tracking of the health of a set of message brokers, used to choose which broker to send to."""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Union
+
+import utilities.integration_adaptors_logger as log
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_INITIAL_PROBE_DELAY = 1.0
+DEFAULT_MAX_PROBE_DELAY = 60.0
+
+
+class _BrokerHealth(object):
+    """The health of, and counters for, a single broker."""
+
+    def __init__(self):
+        self.up = True
+        self.probing = False
+        self.successes = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+
+class BrokerHealthTracker(object):
+    """Tracks which of a set of brokers are healthy, so that sends are made to a broker that is known to be working
+    rather than always trying the brokers in their configured order.
+
+    The broker which most recently accepted a message is preferred until it fails. A broker that fails is marked as
+    down and is only tried once every healthy broker has been tried. Whilst a broker is down it is probed in the
+    background, with an exponentially increasing delay between probes, and is marked as up again once a probe
+    succeeds.
+    """
+
+    def __init__(self, urls: List[str], probe: Callable[[str], Awaitable[None]],
+                 initial_probe_delay: float = DEFAULT_INITIAL_PROBE_DELAY,
+                 max_probe_delay: float = DEFAULT_MAX_PROBE_DELAY):
+        """Create a new BrokerHealthTracker.
+
+        :param urls: The urls of the brokers, in the order they should be preferred when all are healthy.
+        :param probe: A function that checks whether the broker with the given url can be connected to. The awaitable
+        it returns should raise an exception if not.
+        :param initial_probe_delay: The time (in seconds) to wait before first probing a broker that has failed.
+        :param max_probe_delay: The maximum time (in seconds) to wait between probes of a broker that is down.
+        """
+        self._urls = urls
+        self._probe = probe
+        self._initial_probe_delay = initial_probe_delay
+        self._max_probe_delay = max_probe_delay
+        self._health = {url: _BrokerHealth() for url in urls}
+        self._preferred = urls[0]
+
+    def ordered_urls(self) -> List[str]:
+        """Get the urls of the brokers in the order they should be tried.
+
+        :return: The preferred broker (if it is up), followed by the other brokers that are up in their configured
+        order, followed by the brokers that are down in their configured order.
+        """
+        up = [url for url in self._urls if self._health[url].up]
+        down = [url for url in self._urls if not self._health[url].up]
+        if self._preferred in up:
+            up.remove(self._preferred)
+            up.insert(0, self._preferred)
+        return up + down
+
+    def is_up(self, url: str) -> bool:
+        """Whether the broker with the given url is currently considered healthy."""
+        return self._health[url].up
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Record that a send to a broker succeeded, making it the preferred broker.
+
+        :param url: The url of the broker.
+        :param latency: The time (in seconds) the send took.
+        """
+        health = self._health[url]
+        health.successes += 1
+        health.total_latency += latency
+        health.max_latency = max(health.max_latency, latency)
+        if not health.up:
+            logger.info('Broker {url} is available again', fparams={'url': url})
+            health.up = True
+        self._preferred = url
+
+    def record_failure(self, url: str) -> None:
+        """Record that a send to a broker failed, marking it as down and starting to probe it in the background.
+
+        :param url: The url of the broker.
+        """
+        health = self._health[url]
+        health.failures += 1
+        if health.up:
+            logger.warning('Marking broker {url} as down', fparams={'url': url})
+            health.up = False
+        if not health.probing:
+            health.probing = True
+            asyncio.ensure_future(self.__probe_until_up(url))
+
+    def get_metrics(self) -> Dict[str, Dict[str, Union[bool, int, float]]]:
+        """Get the current counters for each broker.
+
+        :return: A dictionary, keyed by broker url, of whether the broker is up, the number of successful and failed
+        sends, and the mean and maximum latency (in seconds) of successful sends.
+        """
+        return {url: {'up': health.up,
+                      'successes': health.successes,
+                      'failures': health.failures,
+                      'mean_latency': health.total_latency / health.successes if health.successes else 0.0,
+                      'max_latency': health.max_latency}
+                for url, health in self._health.items()}
+
+    def log_metrics(self) -> None:
+        """Log the current counters for each broker."""
+        for url, metrics in self.get_metrics().items():
+            logger.info('Broker {url} up: {up}. {successes} successful sends (mean latency {mean_latency}s, max '
+                        '{max_latency}s), {failures} failed sends', fparams={'url': url, **metrics})
+
+    async def __probe_until_up(self, url: str) -> None:
+        health = self._health[url]
+        delay = self._initial_probe_delay
+        try:
+            while not health.up:
+                await asyncio.sleep(delay)
+                if health.up:
+                    break
+                try:
+                    await self._probe(url)
+                except Exception:
+                    delay = min(delay * 2, self._max_probe_delay)
+                    logger.info('Probe of broker {url} failed. Probing again in {delay} seconds',
+                                fparams={'url': url, 'delay': delay})
+                else:
+                    logger.info('Probe of broker {url} succeeded. Marking as up', fparams={'url': url})
+                    health.up = True
+        finally:
+            health.probing = False
@@ -2,6 +2,7 @@ from typing import Dict
 
 from tornado import httpclient
 
+from comms.http_client_pool import HttpClientPool
 from utilities import integration_adaptors_logger as log
 import logging
 
@@ -14,7 +15,7 @@ class CommonHttps(object):
     async def make_request(url: str, method: str, headers: Dict[str, str], body: str, client_cert: str = None,
                            client_key: str = None, ca_certs: str = None, validate_cert: bool = True,
                            http_proxy_host: str = None, http_proxy_port: int = None,
-                           raise_error_response: bool = True):
+                           raise_error_response: bool = True, client_pool: HttpClientPool = None):
         """Send a HTTPS request and return it's response.
         :param url: A string containing the endpoint to send the request to.
         :param method: A string containing the HTTP method to send the request as.
@@ -27,6 +28,8 @@ class CommonHttps(object):
         :param http_proxy_host The hostname of the HTTP proxy to be used.
         :param http_proxy_port The port of the HTTP proxy to be used.
         :param raise_error_response: Return an error response
+        :param client_pool: The HTTP client pool to make the request from. If not provided, the shared
+        `AsyncHTTPClient` is used.
         """
 
         logger.info("About to send {method} request with {headers} to {url} using {proxy_host} & {proxy_port}",
@@ -42,17 +45,18 @@ class CommonHttps(object):
         if not validate_cert:
             logger.warning("Server certificate validation has been disabled.")
 
-        response = await httpclient.AsyncHTTPClient().fetch(url,
-                                                            raise_error=raise_error_response,
-                                                            method=method,
-                                                            body=body,
-                                                            headers=headers,
-                                                            client_cert=client_cert,
-                                                            client_key=client_key,
-                                                            ca_certs=ca_certs,
-                                                            validate_cert=validate_cert,
-                                                            proxy_host=http_proxy_host,
-                                                            proxy_port=http_proxy_port)
+        fetch = client_pool.fetch if client_pool is not None else httpclient.AsyncHTTPClient().fetch
+        response = await fetch(url,
+                               raise_error=raise_error_response,
+                               method=method,
+                               body=body,
+                               headers=headers,
+                               client_cert=client_cert,
+                               client_key=client_key,
+                               ca_certs=ca_certs,
+                               validate_cert=validate_cert,
+                               proxy_host=http_proxy_host,
+                               proxy_port=http_proxy_port)
         logger.info("Sent {method} request with {headers} to {url} using {proxy_host} & {proxy_port}, and "
                     "received status code {code}",
                     fparams={
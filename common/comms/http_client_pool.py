@@ -0,0 +1,152 @@
+"""This module defines a named pool of HTTP connections with its own limits on concurrency and timeouts."""
+from typing import Dict, Union
+
+from tornado import httpclient
+
+import utilities.config as config
+from utilities import integration_adaptors_logger as log
+from utilities.string_utilities import str2bool
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 10
+DEFAULT_CONNECT_TIMEOUT = 20.0
+DEFAULT_REQUEST_TIMEOUT = 20.0
+DEFAULT_KEEP_ALIVE_IDLE = 60
+
+
+class HttpClientPool(object):
+    """A named pool of HTTP connections to one destination (or kind of destination).
+
+    Each pool has its own HTTP client, so requests made through one pool never wait for connections held by
+    another. Requests made while all of a pool's connections are in use are queued until one becomes free; the depth
+    of this queue is logged and reported by `get_metrics`.
+    """
+
+    def __init__(self, name: str, max_clients: int = DEFAULT_MAX_CLIENTS,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 keep_alive: bool = True, keep_alive_idle: int = DEFAULT_KEEP_ALIVE_IDLE):
+        """Create a new HttpClientPool.
+
+        :param name: The name of the pool, used when logging and reporting metrics.
+        :param max_clients: The maximum number of requests this pool makes concurrently. Further requests are queued.
+        :param connect_timeout: The default timeout (in seconds) for establishing a connection.
+        :param request_timeout: The default timeout (in seconds) for a whole request.
+        :param keep_alive: Whether connections should be kept open and reused between requests.
+        :param keep_alive_idle: The time (in seconds) a kept-alive connection may sit idle before TCP keep-alive
+        probes are sent.
+        """
+        self.name = name
+        self.max_clients = max_clients
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.keep_alive = keep_alive
+        self.keep_alive_idle = keep_alive_idle
+
+        self._client = None
+        self._in_flight = 0
+        self._requests_total = 0
+        self._queued_total = 0
+        self._max_queue_depth = 0
+
+    @classmethod
+    def from_config(cls, name: str) -> 'HttpClientPool':
+        """Create a new HttpClientPool configured from the config values for the named pool. For a pool named
+        `route-lookup` these are `HTTP_POOL_ROUTE_LOOKUP_MAX_CLIENTS`, `HTTP_POOL_ROUTE_LOOKUP_CONNECT_TIMEOUT`,
+        `HTTP_POOL_ROUTE_LOOKUP_REQUEST_TIMEOUT`, `HTTP_POOL_ROUTE_LOOKUP_KEEP_ALIVE` and
+        `HTTP_POOL_ROUTE_LOOKUP_KEEP_ALIVE_IDLE`.
+
+        :param name: The name of the pool.
+        :return: A new HttpClientPool.
+        """
+        prefix = 'HTTP_POOL_' + name.upper().replace('-', '_') + '_'
+        return cls(name,
+                   max_clients=int(config.get_config(prefix + 'MAX_CLIENTS', default=str(DEFAULT_MAX_CLIENTS))),
+                   connect_timeout=float(config.get_config(prefix + 'CONNECT_TIMEOUT',
+                                                           default=str(DEFAULT_CONNECT_TIMEOUT))),
+                   request_timeout=float(config.get_config(prefix + 'REQUEST_TIMEOUT',
+                                                           default=str(DEFAULT_REQUEST_TIMEOUT))),
+                   keep_alive=str2bool(config.get_config(prefix + 'KEEP_ALIVE', default=str(True))),
+                   keep_alive_idle=int(config.get_config(prefix + 'KEEP_ALIVE_IDLE',
+                                                         default=str(DEFAULT_KEEP_ALIVE_IDLE))))
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of requests currently waiting for a free connection in this pool."""
+        return max(0, self._in_flight - self.max_clients)
+
+    async def fetch(self, url: str, **kwargs) -> httpclient.HTTPResponse:
+        """Make a HTTP request using a connection from this pool.
+
+        :param url: The URL to make the request to.
+        :param kwargs: Any other arguments accepted by `tornado.httpclient.AsyncHTTPClient.fetch`.
+        :return: The response received.
+        """
+        client = self._get_client()
+
+        self._in_flight += 1
+        self._requests_total += 1
+        queue_depth = self.queue_depth
+        if queue_depth:
+            self._queued_total += 1
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth)
+            logger.warning('All connections in {PoolName} HTTP client pool are in use. Request to {url} is queued '
+                           'at {QueueDepth}', fparams={'PoolName': self.name, 'url': url, 'QueueDepth': queue_depth})
+        try:
+            return await client.fetch(url, **kwargs)
+        finally:
+            self._in_flight -= 1
+
+    def get_metrics(self) -> Dict[str, Union[str, int]]:
+        """Get the current metrics for this pool.
+
+        :return: A dictionary of the pool's name, its maximum number of concurrent requests, the number of requests
+        in flight (including those queued), the current and maximum queue depths, and the total number of requests
+        made and of requests that had to be queued.
+        """
+        return {
+            'pool': self.name,
+            'max_clients': self.max_clients,
+            'in_flight': self._in_flight,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self._max_queue_depth,
+            'requests_total': self._requests_total,
+            'queued_total': self._queued_total
+        }
+
+    def log_metrics(self) -> None:
+        """Log the current metrics for this pool."""
+        metrics = self.get_metrics()
+        logger.info('{pool} HTTP client pool has {in_flight} requests in flight of {max_clients} connections, '
+                    '{queue_depth} queued (max {max_queue_depth}). {requests_total} requests made, {queued_total} '
+                    'queued', fparams=metrics)
+
+    def close(self) -> None:
+        """Close this pool's HTTP client, along with any connections it holds open."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _get_client(self) -> httpclient.AsyncHTTPClient:
+        # The client is bound to the IO loop that is current when it is created, so is only created once a request
+        # is made from that loop
+        if self._client is None:
+            logger.info('Creating {PoolName} HTTP client pool with {MaxClients} connections',
+                        fparams={'PoolName': self.name, 'MaxClients': self.max_clients})
+            self._client = httpclient.AsyncHTTPClient(force_instance=True,
+                                                      max_clients=self.max_clients,
+                                                      defaults=dict(connect_timeout=self.connect_timeout,
+                                                                    request_timeout=self.request_timeout,
+                                                                    prepare_curl_callback=self._prepare_curl))
+        return self._client
+
+    def _prepare_curl(self, curl) -> None:
+        # Only called when tornado has been configured to use the curl HTTP client
+        import pycurl
+
+        if self.keep_alive:
+            curl.setopt(pycurl.TCP_KEEPALIVE, 1)
+            curl.setopt(pycurl.TCP_KEEPIDLE, self.keep_alive_idle)
+            curl.setopt(pycurl.TCP_KEEPINTVL, self.keep_alive_idle)
+        else:
+            curl.setopt(pycurl.FORBID_REUSE, 1)
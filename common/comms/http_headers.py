@@ -6,4 +6,6 @@ class HttpHeaders:
     INBOUND_MESSAGE_ID = "Inbound-Message-Id"
     FROM_ASID = "from-asid"
     WAIT_FOR_RESPONSE = "wait-for-response"
+    STORE_RESPONSE = "store-response"
     ODS_CODE = "ods-code"
+    RETRY_AFTER = "Retry-After"
@@ -1,10 +1,17 @@
 """Module for Proton specific queue adaptor functionality. """
+import asyncio
+import collections
+import itertools
 import json
+import threading
+import time
+from typing import Dict, Any, List, Optional, Union
+
 import proton.handlers
 import proton.reactor
-from typing import Dict, Any, List
 
 import comms.queue_adaptor
+from comms import broker_health
 import utilities.integration_adaptors_logger as log
 import utilities.message_utilities as message_utilities
 from exceptions import MaxRetriesExceeded
@@ -23,16 +30,31 @@ class EarlyDisconnectError(RuntimeError):
     pass
 
 
+class MessageRejectedError(RuntimeError):
+    """The Message Queue rejected or released the message rather than accepting it."""
+    pass
+
+
+SEND_REQUEST_EVENT = 'send_request'
+PROBE_REQUEST_EVENT = 'probe_request'
+CLOSE_REQUEST_EVENT = 'close_request'
+
+
 class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
     """Proton implementation of a queue adaptor."""
 
-    def __init__(self, urls: List[str], queue: str, username, password, max_retries=0, retry_delay=0, ttl_in_seconds=0) -> None:
+    def __init__(self, urls: List[str], queue: str, username, password, max_retries=0, retry_delay=0, ttl_in_seconds=0,
+                 initial_probe_delay=broker_health.DEFAULT_INITIAL_PROBE_DELAY,
+                 max_probe_delay=broker_health.DEFAULT_MAX_PROBE_DELAY) -> None:
         """
         Construct a Proton implementation of a :class:`QueueAdaptor <comms.queue_adaptor.QueueAdaptor>`.
         The kwargs provided should contain the following information:
           * host: The host of the Message Queue to be interacted with.
           * username: The username to use to connect to the Message Queue.
           * password The password to use to connect to the Message Queue.
+        Messages are sent to the broker that most recently accepted one. A broker that fails is tried only after the
+        healthy brokers until a background probe finds that it has recovered, see
+        :class:`BrokerHealthTracker <comms.broker_health.BrokerHealthTracker>`.
         :param kwargs: The key word arguments required for this constructor.
         """
         super().__init__()
@@ -49,6 +71,11 @@ class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
         if queue is None or len(queue.strip()) == 0:
             raise ValueError("Invalid queue name %s", queue)
 
+        self._sender_pool = ProtonSenderPool(queue, username, password)
+        self._broker_health = broker_health.BrokerHealthTracker(urls, self._sender_pool.probe,
+                                                                initial_probe_delay=initial_probe_delay,
+                                                                max_probe_delay=max_probe_delay)
+
         logger.info('Initialized proton queue adaptor for {urls} with {max_retries} and {retry_delay}',
                     fparams={'urls': self.urls, 'max_retries': max_retries, 'retry_delay': retry_delay})
 
@@ -66,6 +93,46 @@ class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
         except MaxRetriesExceeded as e:
             raise MessageSendingError() from e
 
+    async def send_batch_async(self, messages: List[dict], properties: List[Dict[str, Any]] = None) -> None:
+        """Builds and asynchronously sends a batch of messages to the host defined when this adaptor was constructed.
+        The messages are pipelined on a single link rather than each being sent only once the previous one has been
+        accepted. Messages that fail to send are retried (along with any others in the batch that failed) as for
+        :meth:`send_async`.
+
+        :param messages: The message bodies to send. Each will be serialised as JSON.
+        :param properties: Optional application properties to send with each message, in the same order as the
+        messages.
+        :raises ValueError: if properties are given for a different number of messages than were given.
+        :raises BatchSendingError: if any of the messages could not be sent, identifying which.
+        """
+        if properties is not None and len(properties) != len(messages):
+            raise ValueError(f'{len(properties)} sets of properties were given for {len(messages)} messages')
+        logger.info('Sending batch of {count} messages asynchronously.', fparams={'count': len(messages)})
+        properties = properties or [None] * len(messages)
+        outstanding = {index: self.__construct_message(message, properties=message_properties)
+                       for index, (message, message_properties) in enumerate(zip(messages, properties))}
+        failures = {}
+        try:
+            await self.__send_batch_with_retries(outstanding, failures)
+        except MaxRetriesExceeded as e:
+            for index in outstanding:
+                failures.setdefault(index, e.__cause__)
+        if failures:
+            raise comms.queue_adaptor.BatchSendingError(failures)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Union[bool, int, float]]]:
+        """Gets whether each broker is up, along with its success, failure and latency counters. See
+        :meth:`BrokerHealthTracker.get_metrics <comms.broker_health.BrokerHealthTracker.get_metrics>`."""
+        return self._broker_health.get_metrics()
+
+    def log_metrics(self) -> None:
+        """Logs whether each broker is up, along with its success, failure and latency counters."""
+        self._broker_health.log_metrics()
+
+    def close(self) -> None:
+        """Closes the connections held to the brokers."""
+        self._sender_pool.close()
+
     def __construct_message(self, message: dict, properties: Dict[str, Any] = None) -> proton.Message:
         """
         Build a message with a generated uuid, and specified message body.
@@ -88,31 +155,95 @@ class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
         :param message: message to send
         """
         exception = None
-        for url in self.urls:
+        for url in self._broker_health.ordered_urls():
             try:
                 logger.info("Trying to send message to {url} {queue}", fparams={'url': url, 'queue': self.queue})
-                messaging_handler = ProtonMessagingHandler(url, self.queue, self.username, self.password, message)
-                proton.reactor.Container(messaging_handler).run()
+                start_time = time.perf_counter()
+                await self._sender_pool.send(url, message)
             except EarlyDisconnectError as e:
+                logger.warning("Failed to send message to '%s", url)
+                self._broker_health.record_failure(url)
+                exception = e
+            except MessageRejectedError as e:
                 logger.warning("Failed to send message to '%s", url)
                 exception = e
             else:
+                self._broker_health.record_success(url, time.perf_counter() - start_time)
                 exception = None
                 break
         if exception:
             logger.warning("Failed to send message to any of '%s", self.urls)
             raise exception
 
+    async def __try_sending_batch_to_all_in_sequence(self, outstanding: Dict[int, proton.Message],
+                                                     failures: Dict[int, Exception]) -> None:
+        """
+        Sends each outstanding message to ONE of available brokers trying each in sequence, sending the messages
+        that failed on one broker to the next. Messages are removed from `outstanding` once sent, or once they fail
+        in a way that cannot be retried, in which case the failure is recorded in `failures`. Raises exception if
+        any retriable failures remain once all brokers have been tried.
+        :param outstanding: the messages still to be sent, by their index in the batch
+        :param failures: the latest failure for each message that has not been sent, by its index in the batch
+        """
+        for url in self._broker_health.ordered_urls():
+            logger.info("Trying to send {count} messages to {url} {queue}",
+                        fparams={'count': len(outstanding), 'url': url, 'queue': self.queue})
+            indexes = list(outstanding)
+            start_time = time.perf_counter()
+            results = await asyncio.gather(*self._sender_pool.send_batch(url, list(outstanding.values())),
+                                           return_exceptions=True)
+            if any(isinstance(result, EarlyDisconnectError) for result in results):
+                self._broker_health.record_failure(url)
+            elif any(result is None for result in results):
+                self._broker_health.record_success(url, time.perf_counter() - start_time)
+            for index, result in zip(indexes, results):
+                if result is None:
+                    del outstanding[index]
+                    failures.pop(index, None)
+                else:
+                    failures[index] = result
+                    if not isinstance(result, (EarlyDisconnectError, MessageRejectedError)):
+                        del outstanding[index]
+            if not outstanding:
+                return
+            logger.warning("Failed to send {count} messages to '{url}'", fparams={'count': len(outstanding),
+                                                                               'url': url})
+        logger.warning("Failed to send {count} messages to any of '{urls}'", fparams={'count': len(outstanding),
+                                                                                    'urls': self.urls})
+        raise EarlyDisconnectError()
+
+    async def __send_batch_with_retries(self, outstanding: Dict[int, proton.Message],
+                                        failures: Dict[int, Exception]) -> None:
+        """
+        Sends a batch of messages to the hosts defined when this adaptor was constructed, retrying those that none
+        accept.
+        :param outstanding: the messages to be sent, by their index in the batch
+        :param failures: the latest failure for each message that has not been sent, by its index in the batch
+        """
+        result = await RetriableAction(
+            lambda: self.__try_sending_batch_to_all_in_sequence(outstanding, failures),
+            self.max_retries,
+            self.retry_delay)\
+            .with_retriable_exception_check(lambda ex: isinstance(ex, EarlyDisconnectError))\
+            .execute()
+
+        if not result.is_successful:
+            logger.error("Exceeded the maximum number of retries, {max_retries} retries, when putting "
+                         "batch of messages onto inbound queue",
+                         fparams={"max_retries": self.max_retries})
+            raise MaxRetriesExceeded('The max number of retries to put a batch of messages onto the inbound queue '
+                                     'has been exceeded') from result.exception
+
     async def __send_with_retries(self, message: proton.Message) -> None:
         """
-        Performs a synchronous send of a message, to the host defined when this adaptor was constructed.
+        Sends a message to one of the hosts defined when this adaptor was constructed, retrying if none accept it.
         :param message: The message to be sent.
         """
         result = await RetriableAction(
             lambda: self.__try_sending_to_all_in_sequence(message),
             self.max_retries,
             self.retry_delay)\
-            .with_retriable_exception_check(lambda ex: isinstance(ex, EarlyDisconnectError))\
+            .with_retriable_exception_check(lambda ex: isinstance(ex, (EarlyDisconnectError, MessageRejectedError)))\
             .execute()
 
         if not result.is_successful:
@@ -123,112 +254,377 @@ class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
                                      'been exceeded') from result.exception
 
 
-class ProtonMessagingHandler(proton.handlers.MessagingHandler):
-    """Implementation of a Proton MessagingHandler which will send a single message. Note that this class will raise
-    an exception to indicate that a message could not be sent successfully."""
+class ProtonSenderPool(object):
+    """A pool of long-lived connections to message brokers, each with a single sender link to the queue. The
+    connections are managed by a Proton Container running on a dedicated thread, so sending a message never blocks
+    the caller's event loop. A connection to a broker is opened when a message is first sent to it, and is reopened by
+    the next message sent after it is lost."""
+
+    def __init__(self, queue: str, username: str, password: str) -> None:
+        """
+        Constructs a ProtonSenderPool which will send messages to the specified queue.
+        :param queue: The name of the queue to send messages to.
+        :param username: The username to login to the brokers with.
+        :param password: The password to login to the brokers with.
+        """
+        self._queue = queue
+        self._username = username
+        self._password = password
+        self._lock = threading.Lock()
+        self._injector = None
+        self._thread = None
+
+    def send(self, url: str, message: proton.Message) -> asyncio.Future:
+        """
+        Sends a message to the queue on the specified broker.
+        :param url: The broker to send the message to.
+        :param message: The message to be sent.
+        :return: A future, bound to the caller's event loop, that completes once the broker has accepted the message.
+        If the message could not be delivered, the future instead raises an :class:`EarlyDisconnectError` or a
+        :class:`MessageRejectedError`.
+        """
+        return self.send_batch(url, [message])[0]
+
+    def send_batch(self, url: str, messages: List[proton.Message]) -> List[asyncio.Future]:
+        """
+        Sends a batch of messages to the queue on the specified broker. The messages are all sent on the same link
+        without waiting for each to be accepted, as fast as the credit granted by the broker allows.
+        :param url: The broker to send the messages to.
+        :param messages: The messages to be sent.
+        :return: A future for each message, in the same order as the messages, each behaving as the future returned
+        by :meth:`send`.
+        """
+        loop = asyncio.get_event_loop()
+        requests = [_SendRequest(url, message, loop, loop.create_future()) for message in messages]
+        if requests:
+            self.__get_injector().trigger(proton.reactor.ApplicationEvent(SEND_REQUEST_EVENT, subject=requests))
+        return [request.future for request in requests]
+
+    def probe(self, url: str) -> asyncio.Future:
+        """
+        Checks whether a sender link to the queue can be opened on the specified broker, reusing the existing
+        connection to it if there is one.
+        :param url: The broker to probe.
+        :return: A future, bound to the caller's event loop, that completes once the link is open, or raises an
+        :class:`EarlyDisconnectError` if it could not be opened.
+        """
+        loop = asyncio.get_event_loop()
+        request = _SendRequest(url, None, loop, loop.create_future())
+        self.__get_injector().trigger(proton.reactor.ApplicationEvent(PROBE_REQUEST_EVENT, subject=request))
+        return request.future
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Closes all connections held by this pool and stops its Container thread. Any messages not yet accepted by a
+        broker are failed with an :class:`EarlyDisconnectError`.
+        :param timeout: The maximum time (in seconds) to wait for the Container thread to stop.
+        """
+        with self._lock:
+            injector, thread = self._injector, self._thread
+            self._injector = self._thread = None
+        if injector is not None:
+            injector.trigger(proton.reactor.ApplicationEvent(CLOSE_REQUEST_EVENT))
+            injector.close()
+            thread.join(timeout)
+
+    def __get_injector(self) -> proton.reactor.EventInjector:
+        with self._lock:
+            if self._injector is None:
+                logger.info('Starting proton container thread for sending messages to {queue}',
+                            fparams={'queue': self._queue})
+                injector = proton.reactor.EventInjector()
+                container = proton.reactor.Container(
+                    _SenderPoolHandler(self._queue, self._username, self._password))
+                container.selectable(injector)
+                self._thread = threading.Thread(target=container.run, name='proton-sender-pool', daemon=True)
+                self._thread.start()
+                self._injector = injector
+            return self._injector
+
+
+class _SendRequest(object):
+    """A request to send a message to (or, with no message, to probe) a broker, along with the future to complete once
+    it has been sent."""
+
+    def __init__(self, url: str, message: proton.Message, loop: asyncio.AbstractEventLoop,
+                 future: asyncio.Future) -> None:
+        self.url = url
+        self.message = message
+        self._loop = loop
+        self.future = future
+
+    def succeed(self) -> None:
+        """Completes this request's future. Can be called from any thread."""
+        self.__complete_threadsafe(None)
+
+    def fail(self, exception: Exception) -> None:
+        """Fails this request's future with the specified exception. Can be called from any thread."""
+        self.__complete_threadsafe(exception)
+
+    def __complete_threadsafe(self, exception: Optional[Exception]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self.__complete, exception)
+        except RuntimeError:
+            # The caller's event loop has already been closed, so nothing is waiting on the future
+            pass
+
+    def __complete(self, exception: Optional[Exception]) -> None:
+        if self.future.done():
+            return
+        if exception is None:
+            self.future.set_result(None)
+        else:
+            self.future.set_exception(exception)
+
+
+class _SenderPoolHandler(proton.handlers.MessagingHandler):
+    """Handles the send and close requests injected into a :class:`ProtonSenderPool`'s Container, passing messages
+    on to the connection to the requested broker."""
+
+    def __init__(self, queue: str, username: str, password: str) -> None:
+        super().__init__()
+        self._queue = queue
+        self._username = username
+        self._password = password
+        self._container = None
+        self._brokers = {}
+
+    def on_start(self, event: proton.Event) -> None:
+        """Called when the Container is started.
+
+        :param event: The start event.
+        """
+        self._container = event.container
+
+    def on_send_request(self, event: proton.reactor.ApplicationEvent) -> None:
+        """Called when messages are to be sent to a broker.
+
+        :param event: The send request event, whose subject is the list of :class:`_SendRequest` to the same broker.
+        """
+        requests = event.subject
+        url = requests[0].url
+        try:
+            self.__get_broker(url).send(self._container, requests)
+        except Exception as e:
+            logger.exception('Failed to send messages to {url}.', fparams={'url': url})
+            for request in requests:
+                request.fail(e)
+
+    def on_probe_request(self, event: proton.reactor.ApplicationEvent) -> None:
+        """Called when a broker is to be probed.
+
+        :param event: The probe request event, whose subject is the :class:`_SendRequest` (with no message).
+        """
+        request = event.subject
+        try:
+            self.__get_broker(request.url).probe(self._container, request)
+        except Exception as e:
+            logger.exception('Failed to probe {url}.', fparams={'url': request.url})
+            request.fail(e)
+
+    def on_close_request(self, event: proton.reactor.ApplicationEvent) -> None:
+        """Called when the pool is being closed.
+
+        :param event: The close request event.
+        """
+        for broker in self._brokers.values():
+            broker.close()
+        self._brokers.clear()
+
+    def __get_broker(self, url: str) -> 'ProtonBrokerSender':
+        broker = self._brokers.get(url)
+        if broker is None:
+            broker = ProtonBrokerSender(url, self._queue, self._username, self._password)
+            self._brokers[url] = broker
+        return broker
+
+
+class ProtonBrokerSender(proton.handlers.MessagingHandler):
+    """Implementation of a Proton MessagingHandler which holds a long-lived connection and sender link to a single
+    broker, sending each message it is given once the link has credit. Must only be used from the Container's
+    thread."""
 
-    def __init__(self, url: str, queue: str, username: str, password: str, message: proton.Message) -> None:
+    def __init__(self, url: str, queue: str, username: str, password: str) -> None:
         """
-        Constructs a MessagingHandler which will send a specified message to a specified host.
-        :param url: The host to send the message to.
+        Constructs a MessagingHandler which will send messages to a specified host.
+        :param url: The host to send messages to.
+        :param queue: The name of the queue to send messages to.
         :param username: The username to login to the host with.
         :param password: The password to login to the host with.
-        :param message: The message to be sent to the host.
         """
         super().__init__()
         self._url = url
         self._queue = queue
         self._username = username
         self._password = password
-        self._message = message
-        self._sent = False
+        self._connection = None
+        self._sender = None
+        self._waiting = collections.deque()
+        self._unsettled = {}
+        self._probes = []
 
-    def on_start(self, event: proton.Event) -> None:
-        """Called when this messaging handler is started.
+    def send(self, container: proton.reactor.Container, requests: List[_SendRequest]) -> None:
+        """
+        Sends messages to this handler's host, connecting to it first if there is not already an open connection.
+        :param container: The Container to create the connection with.
+        :param requests: The requests for the messages to be sent.
+        """
+        self.__connect(container)
+        self._waiting.extend(requests)
+        self.__send_waiting()
 
-        :param event: The start event.
+    def probe(self, container: proton.reactor.Container, request: _SendRequest) -> None:
         """
-        logger.info('Establishing connection to {url} for sending messages.', fparams={'url': self._url})
-        conn = event.container.connect(url=self._url, user=self._username, password=self._password, reconnect=False)
-        event.container.create_sender(conn, target=self._queue)
+        Checks that a sender link can be opened to this handler's host, connecting to it first if there is not
+        already an open connection. The request succeeds once the link has been opened.
+        :param container: The Container to create the connection with.
+        :param request: The probe request.
+        """
+        self.__connect(container)
+        if self._sender.state & proton.Endpoint.REMOTE_ACTIVE:
+            request.succeed()
+        else:
+            self._probes.append(request)
+
+    def on_link_opened(self, event: proton.Event) -> None:
+        """Called when the sender link has been opened by the remote peer.
+
+        :param event: The link opened event.
+        """
+        for request in self._probes:
+            request.succeed()
+        self._probes.clear()
+
+    def close(self) -> None:
+        """Closes the connection to this handler's host, failing any messages which have not yet been accepted."""
+        if self._connection is not None:
+            self._connection.close()
+        self.__fail_all(EarlyDisconnectError())
 
     def on_sendable(self, event: proton.Event) -> None:
         """Called when the link is ready for sending messages.
 
         :param event: The sendable event.
         """
-        if event.sender.credit:
-            if not self._sent:
-                event.sender.send(self._message)
-                logger.info('Message sent to {url}.', fparams={'url': event.connection.connected_address})
-                self._sent = True
-        else:
-            logger.error('Failed to send message as no available credit.')
-            raise MessageSendingError()
+        self.__send_waiting()
 
     def on_accepted(self, event: proton.Event) -> None:
-        """Called when the outgoing message is accepted by the remote peer.
+        """Called when an outgoing message is accepted by the remote peer.
 
         :param event: The accepted event.
         """
-        logger.info('Message received by {url}.', fparams={'url': event.connection.connected_address})
-        event.connection.close()
+        request = self._unsettled.pop(event.delivery.tag, None)
+        if request is not None:
+            logger.info('Message received by {url}.', fparams={'url': self._url})
+            request.succeed()
 
-    def on_disconnected(self, event: proton.Event) -> None:
-        """Called when the socket is disconnected.
+    def on_rejected(self, event: proton.Event) -> None:
+        """Called when an outgoing message is rejected by the remote peer.
 
-        :param event: The disconnect event.
+        :param event: The rejected event.
         """
-        logger.info('Disconnected from {url}.', fparams={'url': event.connection.connected_address})
-        if not self._sent:
-            logger.error('Disconnected before message could be sent.')
-            raise EarlyDisconnectError()
+        request = self._unsettled.pop(event.delivery.tag, None)
+        if request is not None:
+            logger.warning('Message rejected by {url}.', fparams={'url': self._url})
+            request.fail(MessageRejectedError())
 
-    def on_rejected(self, event: proton.Event) -> None:
-        """Called when the outgoing message is rejected by the remote peer.
+    def on_released(self, event: proton.Event) -> None:
+        """Called when an outgoing message is released by the remote peer without being processed.
 
-        :param event:
-        :return:
+        :param event: The released event.
         """
-        logger.warning('Message rejected by {url}.', fparams={'url': self._url})
-        self._sent = False
+        request = self._unsettled.pop(event.delivery.tag, None)
+        if request is not None:
+            logger.warning('Message released by {url}.', fparams={'url': self._url})
+            request.fail(MessageRejectedError())
+
+    def on_disconnected(self, event: proton.Event) -> None:
+        """Called when the socket is disconnected.
+
+        :param event: The disconnect event.
+        """
+        if self.__is_stale(event):
+            return
+        logger.info('Disconnected from {url}.', fparams={'url': self._url})
+        if self._waiting or self._unsettled:
+            logger.error('Disconnected before messages could be sent.')
+        self.__disconnect()
 
     def on_transport_error(self, event: proton.Event) -> None:
         """Called when an error is encountered with the transport over which the AMQP connection is established.
 
         :param event: The transport error event.
         """
+        if self.__is_stale(event):
+            return
         logger.error("There was an error with the transport used for the connection to {url}.",
-                     fparams={'url': event.connection.connected_address})
-        super().on_transport_error(event)
-        raise EarlyDisconnectError()
+                     fparams={'url': self._url})
+        self.__disconnect()
 
     def on_connection_error(self, event: proton.Event) -> None:
         """Called when the peer closes the connection with an error condition.
 
         :param event: The connection error event.
         """
+        if self.__is_stale(event):
+            return
         logger.error("{url} closed the connection with an error. {remote_condition}",
-                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
-        super().on_connection_error(event)
-        raise EarlyDisconnectError()
+                     fparams={'url': self._url, 'remote_condition': event.context.remote_condition})
+        self.__disconnect()
 
     def on_session_error(self, event: proton.Event) -> None:
         """Called when the peer closes the session with an error condition.
 
         :param event: The session error event.
         """
+        if self.__is_stale(event):
+            return
         logger.error("{url} closed the session with an error. {remote_condition}",
-                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
-        super().on_session_error(event)
-        raise EarlyDisconnectError()
+                     fparams={'url': self._url, 'remote_condition': event.context.remote_condition})
+        self.__disconnect()
 
     def on_link_error(self, event: proton.Event) -> None:
         """Called when the peer closes the link with an error condition.
 
         :param event: The link error event.
         """
+        if self.__is_stale(event):
+            return
         logger.error("{url} closed the link with an error. {remote_condition}",
-                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
-        super().on_link_error(event)
-        raise EarlyDisconnectError()
+                     fparams={'url': self._url, 'remote_condition': event.context.remote_condition})
+        self.__disconnect()
+
+    def __is_stale(self, event: proton.Event) -> bool:
+        # Proton can raise several of these events for a single failed connection. Any that arrive once a new
+        # connection has been opened must not close it. Proton wraps the same connection in a new object for each
+        # event, so connections are compared by equality
+        return event.connection is not None and event.connection != self._connection
+
+    def __connect(self, container: proton.reactor.Container) -> None:
+        if self._connection is None:
+            logger.info('Establishing connection to {url} for sending messages.', fparams={'url': self._url})
+            self._connection = container.connect(url=self._url, user=self._username, password=self._password,
+                                                 reconnect=False, handler=self)
+            self._sender = container.create_sender(self._connection, target=self._queue)
+
+    def __send_waiting(self) -> None:
+        while self._waiting and self._sender is not None and self._sender.credit:
+            request = self._waiting.popleft()
+            delivery = self._sender.send(request.message)
+            self._unsettled[delivery.tag] = request
+            logger.info('Message sent to {url}.', fparams={'url': self._url})
+
+    def __disconnect(self) -> None:
+        connection = self._connection
+        self._connection = None
+        self._sender = None
+        if connection is not None:
+            connection.close()
+        self.__fail_all(EarlyDisconnectError())
+
+    def __fail_all(self, exception: Exception) -> None:
+        for request in itertools.chain(self._waiting, self._unsettled.values(), self._probes):
+            request.fail(exception)
+        self._waiting.clear()
+        self._unsettled.clear()
+        self._probes.clear()
@@ -1,6 +1,18 @@
 """Module for generic queue adaptor functionality"""
 import abc
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+
+class BatchSendingError(RuntimeError):
+    """One or more messages in a batch could not be sent to the Message Queue"""
+
+    def __init__(self, failures: Dict[int, Exception]):
+        """
+        :param failures: The exception raised for each message that could not be sent, by the message's index in the
+        batch.
+        """
+        super().__init__(f'Failed to send {len(failures)} messages in batch')
+        self.failures = failures
 
 
 class QueueAdaptor(abc.ABC):
@@ -14,3 +26,16 @@ class QueueAdaptor(abc.ABC):
         :param properties: Optional additional properties to send with the message.
         """
         pass
+
+    @abc.abstractmethod
+    async def send_batch_async(self, messages: List[dict], properties: List[Dict[str, Any]] = None) -> None:
+        """
+        Sends a batch of messages which awaits using the async flow. Messages that were sent successfully are not
+        affected by the failure of others in the batch.
+        :param messages: The message contents to send. Each will be serialised as JSON.
+        :param properties: Optional additional properties to send with each message, in the same order as the
+        messages.
+        :raises ValueError: if properties are given for a different number of messages than were given.
+        :raises BatchSendingError: if any of the messages could not be sent.
+        """
+        pass
@@ -0,0 +1,89 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+from comms import broker_health
+from comms.broker_health import BrokerHealthTracker
+from utilities.test_utilities import async_test, awaitable, awaitable_exception
+
+URLS = ["URL_1", "URL_2", "URL_3"]
+
+
+class TestBrokerHealthTracker(TestCase):
+
+    def setUp(self):
+        self.probed = []
+        self.probe_results = []
+        self.tracker = BrokerHealthTracker(URLS, self.probe, initial_probe_delay=1, max_probe_delay=4)
+
+    def probe(self, url):
+        self.probed.append(url)
+        result = self.probe_results.pop(0)
+        return awaitable(None) if result is None else awaitable_exception(result)
+
+    def test_ordered_urls_initially_in_configured_order(self):
+        self.assertEqual(URLS, self.tracker.ordered_urls())
+
+    @async_test
+    async def test_ordered_urls_prefers_last_successful_broker(self):
+        self.tracker.record_success(URLS[1], 0.1)
+
+        self.assertEqual([URLS[1], URLS[0], URLS[2]], self.tracker.ordered_urls())
+
+    @async_test
+    async def test_ordered_urls_tries_down_brokers_last(self):
+        with patch.object(broker_health.asyncio, 'sleep', return_value=asyncio.Future()):
+            self.tracker.record_failure(URLS[0])
+
+            self.assertFalse(self.tracker.is_up(URLS[0]))
+            self.assertEqual([URLS[1], URLS[2], URLS[0]], self.tracker.ordered_urls())
+
+            self.tracker.record_success(URLS[2], 0.1)
+            self.tracker.record_failure(URLS[2])
+
+            self.assertEqual([URLS[1], URLS[0], URLS[2]], self.tracker.ordered_urls())
+
+    @async_test
+    async def test_success_marks_broker_as_up(self):
+        with patch.object(broker_health.asyncio, 'sleep', return_value=asyncio.Future()):
+            self.tracker.record_failure(URLS[0])
+            self.tracker.record_success(URLS[0], 0.1)
+
+        self.assertTrue(self.tracker.is_up(URLS[0]))
+        self.assertEqual(URLS, self.tracker.ordered_urls())
+
+    @async_test
+    async def test_probes_with_backoff_until_up(self):
+        self.probe_results = [Exception(), Exception(), Exception(), None]
+        delays = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(delay):
+            delays.append(delay)
+            await real_sleep(0)
+
+        with patch.object(broker_health.asyncio, 'sleep', new=sleep):
+            self.tracker.record_failure(URLS[0])
+            self.tracker.record_failure(URLS[0])
+            for _ in range(10):
+                await real_sleep(0)
+
+        self.assertEqual([1, 2, 4, 4], delays)
+        self.assertEqual([URLS[0]] * 4, self.probed)
+        self.assertTrue(self.tracker.is_up(URLS[0]))
+
+    @async_test
+    async def test_metrics(self):
+        self.tracker.record_success(URLS[0], 0.1)
+        self.tracker.record_success(URLS[0], 0.3)
+        with patch.object(broker_health.asyncio, 'sleep', return_value=asyncio.Future()):
+            self.tracker.record_failure(URLS[1])
+
+        metrics = self.tracker.get_metrics()
+
+        self.assertEqual({'up': True, 'successes': 2, 'failures': 0, 'mean_latency': 0.2, 'max_latency': 0.3},
+                         metrics[URLS[0]])
+        self.assertEqual({'up': False, 'successes': 0, 'failures': 1, 'mean_latency': 0.0, 'max_latency': 0.0},
+                         metrics[URLS[1]])
+        self.assertEqual({'up': True, 'successes': 0, 'failures': 0, 'mean_latency': 0.0, 'max_latency': 0.0},
+                         metrics[URLS[2]])
@@ -66,3 +66,28 @@ class TestCommonHttps(TestCase):
                                           proxy_port=None)
 
             self.assertIs(actual_response, return_value, "Expected content should be returned.")
+
+    @async_test
+    async def test_make_request_with_client_pool(self):
+        client_pool = Mock()
+        return_value = Mock()
+        client_pool.fetch.return_value = awaitable(return_value)
+
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            actual_response = await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=BODY,
+                                                             client_pool=client_pool)
+
+            mock_fetch.assert_not_called()
+
+        client_pool.fetch.assert_called_with(URL,
+                                             raise_error=True,
+                                             method=METHOD,
+                                             body=BODY,
+                                             headers=HEADERS,
+                                             client_cert=None,
+                                             client_key=None,
+                                             ca_certs=None,
+                                             validate_cert=True,
+                                             proxy_host=None,
+                                             proxy_port=None)
+        self.assertIs(actual_response, return_value, "Expected content should be returned.")
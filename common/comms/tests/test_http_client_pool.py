@@ -0,0 +1,135 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch, Mock, MagicMock
+
+from comms import http_client_pool
+from comms.http_client_pool import HttpClientPool
+from utilities import config
+from utilities.test_utilities import async_test, awaitable
+
+URL = "ABC.ABC"
+POOL_NAME = "route-lookup"
+
+
+class TestHttpClientPool(TestCase):
+
+    def setUp(self):
+        patcher = patch.object(http_client_pool.httpclient, "AsyncHTTPClient")
+        self.mock_client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_client = self.mock_client_class.return_value
+
+    @async_test
+    async def test_fetch(self):
+        return_value = Mock()
+        self.mock_client.fetch.return_value = awaitable(return_value)
+        pool = HttpClientPool(POOL_NAME, max_clients=5, connect_timeout=1.0, request_timeout=2.0)
+
+        actual_response = await pool.fetch(URL, method="GET")
+
+        self.assertIs(actual_response, return_value)
+        self.mock_client.fetch.assert_called_once_with(URL, method="GET")
+        self.mock_client_class.assert_called_once()
+        _, kwargs = self.mock_client_class.call_args
+        self.assertTrue(kwargs['force_instance'])
+        self.assertEqual(5, kwargs['max_clients'])
+        self.assertEqual(1.0, kwargs['defaults']['connect_timeout'])
+        self.assertEqual(2.0, kwargs['defaults']['request_timeout'])
+
+    @async_test
+    async def test_fetch_reuses_client(self):
+        self.mock_client.fetch.side_effect = lambda *args, **kwargs: awaitable(Mock())
+        pool = HttpClientPool(POOL_NAME)
+
+        await pool.fetch(URL)
+        await pool.fetch(URL)
+
+        self.mock_client_class.assert_called_once()
+        self.assertEqual(2, pool.get_metrics()['requests_total'])
+
+    @async_test
+    async def test_fetch_records_queue_depth(self):
+        response_future = asyncio.Future()
+        self.mock_client.fetch.return_value = response_future
+        pool = HttpClientPool(POOL_NAME, max_clients=1)
+
+        requests = [asyncio.ensure_future(pool.fetch(URL)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        metrics = pool.get_metrics()
+        self.assertEqual(3, metrics['in_flight'])
+        self.assertEqual(2, metrics['queue_depth'])
+        self.assertEqual(2, metrics['max_queue_depth'])
+        self.assertEqual(2, metrics['queued_total'])
+
+        response_future.set_result(Mock())
+        await asyncio.gather(*requests)
+
+        metrics = pool.get_metrics()
+        self.assertEqual(0, metrics['in_flight'])
+        self.assertEqual(0, metrics['queue_depth'])
+        self.assertEqual(2, metrics['max_queue_depth'])
+        self.assertEqual(3, metrics['requests_total'])
+
+    @async_test
+    async def test_fetch_releases_slot_on_error(self):
+        self.mock_client.fetch.side_effect = ValueError("Error")
+        pool = HttpClientPool(POOL_NAME)
+
+        with self.assertRaises(ValueError):
+            await pool.fetch(URL)
+
+        self.assertEqual(0, pool.get_metrics()['in_flight'])
+
+    @async_test
+    async def test_close(self):
+        self.mock_client.fetch.return_value = awaitable(Mock())
+        pool = HttpClientPool(POOL_NAME)
+        await pool.fetch(URL)
+
+        pool.close()
+
+        self.mock_client.close.assert_called_once()
+
+    def test_prepare_curl_keep_alive(self):
+        curl = MagicMock()
+        pool = HttpClientPool(POOL_NAME, keep_alive=True, keep_alive_idle=30)
+
+        with patch.dict('sys.modules', pycurl=MagicMock(TCP_KEEPALIVE='keepalive', TCP_KEEPIDLE='idle',
+                                                        TCP_KEEPINTVL='interval', FORBID_REUSE='forbid')):
+            pool._prepare_curl(curl)
+
+        curl.setopt.assert_any_call('keepalive', 1)
+        curl.setopt.assert_any_call('idle', 30)
+        self.assertNotIn(('forbid', 1), [call[0] for call in curl.setopt.call_args_list])
+
+    def test_prepare_curl_no_keep_alive(self):
+        curl = MagicMock()
+        pool = HttpClientPool(POOL_NAME, keep_alive=False)
+
+        with patch.dict('sys.modules', pycurl=MagicMock(FORBID_REUSE='forbid')):
+            pool._prepare_curl(curl)
+
+        curl.setopt.assert_called_once_with('forbid', 1)
+
+    def test_from_config(self):
+        with patch.dict(config.config, {'HTTP_POOL_ROUTE_LOOKUP_MAX_CLIENTS': '25',
+                                        'HTTP_POOL_ROUTE_LOOKUP_CONNECT_TIMEOUT': '3.5',
+                                        'HTTP_POOL_ROUTE_LOOKUP_REQUEST_TIMEOUT': '7',
+                                        'HTTP_POOL_ROUTE_LOOKUP_KEEP_ALIVE': 'False'}):
+            pool = HttpClientPool.from_config(POOL_NAME)
+
+        self.assertEqual(POOL_NAME, pool.name)
+        self.assertEqual(25, pool.max_clients)
+        self.assertEqual(3.5, pool.connect_timeout)
+        self.assertEqual(7.0, pool.request_timeout)
+        self.assertFalse(pool.keep_alive)
+        self.assertEqual(http_client_pool.DEFAULT_KEEP_ALIVE_IDLE, pool.keep_alive_idle)
+
+    def test_from_config_defaults(self):
+        pool = HttpClientPool.from_config('spine')
+
+        self.assertEqual(http_client_pool.DEFAULT_MAX_CLIENTS, pool.max_clients)
+        self.assertEqual(http_client_pool.DEFAULT_CONNECT_TIMEOUT, pool.connect_timeout)
+        self.assertEqual(http_client_pool.DEFAULT_REQUEST_TIMEOUT, pool.request_timeout)
+        self.assertTrue(pool.keep_alive)
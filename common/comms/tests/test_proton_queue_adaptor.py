@@ -1,12 +1,18 @@
 """Module for testing the Proton queue adaptor functionality."""
+import asyncio
+import json
+import socket
+import threading
 import unittest.mock
 from unittest import mock
 
 import proton
+import proton.handlers
+import proton.reactor
 
 import comms.proton_queue_adaptor
+import comms.queue_adaptor
 import utilities.test_utilities
-from exceptions import MaxRetriesExceeded
 
 TEST_UUID = "TEST UUID"
 TEST_MESSAGE = {'test': 'message'}
@@ -22,6 +28,7 @@ TEST_QUEUE_PASSWORD = "TEST QUEUE PASSWORD"
 TEST_EXCEPTION = Exception()
 TEST_SIDE_EFFECT = unittest.mock.Mock(side_effect=TEST_EXCEPTION)
 TEST_TTL = 100
+TEST_BATCH = [{'test': 'message 1'}, {'test': 'message 2'}, {'test': 'message 3'}]
 
 
 @unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
@@ -30,8 +37,9 @@ class TestProtonQueueAdaptor(unittest.TestCase):
 
     def setUp(self) -> None:
         """Prepare standard mocks and service for unit testing."""
-        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor.proton.reactor, "Container")
-        self.mock_container = patcher.start()
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor, "ProtonSenderPool")
+        self.mock_sender_pool = patcher.start().return_value
+        self.mock_sender_pool.send.side_effect = lambda url, message: utilities.test_utilities.awaitable(None)
         self.addCleanup(patcher.stop)
         self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
             urls=TEST_QUEUE_SINGLE_URL,
@@ -62,7 +70,7 @@ class TestProtonQueueAdaptor(unittest.TestCase):
     async def test_send_async_success(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
         await awaitable
 
@@ -72,23 +80,29 @@ class TestProtonQueueAdaptor(unittest.TestCase):
     async def test_send_async_with_properties_success(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE, properties=TEST_PROPERTIES)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
         await awaitable
 
         self.assert_proton_called_correctly(properties=TEST_PROPERTIES)
 
+    def test_sender_pool_created_correctly(self):
+        comms.proton_queue_adaptor.ProtonSenderPool.assert_called_once_with(
+            TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD)
+
+    def test_close(self):
+        self.service.close()
+
+        self.mock_sender_pool.close.assert_called_once()
+
     def assert_proton_called_correctly(self, properties=None):
-        self.assertTrue(self.mock_container.return_value.run.called)
-        proton_messaging_handler = self.mock_container.call_args[0][0]
-        self.assertEqual(TEST_QUEUE_SINGLE_URL[0], proton_messaging_handler._url)
-        self.assertEqual(TEST_QUEUE_NAME, proton_messaging_handler._queue)
-        self.assertEqual(TEST_QUEUE_USERNAME, proton_messaging_handler._username)
-        self.assertEqual(TEST_QUEUE_PASSWORD, proton_messaging_handler._password)
-        self.assertEqual(TEST_MESSAGE_SERIALISED, proton_messaging_handler._message.body)
-        self.assertEqual(TEST_UUID, proton_messaging_handler._message.id)
-        self.assertEqual(TEST_TTL, proton_messaging_handler._message.ttl)
-        self.assertEqual(properties, proton_messaging_handler._message.properties)
+        self.mock_sender_pool.send.assert_called_once()
+        url, message = self.mock_sender_pool.send.call_args[0]
+        self.assertEqual(TEST_QUEUE_SINGLE_URL[0], url)
+        self.assertEqual(TEST_MESSAGE_SERIALISED, message.body)
+        self.assertEqual(TEST_UUID, message.id)
+        self.assertEqual(TEST_TTL, message.ttl)
+        self.assertEqual(properties, message.properties)
 
 
 @unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
@@ -97,8 +111,9 @@ class TestProtonQueueAdaptorRetries(unittest.TestCase):
 
     def setUp(self) -> None:
         """Prepare standard mocks and service for unit testing."""
-        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor.proton.reactor, "Container")
-        self.mock_container = patcher.start()
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor, "ProtonSenderPool")
+        self.mock_sender_pool = patcher.start().return_value
+        self.mock_sender_pool.send.side_effect = lambda url, message: utilities.test_utilities.awaitable(None)
         self.addCleanup(patcher.stop)
         self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
             urls=TEST_QUEUE_MULTIPLE_URLS,
@@ -114,11 +129,11 @@ class TestProtonQueueAdaptorRetries(unittest.TestCase):
     async def test_send_async_when_first_url_succeeds(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
-        self.mock_container.return_value.run.side_effect = [
-            None,
-            comms.proton_queue_adaptor.EarlyDisconnectError()
+        self.mock_sender_pool.send.side_effect = [
+            utilities.test_utilities.awaitable(None),
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError())
         ]
 
         await awaitable
@@ -129,11 +144,11 @@ class TestProtonQueueAdaptorRetries(unittest.TestCase):
     async def test_send_async_when_first_url_fails(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
-        self.mock_container.return_value.run.side_effect = [
-            comms.proton_queue_adaptor.EarlyDisconnectError(),
-            None
+        self.mock_sender_pool.send.side_effect = [
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError()),
+            utilities.test_utilities.awaitable(None)
         ]
 
         await awaitable
@@ -145,28 +160,51 @@ class TestProtonQueueAdaptorRetries(unittest.TestCase):
     async def test_send_async_when_second_both_urls_fail_once(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
         side_effects = [
-            comms.proton_queue_adaptor.EarlyDisconnectError(),
-            comms.proton_queue_adaptor.EarlyDisconnectError(),
-            None
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError()),
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.MessageRejectedError()),
+            utilities.test_utilities.awaitable(None)
         ]
-        self.mock_container.return_value.run.side_effect = side_effects
+        self.mock_sender_pool.send.side_effect = side_effects
 
         await awaitable
 
         self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=len(side_effects))
         self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=1, call_count=len(side_effects))
-        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=2, call_count=len(side_effects))
+        # The first broker disconnected so is marked as down, whereas the second is up (despite rejecting the message)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=2, call_count=len(side_effects))
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_prefers_last_healthy_url(self):
+        self.mock_sender_pool.send.side_effect = [
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError()),
+            utilities.test_utilities.awaitable(None),
+            utilities.test_utilities.awaitable(None)
+        ]
+
+        await self.service.send_async(TEST_MESSAGE)
+        await self.service.send_async(TEST_MESSAGE)
+
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=3)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=1, call_count=3)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=2, call_count=3)
+        metrics = self.service.get_metrics()
+        self.assertEqual((False, 0, 1), tuple(metrics[TEST_QUEUE_MULTIPLE_URLS[0]][key]
+                                              for key in ('up', 'successes', 'failures')))
+        self.assertEqual((True, 2, 0), tuple(metrics[TEST_QUEUE_MULTIPLE_URLS[1]][key]
+                                             for key in ('up', 'successes', 'failures')))
 
     @utilities.test_utilities.async_test
     async def test_send_async_when_second_both_urls_fail_twice(self):
         """Test happy path of send_async."""
         awaitable = self.service.send_async(TEST_MESSAGE)
-        self.assertFalse(self.mock_container.return_value.run.called)
+        self.assertFalse(self.mock_sender_pool.send.called)
 
-        self.mock_container.return_value.run.side_effect = [comms.proton_queue_adaptor.EarlyDisconnectError() for _ in range(4)]
+        self.mock_sender_pool.send.side_effect = [
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError())
+            for _ in range(4)]
 
         with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
             await awaitable
@@ -176,160 +214,329 @@ class TestProtonQueueAdaptorRetries(unittest.TestCase):
         self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=2, call_count=4)
         self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=3, call_count=4)
 
-    def assert_proton_called_correctly(self, url, call_index, call_count):
-        self.assertTrue(self.mock_container.return_value.run.called)
-        self.assertEqual(self.mock_container.return_value.run.call_count, call_count)
-        url_index = TEST_QUEUE_MULTIPLE_URLS.index(url)
-        proton_messaging_handler = self.mock_container.call_args_list[call_index][0][0]
-        self.assertEqual(TEST_QUEUE_MULTIPLE_URLS[url_index], proton_messaging_handler._url)
-        self.assertEqual(TEST_QUEUE_NAME, proton_messaging_handler._queue)
-        self.assertEqual(TEST_QUEUE_USERNAME, proton_messaging_handler._username)
-        self.assertEqual(TEST_QUEUE_PASSWORD, proton_messaging_handler._password)
-        self.assertEqual(TEST_MESSAGE_SERIALISED, proton_messaging_handler._message.body)
-        self.assertEqual(TEST_UUID, proton_messaging_handler._message.id)
+    # TESTING SEND BATCH ASYNC METHOD
 
+    def batch_results(self, *results):
+        """Make send_batch return, for each call, a future per message with the given results. A result of None
+        means the message was accepted."""
+        def to_future(result):
+            if result is None:
+                return utilities.test_utilities.awaitable(None)
+            return utilities.test_utilities.awaitable_exception(result)
 
-class TestProtonMessagingHandler(unittest.TestCase):
-    """Class to contain tests for the ProtonMessagingHandler functionality."""
+        call_results = iter(results)
+        self.mock_sender_pool.send_batch.side_effect = \
+            lambda url, messages: [to_future(result) for result in next(call_results)]
 
-    def setUp(self) -> None:
-        """Prepare service for testing."""
-        self.handler = comms.proton_queue_adaptor.ProtonMessagingHandler(
-            TEST_QUEUE_SINGLE_URL[0], TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD, TEST_PROTON_MESSAGE)
+    def batch_call(self, call_index):
+        url, messages = self.mock_sender_pool.send_batch.call_args_list[call_index][0]
+        return url, [json.loads(message.body) for message in messages]
 
-    # TESTING STARTUP METHOD
-    def test_on_start_success(self):
-        """Test happy path of on_start."""
-        mock_event = unittest.mock.MagicMock()
+    @utilities.test_utilities.async_test
+    async def test_send_batch_async_success(self):
+        self.batch_results([None, None, None])
 
-        conn_mock = unittest.mock.MagicMock()
-        mock_event.container.connect.return_value = conn_mock
+        await self.service.send_batch_async(TEST_BATCH, properties=[TEST_PROPERTIES, None, TEST_PROPERTIES])
 
-        self.handler.on_start(mock_event)
+        self.assertEqual(1, self.mock_sender_pool.send_batch.call_count)
+        self.assertEqual((TEST_QUEUE_MULTIPLE_URLS[0], TEST_BATCH), self.batch_call(0))
+        _, messages = self.mock_sender_pool.send_batch.call_args[0]
+        self.assertEqual([TEST_PROPERTIES, None, TEST_PROPERTIES], [message.properties for message in messages])
+
+    @utilities.test_utilities.async_test
+    async def test_send_batch_async_retries_only_failed_messages(self):
+        self.batch_results([None, comms.proton_queue_adaptor.MessageRejectedError(), None],
+                           [comms.proton_queue_adaptor.EarlyDisconnectError()],
+                           [None])
+
+        await self.service.send_batch_async(TEST_BATCH)
+
+        self.assertEqual(3, self.mock_sender_pool.send_batch.call_count)
+        self.assertEqual((TEST_QUEUE_MULTIPLE_URLS[0], TEST_BATCH), self.batch_call(0))
+        self.assertEqual((TEST_QUEUE_MULTIPLE_URLS[1], [TEST_BATCH[1]]), self.batch_call(1))
+        self.assertEqual((TEST_QUEUE_MULTIPLE_URLS[0], [TEST_BATCH[1]]), self.batch_call(2))
+
+    @utilities.test_utilities.async_test
+    async def test_send_batch_async_reports_failed_messages(self):
+        non_retriable_error = Exception()
+        self.batch_results(*[[comms.proton_queue_adaptor.EarlyDisconnectError(), None, non_retriable_error]] +
+                           [[comms.proton_queue_adaptor.EarlyDisconnectError()] for _ in range(3)])
 
-        mock_event.container.connect.assert_called_once_with(
+        with self.assertRaises(comms.queue_adaptor.BatchSendingError) as cm:
+            await self.service.send_batch_async(TEST_BATCH)
+
+        self.assertEqual({0, 2}, set(cm.exception.failures))
+        self.assertIsInstance(cm.exception.failures[0], comms.proton_queue_adaptor.EarlyDisconnectError)
+        self.assertIs(cm.exception.failures[2], non_retriable_error)
+        self.assertEqual(4, self.mock_sender_pool.send_batch.call_count)
+        for call_index in range(1, 4):
+            self.assertEqual([TEST_BATCH[0]], self.batch_call(call_index)[1])
+
+    @utilities.test_utilities.async_test
+    async def test_send_batch_async_rejects_properties_for_a_different_number_of_messages(self):
+        with self.assertRaises(ValueError):
+            await self.service.send_batch_async(TEST_BATCH, properties=[TEST_PROPERTIES])
+
+        self.mock_sender_pool.send_batch.assert_not_called()
+
+    def assert_proton_called_correctly(self, url, call_index, call_count):
+        self.assertEqual(self.mock_sender_pool.send.call_count, call_count)
+        actual_url, message = self.mock_sender_pool.send.call_args_list[call_index][0]
+        self.assertEqual(url, actual_url)
+        self.assertEqual(TEST_MESSAGE_SERIALISED, message.body)
+        self.assertEqual(TEST_UUID, message.id)
+
+
+class TestProtonBrokerSender(unittest.TestCase):
+    """Class to contain tests for the ProtonBrokerSender functionality."""
+
+    def setUp(self) -> None:
+        """Prepare service for testing."""
+        self.handler = comms.proton_queue_adaptor.ProtonBrokerSender(
+            TEST_QUEUE_SINGLE_URL[0], TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD)
+        self.mock_container = unittest.mock.MagicMock()
+        self.mock_connection = self.mock_container.connect.return_value
+        self.mock_sender = self.mock_container.create_sender.return_value
+        self.mock_sender.credit = 10
+        self.mock_sender.send.side_effect = self.send_with_credit
+
+    def send_with_credit(self, message):
+        self.mock_sender.credit -= 1
+        return unittest.mock.Mock(tag=message)
+
+    # TESTING SEND METHOD
+    def test_send_connects_on_first_message(self):
+        """Test that a connection and sender link are created for the first message only."""
+        self.handler.send(self.mock_container, [unittest.mock.Mock(message='first')])
+        self.handler.send(self.mock_container, [unittest.mock.Mock(message='second')])
+
+        self.mock_container.connect.assert_called_once_with(
             url=TEST_QUEUE_SINGLE_URL[0],
             user=TEST_QUEUE_USERNAME,
             password=TEST_QUEUE_PASSWORD,
-            reconnect=False)
-        mock_event.container.create_sender.assert_called_once_with(conn_mock, target=TEST_QUEUE_NAME)
+            reconnect=False,
+            handler=self.handler)
+        self.mock_container.create_sender.assert_called_once_with(self.mock_connection, target=TEST_QUEUE_NAME)
+        self.assertEqual([mock.call('first'), mock.call('second')], self.mock_sender.send.call_args_list)
 
-    def test_on_start_error(self):
-        """Test error condition when creating a message sender."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.container.create_sender.side_effect = TEST_SIDE_EFFECT
+    def test_send_batch_within_credit(self):
+        """Test that a batch of messages is sent as far as the credit allows, without waiting for acceptance."""
+        self.mock_sender.credit = 2
+        requests = [unittest.mock.Mock(message=str(i)) for i in range(3)]
 
-        with self.assertRaises(Exception) as ex:
-            self.handler.on_start(mock_event)
+        self.handler.send(self.mock_container, requests)
+        self.assertEqual([mock.call('0'), mock.call('1')], self.mock_sender.send.call_args_list)
 
-        self.assertIs(ex.exception, TEST_EXCEPTION)
-        self.assertTrue(mock_event.container.create_sender.called)
+        self.handler.on_accepted(unittest.mock.Mock(delivery=unittest.mock.Mock(tag='1')))
+        requests[1].succeed.assert_called_once_with()
+        self.assertFalse(requests[0].succeed.called)
 
-    # TESTING SENDABLE METHOD
-    def test_on_sendable_success(self):
-        """Test happy path for on_sendable."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.sender.credit = True
-        self.handler._sent = False
+        self.mock_sender.credit = 1
+        self.handler.on_sendable(unittest.mock.MagicMock())
+        self.assertEqual(mock.call('2'), self.mock_sender.send.call_args)
 
-        self.handler.on_sendable(mock_event)
+    def test_send_waits_for_credit(self):
+        """Test that messages are only sent once the sender link has credit."""
+        self.mock_sender.credit = 0
+        self.handler.send(self.mock_container, [unittest.mock.Mock(message='first')])
+        self.handler.send(self.mock_container, [unittest.mock.Mock(message='second')])
+        self.assertFalse(self.mock_sender.send.called)
 
-        self.assertTrue(mock_event.sender.send.called)
-        self.assertTrue(self.handler._sent)
+        self.mock_sender.credit = 2
+        self.handler.on_sendable(unittest.mock.MagicMock())
 
-    def test_on_sendable_already_sent(self):
-        """Test on_sendable when message has already been sent (and not rejected)."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.sender.credit = True
-        self.handler._sent = True
+        self.assertEqual([mock.call('first'), mock.call('second')], self.mock_sender.send.call_args_list)
 
-        self.handler.on_sendable(mock_event)
+    # TESTING DELIVERY OUTCOME METHODS
+    def test_on_accepted(self):
+        """Test that the request for an accepted message succeeds."""
+        request = unittest.mock.Mock(message='message')
+        self.handler.send(self.mock_container, [request])
 
-        self.assertFalse(mock_event.sender.send.called)
-        self.assertTrue(self.handler._sent)
+        self.handler.on_accepted(unittest.mock.Mock(delivery=unittest.mock.Mock(tag='message')))
 
-    def test_on_sendable_no_credit(self):
-        """Test unhappy path when on_sendable is invoked but there is no sending credit."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.sender.credit = False
-        self.handler._sent = False
+        request.succeed.assert_called_once_with()
+        self.assertFalse(request.fail.called)
 
-        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
-            self.handler.on_sendable(mock_event)
+    def test_on_rejected_and_released(self):
+        """Test that the request for a rejected or released message fails."""
+        for outcome_method in ['on_rejected', 'on_released']:
+            with self.subTest(outcome_method):
+                request = unittest.mock.Mock(message='message')
+                self.handler.send(self.mock_container, [request])
 
-        self.assertFalse(mock_event.sender.send.called)
-        self.assertFalse(self.handler._sent)
+                getattr(self.handler, outcome_method)(unittest.mock.Mock(delivery=unittest.mock.Mock(tag='message')))
 
-    def test_on_sendable_error(self):
-        """Test unhappy path where performing the send action raises an exception."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.sender.credit = True
-        mock_event.sender.send.side_effect = TEST_SIDE_EFFECT
-        self.handler._sent = False
+                exception = request.fail.call_args[0][0]
+                self.assertIsInstance(exception, comms.proton_queue_adaptor.MessageRejectedError)
+                self.assertFalse(request.succeed.called)
 
-        with self.assertRaises(Exception) as ex:
-            self.handler.on_sendable(mock_event)
+    # TESTING ERROR HANDLING METHODS
+    def test_should_fail_outstanding_messages_and_reconnect_on_error(self):
+        error_handling_methods = [
+            'on_disconnected',
+            'on_transport_error',
+            'on_connection_error',
+            'on_session_error',
+            'on_link_error'
+        ]
 
-        self.assertIs(ex.exception, TEST_EXCEPTION)
-        self.assertTrue(mock_event.sender.send.called)
-        self.assertFalse(self.handler._sent)
+        for error_handling_method in error_handling_methods:
+            with self.subTest(error_handling_method):
+                self.setUp()
+                sent_request = unittest.mock.Mock(message='sent')
+                self.handler.send(self.mock_container, [sent_request])
+                self.mock_sender.credit = 0
+                waiting_request = unittest.mock.Mock(message='waiting')
+                self.handler.send(self.mock_container, [waiting_request])
 
-    # TESTING ACCEPTED METHOD
-    def test_on_accepted_success(self):
-        """Test happy path for on_accepted."""
-        mock_event = unittest.mock.MagicMock()
+                getattr(self.handler, error_handling_method)(unittest.mock.MagicMock(connection=self.mock_connection))
 
-        self.handler.on_accepted(mock_event)
+                for request in [sent_request, waiting_request]:
+                    self.assertIsInstance(request.fail.call_args[0][0],
+                                          comms.proton_queue_adaptor.EarlyDisconnectError)
+                self.mock_connection.close.assert_called_once()
 
-        self.assertTrue(mock_event.connection.close.called)
+                self.handler.send(self.mock_container, [unittest.mock.Mock(message='next')])
+                self.assertEqual(2, self.mock_container.connect.call_count)
 
-    def test_on_accepted_error(self):
-        """Test unhappy path when attempting to close the connection raises an exception."""
-        mock_event = unittest.mock.MagicMock()
-        mock_event.connection.close.side_effect = TEST_SIDE_EFFECT
+    def test_should_ignore_errors_from_a_previous_connection(self):
+        """Test that a late error event for a connection that has been replaced does not close the new one."""
+        first_connection = unittest.mock.MagicMock()
+        second_connection = unittest.mock.MagicMock()
+        self.mock_container.connect.side_effect = [first_connection, second_connection]
+        self.handler.send(self.mock_container, [unittest.mock.Mock(message='first')])
+        self.handler.on_connection_error(unittest.mock.MagicMock(connection=first_connection))
+        request = unittest.mock.Mock(message='second')
+        self.handler.send(self.mock_container, [request])
 
-        with self.assertRaises(Exception) as ex:
-            self.handler.on_accepted(mock_event)
+        self.handler.on_disconnected(unittest.mock.MagicMock(connection=first_connection))
 
-        self.assertIs(ex.exception, TEST_EXCEPTION)
+        second_connection.close.assert_not_called()
+        self.assertFalse(request.fail.called)
+        self.assertEqual(2, self.mock_container.connect.call_count)
 
-    # TESTING DISCONNECT METHOD
-    def test_on_disconnected_success(self):
-        """Test happy path for disconnecting from the host."""
-        mock_event = unittest.mock.MagicMock()
-        self.handler._sent = True
+    def test_close(self):
+        """Test that closing fails any outstanding messages."""
+        request = unittest.mock.Mock(message='message')
+        self.handler.send(self.mock_container, [request])
 
-        self.handler.on_disconnected(mock_event)
+        self.handler.close()
 
-    def test_on_disconnected_early(self):
-        """Test unhappy path when disconnecting from the host occurs too early."""
-        mock_event = unittest.mock.MagicMock()
+        self.mock_connection.close.assert_called_once()
+        self.assertIsInstance(request.fail.call_args[0][0], comms.proton_queue_adaptor.EarlyDisconnectError)
 
-        with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
-            self.handler.on_disconnected(mock_event)
 
-    # TESTING REJECTED METHOD
-    def test_on_rejected(self):
-        """Test happy path allowing for a message to be rejected by the host (and ultimately re-submitted)."""
-        mock_event = unittest.mock.MagicMock()
-        self.handler._sent = True
+class LocalBroker(proton.handlers.MessagingHandler):
+    """A minimal broker which accepts (or rejects) every message it receives."""
 
-        self.handler.on_rejected(mock_event)
+    def __init__(self, url: str, accept: bool) -> None:
+        super().__init__(auto_accept=False)
+        self.url = url
+        self.accept_messages = accept
+        self.received = []
+        self.connections_opened = 0
+        self.container = None
 
-        self.assertFalse(self.handler._sent)
+    def on_start(self, event: proton.Event) -> None:
+        self.container = event.container
+        self.container.listen(self.url)
 
-    # TESTING ERROR HANDLING METHODS
-    def test_should_raise_exception_on_error(self):
-        error_handling_methods = [
-            self.handler.on_transport_error,
-            self.handler.on_connection_error,
-            self.handler.on_session_error,
-            self.handler.on_link_error
-        ]
+    def on_stop_request(self, event: proton.Event) -> None:
+        self.container.stop()
 
-        for error_handling_method in error_handling_methods:
-            with self.subTest(error_handling_method.__name__):
-                mock_event = unittest.mock.MagicMock()
+    def on_connection_opened(self, event: proton.Event) -> None:
+        self.connections_opened += 1
+
+    def on_message(self, event: proton.Event) -> None:
+        self.received.append(event.message.body)
+        if self.accept_messages:
+            self.accept(event.delivery)
+        else:
+            self.reject(event.delivery)
+
+
+class TestProtonSenderPool(unittest.TestCase):
+    """Class to contain tests for the ProtonSenderPool functionality, sending messages to a local broker."""
+
+    def setUp(self) -> None:
+        self.sender_pool = comms.proton_queue_adaptor.ProtonSenderPool(TEST_QUEUE_NAME, None, None)
 
-                with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
-                    error_handling_method(mock_event)
+    def tearDown(self) -> None:
+        self.sender_pool.close(5)
+
+    def start_broker(self, accept: bool = True) -> LocalBroker:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        broker = LocalBroker(f'127.0.0.1:{port}', accept)
+        injector = proton.reactor.EventInjector()
+        container = proton.reactor.Container(broker)
+        container.selectable(injector)
+        thread = threading.Thread(target=container.run, daemon=True)
+        thread.start()
+
+        def stop():
+            injector.trigger(proton.reactor.ApplicationEvent('stop_request'))
+            thread.join(5)
+
+        self.addCleanup(stop)
+        return broker
+
+    @utilities.test_utilities.async_test
+    async def test_send_reuses_connection(self):
+        broker = self.start_broker()
+
+        await asyncio.wait_for(self.sender_pool.send(broker.url, proton.Message(body='first')), 5)
+        await asyncio.wait_for(asyncio.gather(*[self.sender_pool.send(broker.url, proton.Message(body=str(i)))
+                                                for i in range(10)]), 5)
+
+        self.assertEqual(['first'] + [str(i) for i in range(10)], broker.received)
+        self.assertEqual(1, broker.connections_opened)
+
+    @utilities.test_utilities.async_test
+    async def test_send_batch(self):
+        broker = self.start_broker()
+        bodies = [str(i) for i in range(100)]
+
+        futures = self.sender_pool.send_batch(broker.url, [proton.Message(body=body) for body in bodies])
+        await asyncio.wait_for(asyncio.gather(*futures), 5)
+
+        self.assertEqual(bodies, broker.received)
+        self.assertEqual(1, broker.connections_opened)
+
+    @utilities.test_utilities.async_test
+    async def test_probe(self):
+        broker = self.start_broker()
+
+        await asyncio.wait_for(self.sender_pool.probe(broker.url), 5)
+        await asyncio.wait_for(self.sender_pool.send(broker.url, proton.Message(body='message')), 5)
+        await asyncio.wait_for(self.sender_pool.probe(broker.url), 5)
+
+        self.assertEqual(['message'], broker.received)
+        self.assertEqual(1, broker.connections_opened)
+
+    @utilities.test_utilities.async_test
+    async def test_probe_unavailable_broker(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            url = '127.0.0.1:{}'.format(s.getsockname()[1])
+
+        with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+            await asyncio.wait_for(self.sender_pool.probe(url), 5)
+
+    @utilities.test_utilities.async_test
+    async def test_send_rejected(self):
+        broker = self.start_broker(accept=False)
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageRejectedError):
+            await asyncio.wait_for(self.sender_pool.send(broker.url, proton.Message(body='message')), 5)
+
+    @utilities.test_utilities.async_test
+    async def test_send_to_unavailable_broker(self):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            url = '127.0.0.1:{}'.format(s.getsockname()[1])
+
+        with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+            await asyncio.wait_for(self.sender_pool.send(url, proton.Message(body='message')), 5)
@@ -0,0 +1,38 @@
+from typing import Callable
+
+import tornado.web
+
+
+class ReadinessHandler(tornado.web.RequestHandler):
+    """
+    A Tornado request handler that returns an empty HTTP 200 response for any GET requests once the application is
+    ready to handle requests, and an empty HTTP 503 response until then. This handler is intended to be hit by
+    anything that should only send requests to the application once it is ready ie for load balancers to do readiness
+    checks.
+    """
+
+    def initialize(self, is_ready: Callable[[], bool]) -> None:
+        """Initialise this request handler with the provided dependencies.
+
+        :param is_ready: A function returning whether the application is ready to handle requests.
+        """
+        self.is_ready = is_ready
+
+    async def get(self):
+        """
+        ---
+        summary: Readiness endpoint
+        description: >-
+          This endpoint returns a HTTP 200 response once the server is ready to
+          handle requests, having completed any warm-up it does at startup, and
+          a HTTP 503 response until then. This endpoint is intended to be used
+          by load balancers/other infrastructure to check that the server is
+          ready.
+        operationId: getReadiness
+        responses:
+          200:
+            description: The server is ready to handle requests.
+          503:
+            description: The server is not yet ready to handle requests.
+        """
+        self.set_status(200 if self.is_ready() else 503)
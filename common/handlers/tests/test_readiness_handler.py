@@ -0,0 +1,24 @@
+import tornado.testing
+from tornado.web import Application
+
+from handlers import readiness_handler
+
+
+class TestReadinessHandler(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self) -> Application:
+        self.ready = False
+        return tornado.web.Application([(r'/readiness', readiness_handler.ReadinessHandler,
+                                         dict(is_ready=lambda: self.ready))])
+
+    def test_get_when_ready(self):
+        self.ready = True
+
+        response = self.fetch('/readiness', method='GET')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual('', response.body.decode())
+
+    def test_get_when_not_ready(self):
+        response = self.fetch('/readiness', method='GET')
+
+        self.assertEqual(503, response.code)
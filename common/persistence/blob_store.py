@@ -0,0 +1,50 @@
+"""
+This module defines the blob store interface, used to store large values outside of the messages that refer to them.
+"""
+import abc
+from typing import Optional
+
+
+class BlobStorageError(RuntimeError):
+    """Error occurred when storing a blob."""
+    pass
+
+
+class BlobRetrievalError(RuntimeError):
+    """Error occurred when retrieving a blob."""
+    pass
+
+
+class BlobDeletionError(RuntimeError):
+    """Error occurred when deleting a blob."""
+    pass
+
+
+class BlobStore(abc.ABC):
+    """A store of binary values (blobs), each identified by a key."""
+
+    @abc.abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """
+        Stores a blob under the given key, replacing any blob already stored under it.
+        :param key: The key under which to store the blob. May contain `/` separated parts.
+        :param data: The blob to store.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Retrieves the blob stored under the given key.
+        :param key: The key which identifies the blob to get.
+        :return: The blob. (None if no blob found)
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Removes the blob stored under the given key, if there is one.
+        :param key: The key of the blob to delete.
+        """
+        pass
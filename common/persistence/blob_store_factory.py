@@ -0,0 +1,26 @@
+import utilities.config as config
+import utilities.integration_adaptors_logger as log
+from persistence.blob_store import BlobStore
+from persistence.file_blob_store import FileBlobStore
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+FILE = 'file'
+
+BLOB_STORE_TYPES = {
+    FILE: FileBlobStore,
+}
+
+
+def get_blob_store(*args, **kwargs) -> BlobStore:
+    """
+    Builds a new blob store of type defined in environment variable BLOB_STORE
+    Must be one of the defined in persistence.blob_store_factory.BLOB_STORE_TYPES
+    :class:`BlobStore <persistence.blob_store.BlobStore>`.
+    :param args: passed downstream to blob store constructor
+    :param kwargs: passed downstream to blob store constructor
+    :return: new instance of blob store
+    """
+    blob_store = config.get_config('BLOB_STORE', default=FILE)
+    logger.info("Building blob store using '%s' type", blob_store)
+    return BLOB_STORE_TYPES[blob_store.lower()](*args, **kwargs)
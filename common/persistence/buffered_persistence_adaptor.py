@@ -0,0 +1,141 @@
+"""Module containing a persistence adaptor that writes updates to another persistence adaptor in the background."""
+import asyncio
+from typing import Dict, List, Optional
+
+import utilities.integration_adaptors_logger as log
+from persistence import persistence_adaptor
+from utilities import config
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_FLUSH_SIZE = 100
+
+
+class BufferedPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
+    """Wraps a persistence adaptor, allowing updates that nothing needs to read back straight away to be written to
+    it in the background.
+
+    Updates passed to `buffer_update` are held in memory until a flush, either once `flush_interval` seconds have
+    passed since the first of them was buffered or once `flush_size` keys have updates buffered. Buffered updates to
+    the same key are merged, so only the latest value of each field is written. A flush makes one `update` call per
+    key, with the calls made concurrently, rather than a single batch write: DynamoDB's BatchWriteItem can only
+    replace whole items, not update some of their fields. Any other call that
+    involves a key with buffered updates first waits for them to be written, so a read always sees them.
+    """
+
+    def __init__(self, store: persistence_adaptor.PersistenceAdaptor, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 flush_size: int = DEFAULT_FLUSH_SIZE):
+        """
+        :param store: The persistence adaptor to write to.
+        :param flush_interval: The maximum time (in seconds) an update is buffered for before it is written.
+        :param flush_size: The number of keys with buffered updates at which they are written without waiting for the
+        flush interval.
+        """
+        self.store = store
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._buffered_updates: Dict[str, dict] = {}
+        self._writes_in_progress: Dict[str, asyncio.Future] = {}
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_config(cls, store: persistence_adaptor.PersistenceAdaptor, name: str) -> 'BufferedPersistenceAdaptor':
+        """Create a new BufferedPersistenceAdaptor configured from the config values for the named store. For a store
+        named `state-store` these are `STATE_STORE_FLUSH_INTERVAL` and `STATE_STORE_FLUSH_SIZE`.
+
+        :param store: The persistence adaptor to write to.
+        :param name: The name of the store.
+        :return: A new BufferedPersistenceAdaptor.
+        """
+        prefix = name.upper().replace('-', '_') + '_'
+        return cls(store,
+                   flush_interval=float(config.get_config(prefix + 'FLUSH_INTERVAL',
+                                                          default=str(DEFAULT_FLUSH_INTERVAL))),
+                   flush_size=int(config.get_config(prefix + 'FLUSH_SIZE', default=str(DEFAULT_FLUSH_SIZE))))
+
+    async def buffer_update(self, key: str, data: dict) -> None:
+        """Buffer an update to an item, to be written to the underlying store in the background. If the update
+        cannot be written, this is logged rather than reported to the caller.
+
+        :param key: The key used to identify the item.
+        :param data: The fields of the item to update.
+        :return: None, as the update is written later.
+        """
+        self._buffered_updates.setdefault(key, {}).update(data)
+
+        if len(self._buffered_updates) >= self.flush_size:
+            asyncio.ensure_future(self.flush())
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_event_loop().call_later(self.flush_interval,
+                                                                    lambda: asyncio.ensure_future(self.flush()))
+
+    async def flush(self) -> None:
+        """Write all buffered updates to the underlying store, using one concurrent `update` per key."""
+        await self.__flush_keys(list(self._buffered_updates.keys()))
+
+    async def add(self, key: str, data: dict) -> None:
+        await self.__flush_keys([key])
+        return await self.store.add(key, data)
+
+    async def update(self, key: str, data: dict):
+        await self.__flush_keys([key])
+        return await self.store.update(key, data)
+
+    async def get(self, key: str, **kwargs) -> Optional[dict]:
+        await self.__flush_keys([key])
+        return await self.store.get(key, **kwargs)
+
+    async def delete(self, key: str) -> Optional[dict]:
+        await self.__flush_keys([key])
+        return await self.store.delete(key)
+
+    async def get_many(self, keys: List[str], **kwargs) -> Dict[str, dict]:
+        await self.__flush_keys(keys)
+        return await self.store.get_many(keys, **kwargs)
+
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        await self.flush()
+        return await self.store.get_all(fields)
+
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        await self.__flush_keys(list(items.keys()))
+        return await self.store.add_many(items)
+
+    async def delete_many(self, keys: List[str]) -> None:
+        await self.__flush_keys(keys)
+        return await self.store.delete_many(keys)
+
+    async def close(self) -> None:
+        """Writes any buffered updates, then closes the underlying store."""
+        await self.flush()
+        await self.store.close()
+
+    async def __flush_keys(self, keys: List[str]) -> None:
+        updates = {key: self._buffered_updates.pop(key) for key in keys if key in self._buffered_updates}
+        if updates:
+            logger.info('Writing {count} buffered updates', fparams={'count': len(updates)})
+        for key, data in updates.items():
+            self._writes_in_progress[key] = asyncio.ensure_future(
+                self.__write(key, data, self._writes_in_progress.get(key)))
+
+        if not self._buffered_updates and self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        in_progress = [self._writes_in_progress[key] for key in keys if key in self._writes_in_progress]
+        if in_progress:
+            await asyncio.gather(*in_progress)
+
+    async def __write(self, key: str, data: dict, previous_write: Optional[asyncio.Future]) -> None:
+        try:
+            # Writes to the same key are made in the order they were buffered
+            if previous_write is not None:
+                await previous_write
+            await self.store.update(key, data)
+        except Exception:
+            logger.exception('Failed to write buffered update for {key}', fparams={'key': key})
+        finally:
+            if self._writes_in_progress.get(key) is asyncio.current_task():
+                del self._writes_in_progress[key]
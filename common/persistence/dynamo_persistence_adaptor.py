@@ -1,19 +1,27 @@
 """Module containing functionality for a DynamoDB implementation of a persistence adaptor."""
-import contextlib
+import asyncio
+from typing import Callable, Dict, List, Optional
 
 import aioboto3
 from boto3.dynamodb.conditions import Attr
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 import utilities.integration_adaptors_logger as log
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor import retriable, RecordCreationError, RecordUpdateError, RecordRetrievalError, \
-    RecordDeletionError, validate_data_has_no_primary_key_field
+    RecordDeletionError, DuplicatePrimaryKeyError, validate_data_has_no_primary_key_field, \
+    validate_items_have_no_primary_key_field
 from utilities import config
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
 _KEY = "key"
 
+# The maximum number of items DynamoDB accepts in a single BatchGetItem and BatchWriteItem request
+_BATCH_GET_LIMIT = 100
+_BATCH_WRITE_LIMIT = 25
+
 
 class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
     """Class responsible for persisting items into a DynamoDB."""
@@ -26,6 +34,8 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
           * table_name: The Table Name used to identify the dynamo table containing required items.
           * max_retries: The number of max retries object should make if there is an error connecting with the DB
           * retry_delay: The delay between retries
+        The DynamoDB client (and its connection pool) is created when the adaptor is first used, and is then reused
+        for every call until :meth:`close` is called.
         :param table_name: Table name to be used in this adaptor.
         """
         self.table_name = table_name
@@ -34,6 +44,12 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
 
         self.endpoint_url = config.get_config('DB_ENDPOINT_URL', None)
         self.region_name = config.get_config('CLOUD_REGION', 'eu-west-2')
+        self.max_pool_connections = int(config.get_config('DB_MAX_POOL_CONNECTIONS', '10'))
+
+        self._resource_context = None
+        self._dynamo_resource = None
+        self._table = None
+        self._table_lock = None
 
     @validate_data_has_no_primary_key_field(primary_key=_KEY)
     @retriable
@@ -47,10 +63,14 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         logger.info('Adding data for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
 
         try:
-            async with self.__get_dynamo_table() as table:
-                await table.put_item(
-                    Item=self.add_primary_key_field(_KEY, key, data),
-                    ConditionExpression=Attr(_KEY).not_exists())
+            table = await self.__get_dynamo_table()
+            await table.put_item(
+                Item=self.add_primary_key_field(_KEY, key, data),
+                ConditionExpression=Attr(_KEY).not_exists())
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                raise DuplicatePrimaryKeyError(f'An item already exists with key {key}') from e
+            raise RecordCreationError from e
         except Exception as e:
             raise RecordCreationError from e
 
@@ -69,11 +89,11 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         attribute_updates = dict([(k, {"Value": v}) for k, v in data.items()])
 
         try:
-            async with self.__get_dynamo_table() as table:
-                response = await table.update_item(
-                    Key={_KEY: key},
-                    AttributeUpdates=attribute_updates,
-                    ReturnValues="ALL_NEW")
+            table = await self.__get_dynamo_table()
+            response = await table.update_item(
+                Key={_KEY: key},
+                AttributeUpdates=attribute_updates,
+                ReturnValues="ALL_NEW")
 
             return self.remove_primary_key_field(_KEY, response.get('Attributes', {}))
         except Exception as e:
@@ -89,10 +109,10 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         """
         logger.info('Getting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
         try:
-            async with self.__get_dynamo_table() as table:
-                response = await table.get_item(
-                    Key={_KEY: key},
-                    ConsistentRead=strongly_consistent_read)
+            table = await self.__get_dynamo_table()
+            response = await table.get_item(
+                Key={_KEY: key},
+                ConsistentRead=strongly_consistent_read)
 
             if 'Item' not in response:
                 logger.info('No item found for record: {key} in table {table}', fparams={'key': key, 'table': self.table_name})
@@ -111,11 +131,11 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         """
         logger.info('Deleting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
         try:
-            async with self.__get_dynamo_table() as table:
-                response = await table.delete_item(
-                    Key={_KEY: key},
-                    ReturnValues='ALL_OLD'
-                )
+            table = await self.__get_dynamo_table()
+            response = await table.delete_item(
+                Key={_KEY: key},
+                ReturnValues='ALL_OLD'
+            )
             if 'Attributes' not in response:
                 logger.info('No values found for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
                 return None
@@ -124,16 +144,163 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         except Exception as e:
             raise RecordDeletionError from e
 
-    @contextlib.asynccontextmanager
+    @retriable
+    async def get_many(self, keys: List[str], strongly_consistent_read: bool = False) -> Dict[str, dict]:
+        """
+        Retrieves the items with the given keys from a specified table, using BatchGetItem.
+        :param keys: The keys which identify the items to get.
+        :param strongly_consistent_read: https://docs.amazonaws.cn/en_us/amazondynamodb/latest/developerguide/HowItWorks.ReadConsistency.html
+        :return: A dictionary of the items found, keyed by their keys. Keys with no item are not included.
+        """
+        logger.info('Getting {count} records from table {table}', fparams={'count': len(keys), 'table': self.table_name})
+        try:
+            dynamo_resource = await self.__get_dynamo_resource()
+            items = {}
+            # BatchGetItem rejects requests that contain the same key twice
+            for chunk in _chunks(list(dict.fromkeys(keys)), _BATCH_GET_LIMIT):
+                request_items = {self.table_name: {'Keys': [{_KEY: key} for key in chunk],
+                                                   'ConsistentRead': strongly_consistent_read}}
+                responses = await self.__batch_request(dynamo_resource.batch_get_item, request_items, 'UnprocessedKeys')
+                for response in responses:
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        key = item[_KEY]
+                        items[key] = self.remove_primary_key_field(_KEY, item)
+            return items
+        except Exception as e:
+            raise RecordRetrievalError from e
+
+    @retriable
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Retrieves every item from a specified table, using a strongly consistent Scan. A Scan consumes read capacity
+        for the whole of every item, even when only some of its fields are retrieved.
+        :param fields: The fields of each item to retrieve. If None, every field is retrieved.
+        :return: A dictionary of all the items, keyed by their keys.
+        """
+        logger.info('Getting all records from table {table}', fparams={'table': self.table_name})
+        try:
+            table = await self.__get_dynamo_table()
+            items = {}
+            scan_kwargs = {'ConsistentRead': True}
+            if fields is not None:
+                # Field names are passed as placeholders, as they may be DynamoDB reserved words
+                names = {f'#f{index}': name for index, name in enumerate([_KEY] + list(fields))}
+                scan_kwargs['ProjectionExpression'] = ', '.join(names)
+                scan_kwargs['ExpressionAttributeNames'] = names
+            while True:
+                response = await table.scan(**scan_kwargs)
+                for item in response.get('Items', []):
+                    key = item[_KEY]
+                    items[key] = self.remove_primary_key_field(_KEY, item)
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            raise RecordRetrievalError from e
+
+    @validate_items_have_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        """
+        Adds a number of items to a specified table, using BatchWriteItem. Any existing item with the same key as one
+        of the items is replaced.
+        :param items: The items to store in persistence, keyed by the key to store each one under.
+        """
+        logger.info('Adding {count} records to table {table}', fparams={'count': len(items), 'table': self.table_name})
+        try:
+            dynamo_resource = await self.__get_dynamo_resource()
+            requests = [{'PutRequest': {'Item': self.add_primary_key_field(_KEY, key, data)}}
+                        for key, data in items.items()]
+            for chunk in _chunks(requests, _BATCH_WRITE_LIMIT):
+                await self.__batch_request(dynamo_resource.batch_write_item, {self.table_name: chunk},
+                                           'UnprocessedItems')
+        except Exception as e:
+            raise RecordCreationError from e
+
+    @retriable
+    async def delete_many(self, keys: List[str]) -> None:
+        """
+        Removes the items with the given keys from a table, using BatchWriteItem. Keys with no item are ignored.
+        :param keys: The keys of the items to delete.
+        """
+        logger.info('Deleting {count} records from table {table}', fparams={'count': len(keys), 'table': self.table_name})
+        try:
+            dynamo_resource = await self.__get_dynamo_resource()
+            # BatchWriteItem rejects requests that contain the same key twice
+            requests = [{'DeleteRequest': {'Key': {_KEY: key}}} for key in dict.fromkeys(keys)]
+            for chunk in _chunks(requests, _BATCH_WRITE_LIMIT):
+                await self.__batch_request(dynamo_resource.batch_write_item, {self.table_name: chunk},
+                                           'UnprocessedItems')
+        except Exception as e:
+            raise RecordDeletionError from e
+
+    async def __batch_request(self, operation: Callable, request_items: dict, unprocessed_field: str) -> List[dict]:
+        """
+        Makes a batch request, resubmitting any part of it that DynamoDB reports as unprocessed (e.g. because the
+        table's throughput was exceeded) with an exponentially increasing delay between attempts.
+        :param operation: The batch operation of the DynamoDB resource to call.
+        :param request_items: The `RequestItems` of the request.
+        :param unprocessed_field: The field of the response holding the part of the request that was not processed.
+        :return: The responses to each attempt.
+        """
+        responses = []
+        attempts = 0
+        while True:
+            response = await operation(RequestItems=request_items)
+            responses.append(response)
+            request_items = response.get(unprocessed_field)
+            if not request_items:
+                return responses
+
+            if attempts >= self.max_retries:
+                raise RuntimeError(f'Part of batch request to {self.table_name} still unprocessed after '
+                                   f'{attempts + 1} attempts')
+            delay = self.retry_delay * 2 ** attempts
+            attempts += 1
+            logger.warning('Part of batch request to {table} was unprocessed. Resubmitting it in {delay} seconds',
+                           fparams={'table': self.table_name, 'delay': delay})
+            await asyncio.sleep(delay)
+
+    async def close(self) -> None:
+        """Closes the DynamoDB client used by this adaptor, if one has been created."""
+        if self._resource_context is not None:
+            logger.info('Closing connection to {table_name}', fparams={'table_name': self.table_name})
+            resource_context = self._resource_context
+            self._resource_context = None
+            self._dynamo_resource = None
+            self._table = None
+            await resource_context.__aexit__(None, None, None)
+
     async def __get_dynamo_table(self):
         """
-        Creates a connection to the table referenced by this instance.
+        Gets the table referenced by this instance, creating the DynamoDB client used to access it on first use.
         :return: The table to be used by this instance.
         """
-        async with aioboto3.resource('dynamodb',
-                                     region_name=self.region_name,
-                                     endpoint_url=self.endpoint_url) as dynamo_resource:
-            logger.info('Establishing connection to {table_name}', fparams={'table_name': self.table_name})
-            yield dynamo_resource.Table(self.table_name)
+        if self._table is None:
+            if self._table_lock is None:
+                self._table_lock = asyncio.Lock()
+            async with self._table_lock:
+                if self._table is None:
+                    logger.info('Establishing connection to {table_name}', fparams={'table_name': self.table_name})
+                    resource_context = aioboto3.resource(
+                        'dynamodb',
+                        region_name=self.region_name,
+                        endpoint_url=self.endpoint_url,
+                        config=Config(max_pool_connections=self.max_pool_connections))
+                    dynamo_resource = await resource_context.__aenter__()
+                    self._resource_context = resource_context
+                    self._dynamo_resource = dynamo_resource
+                    self._table = dynamo_resource.Table(self.table_name)
+        return self._table
+
+    async def __get_dynamo_resource(self):
+        """
+        Gets the DynamoDB resource used by this instance, creating it on first use.
+        :return: The resource to be used by this instance.
+        """
+        await self.__get_dynamo_table()
+        return self._dynamo_resource
 
 
+def _chunks(values: list, size: int) -> List[list]:
+    return [values[i:i + size] for i in range(0, len(values), size)]
@@ -0,0 +1,93 @@
+"""Module containing functionality for a local filesystem implementation of a blob store."""
+import asyncio
+import os
+import pathlib
+import tempfile
+from typing import Optional
+
+import utilities.integration_adaptors_logger as log
+from persistence import blob_store
+from persistence.blob_store import BlobStorageError, BlobRetrievalError, BlobDeletionError
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+
+class FileBlobStore(blob_store.BlobStore):
+    """Class responsible for storing blobs as files in a directory on the local filesystem. Intended for testing and
+    for single host deployments where the directory is shared by the producers and consumers of the blobs."""
+
+    def __init__(self, directory: str):
+        """
+        Constructs a local filesystem version of a :class:`BlobStore <persistence.blob_store.BlobStore>`.
+        :param directory: The directory to store blobs in. Created if it does not already exist.
+        """
+        self.directory = pathlib.Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def put(self, key: str, data: bytes) -> None:
+        """Stores a blob as a file, using a provided key as its path within the directory.
+
+        :param key: The key under which to store the blob.
+        :param data: The blob to store.
+        """
+        logger.info('Storing blob of {size} bytes for {key}', fparams={'size': len(data), 'key': key})
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self.__write, self.__path(key), data)
+        except Exception as e:
+            raise BlobStorageError from e
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Retrieves the blob stored as a file for a given key.
+
+        :param key: The key which identifies the blob to get.
+        :return: The blob. (None if no blob found)
+        """
+        logger.info('Retrieving blob for {key}', fparams={'key': key})
+        try:
+            return await asyncio.get_event_loop().run_in_executor(None, self.__read, self.__path(key))
+        except Exception as e:
+            raise BlobRetrievalError from e
+
+    async def delete(self, key: str) -> None:
+        """Removes the file storing the blob for a given key.
+
+        :param key: The key of the blob to delete.
+        """
+        logger.info('Deleting blob for {key}', fparams={'key': key})
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self.__remove, self.__path(key))
+        except Exception as e:
+            raise BlobDeletionError from e
+
+    def __path(self, key: str) -> pathlib.Path:
+        path = (self.directory / key).resolve()
+        if self.directory not in path.parents:
+            raise ValueError(f'Blob key {key} is outside of the blob store directory')
+        return path
+
+    @staticmethod
+    def __write(path: pathlib.Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that readers never see a partially written blob
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=str(path.parent))
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary_path, str(path))
+        except Exception:
+            os.unlink(temporary_path)
+            raise
+
+    @staticmethod
+    def __read(path: pathlib.Path) -> Optional[bytes]:
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def __remove(path: pathlib.Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,164 @@
+"""Module containing a persistence adaptor that compresses a large field of each item and splits it across items."""
+import base64
+import zlib
+from typing import Dict, List, Optional
+
+import utilities.integration_adaptors_logger as log
+from persistence import persistence_adaptor
+from utilities import config
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+ZLIB = 'zlib'
+
+# Sized so a chunk fits in a DynamoDB item (400KB) even if every character takes four bytes to encode
+DEFAULT_CHUNK_SIZE = 100000
+
+COMPRESSION = '_COMPRESSION'
+CHUNKS = '_CHUNKS'
+
+
+class LargeItemPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
+    """Wraps a persistence adaptor, keeping one field of each item it stores small.
+
+    The field's value is optionally compressed (and stored base64 encoded). If the stored value is longer than
+    `chunk_size`, the remainder is split across extra items with keys of the form `<key>#<index>`, which are written
+    before the item itself and combined with it again when it is read. Items written without this adaptor are read
+    unchanged.
+    """
+
+    def __init__(self, store: persistence_adaptor.PersistenceAdaptor, field: str, compression: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        :param store: The persistence adaptor to write to.
+        :param field: The field of each item to compress and split across items.
+        :param compression: The compression to apply to the field, `zlib` or None for no compression.
+        :param chunk_size: The maximum length (in characters) of the field stored in each item.
+        """
+        if compression not in (None, ZLIB):
+            raise ValueError(f'Unsupported compression: {compression}')
+
+        self.store = store
+        self.field = field
+        self.compression = compression
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_config(cls, store: persistence_adaptor.PersistenceAdaptor, field: str,
+                    name: str) -> 'LargeItemPersistenceAdaptor':
+        """Create a new LargeItemPersistenceAdaptor configured from the config values for the named store. For a
+        store named `sync-async-store` these are `SYNC_ASYNC_STORE_COMPRESSION` and `SYNC_ASYNC_STORE_CHUNK_SIZE`.
+
+        :param store: The persistence adaptor to write to.
+        :param field: The field of each item to compress and split across items.
+        :param name: The name of the store.
+        :return: A new LargeItemPersistenceAdaptor.
+        """
+        prefix = name.upper().replace('-', '_') + '_'
+        return cls(store, field,
+                   compression=config.get_config(prefix + 'COMPRESSION', default=None) or None,
+                   chunk_size=int(config.get_config(prefix + 'CHUNK_SIZE', default=str(DEFAULT_CHUNK_SIZE))))
+
+    async def add(self, key: str, data: dict) -> None:
+        item, chunks = self._encode(key, data)
+        if chunks:
+            await self.store.add_many(chunks)
+        return await self.store.add(key, item)
+
+    async def update(self, key: str, data: dict):
+        item, chunks = self._encode(key, data)
+        if chunks:
+            raise ValueError(f'{self.field} is too large to be updated')
+        return await self._decode(key, await self.store.update(key, item))
+
+    async def get(self, key: str, **kwargs) -> Optional[dict]:
+        return await self._decode(key, await self.store.get(key, **kwargs), **kwargs)
+
+    async def delete(self, key: str) -> Optional[dict]:
+        """Removes an item, along with any items its field was split across.
+
+        :param key: The key of the item to delete.
+        :return: The deleted item as it was stored, so its field may be compressed or only the first chunk of it.
+        """
+        item = await self.store.delete(key)
+        if item is not None and item.get(CHUNKS):
+            await self.store.delete_many(self._chunk_keys(key, item[CHUNKS]))
+        return item
+
+    async def get_many(self, keys: List[str], **kwargs) -> Dict[str, dict]:
+        items = await self.store.get_many(keys, **kwargs)
+        return {key: await self._decode(key, item, **kwargs) for key, item in items.items()}
+
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        # The number of chunks is always read, as it is needed to tell which items are chunks
+        items = await self.store.get_all(None if fields is None else list(fields) + [CHUNKS, COMPRESSION])
+        chunk_keys = {chunk_key for key, item in items.items() if item.get(CHUNKS)
+                      for chunk_key in self._chunk_keys(key, item[CHUNKS])}
+        if fields is not None and self.field not in fields:
+            return {key: {name: value for name, value in item.items() if name in fields}
+                    for key, item in items.items() if key not in chunk_keys}
+        return {key: await self._decode(key, item) for key, item in items.items() if key not in chunk_keys}
+
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        encoded_items = {}
+        all_chunks = {}
+        for key, data in items.items():
+            encoded_items[key], chunks = self._encode(key, data)
+            all_chunks.update(chunks)
+
+        if all_chunks:
+            await self.store.add_many(all_chunks)
+        await self.store.add_many(encoded_items)
+
+    async def delete_many(self, keys: List[str]) -> None:
+        items = await self.store.get_many(keys)
+        chunk_keys = [chunk_key for key, item in items.items() if item.get(CHUNKS)
+                      for chunk_key in self._chunk_keys(key, item[CHUNKS])]
+        await self.store.delete_many(list(keys) + chunk_keys)
+
+    async def close(self) -> None:
+        await self.store.close()
+
+    def _encode(self, key: str, data: dict):
+        value = data.get(self.field)
+        if value is None:
+            return data, {}
+
+        item = dict(data)
+        if self.compression == ZLIB:
+            value = base64.b64encode(zlib.compress(value.encode())).decode()
+            item[COMPRESSION] = ZLIB
+
+        parts = [value[i:i + self.chunk_size] for i in range(0, len(value), self.chunk_size)] or ['']
+        item[self.field] = parts[0]
+        chunks = {}
+        if len(parts) > 1:
+            logger.info('Splitting {field} of {key} across {chunks} items',
+                        fparams={'field': self.field, 'key': key, 'chunks': len(parts)})
+            item[CHUNKS] = len(parts) - 1
+            chunks = {chunk_key: {self.field: part}
+                      for chunk_key, part in zip(self._chunk_keys(key, item[CHUNKS]), parts[1:])}
+        return item, chunks
+
+    async def _decode(self, key: str, item: Optional[dict], **kwargs) -> Optional[dict]:
+        if item is None or (COMPRESSION not in item and CHUNKS not in item):
+            return item
+
+        item = dict(item)
+        value = item[self.field]
+        chunk_count = int(item.pop(CHUNKS, 0))
+        if chunk_count:
+            chunk_keys = self._chunk_keys(key, chunk_count)
+            chunks = await self.store.get_many(chunk_keys, **kwargs)
+            if len(chunks) != chunk_count:
+                raise persistence_adaptor.RecordRetrievalError(f'Missing chunks of {self.field} of {key}')
+            value += ''.join(chunks[chunk_key][self.field] for chunk_key in chunk_keys)
+
+        if item.pop(COMPRESSION, None) == ZLIB:
+            value = zlib.decompress(base64.b64decode(value)).decode()
+        item[self.field] = value
+        return item
+
+    @staticmethod
+    def _chunk_keys(key: str, chunk_count) -> List[str]:
+        return [f'{key}#{index}' for index in range(1, int(chunk_count) + 1)]
@@ -1,19 +1,23 @@
 """Module containing functionality for a MongoDB implementation of a persistence adaptor."""
 import threading
+from typing import Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ReturnDocument
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 import utilities.integration_adaptors_logger as log
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor import retriable, RecordCreationError, RecordUpdateError, RecordRetrievalError, \
-    RecordDeletionError, validate_data_has_no_primary_key_field
+    RecordDeletionError, DuplicatePrimaryKeyError, validate_data_has_no_primary_key_field, \
+    validate_items_have_no_primary_key_field
 from utilities import config
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
 _DB_NAME = 'integration-adaptors'
 _KEY = "_id"
+_DUPLICATE_KEY_ERROR_CODE = 11000
 
 
 class MongoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
@@ -53,6 +57,8 @@ class MongoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
             result = await self.collection.insert_one(self.add_primary_key_field(_KEY, key, data))
             if not result.acknowledged:
                 raise RecordCreationError
+        except DuplicateKeyError as e:
+            raise DuplicatePrimaryKeyError(f'An item already exists with key {key}') from e
         except Exception as e:
             raise RecordCreationError from e
 
@@ -105,6 +111,86 @@ class MongoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         except Exception as e:
             raise RecordDeletionError from e
 
+    @retriable
+    async def get_many(self, keys: List[str], **kwargs) -> Dict[str, dict]:
+        """
+        Retrieves the items with the given keys from a specified table, using a single `$in` query.
+        :param keys: The keys which identify the items to get.
+        :return: A dictionary of the items found, keyed by their keys. Keys with no item are not included.
+        """
+        logger.info('Getting {count} records from table {table}', fparams={'count': len(keys), 'table': self.table_name})
+        try:
+            documents = await self.collection.find({_KEY: {'$in': keys}}).to_list(length=None)
+            items = {}
+            for document in documents:
+                key = document[_KEY]
+                items[key] = self.remove_primary_key_field(_KEY, document)
+            return items
+        except Exception as e:
+            raise RecordRetrievalError from e
+
+    @retriable
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Retrieves every item from a specified table.
+        :param fields: The fields of each item to retrieve. If None, every field is retrieved.
+        :return: A dictionary of all the items, keyed by their keys.
+        """
+        logger.info('Getting all records from table {table}', fparams={'table': self.table_name})
+        projection = None if fields is None else {field: True for field in fields}
+        try:
+            documents = await self.collection.find({}, projection).to_list(length=None)
+            items = {}
+            for document in documents:
+                key = document[_KEY]
+                items[key] = self.remove_primary_key_field(_KEY, document)
+            return items
+        except Exception as e:
+            raise RecordRetrievalError from e
+
+    @validate_items_have_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        """
+        Adds a number of items to a specified table, using `bulk_write` to upsert each one. Any existing item with the
+        same key as one of the items is replaced.
+        :param items: The items to store in persistence, keyed by the key to store each one under.
+        """
+        logger.info('Adding {count} records to table {table}', fparams={'count': len(items), 'table': self.table_name})
+        if not items:
+            return
+
+        try:
+            result = await self.collection.bulk_write(
+                [ReplaceOne({_KEY: key}, self.add_primary_key_field(_KEY, key, data), upsert=True)
+                 for key, data in items.items()],
+                ordered=False)
+            if not result.acknowledged:
+                raise RecordCreationError
+        except BulkWriteError as e:
+            # Concurrent upserts of the same key can conflict, but retrying would replace the other caller's item
+            if any(error.get('code') == _DUPLICATE_KEY_ERROR_CODE for error in e.details.get('writeErrors', [])):
+                raise DuplicatePrimaryKeyError('An item was added concurrently with the same key as one of the items') \
+                    from e
+            raise RecordCreationError from e
+        except Exception as e:
+            raise RecordCreationError from e
+
+    @retriable
+    async def delete_many(self, keys: List[str]) -> None:
+        """
+        Removes the items with the given keys from a table, using `bulk_write`. Keys with no item are ignored.
+        :param keys: The keys of the items to delete.
+        """
+        logger.info('Deleting {count} records from table {table}', fparams={'count': len(keys), 'table': self.table_name})
+        if not keys:
+            return
+
+        try:
+            await self.collection.bulk_write([DeleteOne({_KEY: key}) for key in keys], ordered=False)
+        except Exception as e:
+            raise RecordDeletionError from e
+
     @staticmethod
     def _initialize_mongo_client():
         with threading.Lock():
@@ -2,7 +2,7 @@
 This module defines the state adaptor interface, used to allow support for multiple state database implementations.
 """
 import abc
-from typing import Optional
+from typing import Dict, List, Optional
 import copy
 from exceptions import MaxRetriesExceeded
 from retry.retriable_action import RetriableAction
@@ -22,12 +22,28 @@ def validate_data_has_no_primary_key_field(primary_key: str):
     return decorator
 
 
+def validate_items_have_no_primary_key_field(primary_key: str):
+    def decorator(function):
+        async def wrapper(*args, **kwargs):
+            _, items = args
+            if any(primary_key in data for data in items.values()):
+                raise ValueError(DATA_VALIDATION_ERROR_MESSAGE.format(primary_key))
+            return await function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
 def retriable(func):
     async def inner(*args, **kwargs):
         self = args[0]
         if hasattr(self, 'max_retries') and hasattr(self, 'retry_delay'):
-            result = await RetriableAction(func, self.max_retries, self.retry_delay).execute(*args, **kwargs)
+            result = await RetriableAction(func, self.max_retries, self.retry_delay) \
+                .with_retriable_exception_check(lambda exception: not isinstance(exception, DuplicatePrimaryKeyError)) \
+                .execute(*args, **kwargs)
             if not result.is_successful:
+                if isinstance(result.exception, DuplicatePrimaryKeyError):
+                    # Retrying would fail in the same way, so the caller is told the key is in use
+                    raise result.exception
                 raise MaxRetriesExceeded("Max number of retries exceeded when performing DB call") from result.exception
             return result.result
         else:
@@ -40,6 +56,11 @@ class RecordCreationError(RuntimeError):
     pass
 
 
+class DuplicatePrimaryKeyError(RecordCreationError):
+    """Error occurred when creating a record with a key that is already in use."""
+    pass
+
+
 class RecordDeletionError(RuntimeError):
     """Error occurred when deleting record."""
     pass
@@ -65,6 +86,7 @@ class PersistenceAdaptor(abc.ABC):
         :param key: The key under which to store the data in persistence.
         :param data: The item to store in persistence. Must have 'key'
         :return: The previous version of the item which has been replaced. (None if no previous item)
+        :raises DuplicatePrimaryKeyError: if an item already exists with the key.
         """
         pass
 
@@ -72,6 +94,16 @@ class PersistenceAdaptor(abc.ABC):
     async def update(self, key: str, data: dict):
         pass
 
+    async def buffer_update(self, key: str, data: dict) -> Optional[dict]:
+        """Updates an item, for a caller that does not need to read the update back straight away. An adaptor may
+        write such updates in the background, but by default they are written straight away using `update`.
+
+        :param key: The key used to identify the item.
+        :param data: The fields of the item to update.
+        :return: The updated item, or None if the update is to be written later.
+        """
+        return await self.update(key, data)
+
     @abc.abstractmethod
     async def get(self, key: str) -> Optional[dict]:
         """
@@ -90,6 +122,51 @@ class PersistenceAdaptor(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        """
+        Retrieves the items with the given keys from a specified table, using as few calls to the database as possible.
+        :param keys: The keys which identify the items to get.
+        :return: A dictionary of the items found, keyed by their keys. Keys with no item are not included.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Retrieves every item from a specified table. This reads the whole table, so should only be used for tables
+        that are known to be small.
+
+        :param fields: The fields of each item to retrieve. If None, every field is retrieved.
+        :return: A dictionary of all the items, keyed by their keys.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        """
+        Adds a number of items to a specified table, using as few calls to the database as possible. Unlike `add`,
+        any existing item with the same key as one of the items is replaced, so adding the same items again (for
+        example, after a partial failure) has no further effect.
+        :param items: The items to store in persistence, keyed by the key to store each one under.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete_many(self, keys: List[str]) -> None:
+        """
+        Removes the items with the given keys from a table, using as few calls to the database as possible. Keys with
+        no item are ignored.
+        :param keys: The keys of the items to delete.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Releases any connections held by this adaptor. The adaptor must not be used after it has been closed.
+        """
+        pass
+
     @staticmethod
     def add_primary_key_field(primary_key_field, key, data):
         item = copy.deepcopy(data)
@@ -0,0 +1,97 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import MagicMock, call, patch
+
+from persistence.buffered_persistence_adaptor import BufferedPersistenceAdaptor
+from utilities import config
+from utilities.test_utilities import async_test, awaitable
+
+KEY = 'key'
+OTHER_KEY = 'other-key'
+
+
+class TestBufferedPersistenceAdaptor(TestCase):
+
+    def setUp(self):
+        self.store = MagicMock()
+        self.store.update.side_effect = lambda key, data: awaitable(data)
+        self.store.get.side_effect = lambda key, **kwargs: awaitable({'key': key})
+        self.store.close.side_effect = lambda: awaitable(None)
+        self.adaptor = BufferedPersistenceAdaptor(self.store, flush_interval=0.01, flush_size=3)
+
+    @async_test
+    async def test_buffered_updates_are_merged_and_written_after_interval(self):
+        await self.adaptor.buffer_update(KEY, {'a': 1, 'b': 1})
+        await self.adaptor.buffer_update(KEY, {'b': 2})
+        await self.adaptor.buffer_update(OTHER_KEY, {'a': 3})
+
+        self.store.update.assert_not_called()
+        await asyncio.sleep(0.05)
+
+        self.assertCountEqual([call(KEY, {'a': 1, 'b': 2}), call(OTHER_KEY, {'a': 3})],
+                              self.store.update.call_args_list)
+
+    @async_test
+    async def test_buffered_updates_are_written_once_flush_size_reached(self):
+        self.adaptor.flush_interval = 60
+
+        for i in range(3):
+            await self.adaptor.buffer_update(str(i), {'a': i})
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(3, self.store.update.call_count)
+        self.assertIsNone(self.adaptor._flush_timer)
+
+    @async_test
+    async def test_get_waits_for_buffered_update_of_same_key(self):
+        self.adaptor.flush_interval = 60
+        await self.adaptor.buffer_update(KEY, {'a': 1})
+        await self.adaptor.buffer_update(OTHER_KEY, {'a': 2})
+
+        await self.adaptor.get(KEY, strongly_consistent_read=True)
+
+        self.assertEqual([call.update(KEY, {'a': 1}), call.get(KEY, strongly_consistent_read=True)],
+                         [c for c in self.store.mock_calls if c[0] in ('update', 'get')])
+
+    @async_test
+    async def test_get_waits_for_write_in_progress(self):
+        write = asyncio.Future()
+        self.store.update.side_effect = lambda key, data: write
+        await self.adaptor.buffer_update(KEY, {'a': 1})
+        flush = asyncio.ensure_future(self.adaptor.flush())
+        await asyncio.sleep(0)
+
+        get = asyncio.ensure_future(self.adaptor.get(KEY))
+        await asyncio.sleep(0)
+        self.store.get.assert_not_called()
+
+        write.set_result(None)
+        await asyncio.gather(flush, get)
+        self.store.get.assert_called_once_with(KEY)
+
+    @async_test
+    async def test_failed_write_is_logged(self):
+        self.store.update.side_effect = ValueError()
+        await self.adaptor.buffer_update(KEY, {'a': 1})
+
+        await self.adaptor.flush()
+
+        self.assertEqual({}, self.adaptor._writes_in_progress)
+
+    @async_test
+    async def test_close_writes_buffered_updates(self):
+        self.adaptor.flush_interval = 60
+        await self.adaptor.buffer_update(KEY, {'a': 1})
+
+        await self.adaptor.close()
+
+        self.store.update.assert_called_once_with(KEY, {'a': 1})
+        self.store.close.assert_called_once()
+
+    def test_from_config(self):
+        with patch.dict(config.config, {'STATE_STORE_FLUSH_INTERVAL': '2.5', 'STATE_STORE_FLUSH_SIZE': '7'}):
+            adaptor = BufferedPersistenceAdaptor.from_config(self.store, 'state-store')
+
+        self.assertIs(self.store, adaptor.store)
+        self.assertEqual(2.5, adaptor.flush_interval)
+        self.assertEqual(7, adaptor.flush_size)
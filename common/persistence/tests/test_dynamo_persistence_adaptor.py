@@ -0,0 +1,187 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from botocore.exceptions import ClientError
+
+from exceptions import MaxRetriesExceeded
+from persistence import dynamo_persistence_adaptor
+from persistence.persistence_adaptor import DuplicatePrimaryKeyError
+from persistence.dynamo_persistence_adaptor import DynamoPersistenceAdaptor
+from utilities import config
+from utilities.test_utilities import async_test, awaitable
+
+TABLE_NAME = 'table'
+KEY = 'key'
+DATA = {'data': 'value'}
+
+
+class FakeResourceContext(object):
+    """Stands in for the async context manager returned by aioboto3.resource"""
+
+    def __init__(self, mock):
+        self.mock = mock
+
+    async def __aenter__(self):
+        return await self.mock.enter()
+
+    async def __aexit__(self, *args):
+        return await self.mock.exit(*args)
+
+
+class TestDynamoPersistenceAdaptor(TestCase):
+
+    def setUp(self):
+        patcher = patch.object(dynamo_persistence_adaptor.aioboto3, 'resource')
+        self.mock_resource = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_dynamo_resource = MagicMock()
+        self.mock_resource_context = MagicMock()
+        self.mock_resource_context.enter.side_effect = lambda: awaitable(self.mock_dynamo_resource)
+        self.mock_resource_context.exit.side_effect = lambda *args: awaitable(None)
+        self.mock_resource.return_value = FakeResourceContext(self.mock_resource_context)
+        self.mock_table = self.mock_dynamo_resource.Table.return_value
+        self.mock_table.put_item.side_effect = lambda **kwargs: awaitable({})
+        self.mock_table.get_item.side_effect = lambda **kwargs: awaitable({'Item': {'key': KEY, **DATA}})
+
+        with patch.dict(config.config, {'DB_MAX_POOL_CONNECTIONS': '25'}):
+            self.adaptor = DynamoPersistenceAdaptor(TABLE_NAME, max_retries=0, retry_delay=0)
+
+    @async_test
+    async def test_client_is_created_lazily_and_reused(self):
+        self.mock_resource.assert_not_called()
+
+        await self.adaptor.add(KEY, DATA)
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+        await asyncio.gather(*[self.adaptor.get(KEY) for _ in range(5)])
+
+        self.mock_resource.assert_called_once()
+        self.assertEqual(25, self.mock_resource.call_args[1]['config'].max_pool_connections)
+        self.mock_resource_context.enter.assert_called_once()
+        self.mock_dynamo_resource.Table.assert_called_once_with(TABLE_NAME)
+        self.assertEqual(7, self.mock_table.put_item.call_count + self.mock_table.get_item.call_count)
+
+    @async_test
+    async def test_buffer_update_writes_straight_away(self):
+        self.mock_table.update_item.side_effect = lambda **kwargs: awaitable({'Attributes': {'key': KEY, **DATA}})
+
+        self.assertEqual(DATA, await self.adaptor.buffer_update(KEY, DATA))
+
+        self.mock_table.update_item.assert_called_once_with(Key={'key': KEY},
+                                                            AttributeUpdates={'data': {'Value': 'value'}},
+                                                            ReturnValues='ALL_NEW')
+
+    @async_test
+    async def test_close(self):
+        await self.adaptor.get(KEY)
+
+        await self.adaptor.close()
+        await self.adaptor.close()
+
+        self.mock_resource_context.exit.assert_called_once()
+
+        await self.adaptor.get(KEY)
+        self.assertEqual(2, self.mock_resource.call_count)
+
+    @async_test
+    async def test_close_before_use(self):
+        await self.adaptor.close()
+
+        self.mock_resource.assert_not_called()
+
+    @async_test
+    async def test_add_existing_key_is_not_retried(self):
+        self.adaptor.max_retries = 2
+        error = ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'PutItem')
+        self.mock_table.put_item.side_effect = error
+
+        with self.assertRaises(DuplicatePrimaryKeyError):
+            await self.adaptor.add(KEY, DATA)
+
+        self.mock_table.put_item.assert_called_once()
+
+    @async_test
+    async def test_get_many(self):
+        keys = [str(i) for i in range(150)]
+        self.mock_dynamo_resource.batch_get_item.side_effect = lambda RequestItems: awaitable(
+            {'Responses': {TABLE_NAME: [{'key': key['key'], **DATA} for key in RequestItems[TABLE_NAME]['Keys']
+                                        if key['key'] != '3']}})
+
+        items = await self.adaptor.get_many(keys + ['0'])
+
+        self.assertEqual({key: DATA for key in keys if key != '3'}, items)
+        self.assertEqual(2, self.mock_dynamo_resource.batch_get_item.call_count)
+        first_request = self.mock_dynamo_resource.batch_get_item.call_args_list[0][1]['RequestItems'][TABLE_NAME]
+        self.assertEqual(100, len(first_request['Keys']))
+        self.assertFalse(first_request['ConsistentRead'])
+
+    @async_test
+    async def test_get_many_retries_unprocessed_keys(self):
+        self.adaptor.max_retries = 1
+        unprocessed = {TABLE_NAME: {'Keys': [{'key': '2'}], 'ConsistentRead': False}}
+        responses = iter([{'Responses': {TABLE_NAME: [{'key': '1', **DATA}]}, 'UnprocessedKeys': unprocessed},
+                          {'Responses': {TABLE_NAME: [{'key': '2', **DATA}]}, 'UnprocessedKeys': {}}])
+        self.mock_dynamo_resource.batch_get_item.side_effect = lambda RequestItems: awaitable(next(responses))
+
+        items = await self.adaptor.get_many(['1', '2'])
+
+        self.assertEqual({'1': DATA, '2': DATA}, items)
+        self.mock_dynamo_resource.batch_get_item.assert_called_with(RequestItems=unprocessed)
+
+    @async_test
+    async def test_get_many_unprocessed_keys_remaining(self):
+        self.mock_dynamo_resource.batch_get_item.side_effect = lambda RequestItems: awaitable(
+            {'Responses': {}, 'UnprocessedKeys': RequestItems})
+
+        with self.assertRaises(MaxRetriesExceeded):
+            await self.adaptor.get_many(['1'])
+
+    @async_test
+    async def test_add_many(self):
+        self.mock_dynamo_resource.batch_write_item.side_effect = lambda RequestItems: awaitable({})
+
+        await self.adaptor.add_many({str(i): DATA for i in range(30)})
+
+        self.assertEqual(2, self.mock_dynamo_resource.batch_write_item.call_count)
+        first_request = self.mock_dynamo_resource.batch_write_item.call_args_list[0][1]['RequestItems'][TABLE_NAME]
+        self.assertEqual(25, len(first_request))
+        self.assertEqual({'PutRequest': {'Item': {'key': '0', **DATA}}}, first_request[0])
+
+    @async_test
+    async def test_add_many_rejects_primary_key_field(self):
+        with self.assertRaises(ValueError):
+            await self.adaptor.add_many({KEY: {'key': KEY}})
+
+        self.mock_dynamo_resource.batch_write_item.assert_not_called()
+
+    @async_test
+    async def test_delete_many(self):
+        self.mock_dynamo_resource.batch_write_item.side_effect = lambda RequestItems: awaitable({})
+
+        await self.adaptor.delete_many(['1', '2', '1'])
+
+        self.mock_dynamo_resource.batch_write_item.assert_called_once_with(
+            RequestItems={TABLE_NAME: [{'DeleteRequest': {'Key': {'key': '1'}}},
+                                       {'DeleteRequest': {'Key': {'key': '2'}}}]})
+
+    @async_test
+    async def test_get_all(self):
+        responses = iter([{'Items': [{'key': '1', **DATA}], 'LastEvaluatedKey': {'key': '1'}},
+                          {'Items': [{'key': '2', **DATA}]}])
+        self.mock_table.scan.side_effect = lambda **kwargs: awaitable(next(responses))
+
+        items = await self.adaptor.get_all()
+
+        self.assertEqual({'1': DATA, '2': DATA}, items)
+        self.mock_table.scan.assert_called_with(ConsistentRead=True, ExclusiveStartKey={'key': '1'})
+
+    @async_test
+    async def test_get_all_with_fields(self):
+        self.mock_table.scan.side_effect = lambda **kwargs: awaitable({'Items': [{'key': '1', 'data': 'value'}]})
+
+        items = await self.adaptor.get_all(['data'])
+
+        self.assertEqual({'1': DATA}, items)
+        self.mock_table.scan.assert_called_once_with(ConsistentRead=True, ProjectionExpression='#f0, #f1',
+                                                     ExpressionAttributeNames={'#f0': 'key', '#f1': 'data'})
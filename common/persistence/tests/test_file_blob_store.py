@@ -0,0 +1,54 @@
+import pathlib
+import tempfile
+from unittest import TestCase
+
+from persistence.blob_store import BlobStorageError
+from persistence.file_blob_store import FileBlobStore
+from utilities.test_utilities import async_test
+
+KEY = 'message-id/attachments/0'
+DATA = b'some data'
+
+
+class TestFileBlobStore(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = pathlib.Path(directory.name) / 'blobs'
+        self.store = FileBlobStore(str(self.directory))
+
+    @async_test
+    async def test_put_and_get(self):
+        await self.store.put(KEY, DATA)
+
+        self.assertEqual(DATA, await self.store.get(KEY))
+        self.assertEqual(DATA, (self.directory / KEY).read_bytes())
+
+    @async_test
+    async def test_put_replaces_existing_blob(self):
+        await self.store.put(KEY, b'old data')
+        await self.store.put(KEY, DATA)
+
+        self.assertEqual(DATA, await self.store.get(KEY))
+        self.assertEqual(['0'], [path.name for path in (self.directory / KEY).parent.iterdir()])
+
+    @async_test
+    async def test_get_missing_blob(self):
+        self.assertIsNone(await self.store.get(KEY))
+
+    @async_test
+    async def test_delete(self):
+        await self.store.put(KEY, DATA)
+
+        await self.store.delete(KEY)
+        await self.store.delete(KEY)
+
+        self.assertIsNone(await self.store.get(KEY))
+
+    @async_test
+    async def test_put_outside_directory(self):
+        with self.assertRaises(BlobStorageError):
+            await self.store.put('../outside', DATA)
+
+        self.assertFalse((self.directory.parent / 'outside').exists())
@@ -0,0 +1,146 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from persistence.large_item_persistence_adaptor import LargeItemPersistenceAdaptor, CHUNKS, COMPRESSION, ZLIB
+from persistence.persistence_adaptor import RecordRetrievalError
+from utilities import config
+from utilities.test_utilities import async_test
+
+KEY = 'key'
+FIELD = 'DATA'
+
+
+class FakeStore(object):
+
+    def __init__(self):
+        self.items = {}
+
+    async def add(self, key, data):
+        self.items[key] = dict(data)
+
+    async def update(self, key, data):
+        self.items[key].update(data)
+        return dict(self.items[key])
+
+    async def get(self, key, **kwargs):
+        item = self.items.get(key)
+        return dict(item) if item is not None else None
+
+    async def delete(self, key):
+        return self.items.pop(key, None)
+
+    async def get_many(self, keys, **kwargs):
+        return {key: dict(self.items[key]) for key in keys if key in self.items}
+
+    async def get_all(self, fields=None):
+        return {key: {name: value for name, value in item.items() if fields is None or name in fields}
+                for key, item in self.items.items()}
+
+    async def add_many(self, items):
+        self.items.update({key: dict(data) for key, data in items.items()})
+
+    async def delete_many(self, keys):
+        for key in keys:
+            self.items.pop(key, None)
+
+
+class TestLargeItemPersistenceAdaptor(TestCase):
+
+    def setUp(self):
+        self.store = FakeStore()
+
+    @async_test
+    async def test_small_item_is_stored_unchanged(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=10)
+
+        await adaptor.add(KEY, {FIELD: 'small', 'other': 1})
+
+        self.assertEqual({KEY: {FIELD: 'small', 'other': 1}}, self.store.items)
+        self.assertEqual({FIELD: 'small', 'other': 1}, await adaptor.get(KEY))
+
+    @async_test
+    async def test_large_field_is_split_across_items(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=4)
+
+        await adaptor.add(KEY, {FIELD: 'abcdefghij', 'other': 1})
+
+        self.assertEqual({KEY: {FIELD: 'abcd', 'other': 1, CHUNKS: 2},
+                          f'{KEY}#1': {FIELD: 'efgh'},
+                          f'{KEY}#2': {FIELD: 'ij'}}, self.store.items)
+        self.assertEqual({FIELD: 'abcdefghij', 'other': 1}, await adaptor.get(KEY))
+
+    @async_test
+    async def test_field_is_compressed(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, compression=ZLIB)
+        value = '<response>' + 'a' * 1000 + '</response>'
+
+        await adaptor.add(KEY, {FIELD: value})
+
+        self.assertEqual(ZLIB, self.store.items[KEY][COMPRESSION])
+        self.assertLess(len(self.store.items[KEY][FIELD]), 100)
+        self.assertEqual({FIELD: value}, await adaptor.get(KEY))
+
+    @async_test
+    async def test_compressed_field_is_split_across_items(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, compression=ZLIB, chunk_size=8)
+        value = 'The quick brown fox jumps over the lazy dog'
+
+        await adaptor.add(KEY, {FIELD: value})
+
+        self.assertGreater(self.store.items[KEY][CHUNKS], 0)
+        self.assertEqual({FIELD: value}, (await adaptor.get_many([KEY]))[KEY])
+
+    @async_test
+    async def test_missing_chunk(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=4)
+        await adaptor.add(KEY, {FIELD: 'abcdefghij'})
+        del self.store.items[f'{KEY}#2']
+
+        with self.assertRaises(RecordRetrievalError):
+            await adaptor.get(KEY)
+
+    @async_test
+    async def test_delete_removes_chunks(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=4)
+        await adaptor.add(KEY, {FIELD: 'abcdefghij'})
+        await adaptor.add('other-key', {FIELD: 'abcdefghij'})
+
+        await adaptor.delete(KEY)
+        await adaptor.delete_many(['other-key'])
+
+        self.assertEqual({}, self.store.items)
+
+    @async_test
+    async def test_item_that_is_too_large_cannot_be_updated(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=4)
+        await adaptor.add(KEY, {FIELD: 'abc'})
+
+        with self.assertRaises(ValueError):
+            await adaptor.update(KEY, {FIELD: 'abcdefghij'})
+
+    def test_unsupported_compression(self):
+        with self.assertRaises(ValueError):
+            LargeItemPersistenceAdaptor(self.store, FIELD, compression='zstd')
+
+    def test_from_config(self):
+        with patch.dict(config.config, {'SYNC_ASYNC_STORE_COMPRESSION': 'zlib', 'SYNC_ASYNC_STORE_CHUNK_SIZE': '7'}):
+            adaptor = LargeItemPersistenceAdaptor.from_config(self.store, FIELD, 'sync-async-store')
+
+        self.assertEqual(ZLIB, adaptor.compression)
+        self.assertEqual(7, adaptor.chunk_size)
+
+    @async_test
+    async def test_get_all_combines_chunks(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, chunk_size=4)
+        await adaptor.add(KEY, {FIELD: 'abcdefghij'})
+        await adaptor.add('other-key', {FIELD: 'abc'})
+
+        self.assertEqual({KEY: {FIELD: 'abcdefghij'}, 'other-key': {FIELD: 'abc'}}, await adaptor.get_all())
+
+    @async_test
+    async def test_get_all_with_fields_does_not_read_chunks(self):
+        adaptor = LargeItemPersistenceAdaptor(self.store, FIELD, compression=ZLIB, chunk_size=4)
+        await adaptor.add(KEY, {FIELD: 'abcdefghij', 'other-field': 'value'})
+        self.store.get_many = None
+
+        self.assertEqual({KEY: {'other-field': 'value'}}, await adaptor.get_all(['other-field']))
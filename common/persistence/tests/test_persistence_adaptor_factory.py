@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -25,6 +25,18 @@ class FakePersistenceAdaptor(PersistenceAdaptor):
     async def delete(self, key: str) -> Optional[dict]:
         pass
 
+    async def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        pass
+
+    async def get_all(self, fields: Optional[List[str]] = None) -> Dict[str, dict]:
+        pass
+
+    async def add_many(self, items: Dict[str, dict]) -> None:
+        pass
+
+    async def delete_many(self, keys: List[str]) -> None:
+        pass
+
 
 class TestPersistenceAdaptorFactory(TestCase):
     _TYPES = {
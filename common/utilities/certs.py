@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import pathlib
 from typing import Union
 
@@ -38,17 +39,24 @@ class Certs(object):
         created_certs = Certs()
         if private_key:
             private_key_file = certs_dir / "client.key"
-            private_key_file.write_text(private_key)
+            _write_atomically(private_key_file, private_key)
             created_certs.private_key_path = str(private_key_file)
 
         if local_cert:
             local_cert_file = certs_dir / "client.pem"
-            local_cert_file.write_text(local_cert)
+            _write_atomically(local_cert_file, local_cert)
             created_certs.local_cert_path = str(local_cert_file)
 
         if ca_certs:
             ca_certs_file = certs_dir / "ca_certs.pem"
-            ca_certs_file.write_text(ca_certs)
+            _write_atomically(ca_certs_file, ca_certs)
             created_certs.ca_certs_path = str(ca_certs_file)
 
         return created_certs
+
+
+def _write_atomically(file: pathlib.Path, text: str) -> None:
+    # Worker processes may each write the same certificates at once, so a file is never left part written
+    temp_file = file.with_name(f'{file.name}.{os.getpid()}.tmp')
+    temp_file.write_text(text)
+    os.replace(str(temp_file), str(file))
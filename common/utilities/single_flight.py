@@ -0,0 +1,47 @@
+"""This module defines a way of coalescing concurrent calls for the same key into a single call."""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Makes only one call at a time for each key. A caller that asks for a key which already has a call in flight
+    waits for that call instead of making its own, and is given the same result (or exception)."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced_total = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for the given key is in flight.
+
+        :param key: The key to check.
+        :return: True if a call for the key has been made and has not yet completed.
+        """
+        return key in self._in_flight
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Make the given call, unless a call for the same key is already in flight, in which case wait for it.
+
+        :param key: The key identifying calls that can be shared.
+        :param call: A function returning the awaitable to wait for if no call for the key is in flight.
+        :return: The result of the call. Note that the same object is returned to every caller sharing the call.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced_total += 1
+        else:
+            future = asyncio.ensure_future(call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda completed: self._remove(key, completed))
+
+        # The call is shielded so that a caller being cancelled does not cancel it for the other callers
+        return await asyncio.shield(future)
+
+    def _remove(self, key: Hashable, completed: asyncio.Future) -> None:
+        if self._in_flight.get(key) is completed:
+            del self._in_flight[key]
+        # Retrieve the exception so that it is not reported as never retrieved if every caller was cancelled
+        if not completed.cancelled():
+            completed.exception()
@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+
+from utilities import test_utilities
+from utilities.single_flight import SingleFlight
+
+KEY = 'key'
+OTHER_KEY = 'other key'
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.calls = []
+
+    async def _call(self, result):
+        self.calls.append(result)
+        await asyncio.sleep(0.01)
+        return result
+
+    async def _failing_call(self):
+        self.calls.append(None)
+        await asyncio.sleep(0.01)
+        raise ValueError('failed')
+
+    @test_utilities.async_test
+    async def test_concurrent_calls_for_the_same_key_are_coalesced(self):
+        results = await asyncio.gather(self.single_flight.run(KEY, lambda: self._call(1)),
+                                       self.single_flight.run(KEY, lambda: self._call(2)),
+                                       self.single_flight.run(OTHER_KEY, lambda: self._call(3)))
+
+        self.assertEqual([1, 1, 3], results)
+        self.assertEqual([1, 3], self.calls)
+        self.assertEqual(1, self.single_flight.coalesced_total)
+
+    @test_utilities.async_test
+    async def test_calls_after_completion_are_made_again(self):
+        await self.single_flight.run(KEY, lambda: self._call(1))
+        await asyncio.sleep(0)
+
+        result = await self.single_flight.run(KEY, lambda: self._call(2))
+
+        self.assertEqual(2, result)
+        self.assertEqual([1, 2], self.calls)
+        self.assertFalse(self.single_flight.in_flight(KEY))
+
+    @test_utilities.async_test
+    async def test_exception_is_raised_to_every_caller(self):
+        results = await asyncio.gather(self.single_flight.run(KEY, self._failing_call),
+                                       self.single_flight.run(KEY, self._failing_call),
+                                       return_exceptions=True)
+
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+        self.assertEqual(1, len(self.calls))
+
+    @test_utilities.async_test
+    async def test_cancelled_caller_does_not_cancel_call_for_others(self):
+        first = asyncio.ensure_future(self.single_flight.run(KEY, lambda: self._call(1)))
+        second = asyncio.ensure_future(self.single_flight.run(KEY, lambda: self._call(2)))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        self.assertEqual(1, await second)
+        self.assertTrue(first.cancelled())
@@ -0,0 +1,128 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from unittest.mock import patch
+
+import utilities.config as config
+from utilities import worker_processes
+
+# Starts the given number of worker processes, each of which records its pid in a file in the given directory and then
+# runs an IO loop until it is stopped. If a worker exit status is given, the workers exit with it instead
+SUPERVISOR_SCRIPT = textwrap.dedent("""
+    import os
+    import sys
+
+    import tornado.ioloop
+
+    from utilities import worker_processes
+
+    directory, processes, max_restarts, exit_status = sys.argv[1:]
+    worker_processes.start_worker_processes(int(processes), max_restarts=int(max_restarts))
+    open(os.path.join(directory, str(os.getpid())), 'w').close()
+    if exit_status:
+        sys.exit(int(exit_status))
+    tornado.ioloop.IOLoop.current().start()
+""")
+TIMEOUT = 10
+
+
+@patch.dict(config.config)
+class TestWorkerProcesses(unittest.TestCase):
+
+    def test_get_worker_process_count_defaults_to_one(self):
+        config.config.pop('WORKER_PROCESSES', None)
+
+        self.assertEqual(1, worker_processes.get_worker_process_count())
+
+    def test_get_worker_process_count_from_config(self):
+        config.config['WORKER_PROCESSES'] = '4'
+
+        self.assertEqual(4, worker_processes.get_worker_process_count())
+
+    @patch('os.cpu_count')
+    def test_get_worker_process_count_zero_is_one_per_cpu(self, mock_cpu_count):
+        config.config['WORKER_PROCESSES'] = '0'
+        mock_cpu_count.return_value = 8
+
+        self.assertEqual(8, worker_processes.get_worker_process_count())
+
+    @patch('os.fork')
+    def test_start_worker_processes_does_not_fork_a_single_process(self, mock_fork):
+        self.assertIsNone(worker_processes.start_worker_processes(1))
+
+        mock_fork.assert_not_called()
+
+
+class TestWorkerProcessSupervision(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def start_supervisor(self, processes: int, max_restarts: int = 10, exit_status: str = '') -> subprocess.Popen:
+        common_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([common_directory, os.environ.get('PYTHONPATH', '')]))
+        supervisor = subprocess.Popen([sys.executable, '-c', SUPERVISOR_SCRIPT, self.directory, str(processes),
+                                       str(max_restarts), exit_status],
+                                      env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(self.stop, supervisor)
+        return supervisor
+
+    def wait_for_workers(self, count: int):
+        deadline = time.monotonic() + TIMEOUT
+        while time.monotonic() < deadline:
+            pids = [int(name) for name in os.listdir(self.directory)]
+            if len(pids) >= count:
+                return pids
+            time.sleep(0.05)
+        self.fail(f'{count} worker processes were not started')
+
+    @staticmethod
+    def stop(supervisor: subprocess.Popen):
+        if supervisor.poll() is None:
+            supervisor.send_signal(signal.SIGTERM)
+            try:
+                supervisor.wait(TIMEOUT)
+            except subprocess.TimeoutExpired:
+                supervisor.kill()
+                supervisor.wait()
+
+    @staticmethod
+    def is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+    def test_sigterm_stops_every_worker(self):
+        supervisor = self.start_supervisor(2)
+        pids = self.wait_for_workers(2)
+
+        supervisor.send_signal(signal.SIGTERM)
+
+        self.assertEqual(0, supervisor.wait(TIMEOUT))
+        for pid in pids:
+            self.assertFalse(self.is_running(pid))
+
+    def test_failed_worker_is_restarted(self):
+        supervisor = self.start_supervisor(2)
+        killed_pid = self.wait_for_workers(2)[0]
+
+        os.kill(killed_pid, signal.SIGKILL)
+
+        pids = self.wait_for_workers(3)
+        self.assertEqual(2, len([pid for pid in pids if self.is_running(pid)]))
+        supervisor.send_signal(signal.SIGTERM)
+        self.assertEqual(0, supervisor.wait(TIMEOUT))
+
+    def test_supervisor_fails_once_workers_are_restarted_too_many_times(self):
+        supervisor = self.start_supervisor(2, max_restarts=1, exit_status='1')
+
+        self.assertNotEqual(0, supervisor.wait(TIMEOUT))
@@ -0,0 +1,124 @@
+"""This module defines a pre-fork mode, in which a server's requests are handled by several worker processes sharing
+the server's listening sockets."""
+import os
+import signal
+import sys
+from typing import Dict, List, Optional
+
+import tornado.ioloop
+
+from utilities import config
+from utilities import integration_adaptors_logger as log
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_MAX_RESTARTS = 100
+
+_STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+def get_worker_process_count() -> int:
+    """Get the number of worker processes to handle requests in, from the `WORKER_PROCESSES` config value.
+
+    :return: The number of worker processes. `WORKER_PROCESSES` defaults to `1`, in which case requests are handled
+    in the main process, and `0` means one worker process for each CPU.
+    """
+    worker_processes = int(config.get_config('WORKER_PROCESSES', default='1'))
+    if worker_processes == 0:
+        worker_processes = os.cpu_count() or 1
+    return worker_processes
+
+
+def start_worker_processes(worker_processes: int, max_restarts: int = DEFAULT_MAX_RESTARTS) -> Optional[int]:
+    """Fork the given number of worker processes, which share any sockets bound before this is called.
+
+    Nothing that holds connections or threads (such as database clients, queue adaptors or IO loops) should be
+    created before this is called, as these cannot be shared with the worker processes. They should instead be created
+    by each worker process once this returns.
+
+    The main process supervises the worker processes and does not return. A worker process that fails is restarted,
+    up to `max_restarts` times in total. When the main process receives SIGTERM or SIGINT, it sends SIGTERM to every
+    worker process, which stops the worker's IO loop so that the worker shuts down as it would if run on its own. The
+    main process exits once every worker process has, with a non-zero status if it stopped them because they had been
+    restarted too many times.
+
+    :param worker_processes: The number of worker processes. If 1 or less, no processes are forked.
+    :param max_restarts: The maximum number of times failed worker processes are restarted.
+    :return: In a worker process, the id (from 0) of the worker. None if no processes were forked.
+    """
+    if worker_processes <= 1:
+        return None
+
+    logger.info('Starting {worker_processes} worker processes', fparams={'worker_processes': worker_processes})
+    workers: Dict[int, int] = {}
+    stopping = False
+
+    def stop_workers(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+
+    to_start: List[int] = list(range(worker_processes))
+    restarts = 0
+    gave_up = False
+    while True:
+        while to_start and not stopping:
+            worker_id = to_start.pop(0)
+            # The stop signals are blocked whilst forking, so that a worker cannot run the main process' handler
+            # before it has set its own, and the main process cannot miss a worker that has not been recorded yet
+            signal.pthread_sigmask(signal.SIG_BLOCK, _STOP_SIGNALS)
+            try:
+                pid = os.fork()
+                if pid == 0:
+                    _initialise_worker_process()
+                    return worker_id
+                workers[pid] = worker_id
+            finally:
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _STOP_SIGNALS)
+
+        if not workers:
+            logger.info('All worker processes have exited')
+            sys.exit(1 if gave_up else 0)
+
+        pid, status = os.wait()
+        if pid not in workers:
+            continue
+        worker_id = workers.pop(pid)
+        if stopping:
+            continue
+
+        if os.WIFSIGNALED(status):
+            logger.warning('Worker process {worker_id} ({pid}) was killed by signal {signal}',
+                           fparams={'worker_id': worker_id, 'pid': pid, 'signal': os.WTERMSIG(status)})
+        elif os.WEXITSTATUS(status) != 0:
+            logger.warning('Worker process {worker_id} ({pid}) exited with status {status}',
+                           fparams={'worker_id': worker_id, 'pid': pid, 'status': os.WEXITSTATUS(status)})
+        else:
+            logger.info('Worker process {worker_id} ({pid}) exited', fparams={'worker_id': worker_id, 'pid': pid})
+            continue
+
+        restarts += 1
+        if restarts > max_restarts:
+            logger.critical('Worker processes have been restarted too many times. Stopping')
+            gave_up = True
+            stop_workers(None, None)
+        else:
+            to_start.append(worker_id)
+
+
+def _initialise_worker_process() -> None:
+    # The main process passes SIGINT on as SIGTERM, so a worker only needs to act on SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # The IO loop is created here rather than in the handler, as creating it is not safe to interrupt, and a signal
+    # could otherwise arrive whilst the worker is creating it
+    io_loop = tornado.ioloop.IOLoop.current()
+
+    def stop_io_loop(signum, frame):
+        io_loop.add_callback_from_signal(io_loop.stop)
+
+    signal.signal(signal.SIGTERM, stop_io_loop)
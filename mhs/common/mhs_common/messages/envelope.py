@@ -22,6 +22,19 @@ TO_ASID = 'to_asid'
 FROM_ASID = 'from_asid'
 RECEIVED_MESSAGE_ID = "received_message_id"
 TEMPLATES_DIR = "data/templates"
+TEMPLATE_FILE_EXTENSION = ".mustache"
+
+_envelope_template_dir = str(pathlib.Path(ROOT_DIR) / TEMPLATES_DIR)
+
+
+def preload_templates() -> None:
+    """Load and parse every envelope template into the shared template registry. This is expected to be called once
+    at the start of an application, so that no message pays the cost of loading its template.
+    """
+    template_files = [template_path.stem
+                      for template_path in pathlib.Path(_envelope_template_dir).glob(f'*{TEMPLATE_FILE_EXTENSION}')]
+    pystache_message_builder.preload_message_builders(_envelope_template_dir, template_files)
+
 
 class Envelope(abc.ABC):
     """An envelope that contains a message to be sent to a remote MHS."""
@@ -33,9 +46,7 @@ class Envelope(abc.ABC):
         :param message_dictionary: The dictionary of values to use when populating the template.
         """
         self.message_dictionary = message_dictionary
-
-        ebxml_template_dir = str(pathlib.Path(ROOT_DIR) / TEMPLATES_DIR)
-        self.message_builder = pystache_message_builder.PystacheMessageBuilder(ebxml_template_dir, template_file)
+        self.message_builder = pystache_message_builder.get_message_builder(_envelope_template_dir, template_file)
 
     @abc.abstractmethod
     def serialize(self) -> Tuple[str, Dict[str, str], str]:
@@ -1,6 +1,7 @@
 """This module defines the envelope used to wrap synchronous messages to be sent to a remote MHS."""
 import copy
 import json
+import threading
 from pathlib import Path
 from typing import Dict, Tuple, Union
 
@@ -34,6 +35,23 @@ logger = log.IntegrationAdaptorsLogger(__name__)
 soap_header_transformer_path = str(Path(ROOT_DIR) / XSLT_DIR / SOAP_HEADER_XSLT)
 soap_body_transformer_path = str(Path(ROOT_DIR) / XSLT_DIR / SOAP_BODY_XSLT)
 
+# lxml XSLT objects must not be shared between threads, so the compiled transformers are held per thread. Applying a
+# transformer is synchronous, so coroutines on the same event loop thread can safely share them.
+_transformers = threading.local()
+
+
+def _get_transformers() -> Tuple[ET.XSLT, ET.XSLT]:
+    """Get the compiled SOAP header and body transformers for the current thread, compiling them on first use.
+
+    :return: A tuple of the SOAP header transformer and the SOAP body transformer.
+    """
+    try:
+        return _transformers.soap_header_transformer, _transformers.soap_body_transformer
+    except AttributeError:
+        _transformers.soap_header_transformer = ET.XSLT(ET.parse(soap_header_transformer_path))
+        _transformers.soap_body_transformer = ET.XSLT(ET.parse(soap_body_transformer_path))
+        return _transformers.soap_header_transformer, _transformers.soap_body_transformer
+
 
 class SoapEnvelope(envelope.Envelope):
     """An envelope that contains a message to be sent synchronously to a remote MHS."""
@@ -81,8 +99,7 @@ class SoapEnvelope(envelope.Envelope):
         :return: An instance of an SoapEnvelope constructed from the message.
         """
         xml_message = ET.fromstring(bytes(bytearray(message, encoding='utf-8')))
-        soap_header_transformer = ET.XSLT(ET.parse(soap_header_transformer_path))
-        soap_body_transformer = ET.XSLT(ET.parse(soap_body_transformer_path))
+        soap_header_transformer, soap_body_transformer = _get_transformers()
 
         try:
             soap_headers = str(soap_header_transformer(xml_message, **headers))
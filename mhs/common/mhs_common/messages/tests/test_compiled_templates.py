@@ -0,0 +1,113 @@
+import pathlib
+from unittest import TestCase
+
+from builder import compiled_message_builder, pystache_message_builder
+from definitions import ROOT_DIR
+
+import mhs_common.messages.common_ack_envelope as common_ack_envelope
+import mhs_common.messages.ebxml_ack_envelope as ebxml_ack_envelope
+import mhs_common.messages.ebxml_envelope as ebxml_envelope
+import mhs_common.messages.ebxml_nack_envelope as ebxml_nack_envelope
+import mhs_common.messages.ebxml_request_envelope as ebxml_request_envelope
+import mhs_common.messages.soap_envelope as soap_envelope
+from mhs_common.messages import envelope
+
+TEMPLATE_DIR = str(pathlib.Path(ROOT_DIR) / envelope.TEMPLATES_DIR)
+
+LARGE_HL7_MESSAGE = '<REPC_IN150016UK05 xmlns="urn:hl7-org:v3">' \
+                    + '<text>Blood pressure &lt; 120/80 &amp; "stable"</text>' * 20000 \
+                    + '</REPC_IN150016UK05>'
+
+EBXML_VALUES = {
+    ebxml_envelope.FROM_PARTY_ID: "TESTGEN-201324",
+    ebxml_envelope.TO_PARTY_ID: "YEA-0000806",
+    ebxml_envelope.CPA_ID: "S1001A1630",
+    ebxml_envelope.CONVERSATION_ID: "79F49A34-9798-404C-AEC4-FD38DD81C138",
+    ebxml_envelope.SERVICE: "urn:nhs:names:services:pdsquery",
+    ebxml_envelope.ACTION: "QUPA_IN000006UK02",
+    ebxml_envelope.MESSAGE_ID: "0F6C1C73-2D5C-4C1B-8E64-F3CF4C3A2D5E",
+    ebxml_envelope.TIMESTAMP: "2012-03-15T06:51:08Z",
+    ebxml_envelope.RECEIVED_MESSAGE_ID: "F5187FB6-B033-4A75-838B-9E7A1AFB3111",
+    common_ack_envelope.RECEIVED_MESSAGE_TIMESTAMP: "2012-03-15T06:51:07Z",
+    ebxml_envelope.ERROR_CODE: "ValueNotRecognized",
+    ebxml_envelope.SEVERITY: "Error",
+    ebxml_envelope.DESCRIPTION: "501319:Unknown eb:CPAId & <reason>"
+}
+
+REQUEST_VALUES = {
+    **EBXML_VALUES,
+    ebxml_request_envelope.DUPLICATE_ELIMINATION: True,
+    ebxml_request_envelope.ACK_REQUESTED: True,
+    ebxml_request_envelope.ACK_SOAP_ACTOR: "urn:oasis:names:tc:ebxml-msg:actor:toPartyMSH",
+    ebxml_request_envelope.SYNC_REPLY: True,
+    ebxml_request_envelope.MESSAGE: LARGE_HL7_MESSAGE,
+    ebxml_request_envelope.ATTACHMENTS: [
+        {
+            ebxml_request_envelope.ATTACHMENT_CONTENT_ID: '8F1D7DE1-02AB-48D7-A797-A947B09F347F@spine.nhs.uk',
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TYPE: 'text/plain',
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TRANSFER_ENCODING: '8bit',
+            ebxml_request_envelope.ATTACHMENT_PAYLOAD: 'Some payload with <markup> & "quotes"',
+            ebxml_request_envelope.ATTACHMENT_DESCRIPTION: 'Some description with <markup> & "quotes"'
+        },
+        {
+            ebxml_request_envelope.ATTACHMENT_CONTENT_ID: '64A73E03-30BD-4231-9A52-9B9C3B5E8DB9@spine.nhs.uk',
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TYPE: 'image/png',
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TRANSFER_ENCODING: 'base64',
+            ebxml_request_envelope.ATTACHMENT_PAYLOAD: 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==',
+            ebxml_request_envelope.ATTACHMENT_DESCRIPTION: 'An image'
+        }
+    ]
+}
+
+SOAP_VALUES = {
+    soap_envelope.FROM_ASID: "918999199111",
+    soap_envelope.TO_ASID: "000009199092",
+    soap_envelope.MESSAGE_ID: "79F49A34-9798-404C-AEC4-FD38DD81C138",
+    soap_envelope.TIMESTAMP: "2012-03-15T06:51:08Z",
+    soap_envelope.SERVICE: "https://pds-sync.national.ncrs.nhs.uk/syncservice-pds/pds",
+    soap_envelope.ACTION: "urn:nhs:names:services:pdsquery/QUPA_IN040000UK32",
+    soap_envelope.MESSAGE: LARGE_HL7_MESSAGE
+}
+
+
+class TestCompiledTemplates(TestCase):
+    """Checks that every envelope template builds byte-for-byte the same message whether it is compiled or rendered
+    by Pystache."""
+
+    def assert_same_message(self, template_file, message_dictionary):
+        pystache_builder = pystache_message_builder.PystacheMessageBuilder(TEMPLATE_DIR, template_file)
+        compiled_builder = compiled_message_builder.CompiledMessageBuilder(TEMPLATE_DIR, template_file)
+
+        self.assertEqual(pystache_builder.build_message(message_dictionary),
+                         compiled_builder.build_message(message_dictionary))
+
+    def test_ebxml_request(self):
+        sub_tests = [
+            ('all flags and attachments', REQUEST_VALUES),
+            ('no flags or attachments', {**REQUEST_VALUES,
+                                         ebxml_request_envelope.DUPLICATE_ELIMINATION: False,
+                                         ebxml_request_envelope.ACK_REQUESTED: False,
+                                         ebxml_request_envelope.SYNC_REPLY: False,
+                                         ebxml_request_envelope.ATTACHMENTS: []})
+        ]
+        for description, message_dictionary in sub_tests:
+            with self.subTest(description):
+                self.assert_same_message(ebxml_request_envelope.EBXML_TEMPLATE, message_dictionary)
+
+    def test_soap_request(self):
+        self.assert_same_message(soap_envelope.SOAP_TEMPLATE, SOAP_VALUES)
+
+    def test_ebxml_ack(self):
+        self.assert_same_message(ebxml_ack_envelope.EBXML_TEMPLATE, EBXML_VALUES)
+
+    def test_ebxml_nack(self):
+        self.assert_same_message(ebxml_nack_envelope.EBXML_TEMPLATE, EBXML_VALUES)
+
+    def test_missing_key_raises_message_generation_error(self):
+        compiled_builder = compiled_message_builder.CompiledMessageBuilder(TEMPLATE_DIR,
+                                                                           ebxml_request_envelope.EBXML_TEMPLATE)
+        message_dictionary = {**REQUEST_VALUES}
+        del message_dictionary[ebxml_envelope.CPA_ID]
+
+        with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError, 'Failed to find key:cpa_id '):
+            compiled_builder.build_message(message_dictionary)
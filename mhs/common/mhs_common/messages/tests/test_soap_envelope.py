@@ -1,3 +1,4 @@
+import threading
 from unittest import TestCase
 from unittest.mock import patch
 from pathlib import Path
@@ -130,3 +131,21 @@ class TestSoapRequestEnvelope(TestCase):
                                                     "during parsing of SOAP message"):
                 soap_envelope.SoapEnvelope.from_string(SOAP_HEADERS, message)
 
+    def test_from_string_reuses_compiled_transformers(self):
+        message = file_utilities.get_file_string(str(self.expected_message_dir / EXPECTED_SOAP))
+        soap_envelope.SoapEnvelope.from_string(SOAP_HEADERS, message)
+
+        with patch.object(soap_envelope.ET, 'XSLT') as xslt_mock:
+            parsed_message = soap_envelope.SoapEnvelope.from_string(SOAP_HEADERS, message)
+
+        xslt_mock.assert_not_called()
+        self.assertEqual(expected_values(message=EXPECTED_MESSAGE), parsed_message.message_dictionary)
+
+    def test_transformers_are_not_shared_between_threads(self):
+        transformers = []
+        thread = threading.Thread(target=lambda: transformers.append(soap_envelope._get_transformers()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(transformers[0][0], soap_envelope._get_transformers()[0])
+        self.assertIs(soap_envelope._get_transformers()[0], soap_envelope._get_transformers()[0])
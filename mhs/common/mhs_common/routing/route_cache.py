@@ -0,0 +1,135 @@
+"""This module defines an in-process cache of the details returned by the Spine Route Lookup service."""
+import collections
+import copy
+import re
+import time
+from typing import Dict, Hashable, Optional, Union
+
+from utilities import config
+from utilities import integration_adaptors_logger as log
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_TTL = 300
+DEFAULT_STALE_IF_ERROR = 3600
+
+_MAX_AGE_PATTERN = re.compile(r'(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*"?(\d+)"?', re.IGNORECASE)
+_STALE_IF_ERROR_PATTERN = re.compile(r'(?:^|,)\s*stale-if-error\s*=\s*"?(\d+)"?', re.IGNORECASE)
+_NO_CACHE_PATTERN = re.compile(r'(?:^|,)\s*(?:no-store|no-cache)\s*(?:,|$)', re.IGNORECASE)
+
+_Entry = collections.namedtuple('_Entry', ['value', 'expires', 'stale_expires'])
+
+
+class RouteCache:
+    """A least recently used cache of route lookup details, each of which expires after a time to live."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL,
+                 stale_if_error: float = DEFAULT_STALE_IF_ERROR):
+        """Initialise a new RouteCache.
+
+        :param max_size: The maximum number of details held. Once reached, the least recently used details are evicted.
+        :param ttl: The time (in seconds) details are held for, if the response they came from did not give a max-age.
+        :param stale_if_error: The time (in seconds) after expiring that details may still be used if they cannot be
+        looked up again, if the response they came from did not give a stale-if-error.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_if_error = stale_if_error
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+
+        self._hits_total = 0
+        self._misses_total = 0
+        self._stale_total = 0
+        self._evictions_total = 0
+
+    @classmethod
+    def from_config(cls) -> 'RouteCache':
+        """Create a new RouteCache configured from the `SPINE_ROUTE_LOOKUP_CACHE_*` config values.
+
+        :return: A new RouteCache.
+        """
+        return cls(max_size=int(config.get_config('SPINE_ROUTE_LOOKUP_CACHE_SIZE', default=str(DEFAULT_MAX_SIZE))),
+                   ttl=float(config.get_config('SPINE_ROUTE_LOOKUP_CACHE_TTL', default=str(DEFAULT_TTL))),
+                   stale_if_error=float(config.get_config('SPINE_ROUTE_LOOKUP_CACHE_STALE_IF_ERROR',
+                                                          default=str(DEFAULT_STALE_IF_ERROR))))
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Get the details held for the given key, if they have not expired.
+
+        :param key: The key the details were stored under.
+        :return: A copy of the details, or None if there are no unexpired details for the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= time.monotonic():
+            self._misses_total += 1
+            return None
+
+        self._hits_total += 1
+        self._entries.move_to_end(key)
+        return copy.deepcopy(entry.value)
+
+    def get_stale(self, key: Hashable) -> Optional[Dict]:
+        """Get the details held for the given key, including ones that have expired but may still be used when
+        they cannot be looked up again.
+
+        :param key: The key the details were stored under.
+        :return: A copy of the details, or None if there are no usable details for the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.stale_expires <= time.monotonic():
+            return None
+
+        self._stale_total += 1
+        return copy.deepcopy(entry.value)
+
+    def put(self, key: Hashable, value: Dict, cache_control: Optional[str] = None) -> None:
+        """Store the given details, evicting the least recently used details if the cache is full.
+
+        :param key: The key to store the details under.
+        :param value: The details to store.
+        :param cache_control: The Cache-Control header of the response the details came from, if any. Its max-age and
+        stale-if-error directives are used in place of this cache's defaults, and details are not stored if it has a
+        no-store or no-cache directive.
+        """
+        if self.max_size <= 0:
+            return
+
+        ttl, stale_if_error = self.ttl, self.stale_if_error
+        if cache_control:
+            if _NO_CACHE_PATTERN.search(cache_control):
+                self._entries.pop(key, None)
+                return
+            max_age = _MAX_AGE_PATTERN.search(cache_control)
+            if max_age:
+                ttl = int(max_age.group(1))
+            stale = _STALE_IF_ERROR_PATTERN.search(cache_control)
+            if stale:
+                stale_if_error = int(stale.group(1))
+
+        expires = time.monotonic() + ttl
+        self._entries[key] = _Entry(copy.deepcopy(value), expires, expires + stale_if_error)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions_total += 1
+
+    def get_metrics(self) -> Dict[str, Union[int, float]]:
+        """Get the current metrics for this cache.
+
+        :return: A dictionary of the number of details held, the maximum number held, and the total number of hits,
+        misses, stale details used and evictions.
+        """
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits_total': self._hits_total,
+            'misses_total': self._misses_total,
+            'stale_total': self._stale_total,
+            'evictions_total': self._evictions_total
+        }
+
+    def log_metrics(self) -> None:
+        """Log the current metrics for this cache."""
+        logger.info('Route cache holds {size} of {max_size} details. {hits_total} hits, {misses_total} misses, '
+                    '{stale_total} stale details used, {evictions_total} evictions', fparams=self.get_metrics())
@@ -1,12 +1,16 @@
 import json
-from typing import Dict
+from typing import Dict, Optional
 
 from comms import common_https
+from comms.http_client_pool import HttpClientPool
+from mhs_common.routing.route_cache import RouteCache
 from utilities.mdc import build_tracking_headers
 from utilities import integration_adaptors_logger as log, timing
+from utilities.single_flight import SingleFlight
 
 ROUTING_PATH = "routing"
 RELIABILITY_PATH = "reliability"
+ROUTING_RELIABILITY_PATH = "routing-reliability"
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -16,7 +20,7 @@ class RoutingAndReliability:
 
     def __init__(self, spine_route_lookup_url: str, spine_org_code: str, client_cert: str = None,
                  client_key: str = None, ca_certs: str = None, http_proxy_host: str = None,
-                 http_proxy_port: int = None):
+                 http_proxy_port: int = None, client_pool: HttpClientPool = None, cache: RouteCache = None):
         """Initialise a new RoutingAndReliability instance.
 
         :param spine_route_lookup_url: The URL to make requests to the Spine Route Lookup service on. e.g.
@@ -27,6 +31,10 @@ class RoutingAndReliability:
         :param ca_certs: An optional string containing the path of the certificate authority certificate file.
         :param http_proxy_host The hostname of the HTTP proxy to be used.
         :param http_proxy_port The port of the HTTP proxy to be used.
+        :param client_pool: The HTTP client pool to send requests to the Spine Route Lookup service from. If not
+        provided, the shared `AsyncHTTPClient` is used.
+        :param cache: The cache to hold the details returned by the Spine Route Lookup service in, keyed by org code
+        and service ID. If not provided, every lookup is a request to the Spine Route Lookup service.
         """
         self.url = spine_route_lookup_url
         self.spine_org_code = spine_org_code
@@ -37,6 +45,10 @@ class RoutingAndReliability:
 
         self._proxy_host = http_proxy_host
         self._proxy_port = http_proxy_port
+        self._client_pool = client_pool
+        self._cache = cache
+        # Concurrent lookups of the same details share a single request to the Spine Route Lookup service
+        self._single_flight = SingleFlight()
 
     @timing.time_function
     async def get_end_point(self, service_id: str, org_code: str = None) -> Dict:
@@ -47,36 +59,7 @@ class RoutingAndReliability:
         is used.
         :return: A dictionary containing the end point information.
         """
-        if org_code is None:
-            org_code = self.spine_org_code
-            logger.info("No org code provided when obtaining endpoint details. Using {spine_org_code}",
-                        fparams={"spine_org_code": org_code})
-
-        url = self._build_request_url(ROUTING_PATH, org_code, service_id)
-
-        try:
-
-            logger.info("Requesting endpoint details from Spine route lookup service for {org_code} & {service_id}.",
-                        fparams={"org_code": org_code, "service_id": service_id})
-            http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
-                                                                        headers=build_tracking_headers(),
-                                                                        body=None,
-                                                                        client_cert=self._client_cert,
-                                                                        client_key=self._client_key,
-                                                                        ca_certs=self._ca_certs,
-                                                                        http_proxy_host=self._proxy_host,
-                                                                        http_proxy_port=self._proxy_port)
-            endpoint_details = json.loads(http_response.body)
-
-            logger.info("Received endpoint details from Spine route lookup service for {org_code} & "
-                        "{service_id}. {endpoint_details}",
-                        fparams={"org_code": org_code, "service_id": service_id, "endpoint_details": endpoint_details})
-            return endpoint_details
-        except Exception:
-            logger.exception("Couldn't obtain endpoint details from Spine route lookup service for {org_code} & "
-                         "{service_id}.",
-                         fparams={"org_code": org_code, "service_id": service_id})
-            raise
+        return await self._get_details(ROUTING_PATH, "endpoint", service_id, org_code)
 
     @timing.time_function
     async def get_reliability(self, service_id: str, org_code: str = None) -> Dict:
@@ -87,40 +70,77 @@ class RoutingAndReliability:
         :param service_id: The ID of the service to get MHS details for.
         :return: A dictionary containing the reliability information.
         """
+        return await self._get_details(RELIABILITY_PATH, "reliability", service_id, org_code)
+
+    @timing.time_function
+    async def get_routing_and_reliability(self, service_id: str, org_code: str = None) -> Dict:
+        """Get both the endpoint and the reliability information for the MHS registered for the specified org code and
+        service ID, in a single request to the Spine Route Lookup service.
+
+        :param service_id: The ID of the service to get MHS details for.
+        :param org_code: The org code of the MHS to get details for. If not provided, the org code configured for Spine
+        is used.
+        :return: A dictionary containing both the end point and the reliability information.
+        """
+        return await self._get_details(ROUTING_RELIABILITY_PATH, "endpoint and reliability", service_id, org_code)
+
+    async def _get_details(self, path: str, details_type: str, service_id: str, org_code: Optional[str]) -> Dict:
         if org_code is None:
             org_code = self.spine_org_code
-            logger.info("No org code provided when obtaining reliability details. Using {spine_org_code}",
-                        fparams={"spine_org_code": org_code})
+            logger.info("No org code provided when obtaining {details_type} details. Using {spine_org_code}",
+                        fparams={"details_type": details_type, "spine_org_code": org_code})
 
-        url = self._build_request_url(RELIABILITY_PATH, org_code, service_id)
+        fparams = {"details_type": details_type, "org_code": org_code, "service_id": service_id}
+        cache_key = (path, org_code, service_id)
+        details = self._get_cached_details(cache_key)
+        if details is not None:
+            logger.info("Using cached {details_type} details for {org_code} & {service_id}.", fparams=fparams)
+            return details
 
         try:
-            logger.info("Requesting reliability details from Spine route lookup service for {org_code} & "
-                        "{service_id}.",
-                        fparams={"org_code": org_code, "service_id": service_id})
-            http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
-                                                                        headers=build_tracking_headers(),
-                                                                        body=None,
-                                                                        client_cert=self._client_cert,
-                                                                        client_key=self._client_key,
-                                                                        ca_certs=self._ca_certs,
-                                                                        http_proxy_host=self._proxy_host,
-                                                                        http_proxy_port=self._proxy_port)
-            reliability_details = json.loads(http_response.body)
-
-            logger.info("Received reliability details from Spine route lookup service for {org_code} & "
-                        "{service_id}. {reliability_details}",
-                        fparams={
-                            "org_code": org_code,
-                            "service_id": service_id,
-                            "reliability_details": reliability_details
-                        })
-            return reliability_details
+            logger.info("Requesting {details_type} details from Spine route lookup service for {org_code} & "
+                        "{service_id}.", fparams=fparams)
+            if self._single_flight.in_flight(cache_key):
+                logger.info("Waiting for in-flight request for {details_type} details for {org_code} & "
+                            "{service_id}.", fparams=fparams)
+            details = await self._single_flight.run(cache_key, lambda: self._request_details(cache_key))
+
+            logger.info("Received {details_type} details from Spine route lookup service for {org_code} & "
+                        "{service_id}. {details}", fparams={**fparams, "details": details})
+            return details
         except Exception:
-            logger.exception("Couldn't obtain reliability details from Spine route lookup service for {org_code} & "
-                             "{service_id}.",
-                             fparams={"org_code": org_code, "service_id": service_id}, exc_info=True)
+            details = self._get_stale_details(cache_key)
+            if details is not None:
+                logger.warning("Couldn't obtain {details_type} details from Spine route lookup service for "
+                               "{org_code} & {service_id}. Using expired cached details.", fparams=fparams,
+                               exc_info=True)
+                return details
+            logger.exception("Couldn't obtain {details_type} details from Spine route lookup service for {org_code} & "
+                             "{service_id}.", fparams=fparams)
             raise
 
+    def _get_cached_details(self, cache_key) -> Optional[Dict]:
+        return self._cache.get(cache_key) if self._cache is not None else None
+
+    def _get_stale_details(self, cache_key) -> Optional[Dict]:
+        return self._cache.get_stale(cache_key) if self._cache is not None else None
+
+    async def _request_details(self, cache_key) -> Dict:
+        path, org_code, service_id = cache_key
+        url = self._build_request_url(path, org_code, service_id)
+        http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
+                                                                    headers=build_tracking_headers(),
+                                                                    body=None,
+                                                                    client_cert=self._client_cert,
+                                                                    client_key=self._client_key,
+                                                                    ca_certs=self._ca_certs,
+                                                                    http_proxy_host=self._proxy_host,
+                                                                    http_proxy_port=self._proxy_port,
+                                                                    client_pool=self._client_pool)
+        details = json.loads(http_response.body)
+        if self._cache is not None:
+            self._cache.put(cache_key, details, http_response.headers.get('Cache-Control'))
+        return details
+
     def _build_request_url(self, path: str, org_code: str, service_id: str) -> str:
         return self.url + "/" + path + "?org-code=" + org_code + "&service-id=" + service_id
@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from mhs_common.routing import route_cache
+
+KEY = ("routing", "ORG CODE", "SERVICE ID")
+OTHER_KEY = ("routing", "OTHER ORG CODE", "SERVICE ID")
+DETAILS = {"nhsMHSEndPoint": ["https://example.com"]}
+
+
+@mock.patch.object(route_cache.time, "monotonic")
+class TestRouteCache(unittest.TestCase):
+
+    def test_get_unexpired_details(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache(ttl=10)
+        cache.put(KEY, DETAILS)
+
+        mock_monotonic.return_value = 109
+        self.assertEqual(DETAILS, cache.get(KEY))
+        self.assertIsNone(cache.get(OTHER_KEY))
+        self.assertEqual(1, cache.get_metrics()["hits_total"])
+        self.assertEqual(1, cache.get_metrics()["misses_total"])
+
+    def test_get_returns_a_copy(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache()
+        cache.put(KEY, DETAILS)
+
+        cache.get(KEY)["nhsMHSEndPoint"].append("https://other.example.com")
+
+        self.assertEqual(DETAILS, cache.get(KEY))
+
+    def test_expired_details_are_only_used_if_stale(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache(ttl=10, stale_if_error=20)
+        cache.put(KEY, DETAILS)
+
+        mock_monotonic.return_value = 110
+        self.assertIsNone(cache.get(KEY))
+        self.assertEqual(DETAILS, cache.get_stale(KEY))
+
+        mock_monotonic.return_value = 130
+        self.assertIsNone(cache.get_stale(KEY))
+        self.assertEqual(1, cache.get_metrics()["stale_total"])
+
+    def test_cache_control_directives(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache(ttl=10, stale_if_error=20)
+        cache.put(KEY, DETAILS, "public, max-age=60, stale-if-error=5")
+
+        mock_monotonic.return_value = 159
+        self.assertEqual(DETAILS, cache.get(KEY))
+        mock_monotonic.return_value = 164
+        self.assertEqual(DETAILS, cache.get_stale(KEY))
+        mock_monotonic.return_value = 165
+        self.assertIsNone(cache.get_stale(KEY))
+
+    def test_no_store_is_not_cached(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache()
+        cache.put(KEY, DETAILS)
+
+        cache.put(KEY, DETAILS, "no-store")
+
+        self.assertIsNone(cache.get_stale(KEY))
+
+    def test_least_recently_used_details_are_evicted(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache(max_size=2)
+        third_key = ("reliability", "ORG CODE", "SERVICE ID")
+        cache.put(KEY, DETAILS)
+        cache.put(OTHER_KEY, DETAILS)
+        cache.get(KEY)
+
+        cache.put(third_key, DETAILS)
+
+        self.assertIsNotNone(cache.get(KEY))
+        self.assertIsNone(cache.get(OTHER_KEY))
+        self.assertIsNotNone(cache.get(third_key))
+        self.assertEqual(2, cache.get_metrics()["size"])
+        self.assertEqual(1, cache.get_metrics()["evictions_total"])
+
+    def test_nothing_is_cached_if_max_size_is_zero(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = route_cache.RouteCache(max_size=0)
+
+        cache.put(KEY, DETAILS)
+
+        self.assertIsNone(cache.get(KEY))
@@ -1,14 +1,16 @@
+import asyncio
 import unittest
 from unittest import mock
 
 from tornado import httpclient
 from utilities import test_utilities
 
-from mhs_common.routing import routing_reliability
+from mhs_common.routing import route_cache, routing_reliability
 
 BASE_URL = "https://example.com"
 ROUTING_PATH = "routing"
 RELIABILITY_PATH = "reliability"
+ROUTING_RELIABILITY_PATH = "routing-reliability"
 SPINE_ORG_CODE = "SPINE ORG CODE"
 CLIENT_CERT_PATH = "client/cert/path"
 CLIENT_KEY_PATH = "client/key/path"
@@ -146,9 +148,89 @@ class TestRoutingAndReliability(unittest.TestCase):
         self._assert_http_client_called_with_expected_args(expected_url, proxy_host=HTTP_PROXY_HOST,
                                                            proxy_port=HTTP_PROXY_PORT)
 
-    def _given_http_client_returns_a_json_response(self):
+    @test_utilities.async_test
+    async def test_should_retrieve_routing_and_reliability_details_in_one_request(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE)
+        self._given_http_client_returns_a_json_response()
+
+        details = await self.routing.get_routing_and_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(EXPECTED_RESPONSE, details)
+        expected_url = self._build_url(path=ROUTING_RELIABILITY_PATH)
+        self._assert_http_client_called_with_expected_args(expected_url)
+        self.assertEqual(1, self.mock_http_client.fetch.call_count)
+
+    @test_utilities.async_test
+    async def test_should_pass_through_exception_if_raised_when_retrieving_routing_and_reliability_details(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE)
+        self.mock_http_client.fetch.side_effect = IOError("Something went wrong!")
+
+        with self.assertRaises(IOError):
+            await self.routing.get_routing_and_reliability(SERVICE_ID)
+
+    @test_utilities.async_test
+    async def test_should_share_one_request_between_concurrent_lookups(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE)
+        mock_response = mock.Mock()
+        mock_response.body = JSON_RESPONSE
+        response = asyncio.Future()
+        self.mock_http_client.fetch.return_value = response
+
+        lookups = asyncio.gather(self.routing.get_end_point(SERVICE_ID, ORG_CODE),
+                                 self.routing.get_end_point(SERVICE_ID, ORG_CODE))
+        await asyncio.sleep(0)
+        response.set_result(mock_response)
+
+        self.assertEqual([EXPECTED_RESPONSE, EXPECTED_RESPONSE], await lookups)
+        self.assertEqual(1, self.mock_http_client.fetch.call_count)
+
+    @test_utilities.async_test
+    async def test_should_use_cached_details_when_cache_provided(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE,
+                                                                 cache=route_cache.RouteCache())
+        self._given_http_client_returns_a_json_response()
+
+        first_endpoint_details = await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        second_endpoint_details = await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        self._given_http_client_returns_a_json_response()
+        reliability_details = await self.routing.get_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(EXPECTED_RESPONSE, first_endpoint_details)
+        self.assertEqual(EXPECTED_RESPONSE, second_endpoint_details)
+        self.assertEqual(EXPECTED_RESPONSE, reliability_details)
+        self.assertEqual(2, self.mock_http_client.fetch.call_count)
+
+    @test_utilities.async_test
+    async def test_should_not_cache_details_if_response_forbids_it(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE,
+                                                                 cache=route_cache.RouteCache())
+        self._given_http_client_returns_a_json_response(cache_control="no-store")
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        self._given_http_client_returns_a_json_response()
+
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.mock_http_client.fetch.call_count)
+
+    @test_utilities.async_test
+    async def test_should_use_expired_cached_details_if_raised_when_retrieving_details(self):
+        self.routing = routing_reliability.RoutingAndReliability(BASE_URL, SPINE_ORG_CODE,
+                                                                 cache=route_cache.RouteCache())
+        self._given_http_client_returns_a_json_response(cache_control="max-age=0")
+        await self.routing.get_reliability(SERVICE_ID, ORG_CODE)
+        self.mock_http_client.fetch.side_effect = IOError("Something went wrong!")
+
+        reliability_details = await self.routing.get_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(EXPECTED_RESPONSE, reliability_details)
+        self.assertEqual(2, self.mock_http_client.fetch.call_count)
+        with self.assertRaises(IOError):
+            await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+    def _given_http_client_returns_a_json_response(self, cache_control: str = None):
         mock_response = mock.Mock()
         mock_response.body = JSON_RESPONSE
+        mock_response.headers = {"Cache-Control": cache_control} if cache_control else {}
         self.mock_http_client.fetch.return_value = test_utilities.awaitable(mock_response)
 
     def _assert_http_client_called_with_expected_args(self, expected_url, client_cert=None, client_key=None,
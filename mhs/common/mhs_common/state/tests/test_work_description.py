@@ -56,11 +56,11 @@ class TestWorkDescription(unittest.TestCase):
         future = test_utilities.awaitable(updated_data)
 
         persistence = MagicMock()
-        persistence.update.return_value = future
+        persistence.buffer_update.return_value = future
         work_description = wd.WorkDescription(persistence, input_data)
 
         await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
-        persistence.update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD})
+        persistence.buffer_update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD})
 
         self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
 
@@ -72,14 +72,63 @@ class TestWorkDescription(unittest.TestCase):
         future = test_utilities.awaitable(updated_data)
 
         persistence = MagicMock()
-        persistence.update.return_value = future
+        persistence.buffer_update.return_value = future
         work_description = wd.WorkDescription(persistence, input_data)
 
         await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
-        persistence.update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED})
+        persistence.buffer_update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED})
 
         self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_FAILED)
 
+    @async_test
+    async def test_set_status_of_unpublished_work_description_adds_it(self):
+        persistence = MagicMock()
+        persistence.add.return_value = test_utilities.awaitable(None)
+        work_description = wd.WorkDescription(persistence, input_data, published=False)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
+
+        expected_data = copy.deepcopy(input_data)
+        expected_data[wd.OUTBOUND_STATUS] = wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED
+        persistence.add.assert_called_once_with(input_data[wd.MESSAGE_ID], expected_data)
+        persistence.buffer_update.assert_not_called()
+        self.assertTrue(work_description.published)
+
+    @async_test
+    async def test_deferred_status_updates_are_written_with_final_status(self):
+        updated_data = copy.deepcopy(input_data)
+        updated_data[wd.INBOUND_STATUS] = wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_STORED
+        updated_data[wd.OUTBOUND_STATUS] = wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED
+
+        persistence = MagicMock()
+        persistence.buffer_update.return_value = test_utilities.awaitable(updated_data)
+        work_description = wd.WorkDescription(persistence, input_data)
+        work_description.defer_status_updates = True
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        persistence.buffer_update.assert_not_called()
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        await work_description.set_final_outbound_status(
+            wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+        persistence.buffer_update.assert_called_once_with(
+            input_data[wd.MESSAGE_ID],
+            {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED})
+        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_STORED)
+
+    @async_test
+    async def test_set_status_with_buffered_store_keeps_local_status(self):
+        persistence = MagicMock()
+        persistence.buffer_update.return_value = test_utilities.awaitable(None)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.buffer_update.assert_called_once_with(
+            input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD})
+        persistence.update.assert_not_called()
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
     def test_null_persistence(self):
         with self.assertRaises(ValueError):
             wd.WorkDescription(None, {'None': 'None'})
@@ -95,7 +144,7 @@ class TestWorkDescriptionFactory(unittest.TestCase):
         await wd.get_work_description_from_store(persistence, 'aaa-aaa-aaa')
 
         persistence.get.assert_called_with('aaa-aaa-aaa', strongly_consistent_read=True)
-        work_mock.assert_called_with(persistence, old_data)
+        work_mock.assert_called_with(persistence, old_data, published=True)
 
     @async_test
     async def test_get_from_store_no_result_found(self):
@@ -130,7 +179,8 @@ class TestWorkDescriptionFactory(unittest.TestCase):
                 'aaa-aaa',
                 '12',
                 workflow.SYNC,
-                outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED))
+                outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED),
+            published=False)
 
     def test_create_wd_null_parameters(self):
         persistence = MagicMock()
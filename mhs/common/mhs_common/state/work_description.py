@@ -79,7 +79,7 @@ async def get_work_description_from_store(persistence_store: pa.PersistenceAdapt
         logger.info('Persistence store returned empty value for {message_id}', fparams={'message_id': message_id})
         return None
 
-    return WorkDescription(persistence_store, json_store_data)
+    return WorkDescription(persistence_store, json_store_data, published=True)
 
 
 def build_store_data(message_id: str,
@@ -104,7 +104,7 @@ def create_new_work_description(persistence_store: pa.PersistenceAdaptor,
                                 ) -> WorkDescription:
     """
     Builds a new local work description instance given the details of the message, these details are held locally
-    until a `publish` is executed
+    until a `publish` is executed or a status is set
     """
     if persistence_store is None:
         logger.error('Failed to build new work description, persistence store should not be null')
@@ -122,23 +122,35 @@ def create_new_work_description(persistence_store: pa.PersistenceAdaptor,
 
     return WorkDescription(
         persistence_store,
-        build_store_data(message_id, timing.get_time(), workflow, inbound_status, outbound_status))
+        build_store_data(message_id, timing.get_time(), workflow, inbound_status, outbound_status),
+        published=False)
 
 
 class WorkDescription(object):
-    """A local copy of an instance of a work description from the state store"""
+    """A local copy of an instance of a work description from the state store.
 
-    def __init__(self, persistence_store: pa.PersistenceAdaptor, store_data: dict):
+    A work description that has not yet been published is written to the state store in a single write the first
+    time it is published or has a status set. Once `defer_status_updates` is set, status changes are only held
+    locally until the final status is set with `set_final_outbound_status`, which writes them all at once. Status
+    changes to a published work description are written with the store's `buffer_update`, so a store may write them
+    in the background.
+    """
+
+    def __init__(self, persistence_store: pa.PersistenceAdaptor, store_data: dict, published: bool = True):
         """
         Given
         :param persistence_store:
         :param store_data:
+        :param published: Whether the work description is already held in the state store.
         """
         if persistence_store is None:
             raise ValueError('Expected persistence store')
 
         self._persistence_store = persistence_store
         self._from_store_data(store_data)
+        self.published = published
+        self.defer_status_updates = False
+        self._pending_updates = {}
 
     async def publish(self):
         """
@@ -146,6 +158,8 @@ class WorkDescription(object):
         :return:
         """
         await self._persistence_store.add(self.message_id, self._to_store_data())
+        self.published = True
+        self._pending_updates = {}
 
     async def set_inbound_status(self, new_status: MessageStatus):
         """
@@ -163,9 +177,33 @@ class WorkDescription(object):
         """
         await self._set_status(OUTBOUND_STATUS, new_status)
 
+    async def set_final_outbound_status(self, new_status: MessageStatus):
+        """
+        Sets the outbound status once the outcome of the message is known, writing it to the state store along with
+        any status changes that were deferred.
+
+        :param new_status: new status to set
+        """
+        self.defer_status_updates = False
+        await self.set_outbound_status(new_status)
+
     async def _set_status(self, field: str, new_status: MessageStatus):
-        store_data = await self._persistence_store.update(self.message_id, {field: new_status})
+        store_data = self._to_store_data()
+        store_data[field] = new_status
         self._from_store_data(store_data)
+        self._pending_updates[field] = new_status
+
+        if self.defer_status_updates:
+            return
+        if not self.published:
+            await self.publish()
+            return
+
+        # Nothing reads a status back whilst handling the message, so the store may write the update in the background
+        store_data = await self._persistence_store.buffer_update(self.message_id, self._pending_updates)
+        self._pending_updates = {}
+        if store_data is not None:
+            self._from_store_data(store_data)
 
     def _from_store_data(self, store_data):
         self.message_id = store_data[MESSAGE_ID]
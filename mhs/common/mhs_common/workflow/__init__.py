@@ -7,10 +7,13 @@ from mhs_common.routing import routing_reliability
 from persistence import persistence_adaptor
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow.asynchronous_express import AsynchronousExpressWorkflow
+from mhs_common.workflow.claim_check import ClaimCheck
 from mhs_common.workflow.asynchronous_reliable import AsynchronousReliableWorkflow
 from mhs_common.workflow.common import CommonWorkflow
+from mhs_common.workflow.outbound_work_queue import OutboundWorkQueue
 from mhs_common.workflow.asynchronous_forward_reliable import AsynchronousForwardReliableWorkflow
 from mhs_common.workflow.sync_async import SyncAsyncWorkflow
+from mhs_common.workflow.sync_async_notifier import SyncAsyncNotifier
 from mhs_common.workflow.sync_async_resynchroniser import SyncAsyncResynchroniser
 from mhs_common.workflow.synchronous import SynchronousWorkflow
 
@@ -28,30 +31,46 @@ def get_workflow_map(party_key: str = None,
                      inbound_async_queue: queue_adaptor.QueueAdaptor = None,
                      max_request_size: int = None,
                      resynchroniser: SyncAsyncResynchroniser = None,
-                     routing: routing_reliability.RoutingAndReliability = None
+                     routing: routing_reliability.RoutingAndReliability = None,
+                     inbound_claim_check: ClaimCheck = None,
+                     sync_async_notifier: SyncAsyncNotifier = None,
+                     outbound_work_queue: OutboundWorkQueue = None
                      ) -> Dict[str, CommonWorkflow]:
     """
-    Get a map of workflows. Keys for each workflow should correspond with keys used in interactions.json
+    Get a map of workflows. Keys for each workflow should correspond with keys used in interactions.json. If an
+    outbound work queue is given, the reliable workflows are registered with it to send the messages it holds.
 
     :return: a map of workflows
     """
-    return {
+    workflows = {
         ASYNC_EXPRESS: AsynchronousExpressWorkflow(party_key, work_description_store, transmission,
                                                    inbound_async_queue,
                                                    max_request_size,
-                                                   routing=routing),
+                                                   routing=routing,
+                                                   claim_check=inbound_claim_check),
         ASYNC_RELIABLE: AsynchronousReliableWorkflow(party_key, work_description_store, transmission,
                                                      inbound_async_queue, max_request_size,
-                                                     routing=routing),
+                                                     routing=routing,
+                                                     claim_check=inbound_claim_check,
+                                                     work_queue=outbound_work_queue),
         FORWARD_RELIABLE: AsynchronousForwardReliableWorkflow(party_key, work_description_store, transmission,
                                                               inbound_async_queue, max_request_size,
-                                                              routing=routing),
+                                                              routing=routing,
+                                                              claim_check=inbound_claim_check,
+                                                              work_queue=outbound_work_queue),
         SYNC_ASYNC: SyncAsyncWorkflow(sync_async_store=sync_async_store,
                                       resynchroniser=resynchroniser,
-                                      work_description_store=work_description_store),
+                                      work_description_store=work_description_store,
+                                      notifier=sync_async_notifier),
         SYNC: SynchronousWorkflow(party_key=party_key,
                                   work_description_store=work_description_store,
                                   transmission=transmission,
                                   max_request_size=max_request_size,
                                   routing=routing)
     }
+
+    if outbound_work_queue:
+        for workflow_name in (ASYNC_RELIABLE, FORWARD_RELIABLE):
+            outbound_work_queue.register_handler(workflow_name, workflows[workflow_name].transmit_queued_message,
+                                                 workflows[workflow_name].fail_queued_message)
+    return workflows
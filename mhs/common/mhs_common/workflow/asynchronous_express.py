@@ -17,6 +17,7 @@ from persistence import persistence_adaptor
 from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow import common_asynchronous
+from mhs_common.workflow.claim_check import ClaimCheck
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -28,8 +29,10 @@ class AsynchronousExpressWorkflow(common_asynchronous.CommonAsynchronousWorkflow
                  transmission: transmission_adaptor.TransmissionAdaptor = None,
                  queue_adaptor: queue_adaptor.QueueAdaptor = None,
                  max_request_size: int = None,
-                 routing: routing_reliability.RoutingAndReliability = None):
-        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing)
+                 routing: routing_reliability.RoutingAndReliability = None,
+                 claim_check: ClaimCheck = None):
+        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing,
+                         claim_check)
 
         self.workflow_specific_interaction_details = dict(duplicate_elimination=False,
                                                           ack_requested=False,
@@ -49,7 +52,7 @@ class AsynchronousExpressWorkflow(common_asynchronous.CommonAsynchronousWorkflow
 
         logger.info('Entered async express workflow to handle outbound message')
         logger.audit('{WorkflowName} outbound workflow invoked.', fparams={'WorkflowName': self.workflow_name})
-        wdo = await self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
+        wdo = self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
 
         try:
             details = await self._lookup_endpoint_details(interaction_details)
@@ -1,5 +1,5 @@
 """This module defines the asynchronous forward reliable workflow."""
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 from isodate import isoerror
 
@@ -10,7 +10,9 @@ from mhs_common.routing import routing_reliability
 from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow import common_asynchronous, asynchronous_reliable
+from mhs_common.workflow.claim_check import ClaimCheck
 from mhs_common.workflow.common import MessageData
+from mhs_common.workflow.outbound_work_queue import OutboundWorkQueue
 from persistence import persistence_adaptor
 from utilities import timing, config
 from utilities.date_utilities import DateUtilities
@@ -25,8 +27,11 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
                  transmission: transmission_adaptor.TransmissionAdaptor = None,
                  queue_adaptor: queue_adaptor.QueueAdaptor = None,
                  max_request_size: int = None,
-                 routing: routing_reliability.RoutingAndReliability = None):
-        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing)
+                 routing: routing_reliability.RoutingAndReliability = None,
+                 claim_check: ClaimCheck = None,
+                 work_queue: OutboundWorkQueue = None):
+        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing,
+                         claim_check, work_queue)
 
         self.workflow_specific_interaction_details = dict(
             ack_soap_actor="urn:oasis:names:tc:ebxml-msg:actor:nextMSH",
@@ -45,10 +50,12 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
 
         logger.info('Entered async forward reliable workflow to handle outbound message')
         logger.audit('Outbound {WorkflowName} workflow invoked.', fparams={'WorkflowName': self.workflow_name})
-        wdo = await self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
+        use_work_queue = self.work_queue is not None and wdo is None
+        wdo = self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
 
         try:
-            details = await self._lookup_endpoint_details(interaction_details)
+            details = await self._lookup_endpoint_and_reliability_details(interaction_details)
+            reliability_details = details[self.ENDPOINT_RELIABILITY]
             url = config.get_config("FORWARD_RELIABLE_ENDPOINT_URL")
             to_party_key = details[self.ENDPOINT_PARTY_KEY]
             cpa_id = details[self.ENDPOINT_CPA_ID]
@@ -56,8 +63,6 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
             await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
             return 500, 'Error obtaining outbound URL', None
 
-        reliability_details = await self._lookup_reliability_details(interaction_details,
-                                                                     interaction_details.get('ods-code'))
         retry_interval_xml_datetime = reliability_details[common_asynchronous.MHS_RETRY_INTERVAL]
         try:
             retry_interval = DateUtilities.convert_xml_date_time_format_to_seconds(retry_interval_xml_datetime)
@@ -71,9 +76,18 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
         if error:
             return error[0], error[1], None
 
+        if use_work_queue:
+            return await self._enqueue_outbound_message(message_id, url, http_headers, message, wdo,
+                                                        reliability_details, retry_interval)
         return await self._make_outbound_request_with_retries_and_handle_response(url, http_headers, message, wdo,
                                                                                   reliability_details, retry_interval)
 
+    async def prefetch_routing_details(self, interaction_details: Dict) -> Optional[str]:
+        if self.routing_reliability is None:
+            return None
+        await self._lookup_endpoint_and_reliability_details(interaction_details)
+        return config.get_config("FORWARD_RELIABLE_ENDPOINT_URL")
+
     @timing.time_function
     async def handle_unsolicited_inbound_message(self, message_id: str, correlation_id: str, message_data: MessageData):
         logger.info('Entered async forward reliable workflow to handle unsolicited inbound message')
@@ -81,7 +95,6 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
                      fparams={'WorkflowName': self.workflow_name})
         work_description = wd.create_new_work_description(self.persistence_store, message_id, self.workflow_name,
                                                           wd.MessageStatus.UNSOLICITED_INBOUND_RESPONSE_RECEIVED)
-        await work_description.publish()
 
         try:
             await self._put_message_onto_queue_with(message_id, correlation_id, message_data)
@@ -21,6 +21,8 @@ from persistence import persistence_adaptor
 from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow import common_asynchronous
+from mhs_common.workflow.claim_check import ClaimCheck
+from mhs_common.workflow.outbound_work_queue import OutboundWorkQueue, WorkItem
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -32,8 +34,14 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
                  transmission: transmission_adaptor.TransmissionAdaptor = None,
                  queue_adaptor: queue_adaptor.QueueAdaptor = None,
                  max_request_size: int = None,
-                 routing: routing_reliability.RoutingAndReliability = None):
-        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing)
+                 routing: routing_reliability.RoutingAndReliability = None,
+                 claim_check: ClaimCheck = None,
+                 work_queue: OutboundWorkQueue = None):
+        super().__init__(party_key, persistence_store, transmission, queue_adaptor, max_request_size, routing,
+                         claim_check)
+        # If set, messages are transmitted (and retried) in the background by the work queue, rather than while the
+        # supplier's request waits
+        self.work_queue = work_queue
 
         self.workflow_specific_interaction_details = dict(duplicate_elimination=True,
                                                           ack_requested=True,
@@ -49,11 +57,14 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
             -> Tuple[int, str, Optional[wd.WorkDescription]]:
 
         logger.info('Entered async reliable workflow to handle outbound message')
-        wdo = await self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
+        # A message sent as part of another workflow (such as sync-async) is always sent while its request waits
+        use_work_queue = self.work_queue is not None and wdo is None
+        wdo = self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
         logger.audit('Outbound {WorkflowName} workflow invoked.', fparams={'WorkflowName': self.workflow_name})
 
         try:
-            details = await self._lookup_endpoint_details(interaction_details)
+            details = await self._lookup_endpoint_and_reliability_details(interaction_details)
+            reliability_details = details[self.ENDPOINT_RELIABILITY]
             url = details[self.ENDPOINT_URL]
             to_party_key = details[self.ENDPOINT_PARTY_KEY]
             cpa_id = details[self.ENDPOINT_CPA_ID]
@@ -61,7 +72,6 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
             await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
             return 500, 'Error obtaining outbound URL', None
 
-        reliability_details = await self._lookup_reliability_details(interaction_details)
         retry_interval_xml_datetime = reliability_details[common_asynchronous.MHS_RETRY_INTERVAL]
         try:
             retry_interval = DateUtilities.convert_xml_date_time_format_to_seconds(retry_interval_xml_datetime)
@@ -75,9 +85,68 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
         if error:
             return error[0], error[1], None
 
+        if use_work_queue:
+            return await self._enqueue_outbound_message(message_id, url, http_headers, message, wdo,
+                                                        reliability_details, retry_interval)
         return await self._make_outbound_request_with_retries_and_handle_response(url, http_headers, message, wdo,
                                                                                   reliability_details, retry_interval)
 
+    async def prefetch_routing_details(self, interaction_details: Dict) -> Optional[str]:
+        if self.routing_reliability is None:
+            return None
+        details = await self._lookup_endpoint_and_reliability_details(interaction_details)
+        return details[self.ENDPOINT_URL]
+
+    async def _enqueue_outbound_message(self, message_id: str, url: str, http_headers: Dict[str, str], message: str,
+                                        wdo: wd.WorkDescription, reliability_details: dict, retry_interval: float):
+        num_of_retries = int(reliability_details[common_asynchronous.MHS_RETRIES])
+        item = WorkItem(message_id=message_id, workflow=self.workflow_name, url=url, http_headers=http_headers,
+                        message=message, max_retries=num_of_retries, retries_remaining=num_of_retries,
+                        retry_interval=retry_interval)
+        try:
+            if not wdo.published:
+                await wdo.publish()
+            await self.work_queue.enqueue(item)
+        except Exception:
+            logger.exception('Failed to add outbound message to work queue')
+            await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
+            return 500, 'Error queueing outbound message', None
+
+        logger.audit('{WorkflowName} outbound workflow invoked. Message queued to be sent to Spine.',
+                     fparams={'WorkflowName': self.workflow_name})
+        return 202, '', None
+
+    async def transmit_queued_message(self, item: WorkItem) -> bool:
+        """Make a single attempt to send a message taken from the work queue.
+
+        :param item: The work item holding the message.
+        :return: True if the message should be sent again after the item's retry interval.
+        """
+        wdo = await wd.get_work_description_from_store(self.persistence_store, item.message_id)
+        # The queue tracks the remaining retries itself, this is only read when handling an error response
+        retries_remaining = [item.retries_remaining]
+        handle_error_response = functools.partial(self._handle_error_response,
+                                                  num_of_retries=item.max_retries, retries_remaining=retries_remaining)
+        try:
+            await self._make_outbound_request_and_handle_response(item.url, item.http_headers, item.message, wdo,
+                                                                  handle_error_response)
+        except _NeedToRetryException:
+            return True
+        return False
+
+    async def fail_queued_message(self, item: WorkItem) -> None:
+        """Record that a message taken from the work queue has been given up on, after the last attempt to send it
+        failed with an unexpected error.
+
+        :param item: The work item holding the message.
+        """
+        wdo = await wd.get_work_description_from_store(self.persistence_store, item.message_id)
+        if wdo is None:
+            logger.error('No work description found for {message_id} to record that it failed to be sent',
+                         fparams={'message_id': item.message_id})
+            return
+        await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
+
     async def _make_outbound_request_with_retries_and_handle_response(self, url: str, http_headers: Dict[str, str],
                                                                       message: str, wdo: wd.WorkDescription,
                                                                       reliability_details: dict, retry_interval: float):
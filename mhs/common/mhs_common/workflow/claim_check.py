@@ -0,0 +1,62 @@
+"""This module defines the claim check used to keep large payloads out of messages placed on the inbound queue."""
+from typing import Optional
+
+import utilities.integration_adaptors_logger as log
+from mhs_common.messages import ebxml_request_envelope
+from persistence import blob_store
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+CLAIM_CHECK = 'claim-check'
+SIZE = 'size'
+
+PAYLOAD = 'payload'
+ATTACHMENTS = 'attachments'
+
+
+class ClaimCheck(object):
+    """Replaces payloads and attachments above a threshold size in an inbound queue message with a reference to a
+    copy of the value written to a blob store.
+
+    A value that has been checked in is replaced in the message by a dictionary of the form
+    `{"claim-check": "<blob key>", "size": <length of the value>}`. The consumer of the queue message retrieves the
+    value from the blob store using the blob key.
+    """
+
+    def __init__(self, store: blob_store.BlobStore, threshold: int):
+        """
+        :param store: The blob store to write values to.
+        :param threshold: The length (in characters) above which a value is written to the blob store.
+        """
+        self.store = store
+        self.threshold = threshold
+
+    async def check_in(self, message_id: str, message: dict) -> dict:
+        """Write any payload or attachment in the message that exceeds the threshold to the blob store.
+
+        :param message_id: The id of the message, used to build the keys of the blobs written.
+        :param message: The queue message, with `payload` and `attachments` fields. It is not modified.
+        :return: A copy of the message in which values that were written to the blob store have been replaced by
+        references to them.
+        """
+        checked_message = dict(message)
+        checked_message[PAYLOAD] = await self.__check_in_value(f'{message_id}/{PAYLOAD}', message.get(PAYLOAD))
+
+        attachments = []
+        for index, attachment in enumerate(message.get(ATTACHMENTS) or []):
+            attachment = dict(attachment)
+            attachment[ebxml_request_envelope.ATTACHMENT_PAYLOAD] = await self.__check_in_value(
+                f'{message_id}/{ATTACHMENTS}/{index}', attachment.get(ebxml_request_envelope.ATTACHMENT_PAYLOAD))
+            attachments.append(attachment)
+        checked_message[ATTACHMENTS] = attachments
+
+        return checked_message
+
+    async def __check_in_value(self, key: str, value: Optional[str]):
+        if value is None or len(value) <= self.threshold:
+            return value
+
+        logger.info('Value of {size} characters is larger than {threshold}. Writing it to the blob store under {key}',
+                    fparams={'size': len(value), 'threshold': self.threshold, 'key': key})
+        await self.store.put(key, value.encode())
+        return {CLAIM_CHECK: key, SIZE: len(value)}
@@ -93,6 +93,19 @@ class CommonWorkflow(abc.ABC):
         """
         pass
 
+    async def prefetch_routing_details(self, interaction_details: Dict) -> Optional[str]:
+        """Look up the routing details this workflow uses to send a message for the given interaction, so that they are
+        already cached when the first message for the interaction is sent.
+
+        :param interaction_details: The interaction details used to send a message for the interaction.
+        :return: The URL a message for the interaction would be sent to, or None if this workflow does not look up
+        routing details.
+        """
+        if self.routing_reliability is None:
+            return None
+        details = await self._lookup_endpoint_details(interaction_details)
+        return details[self.ENDPOINT_URL]
+
     async def _lookup_endpoint_details(self, interaction_details: Dict) -> Dict:
         try:
             service_id = await self._build_service_id(interaction_details)
@@ -104,22 +117,25 @@ class CommonWorkflow(abc.ABC):
             logger.info('Looking up endpoint details for {service_id}.', fparams={'service_id': service_id})
             endpoint_details = await self.routing_reliability.get_end_point(service_id, ods_code)
 
-            url = CommonWorkflow._extract_endpoint_url(endpoint_details)
-            to_party_key = endpoint_details[MHS_TO_PARTY_KEY_KEY]
-            cpa_id = endpoint_details[MHS_CPA_ID_KEY]
-            to_asid = self._extract_asid(endpoint_details)
-            details = {self.ENDPOINT_SERVICE_ID: service_id,
-                       self.ENDPOINT_URL: url,
-                       self.ENDPOINT_PARTY_KEY: to_party_key,
-                       self.ENDPOINT_CPA_ID: cpa_id,
-                       self.ENDPOINT_TO_ASID: to_asid
-                       }
+            details = self._build_endpoint_details(service_id, endpoint_details)
             logger.info('Retrieved endpoint details for {details}', fparams={'details': details})
             return details
         except Exception:
             logger.exception('Error encountered whilst retrieving endpoint details.')
             raise
 
+    def _build_endpoint_details(self, service_id: str, endpoint_details: Dict) -> Dict:
+        url = CommonWorkflow._extract_endpoint_url(endpoint_details)
+        to_party_key = endpoint_details[MHS_TO_PARTY_KEY_KEY]
+        cpa_id = endpoint_details[MHS_CPA_ID_KEY]
+        to_asid = self._extract_asid(endpoint_details)
+        return {self.ENDPOINT_SERVICE_ID: service_id,
+                self.ENDPOINT_URL: url,
+                self.ENDPOINT_PARTY_KEY: to_party_key,
+                self.ENDPOINT_CPA_ID: cpa_id,
+                self.ENDPOINT_TO_ASID: to_asid
+                }
+
     @staticmethod
     def _extract_endpoint_url(endpoint_details: Dict[str, List[str]]) -> str:
         endpoint_urls = endpoint_details[MHS_END_POINT_KEY]
@@ -9,6 +9,7 @@ from mhs_common.messages import ebxml_request_envelope, ebxml_envelope
 from mhs_common.routing import routing_reliability
 from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
+from mhs_common.workflow.claim_check import ClaimCheck
 from mhs_common.workflow.common import CommonWorkflow, MessageData
 from persistence import persistence_adaptor
 from utilities import timing
@@ -25,29 +26,35 @@ MHS_ACK_REQUESTED = "nhsMHSAckRequested"
 
 class CommonAsynchronousWorkflow(CommonWorkflow):
     """Common functionality across all asynchronous workflows."""
+
+    ENDPOINT_RELIABILITY = 'reliability'
+
     def __init__(self,
                  party_key: str = None,
                  persistence_store: persistence_adaptor.PersistenceAdaptor = None,
                  transmission: transmission_adaptor.TransmissionAdaptor = None,
                  queue_adaptor: queue_adaptor.QueueAdaptor = None,
                  max_request_size: int = None,
-                 routing: routing_reliability.RoutingAndReliability = None):
+                 routing: routing_reliability.RoutingAndReliability = None,
+                 claim_check: ClaimCheck = None):
 
         self.persistence_store = persistence_store
         self.transmission = transmission
         self.party_key = party_key
         self.queue_adaptor = queue_adaptor
         self.max_request_size = max_request_size
+        self.claim_check = claim_check
         super().__init__(routing)
 
-    async def _create_new_work_description_if_required(self, message_id: str, wdo: wd.WorkDescription,
-                                                       workflow_name: str):
+    def _create_new_work_description_if_required(self, message_id: str, wdo: wd.WorkDescription,
+                                                 workflow_name: str):
+        # The work description is only written to the state store once the message is about to be sent (or it
+        # fails to be prepared), so that a message that fails early costs a single write
         if not wdo:
             wdo = wd.create_new_work_description(self.persistence_store,
-                                                       message_id,
-                                                       workflow_name,
-                                                       outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
-            await wdo.publish()
+                                                 message_id,
+                                                 workflow_name,
+                                                 outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
         return wdo
 
     async def _serialize_outbound_message(self, message_id, correlation_id, interaction_details, payload, wdo,
@@ -80,6 +87,11 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
             self, url: str, http_headers: Dict[str, str], message: str, wdo: wd.WorkDescription,
             handle_error_response: Callable[[httpclient.HTTPResponse], Tuple[int, str, Optional[wd.WorkDescription]]]):
 
+        if not wdo.published:
+            # The inbound service looks up the work description when Spine's asynchronous response arrives, which
+            # may be before the acknowledgement of this request, so it must be in the state store before sending
+            await wdo.publish()
+
         logger.info('About to make outbound request')
         try:
             response = await self.transmission.make_request(url, http_headers, message, raise_error_response=False)
@@ -133,27 +145,43 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
             await wdo.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
             raise e
 
-    async def _lookup_reliability_details(self, interaction_details: Dict, org_code: str = None) -> Dict:
+    async def _lookup_endpoint_and_reliability_details(self, interaction_details: Dict) -> Dict:
+        """Look up both the endpoint and the reliability details of the remote MHS in a single request.
+
+        :param interaction_details: The interaction details of the message to be sent, including the ods code of the
+        remote MHS if it is not Spine.
+        :return: The endpoint details, as returned by `_lookup_endpoint_details`, along with the reliability details
+        under the `ENDPOINT_RELIABILITY` key.
+        """
         try:
             service_id = await self._build_service_id(interaction_details)
 
-            logger.info('Looking up reliability details for {service_id}.', fparams={'service_id': service_id})
-            reliability_details = await self.routing_reliability.get_reliability(service_id, org_code)
-
-            logger.info('Retrieved reliability details for {service_id}. {reliability_details}',
-                        fparams={'service_id': service_id, 'reliability_details': reliability_details})
-            return reliability_details
+            ods_code = interaction_details.get('ods-code')
+            logger.info('Looking up endpoint and reliability details for {service_id} and {ods_code}.',
+                        fparams={'service_id': service_id, 'ods_code': ods_code})
+            routing_and_reliability = await self.routing_reliability.get_routing_and_reliability(service_id,
+                                                                                                 ods_code)
+
+            details = self._build_endpoint_details(service_id, routing_and_reliability)
+            details[self.ENDPOINT_RELIABILITY] = routing_and_reliability
+            logger.info('Retrieved endpoint and reliability details for {service_id}. {details}',
+                        fparams={'service_id': service_id, 'details': details})
+            return details
         except Exception:
-            logger.exception('Error encountered whilst obtaining outbound URL.')
+            logger.exception('Error encountered whilst retrieving endpoint and reliability details.')
             raise
 
     async def _put_message_onto_queue_with(self, message_id, correlation_id, message_data: MessageData):
+        message = {
+            'ebXML': message_data.ebxml,
+            'payload': message_data.payload,
+            'attachments': message_data.attachments or []
+        }
+        if self.claim_check:
+            message = await self.claim_check.check_in(message_id, message)
+
         await self.queue_adaptor.send_async(
-            {
-                'ebXML': message_data.ebxml,
-                'payload': message_data.payload,
-                'attachments': message_data.attachments or []
-            },
+            message,
             properties={
                 'message-id': message_id,
                 'correlation-id': correlation_id
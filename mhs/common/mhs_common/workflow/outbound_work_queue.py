@@ -0,0 +1,280 @@
+"""This module defines the durable queue used to transmit reliable outbound messages, and retry them, in the
+background."""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import utilities.integration_adaptors_logger as log
+from persistence import persistence_adaptor
+from persistence.persistence_adaptor import DuplicatePrimaryKeyError
+from utilities import config
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 10
+DEFAULT_POLL_INTERVAL = 30.0
+DEFAULT_LEASE_TIMEOUT = 300.0
+
+WORKFLOW = 'WORKFLOW'
+URL = 'URL'
+HTTP_HEADERS = 'HTTP_HEADERS'
+MESSAGE = 'MESSAGE'
+MAX_RETRIES = 'MAX_RETRIES'
+RETRIES_REMAINING = 'RETRIES_REMAINING'
+RETRY_INTERVAL = 'RETRY_INTERVAL'
+ATTEMPT = 'ATTEMPT'
+DUE = 'DUE'
+CLAIMED = 'CLAIMED'
+
+
+@dataclass
+class WorkItem:
+    """An outbound message waiting to be transmitted, along with the state of its retries."""
+    message_id: str
+    workflow: str
+    url: str
+    http_headers: Dict[str, str]
+    message: str
+    max_retries: int
+    retries_remaining: int
+    retry_interval: float
+    attempt: int = 0
+    due: float = field(default_factory=time.time)
+
+    def to_store_data(self) -> dict:
+        return {
+            WORKFLOW: self.workflow,
+            URL: self.url,
+            HTTP_HEADERS: self.http_headers,
+            MESSAGE: self.message,
+            MAX_RETRIES: self.max_retries,
+            RETRIES_REMAINING: self.retries_remaining,
+            # Stored as strings, as DynamoDB does not accept floats
+            RETRY_INTERVAL: str(self.retry_interval),
+            ATTEMPT: self.attempt,
+            DUE: str(self.due)
+        }
+
+    @classmethod
+    def from_store_data(cls, message_id: str, store_data: dict) -> 'WorkItem':
+        return cls(message_id=message_id,
+                   workflow=store_data[WORKFLOW],
+                   url=store_data[URL],
+                   http_headers=dict(store_data[HTTP_HEADERS]),
+                   message=store_data[MESSAGE],
+                   max_retries=int(store_data[MAX_RETRIES]),
+                   retries_remaining=int(store_data[RETRIES_REMAINING]),
+                   retry_interval=float(store_data[RETRY_INTERVAL]),
+                   attempt=int(store_data[ATTEMPT]),
+                   due=float(store_data[DUE]))
+
+
+# Attempts to transmit a work item, returning True if it should be retried
+WorkItemHandler = Callable[[WorkItem], Awaitable[bool]]
+# Records that a work item has been given up on after its handler failed
+WorkItemFailureHandler = Callable[[WorkItem], Awaitable[None]]
+
+
+class OutboundWorkQueue(object):
+    """A queue of outbound messages, held in a persistence store, that are transmitted in the background.
+
+    Each work item is transmitted by the handler registered for its workflow once it is due, with at most
+    `max_workers` transmissions in progress at once. A handler that asks for its item to be retried has the item
+    rescheduled `retry_interval` seconds later, until it has no retries remaining. A handler that raises an exception
+    (for example because the state store could not be reached) has its item rescheduled in the same way, and once the
+    item has no retries remaining the failure handler registered for its workflow is called before it is removed.
+
+    Every `poll_interval` seconds the store is read for items that this queue has not scheduled itself, so that items
+    left by a restarted process are picked up and the items are shared between every process using the store.
+    Before it is transmitted, each attempt of an item is claimed by adding a `<message id>#claim-<attempt>` item to
+    the store, which only one process can do. A claim that is older than `lease_timeout` seconds belongs to a process
+    that stopped part way through the attempt, so the attempt is given up on and counted against the item's retries,
+    as a failed attempt is. The next attempt is made instead, or if no retries remain, the item is given up on.
+    """
+
+    def __init__(self, store: persistence_adaptor.PersistenceAdaptor, max_workers: int = DEFAULT_MAX_WORKERS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, lease_timeout: float = DEFAULT_LEASE_TIMEOUT):
+        """
+        :param store: The persistence adaptor to hold the queue in.
+        :param max_workers: The maximum number of items transmitted at once.
+        :param poll_interval: The time (in seconds) between reads of the store for items to schedule.
+        :param lease_timeout: The time (in seconds) after which a claimed attempt that has not finished is given up on.
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+
+        self._handlers: Dict[str, WorkItemHandler] = {}
+        self._failure_handlers: Dict[str, WorkItemFailureHandler] = {}
+        self._scheduled: Dict[str, asyncio.TimerHandle] = {}
+        self._in_progress: Set[str] = set()
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._poll_task: Optional[asyncio.Future] = None
+
+    @classmethod
+    def from_config(cls, store: persistence_adaptor.PersistenceAdaptor) -> 'OutboundWorkQueue':
+        """Create a new OutboundWorkQueue configured from the `OUTBOUND_QUEUE_*` config values.
+
+        :param store: The persistence adaptor to hold the queue in.
+        :return: A new OutboundWorkQueue.
+        """
+        return cls(store,
+                   max_workers=int(config.get_config('OUTBOUND_QUEUE_MAX_WORKERS', default=str(DEFAULT_MAX_WORKERS))),
+                   poll_interval=float(config.get_config('OUTBOUND_QUEUE_POLL_INTERVAL',
+                                                         default=str(DEFAULT_POLL_INTERVAL))),
+                   lease_timeout=float(config.get_config('OUTBOUND_QUEUE_LEASE_TIMEOUT',
+                                                         default=str(DEFAULT_LEASE_TIMEOUT))))
+
+    def register_handler(self, workflow_name: str, handler: WorkItemHandler,
+                         failure_handler: Optional[WorkItemFailureHandler] = None) -> None:
+        """Register the handler used to transmit the items of a workflow.
+
+        :param workflow_name: The name of the workflow.
+        :param handler: A coroutine function that attempts to transmit an item and returns True if it should be
+        retried.
+        :param failure_handler: A coroutine function called with an item that is given up on because its handler
+        raised an exception on, or did not finish, its last attempt.
+        """
+        self._handlers[workflow_name] = handler
+        if failure_handler is not None:
+            self._failure_handlers[workflow_name] = failure_handler
+
+    def start(self) -> None:
+        """Start reading the store for items to transmit."""
+        self._poll_task = asyncio.ensure_future(self.__poll_periodically())
+
+    async def enqueue(self, item: WorkItem) -> None:
+        """Add an item to the queue, to be transmitted as soon as it is due.
+
+        :param item: The item to add.
+        """
+        await self.store.add(item.message_id, item.to_store_data())
+        logger.info('Added {message_id} to outbound queue', fparams={'message_id': item.message_id})
+        self._schedule(item.message_id, item.due)
+
+    async def poll(self) -> None:
+        """Schedule every item in the store that this queue is not already handling."""
+        # Only what's needed to schedule each item is read. Its message is read when it is transmitted
+        items = await self.store.get_all([WORKFLOW, DUE])
+        unscheduled = {key: item for key, item in items.items()
+                       if WORKFLOW in item and key not in self._scheduled and key not in self._in_progress}
+        if unscheduled:
+            logger.info('Found {count} outbound queue items to schedule', fparams={'count': len(unscheduled)})
+        for message_id, item in unscheduled.items():
+            self._schedule(message_id, float(item[DUE]))
+
+    async def close(self) -> None:
+        """Stop transmitting items. Items that have not been transmitted are left in the store."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        for timer in self._scheduled.values():
+            timer.cancel()
+        self._scheduled.clear()
+
+    def _schedule(self, message_id: str, due: float) -> None:
+        delay = max(due - time.time(), 0)
+        self._scheduled[message_id] = asyncio.get_event_loop().call_later(
+            delay, lambda: asyncio.ensure_future(self.__process(message_id)))
+
+    async def __poll_periodically(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception('Failed to read outbound queue')
+            await asyncio.sleep(self.poll_interval)
+
+    async def __process(self, message_id: str) -> None:
+        self._scheduled.pop(message_id, None)
+        self._in_progress.add(message_id)
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.max_workers)
+        try:
+            async with self._workers:
+                await self.__process_item(message_id)
+        except Exception:
+            logger.exception('Failed to process outbound queue item {message_id}', fparams={'message_id': message_id})
+        finally:
+            self._in_progress.discard(message_id)
+
+    async def __process_item(self, message_id: str) -> None:
+        # Another process may have transmitted the item since it was scheduled
+        store_data = await self.store.get(message_id)
+        if store_data is None:
+            return
+        item = WorkItem.from_store_data(message_id, store_data)
+        if item.due > time.time():
+            self._schedule(message_id, item.due)
+            return
+        if not await self.__claim(item):
+            return
+
+        handler = self._handlers[item.workflow]
+        failed = False
+        try:
+            retry = await handler(item)
+        except Exception:
+            logger.exception('Failed to transmit {message_id}', fparams={'message_id': message_id})
+            retry = failed = True
+
+        if retry and item.retries_remaining > 0:
+            item.attempt += 1
+            item.retries_remaining -= 1
+            item.due = time.time() + item.retry_interval
+            logger.info('Retrying {message_id} in {retry_interval} seconds. {retries_remaining} retries remaining',
+                        fparams={'message_id': message_id, 'retry_interval': item.retry_interval,
+                                 'retries_remaining': item.retries_remaining})
+            await self.store.update(message_id, {ATTEMPT: item.attempt, RETRIES_REMAINING: item.retries_remaining,
+                                                 DUE: str(item.due)})
+            self._schedule(message_id, item.due)
+        else:
+            if failed:
+                await self.__give_up(item)
+            await self.store.delete_many([message_id] + self._claim_keys(item))
+
+    async def __give_up(self, item: WorkItem) -> None:
+        logger.error('Giving up on {message_id} after {attempts} attempts',
+                     fparams={'message_id': item.message_id, 'attempts': item.attempt + 1})
+        failure_handler = self._failure_handlers.get(item.workflow)
+        if failure_handler is not None:
+            await failure_handler(item)
+
+    async def __claim(self, item: WorkItem) -> bool:
+        claim_key = self._claim_key(item.message_id, item.attempt)
+        try:
+            await self.store.add(claim_key, {CLAIMED: str(time.time())})
+            return True
+        except DuplicatePrimaryKeyError:
+            claim = await self.store.get(claim_key)
+
+        if claim is None or time.time() - float(claim[CLAIMED]) < self.lease_timeout:
+            logger.info('Attempt {attempt} of {message_id} has been claimed by another process',
+                        fparams={'attempt': item.attempt, 'message_id': item.message_id})
+            return False
+
+        # The attempt may have crashed or hung its process, so it counts against the item's retries like a failure
+        if item.retries_remaining <= 0:
+            logger.warning('Attempt {attempt} of {message_id} was not finished and no retries remain',
+                           fparams={'attempt': item.attempt, 'message_id': item.message_id})
+            await self.__give_up(item)
+            await self.store.delete_many([item.message_id] + self._claim_keys(item))
+            return False
+
+        logger.warning('Attempt {attempt} of {message_id} was not finished. Making the next attempt instead',
+                       fparams={'attempt': item.attempt, 'message_id': item.message_id})
+        item.attempt += 1
+        item.retries_remaining -= 1
+        await self.store.update(item.message_id, {ATTEMPT: item.attempt, RETRIES_REMAINING: item.retries_remaining})
+        return await self.__claim(item)
+
+    @staticmethod
+    def _claim_key(message_id: str, attempt: int) -> str:
+        # Distinct from the `<message id>#<index>` keys a LargeItemPersistenceAdaptor splits a message across
+        return f'{message_id}#claim-{attempt}'
+
+    @classmethod
+    def _claim_keys(cls, item: WorkItem) -> List[str]:
+        return [cls._claim_key(item.message_id, attempt) for attempt in range(item.attempt + 1)]
@@ -6,6 +6,7 @@ from mhs_common.state import work_description as wd
 from mhs_common.workflow import common
 from mhs_common.workflow import common_synchronous
 from mhs_common.workflow import sync_async_resynchroniser
+from mhs_common.workflow.sync_async_notifier import SyncAsyncNotifier
 from mhs_common.workflow.common import MessageData
 from persistence import persistence_adaptor as pa
 from utilities import integration_adaptors_logger as log
@@ -16,6 +17,7 @@ ASYNC_RESPONSE_EXPECTED = 'async_response_expected'
 MESSAGE_ID = 'MESSAGE_ID'
 MESSAGE_DATA = 'DATA'
 CORRELATION_ID = 'CORRELATION_ID'
+EXPECTED_RESPONSE_TIME = 'expected_response_time'
 
 
 class SyncAsyncStoreFailure(RuntimeError):
@@ -30,6 +32,7 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
                  sync_async_store: pa.PersistenceAdaptor = None,
                  work_description_store: pa.PersistenceAdaptor = None,
                  resynchroniser: sync_async_resynchroniser.SyncAsyncResynchroniser = None,
+                 notifier: SyncAsyncNotifier = None
                  ):
         """Create a new SyncAsyncWorkflow that uses the specified dependencies to load config, build a message and
         send it.
@@ -37,11 +40,14 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
         :param work_description_store: The persistence store instance that holds the work description data
         :param sync_async_store_retry_delay: time between sync async store publish attempts
         :param persistence_store_max_retries: number of times to retry publishing something to a persistence store
+        :param notifier: An optional notifier used to wake the outbound request waiting for an inbound message once
+        it has been placed in the sync async store
         """
         super().__init__()
         self.sync_async_store = sync_async_store
         self.work_description_store = work_description_store
         self.resynchroniser = resynchroniser
+        self.notifier = notifier
         self.workflow_name = workflow.SYNC_ASYNC
 
     async def handle_outbound_message(self, from_asid: Optional[str],
@@ -62,7 +68,9 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
         wdo = wd.create_new_work_description(self.work_description_store, message_id,
                                              workflow.SYNC_ASYNC,
                                              outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
-        await wdo.publish()
+        # The statuses set by the async workflow are overwritten by the final status written once the response has
+        # been returned, so are only written along with it
+        wdo.defer_status_updates = True
 
         status_code, response, _ = await async_workflow.handle_outbound_message(from_asid, message_id, correlation_id,
                                                                                 interaction_details, payload, wdo)
@@ -70,13 +78,75 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
             logger.warning('No ACK received ')
             return status_code, response, wdo
 
-        status_code, response = await self._retrieve_async_response(message_id, wdo)
+        status_code, response = await self._retrieve_async_response(message_id, wdo,
+                                                                    interaction_details.get(EXPECTED_RESPONSE_TIME))
         return status_code, response, wdo
 
-    async def _retrieve_async_response(self, message_id, wdo: wd.WorkDescription):
+    async def submit_sync_async_outbound_message(self, from_asid: Optional[str], message_id: str,
+                                                 correlation_id: str, interaction_details: dict, payload: str,
+                                                 async_workflow: common.CommonWorkflow
+                                                 ) -> Tuple[int, str, wd.WorkDescription]:
+        """Send a message using the given asynchronous workflow without waiting for its asynchronous response. The
+        response is placed in the sync-async store when it is received, to be fetched with
+        `retrieve_sync_async_response`.
+
+        :return: The status code and response from the asynchronous workflow, along with the work description.
+        """
+        logger.info('Entered sync-async workflow to submit outbound message')
+        wdo = wd.create_new_work_description(self.work_description_store, message_id,
+                                             workflow.SYNC_ASYNC,
+                                             outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+
+        status_code, response, _ = await async_workflow.handle_outbound_message(from_asid, message_id, correlation_id,
+                                                                                interaction_details, payload, wdo)
+        return status_code, response, wdo
+
+    async def retrieve_sync_async_response(self, message_id: str, timeout: float
+                                           ) -> Tuple[int, str, Optional[wd.WorkDescription]]:
+        """Fetch the asynchronous response to a message submitted with `submit_sync_async_outbound_message`, waiting
+        up to the given time for it to be received.
+
+        :param message_id: The id of the outbound message.
+        :param timeout: The longest time (in seconds) to wait for the response.
+        :return: A 200 status code and the response if it was received, a 202 status code if it has not been received
+        yet, a 404 status code if no sync-async message with the given id was sent or a 410 status code if the
+        response has already been delivered and is no longer held. The work description is only returned along with
+        a response.
+        """
+        logger.info('Attempting to retrieve the async response to {messageId}', fparams={'messageId': message_id})
+        wdo = await wd.get_work_description_from_store(self.work_description_store, message_id)
+        if wdo is None or wdo.workflow != workflow.SYNC_ASYNC:
+            logger.warning('No sync-async message was sent with {messageId}', fparams={'messageId': message_id})
+            return 404, f'No sync-async message was sent with message id {message_id}', None
+
+        if self.__is_delivered(wdo):
+            # Don't wait for a response that may already have been deleted from the sync-async store
+            timeout = 0
+
+        try:
+            response = await self.resynchroniser.wait_for_response(message_id, timeout)
+        except sync_async_resynchroniser.SyncAsyncResponseException:
+            return 500, 'Failed to retrieve async response from sync-async store', None
+
+        if response is None:
+            # The response may have been delivered to another request whilst this one was waiting
+            wdo = await wd.get_work_description_from_store(self.work_description_store, message_id)
+            if self.__is_delivered(wdo):
+                logger.info('Async response to {messageId} has already been delivered',
+                            fparams={'messageId': message_id})
+                return 410, 'The async response has already been retrieved', None
+
+            logger.info('No async response received yet for {messageId}', fparams={'messageId': message_id})
+            return 202, 'No async response received yet', None
+
+        logger.info('Retrieved async response from sync-async store')
+        return 200, response[MESSAGE_DATA], wdo
+
+    async def _retrieve_async_response(self, message_id, wdo: wd.WorkDescription,
+                                       expected_response_time: Optional[float] = None):
         logger.info('Attempting to retrieve the async response from the async store')
         try:
-            response = await self.resynchroniser.pause_request(message_id)
+            response = await self.resynchroniser.pause_request(message_id, expected_response_time)
             logger.info('Retrieved async response from sync-async store')
             return 200, response[MESSAGE_DATA]
         except sync_async_resynchroniser.SyncAsyncResponseException:
@@ -90,6 +160,8 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
         try:
             await self.sync_async_store.add(message_id, {MESSAGE_ID: message_id, CORRELATION_ID: correlation_id, MESSAGE_DATA: message_data.payload})
             logger.info('Placed message in sync-async store successfully')
+            if self.notifier:
+                await self.notifier.notify(message_id)
             await wdo.set_inbound_status(wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_STORED)
         except Exception as e:
             logger.error('Failed to write to sync-async store')
@@ -97,7 +169,20 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
             raise e
 
     async def set_successful_message_response(self, wdo: wd.WorkDescription):
-        await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+        await wdo.set_final_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
 
     async def set_failure_message_response(self, wdo: wd.WorkDescription):
-        await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_FAILED_TO_RESPOND)
+        await wdo.set_final_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_FAILED_TO_RESPOND)
+
+    def consume_sync_async_response(self, message_id: str) -> None:
+        """Mark a response retrieved with `retrieve_sync_async_response` as delivered, so it may be removed from the
+        sync-async store. Only to be called once the work description has been marked as successfully responded.
+
+        :param message_id: The id of the outbound message.
+        """
+        self.resynchroniser.consume(message_id)
+
+    @staticmethod
+    def __is_delivered(wdo: Optional[wd.WorkDescription]) -> bool:
+        return wdo is not None and \
+            wdo.outbound_status == wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED
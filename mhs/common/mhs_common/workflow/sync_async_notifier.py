@@ -0,0 +1,157 @@
+"""This module defines notifiers used to wake an outbound sync-async request as soon as its asynchronous response
+has been placed in the sync-async store."""
+import abc
+import asyncio
+from typing import Dict, Optional, Set
+
+from utilities import integration_adaptors_logger as log
+
+from persistence import persistence_adaptor
+from persistence.mongo_persistence_adaptor import MongoPersistenceAdaptor
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+IN_MEMORY = 'memory'
+MONGO_DB = 'mongodb'
+
+DEFAULT_RECONNECT_DELAY = 5.0
+
+
+class SyncAsyncNotifier(abc.ABC):
+    """Notifies requests waiting for a sync-async response that the response has been stored.
+
+    A notification only tells the waiting request to check the sync-async store, so a notification that is lost or
+    duplicated only delays a response until the request's next poll of the store. Several requests may wait for the
+    response to the same message, and each is woken.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[asyncio.Event]] = {}
+
+    def subscribe(self, message_id: str) -> asyncio.Event:
+        """Subscribe to notifications for the response to the given message. A subscription should be made before
+        first checking the sync-async store for the response, so that a notification is not missed.
+
+        :param message_id: The id of the outbound message.
+        :return: An event that is set when a notification is received for the message.
+        """
+        event = asyncio.Event()
+        self._subscriptions.setdefault(message_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, message_id: str, event: asyncio.Event) -> None:
+        """Stop receiving notifications for the response to the given message on an event returned by `subscribe`.
+        Any other subscriptions for the message are left in place.
+
+        :param message_id: The id of the outbound message.
+        :param event: The event returned when subscribing.
+        """
+        events = self._subscriptions.get(message_id)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            del self._subscriptions[message_id]
+
+    @abc.abstractmethod
+    async def notify(self, message_id: str) -> None:
+        """Notify any request waiting for the response to the given message that the response has been stored.
+
+        :param message_id: The id of the message the response is to.
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release any connections held by this notifier."""
+        pass
+
+    def _wake_subscriber(self, message_id: str) -> None:
+        events = self._subscriptions.get(message_id)
+        if events:
+            logger.info('Waking {count} requests waiting for sync-async response to {message_id}',
+                        fparams={'count': len(events), 'message_id': message_id})
+            for event in events:
+                event.set()
+
+
+class InMemorySyncAsyncNotifier(SyncAsyncNotifier):
+    """A notifier that only wakes requests waiting in the same process as the one the response was stored in. As
+    the inbound and outbound services run in separate processes, this is only useful for testing.
+    """
+
+    async def notify(self, message_id: str) -> None:
+        self._wake_subscriber(message_id)
+
+
+class MongoSyncAsyncNotifier(SyncAsyncNotifier):
+    """A notifier that watches a MongoDB change stream of the sync-async store's collection, so that requests are
+    woken whichever process stored their response. Storing the response is the notification, so `notify` does
+    nothing. Change streams require MongoDB to be running as a replica set.
+    """
+
+    def __init__(self, collection, reconnect_delay: float = DEFAULT_RECONNECT_DELAY):
+        """
+        :param collection: The motor collection used by the sync-async store.
+        :param reconnect_delay: The time (in seconds) to wait before watching the change stream again after an error.
+        """
+        super().__init__()
+        self.collection = collection
+        self.reconnect_delay = reconnect_delay
+        self._watch_task: Optional[asyncio.Future] = None
+
+    def subscribe(self, message_id: str) -> asyncio.Event:
+        # The change stream is only watched once a request is waiting, on the IO loop the request is waiting on
+        if self._watch_task is None:
+            self._watch_task = asyncio.ensure_future(self.__watch())
+        return super().subscribe(message_id)
+
+    async def notify(self, message_id: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    async def __watch(self) -> None:
+        while True:
+            try:
+                logger.info('Watching sync-async store for responses')
+                async with self.collection.watch([{'$match': {'operationType': 'insert'}}]) as stream:
+                    async for change in stream:
+                        self._wake_subscriber(change['documentKey']['_id'])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Error watching sync-async store. Watching again in {delay} seconds',
+                                 fparams={'delay': self.reconnect_delay})
+            await asyncio.sleep(self.reconnect_delay)
+
+
+def get_sync_async_notifier(notifier_type: Optional[str],
+                            sync_async_store: persistence_adaptor.PersistenceAdaptor,
+                            outbound: bool = False) -> Optional[SyncAsyncNotifier]:
+    """Build the sync-async notifier of the given type.
+
+    :param notifier_type: The type of notifier, `memory` or `mongodb`. If None, no notifier is used and requests only
+    poll the sync-async store.
+    :param sync_async_store: The sync-async store that responses are placed in.
+    :param outbound: Whether the notifier is for the outbound service, which waits for notifications. A `memory`
+    notifier is rejected for it, as responses are never stored in the outbound service's process.
+    :return: The notifier, or None if no notifier should be used.
+    """
+    if not notifier_type:
+        return None
+
+    notifier_type = notifier_type.lower()
+    logger.info('Building {notifier_type} sync-async notifier', fparams={'notifier_type': notifier_type})
+    if notifier_type == IN_MEMORY:
+        if outbound:
+            raise ValueError('A memory sync-async notifier cannot be used by the outbound service, as it would never '
+                             'be notified')
+        return InMemorySyncAsyncNotifier()
+    if notifier_type == MONGO_DB:
+        if not isinstance(sync_async_store, MongoPersistenceAdaptor):
+            raise ValueError('A mongodb sync-async notifier requires the sync-async store to use mongodb')
+        return MongoSyncAsyncNotifier(sync_async_store.collection)
+    raise ValueError(f'Unknown sync-async notifier type: {notifier_type}')
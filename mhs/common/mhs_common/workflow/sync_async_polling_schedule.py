@@ -0,0 +1,95 @@
+"""This module defines the schedule on which the sync-async store is polled for an asynchronous response."""
+import random
+import time
+from typing import Iterator, Optional
+
+from utilities import config
+
+DEFAULT_EXPECTED_RESPONSE_TIME = 0.3
+DEFAULT_INITIAL_INTERVAL = 0.05
+DEFAULT_MAX_INTERVAL = 1.0
+DEFAULT_BACKOFF_MULTIPLIER = 2.0
+DEFAULT_JITTER = 0.2
+
+
+class BackoffPollingSchedule(object):
+    """A polling schedule that polls densely until a response is expected to have arrived, then backs off
+    exponentially until a deadline.
+
+    Polls are made every `initial_interval` seconds until `expected_response_time` seconds have passed. The interval
+    is then multiplied by `backoff_multiplier` after every poll, up to `max_interval`. Each interval is randomly
+    varied by up to `jitter` times its length, so that requests made at the same time do not poll in step. No poll is
+    scheduled after `deadline` seconds have passed.
+    """
+
+    def __init__(self, deadline: float,
+                 expected_response_time: float = DEFAULT_EXPECTED_RESPONSE_TIME,
+                 initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 backoff_multiplier: float = DEFAULT_BACKOFF_MULTIPLIER,
+                 jitter: float = DEFAULT_JITTER):
+        """
+        :param deadline: The time (in seconds) after the schedule starts beyond which no more polls are made.
+        :param expected_response_time: The time (in seconds) by which a response is usually received, used for
+        interactions that do not specify their own.
+        :param initial_interval: The time (in seconds) between polls until the expected response time.
+        :param max_interval: The longest time (in seconds) between polls.
+        :param backoff_multiplier: The factor the interval between polls grows by after the expected response time.
+        :param jitter: The proportion of each interval by which it may be randomly lengthened or shortened.
+        """
+        self.deadline = deadline
+        self.expected_response_time = expected_response_time
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_multiplier = backoff_multiplier
+        self.jitter = jitter
+
+    @classmethod
+    def from_config(cls) -> Optional['BackoffPollingSchedule']:
+        """Create a new BackoffPollingSchedule from the `RESYNC_*` config values.
+
+        :return: The polling schedule, or None if `RESYNC_DEADLINE` is not set, in which case the sync-async store
+        should be polled at the fixed `RESYNC_INTERVAL` instead.
+        """
+        deadline = config.get_config('RESYNC_DEADLINE', default=None)
+        if not deadline:
+            return None
+
+        return cls(float(deadline),
+                   expected_response_time=float(config.get_config('RESYNC_EXPECTED_RESPONSE_TIME',
+                                                                  default=str(DEFAULT_EXPECTED_RESPONSE_TIME))),
+                   initial_interval=float(config.get_config('RESYNC_INITIAL_INTERVAL',
+                                                            default=str(DEFAULT_INITIAL_INTERVAL))),
+                   max_interval=float(config.get_config('RESYNC_MAX_INTERVAL', default=str(DEFAULT_MAX_INTERVAL))),
+                   backoff_multiplier=float(config.get_config('RESYNC_BACKOFF_MULTIPLIER',
+                                                              default=str(DEFAULT_BACKOFF_MULTIPLIER))),
+                   jitter=float(config.get_config('RESYNC_JITTER', default=str(DEFAULT_JITTER))))
+
+    def intervals(self, expected_response_time: Optional[float] = None,
+                  deadline: Optional[float] = None) -> Iterator[float]:
+        """Start the schedule.
+
+        :param expected_response_time: The time (in seconds) by which a response to the interaction being waited for
+        is usually received. If None, the schedule's default is used.
+        :param deadline: The time (in seconds) after which no more polls are made. If None, the schedule's default is
+        used.
+        :return: An iterator of the times (in seconds) to wait between polls, which ends once the deadline is reached.
+        """
+        if expected_response_time is None:
+            expected_response_time = self.expected_response_time
+        if deadline is None:
+            deadline = self.deadline
+        return self.__intervals(time.monotonic(), expected_response_time, deadline)
+
+    def __intervals(self, start: float, expected_response_time: float, deadline: float) -> Iterator[float]:
+        interval = self.initial_interval
+        while True:
+            elapsed = time.monotonic() - start
+            remaining = deadline - elapsed
+            if remaining <= 0:
+                return
+
+            if elapsed >= expected_response_time:
+                interval = min(interval * self.backoff_multiplier, self.max_interval)
+            jittered_interval = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            yield min(jittered_interval, remaining)
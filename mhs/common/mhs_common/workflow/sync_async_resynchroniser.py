@@ -1,9 +1,14 @@
 import asyncio
+import itertools
+import time
+from typing import Dict, Iterable, Iterator, Optional, Union
 
 from utilities import integration_adaptors_logger as log
 
 from retry import retriable_action
 from persistence import persistence_adaptor
+from mhs_common.workflow.sync_async_notifier import SyncAsyncNotifier
+from mhs_common.workflow.sync_async_polling_schedule import BackoffPollingSchedule
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -17,22 +22,58 @@ class SyncAsyncResynchroniser(object):
     def __init__(self, sync_async_store: persistence_adaptor.PersistenceAdaptor,
                  max_retries: int,
                  retry_interval: float,
-                 initial_delay: float
+                 initial_delay: float,
+                 notifier: Optional[SyncAsyncNotifier] = None,
+                 polling_schedule: Optional[BackoffPollingSchedule] = None,
+                 delete_on_consume: bool = False
                  ):
         """
         :param sync_async_store: The store where the sync-async messages are placed from the inbound service
         :param max_retries: The total number of polling attempts to the sync async store while attempting to resynchronise
         :param retry_interval: The time between polling requests to the sync-async store in seconds
         :param initial_delay: The time to wait before making the first request to the sync async store in seconds
+        :param notifier: An optional notifier of responses being placed in the sync-async store. When provided, the
+        store is checked as soon as a notification is received, with polling only used as a fallback.
+        :param polling_schedule: An optional schedule to poll the sync-async store on. When provided, it is used
+        instead of `max_retries`, `retry_interval` and `initial_delay`.
+        :param delete_on_consume: Whether to delete a response from the sync-async store once it has been retrieved.
         """
         self.max_retries = max_retries
         self.retry_interval = retry_interval
         self.sync_async_store = sync_async_store
         self.initial_delay = initial_delay
+        self.notifier = notifier
+        self.polling_schedule = polling_schedule
+        self.delete_on_consume = delete_on_consume
 
-    async def pause_request(self, message_id: str) -> dict:
+        self._responses_total = 0
+        self._timeouts_total = 0
+        self._polls_total = 0
+        self._max_polls = 0
+
+    async def pause_request(self, message_id: str, expected_response_time: Optional[float] = None) -> dict:
+        """Wait for the asynchronous response to a message to be placed in the sync-async store.
+
+        :param message_id: The id of the outbound message.
+        :param expected_response_time: The time (in seconds) by which a response to the message's interaction is
+        usually received. Only used by the polling schedule, if there is one.
+        :return: The response from the sync-async store.
+        :raises SyncAsyncResponseException: If no response is placed in the store in time.
+        """
         logger.info('Beginning async retrieval from sync-async store')
 
+        if self.polling_schedule or self.notifier:
+            if self.polling_schedule:
+                intervals = self.polling_schedule.intervals(expected_response_time)
+            else:
+                intervals = itertools.repeat(self.retry_interval, self.max_retries)
+
+            result = await self.__poll(message_id, intervals)
+            if result is None:
+                raise SyncAsyncResponseException('Polling on the sync async store timed out')
+            self.__consume(message_id)
+            return result
+
         await asyncio.sleep(self.initial_delay)
 
         retry_result = await retriable_action.RetriableAction(lambda: self.sync_async_store.get(message_id),
@@ -45,4 +86,125 @@ class SyncAsyncResynchroniser(object):
             logger.error('Resync retries exceeded. {max_retries}', fparams={'max_retries': self.max_retries})
             raise SyncAsyncResponseException('Polling on the sync async store timed out')
 
+        self.__consume(message_id)
         return retry_result.result
+
+    async def wait_for_response(self, message_id: str, timeout: float) -> Optional[dict]:
+        """Wait up to the given time for the asynchronous response to a message to be placed in the sync-async store.
+        The response is left in the store, so that it can be retrieved again if it fails to be delivered. Once it has
+        been delivered, `consume` should be called.
+
+        :param message_id: The id of the outbound message.
+        :param timeout: The longest time (in seconds) to wait for the response.
+        :return: The response from the sync-async store, or None if it was not placed in the store in time.
+        :raises SyncAsyncResponseException: If the sync-async store could not be read.
+        """
+        if self.polling_schedule:
+            intervals = self.polling_schedule.intervals(deadline=timeout)
+        else:
+            intervals = self.__intervals_until(self.retry_interval, timeout)
+
+        return await self.__poll(message_id, intervals)
+
+    def consume(self, message_id: str) -> None:
+        """Mark the response to a message retrieved with `wait_for_response` as delivered, deleting it from the
+        sync-async store if this resynchroniser deletes responses once they have been consumed.
+
+        :param message_id: The id of the outbound message.
+        """
+        self.__consume(message_id)
+
+    def get_metrics(self) -> Dict[str, Union[int, float]]:
+        """Get the polling metrics for the responses retrieved using a notifier or polling schedule.
+
+        :return: A dictionary of the total number of responses retrieved and of requests that timed out, the total
+        number of polls made, the mean number of polls each response needed and the most polls any response needed.
+        """
+        return {
+            'responses_total': self._responses_total,
+            'timeouts_total': self._timeouts_total,
+            'polls_total': self._polls_total,
+            'mean_polls': self._polls_total / max(self._responses_total + self._timeouts_total, 1),
+            'max_polls': self._max_polls
+        }
+
+    def log_metrics(self) -> None:
+        """Log the polling metrics of this resynchroniser."""
+        logger.info('{responses_total} sync-async responses retrieved and {timeouts_total} timed out, with '
+                    '{polls_total} polls made. {mean_polls} polls per response (max {max_polls})',
+                    fparams=self.get_metrics())
+
+    async def __poll(self, message_id: str, intervals: Iterable[float]) -> Optional[dict]:
+        start = time.monotonic()
+        polls = 0
+        notification = self.notifier.subscribe(message_id) if self.notifier else None
+        try:
+            intervals = iter(intervals)
+            while True:
+                if notification:
+                    notification.clear()
+
+                polls += 1
+                try:
+                    result = await self.sync_async_store.get(message_id)
+                except Exception as e:
+                    logger.exception('Error retrieving response from sync-async store')
+                    self.__record_polls(polls, timed_out=True)
+                    raise SyncAsyncResponseException('Error retrieving response from the sync async store') from e
+                if result is not None:
+                    logger.info('Retrieved sync-async response after {polls} polls in {elapsed} seconds',
+                                fparams={'polls': polls, 'elapsed': round(time.monotonic() - start, 3)})
+                    self.__record_polls(polls, timed_out=False)
+                    return result
+
+                interval = next(intervals, None)
+                if interval is None:
+                    break
+                await self.__wait(notification, interval)
+        finally:
+            if notification:
+                self.notifier.unsubscribe(message_id, notification)
+
+        self.__record_polls(polls, timed_out=True)
+        logger.error('Resync timed out after {polls} polls in {elapsed} seconds',
+                     fparams={'polls': polls, 'elapsed': round(time.monotonic() - start, 3)})
+        return None
+
+    @staticmethod
+    def __intervals_until(interval: float, timeout: float) -> Iterator[float]:
+        end = time.monotonic() + timeout
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            yield min(interval, remaining)
+
+    def __consume(self, message_id: str) -> None:
+        if self.delete_on_consume:
+            # The response has already been read, so there's no need to hold up returning it
+            asyncio.ensure_future(self.__delete(message_id))
+
+    async def __delete(self, message_id: str) -> None:
+        try:
+            await self.sync_async_store.delete(message_id)
+        except Exception:
+            logger.exception('Failed to delete consumed response from sync-async store')
+
+    @staticmethod
+    async def __wait(notification: Optional[asyncio.Event], interval: float) -> None:
+        if notification is None:
+            await asyncio.sleep(interval)
+            return
+
+        try:
+            await asyncio.wait_for(notification.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+    def __record_polls(self, polls: int, timed_out: bool) -> None:
+        if timed_out:
+            self._timeouts_total += 1
+        else:
+            self._responses_total += 1
+        self._polls_total += polls
+        self._max_polls = max(self._max_polls, polls)
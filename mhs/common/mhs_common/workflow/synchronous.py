@@ -47,14 +47,13 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
         logger.info('Entered sync workflow for outbound message')
         logger.audit('Outbound Synchronous workflow invoked.')
 
+        if not from_asid:
+            return 400, '`from_asid` header field required for sync messages', None
+
         wdo = wd.create_new_work_description(self.wd_store,
                                              message_id,
                                              workflow.SYNC,
                                              outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
-        await wdo.publish()
-
-        if not from_asid:
-            return 400, '`from_asid` header field required for sync messages', None
 
         try:
             endpoint_details = await self._lookup_endpoint_details(interaction_details)
@@ -83,6 +82,11 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
                         f'RequestSize={len(message)}', None
 
         logger.info('Outbound message prepared')
+        # The work description is added before sending, so that a message id that has already been used is rejected
+        # before the message reaches Spine and a record exists if the request is interrupted. Nothing reads it back
+        # whilst the message is in flight, so later status changes are written along with the final status
+        await wdo.publish()
+        wdo.defer_status_updates = True
         try:
             response = await self.transmission.make_request(url, headers, message)
         except httpclient.HTTPClientError as e:
@@ -91,7 +95,7 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
 
         except Exception:
             logger.exception('Error encountered whilst making outbound request.')
-            await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
+            await wdo.set_final_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
             return 500, 'Error making outbound request', None
 
         logger.audit('Outbound Synchronous workflow completed. Message sent to Spine and {Acknowledgment} received.',
@@ -134,7 +138,7 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
                                   'inbound message')
 
     async def set_successful_message_response(self, wdo: wd.WorkDescription):
-        await wdo.set_outbound_status(wd.MessageStatus.SYNC_RESPONSE_SUCCESSFUL)
+        await wdo.set_final_outbound_status(wd.MessageStatus.SYNC_RESPONSE_SUCCESSFUL)
 
     async def set_failure_message_response(self, wdo: wd.WorkDescription):
-        await wdo.set_outbound_status(wd.MessageStatus.SYNC_RESPONSE_FAILED)
+        await wdo.set_final_outbound_status(wd.MessageStatus.SYNC_RESPONSE_FAILED)
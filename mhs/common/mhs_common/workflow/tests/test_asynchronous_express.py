@@ -185,7 +185,7 @@ class TestAsynchronousExpressWorkflow(unittest.TestCase):
 
         self.assertEqual(500, status)
         self.assertEqual('Error serialising outbound message', message)
-        self.mock_work_description.publish.assert_called_once()
+        self.mock_work_description.publish.assert_not_called()
         self.assertEqual([mock.call(MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)],
                          self.mock_work_description.set_outbound_status.call_args_list)
         self.mock_transmission_adaptor.make_request.assert_not_called()
@@ -219,7 +219,7 @@ class TestAsynchronousExpressWorkflow(unittest.TestCase):
 
         self.assertEqual(500, status)
         self.assertEqual('Error obtaining outbound URL', message)
-        self.mock_work_description.publish.assert_called_once()
+        self.mock_work_description.publish.assert_not_called()
         self.assertEqual([mock.call(MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)],
                          self.mock_work_description.set_outbound_status.call_args_list)
         self.mock_transmission_adaptor.make_request.assert_not_called()
@@ -392,6 +392,22 @@ class TestAsynchronousExpressWorkflow(unittest.TestCase):
             '{WorkflowName} inbound workflow completed. Message placed on queue, returning {Acknowledgement} to spine',
             fparams={'Acknowledgement': 'INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED', 'WorkflowName': 'async-express'})
 
+    @async_test
+    async def test_handle_inbound_message_with_claim_check(self):
+        self.setup_mock_work_description()
+        self.mock_queue_adaptor.send_async.return_value = test_utilities.awaitable(None)
+        claimed_message = {'ebXML': EBXML, 'payload': {'claim-check': 'key', 'size': 1}, 'attachments': []}
+        self.workflow.claim_check = mock.MagicMock()
+        self.workflow.claim_check.check_in.return_value = test_utilities.awaitable(claimed_message)
+
+        await self.workflow.handle_inbound_message(MESSAGE_ID, CORRELATION_ID, self.mock_work_description,
+                                                   INBOUND_MESSAGE_DATA)
+
+        self.workflow.claim_check.check_in.assert_called_once_with(
+            MESSAGE_ID, {'ebXML': EBXML, 'payload': PAYLOAD, 'attachments': ATTACHMENTS})
+        self.mock_queue_adaptor.send_async.assert_called_once_with(
+            claimed_message, properties={'message-id': MESSAGE_ID, 'correlation-id': CORRELATION_ID})
+
     @async_test
     async def test_handle_inbound_message_error_putting_message_onto_queue_despite_retries(self):
         self.setup_mock_work_description()
@@ -411,11 +427,16 @@ class TestAsynchronousExpressWorkflow(unittest.TestCase):
 
     def setup_mock_work_description(self):
         self.mock_work_description = self.mock_create_new_work_description.return_value
-        self.mock_work_description.publish.return_value = test_utilities.awaitable(None)
+        self.mock_work_description.published = False
+        self.mock_work_description.publish.side_effect = self._publish_mock_work_description
         self.mock_work_description.set_outbound_status.return_value = test_utilities.awaitable(None)
         self.mock_work_description.set_inbound_status.return_value = test_utilities.awaitable(None)
         self.mock_work_description.update.return_value = test_utilities.awaitable(None)
 
+    def _publish_mock_work_description(self):
+        self.mock_work_description.published = True
+        return test_utilities.awaitable(None)
+
     def _setup_routing_mock(self):
         self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable({
             MHS_END_POINT_KEY: [URL],
@@ -16,6 +16,7 @@ from mhs_common import workflow
 from mhs_common.messages import ebxml_request_envelope, ebxml_envelope
 from mhs_common.state import work_description
 from mhs_common.state.work_description import MessageStatus
+from mhs_common.workflow import outbound_work_queue
 from mhs_common.workflow.common import MessageData
 from utilities import test_utilities
 from utilities.test_utilities import async_test
@@ -130,7 +131,7 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
         self.assertEqual(
             [mock.call(MessageStatus.OUTBOUND_MESSAGE_ACKD)],
             self.mock_work_description.set_outbound_status.call_args_list)
-        self.mock_routing_reliability.get_end_point.assert_called_once_with(SERVICE_ID, None)
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, None)
         self.mock_ebxml_request_envelope.assert_called_once_with(expected_interaction_details)
         self.mock_transmission_adaptor.make_request.assert_called_once_with(URL, HTTP_HEADERS, SERIALIZED_MESSAGE,
                                                                             raise_error_response=False)
@@ -188,7 +189,7 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
 
         self.assertEqual(500, status)
         self.assertEqual('Error serialising outbound message', message)
-        self.mock_work_description.publish.assert_called_once()
+        self.mock_work_description.publish.assert_not_called()
         self.assertEqual([mock.call(MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)],
                          self.mock_work_description.set_outbound_status.call_args_list)
         self.mock_transmission_adaptor.make_request.assert_not_called()
@@ -214,7 +215,7 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
     @async_test
     async def test_handle_outbound_message_error_when_looking_up_spine_url(self):
         self.setup_mock_work_description()
-        self.mock_routing_reliability.get_end_point.side_effect = Exception()
+        self.mock_routing_reliability.get_routing_and_reliability.side_effect = Exception()
 
         status, message, _ = await self.workflow.handle_outbound_message(None, MESSAGE_ID, CORRELATION_ID,
                                                                          INTERACTION_DETAILS,
@@ -222,7 +223,7 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
 
         self.assertEqual(500, status)
         self.assertEqual('Error obtaining outbound URL', message)
-        self.mock_work_description.publish.assert_called_once()
+        self.mock_work_description.publish.assert_not_called()
         self.assertEqual([mock.call(MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)],
                          self.mock_work_description.set_outbound_status.call_args_list)
         self.mock_transmission_adaptor.make_request.assert_not_called()
@@ -369,17 +370,22 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
         audit_log_mock.assert_called_once_with('Outbound {WorkflowName} workflow invoked.',
                                                fparams={'WorkflowName': 'async-reliable'})
 
+    @async_test
+    async def test_prefetch_routing_details(self):
+        self._setup_routing_mock()
+
+        url = await self.workflow.prefetch_routing_details(INTERACTION_DETAILS)
+
+        self.assertEqual(URL, url)
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, None)
+
     ############################
     # Reliability tests
     ############################
     @async_test
     async def test_retry_interval_contract_property_is_invalid(self):
         self.setup_mock_work_description()
-        self._setup_routing_mock()
-
-        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable({
-            workflow.common_asynchronous.MHS_RETRY_INTERVAL: MHS_RETRY_INTERVAL_INVALID_VAL,
-            workflow.common_asynchronous.MHS_RETRIES: MHS_RETRY_VAL})
+        self._setup_routing_mock(retry_interval=MHS_RETRY_INTERVAL_INVALID_VAL)
 
         self.mock_ebxml_request_envelope.return_value.serialize.return_value = (MESSAGE_ID, {}, SERIALIZED_MESSAGE)
 
@@ -491,6 +497,88 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
 
         self.mock_transmission_adaptor.make_request.assert_called_once()
 
+    @async_test
+    async def test_handle_outbound_message_adds_message_to_work_queue(self):
+        work_queue = mock.MagicMock()
+        work_queue.enqueue.return_value = test_utilities.awaitable(None)
+        self.workflow.work_queue = work_queue
+        self.setup_mock_work_description()
+        self._setup_routing_mock()
+        self.mock_ebxml_request_envelope.return_value.serialize.return_value = (
+            MESSAGE_ID, HTTP_HEADERS, SERIALIZED_MESSAGE)
+
+        status, message, _ = await self.workflow.handle_outbound_message(None, MESSAGE_ID, CORRELATION_ID,
+                                                                         INTERACTION_DETAILS, PAYLOAD, None)
+
+        self.assertEqual(202, status)
+        self.assertEqual('', message)
+        self.mock_work_description.publish.assert_called_once()
+        self.mock_transmission_adaptor.make_request.assert_not_called()
+        item = work_queue.enqueue.call_args[0][0]
+        self.assertEqual(MESSAGE_ID, item.message_id)
+        self.assertEqual(workflow.ASYNC_RELIABLE, item.workflow)
+        self.assertEqual(URL, item.url)
+        self.assertEqual(SERIALIZED_MESSAGE, item.message)
+        self.assertEqual(MHS_RETRY_VAL, item.retries_remaining)
+        self.assertEqual(MHS_RETRY_INTERVAL_VAL_IN_SECONDS, item.retry_interval)
+
+    @async_test
+    async def test_handle_outbound_message_work_queue_error(self):
+        work_queue = mock.MagicMock()
+        work_queue.enqueue.side_effect = RuntimeError('failed')
+        self.workflow.work_queue = work_queue
+        self.setup_mock_work_description()
+        self._setup_routing_mock()
+        self.mock_ebxml_request_envelope.return_value.serialize.return_value = (
+            MESSAGE_ID, HTTP_HEADERS, SERIALIZED_MESSAGE)
+
+        status, _, _ = await self.workflow.handle_outbound_message(None, MESSAGE_ID, CORRELATION_ID,
+                                                                   INTERACTION_DETAILS, PAYLOAD, None)
+
+        self.assertEqual(500, status)
+        self.assertEqual(
+            [mock.call(MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)],
+            self.mock_work_description.set_outbound_status.call_args_list)
+
+    @mock.patch.object(work_description, 'get_work_description_from_store', new_callable=mock.MagicMock)
+    @async_test
+    async def test_transmit_queued_message_asks_for_retry_on_retriable_error(self, mock_get_work_description):
+        self.setup_mock_work_description()
+        self.mock_work_description.published = True
+        mock_get_work_description.return_value = test_utilities.awaitable(self.mock_work_description)
+
+        response = mock.MagicMock()
+        response.code = 500
+        response.headers = {'Content-Type': 'text/xml'}
+        response.body = file_utilities.get_file_string(
+            Path(self.test_message_dir) / 'soapfault_response_single_error.xml')
+        self.mock_transmission_adaptor.make_request.return_value = test_utilities.awaitable(response)
+
+        item = outbound_work_queue.WorkItem(message_id=MESSAGE_ID, workflow=workflow.ASYNC_RELIABLE, url=URL,
+                                            http_headers=HTTP_HEADERS, message=SERIALIZED_MESSAGE,
+                                            max_retries=MHS_RETRY_VAL, retries_remaining=1,
+                                            retry_interval=MHS_RETRY_INTERVAL_VAL_IN_SECONDS)
+        self.assertTrue(await self.workflow.transmit_queued_message(item))
+
+        item.retries_remaining = 0
+        self.mock_transmission_adaptor.make_request.return_value = test_utilities.awaitable(response)
+        self.assertFalse(await self.workflow.transmit_queued_message(item))
+
+    @mock.patch.object(work_description, 'get_work_description_from_store', new_callable=mock.MagicMock)
+    @async_test
+    async def test_fail_queued_message_sets_transmission_failed_status(self, mock_get_work_description):
+        self.setup_mock_work_description()
+        mock_get_work_description.return_value = test_utilities.awaitable(self.mock_work_description)
+        item = outbound_work_queue.WorkItem(message_id=MESSAGE_ID, workflow=workflow.ASYNC_RELIABLE, url=URL,
+                                            http_headers=HTTP_HEADERS, message=SERIALIZED_MESSAGE,
+                                            max_retries=MHS_RETRY_VAL, retries_remaining=0,
+                                            retry_interval=MHS_RETRY_INTERVAL_VAL_IN_SECONDS)
+
+        await self.workflow.fail_queued_message(item)
+
+        self.mock_work_description.set_outbound_status.assert_called_once_with(
+            MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
+
     ############################
     # Inbound tests
     ############################
@@ -541,18 +629,21 @@ class TestAsynchronousReliableWorkflow(unittest.TestCase):
 
     def setup_mock_work_description(self):
         self.mock_work_description = self.mock_create_new_work_description.return_value
-        self.mock_work_description.publish.return_value = test_utilities.awaitable(None)
+        self.mock_work_description.published = False
+        self.mock_work_description.publish.side_effect = self._publish_mock_work_description
         self.mock_work_description.set_outbound_status.return_value = test_utilities.awaitable(None)
         self.mock_work_description.set_inbound_status.return_value = test_utilities.awaitable(None)
         self.mock_work_description.update.return_value = test_utilities.awaitable(None)
 
-    def _setup_routing_mock(self):
-        self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable({
+    def _publish_mock_work_description(self):
+        self.mock_work_description.published = True
+        return test_utilities.awaitable(None)
+
+    def _setup_routing_mock(self, retry_interval: str = MHS_RETRY_INTERVAL_VAL):
+        self.mock_routing_reliability.get_routing_and_reliability.return_value = test_utilities.awaitable({
             MHS_END_POINT_KEY: [URL],
             MHS_TO_PARTY_KEY_KEY: TO_PARTY_KEY,
             MHS_CPA_ID_KEY: CPA_ID,
-            MHS_ASID: [ASID]
-        })
-        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable({
-            workflow.common_asynchronous.MHS_RETRY_INTERVAL: MHS_RETRY_INTERVAL_VAL,
+            MHS_ASID: [ASID],
+            workflow.common_asynchronous.MHS_RETRY_INTERVAL: retry_interval,
             workflow.common_asynchronous.MHS_RETRIES: MHS_RETRY_VAL})
@@ -0,0 +1,58 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from utilities.test_utilities import async_test, awaitable
+
+from mhs_common.workflow.claim_check import ClaimCheck
+
+MESSAGE_ID = 'message-id'
+THRESHOLD = 10
+SMALL_VALUE = 'x' * THRESHOLD
+LARGE_VALUE = 'y' * (THRESHOLD + 1)
+
+
+class TestClaimCheck(TestCase):
+
+    def setUp(self):
+        self.store = MagicMock()
+        self.store.put.side_effect = lambda key, data: awaitable(None)
+        self.claim_check = ClaimCheck(self.store, THRESHOLD)
+
+    @async_test
+    async def test_small_values_are_not_checked_in(self):
+        message = {'ebXML': LARGE_VALUE, 'payload': SMALL_VALUE,
+                   'attachments': [{'content_id': 'id', 'payload': SMALL_VALUE}]}
+
+        checked_message = await self.claim_check.check_in(MESSAGE_ID, message)
+
+        self.assertEqual(message, checked_message)
+        self.store.put.assert_not_called()
+
+    @async_test
+    async def test_large_values_are_checked_in(self):
+        message = {'ebXML': SMALL_VALUE, 'payload': LARGE_VALUE,
+                   'attachments': [{'content_id': 'id-1', 'payload': SMALL_VALUE},
+                                   {'content_id': 'id-2', 'payload': LARGE_VALUE + 'z'}]}
+
+        checked_message = await self.claim_check.check_in(MESSAGE_ID, message)
+
+        self.assertEqual({'ebXML': SMALL_VALUE,
+                          'payload': {'claim-check': 'message-id/payload', 'size': THRESHOLD + 1},
+                          'attachments': [{'content_id': 'id-1', 'payload': SMALL_VALUE},
+                                          {'content_id': 'id-2',
+                                           'payload': {'claim-check': 'message-id/attachments/1',
+                                                       'size': THRESHOLD + 2}}]},
+                         checked_message)
+        self.assertEqual([(('message-id/payload', LARGE_VALUE.encode()),),
+                          (('message-id/attachments/1', (LARGE_VALUE + 'z').encode()),)],
+                         self.store.put.call_args_list)
+        self.assertEqual(LARGE_VALUE, message['payload'])
+        self.assertEqual(LARGE_VALUE + 'z', message['attachments'][1]['payload'])
+
+    @async_test
+    async def test_missing_payload(self):
+        message = {'ebXML': SMALL_VALUE, 'payload': None, 'attachments': []}
+
+        checked_message = await self.claim_check.check_in(MESSAGE_ID, message)
+
+        self.assertEqual(message, checked_message)
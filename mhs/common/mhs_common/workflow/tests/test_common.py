@@ -102,6 +102,26 @@ class TestCommonWorkflow(unittest.TestCase):
         with self.assertRaises(Exception):
             await self.workflow._lookup_endpoint_details(INTERACTION_DETAILS)
 
+    @async_test
+    async def test_prefetch_routing_details(self):
+        self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable({
+            MHS_END_POINT_KEY: [MHS_END_POINT_VALUE],
+            MHS_TO_PARTY_KEY_KEY: MHS_TO_PARTY_KEY_VALUE,
+            MHS_CPA_ID_KEY: MHS_CPA_ID_VALUE,
+            MHS_TO_ASID: [MHS_ASID_VALUE]
+        })
+
+        url = await self.workflow.prefetch_routing_details(INTERACTION_DETAILS)
+
+        self.mock_routing_reliability.get_end_point.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.assertEqual(MHS_END_POINT_VALUE, url)
+
+    @async_test
+    async def test_prefetch_routing_details_without_routing(self):
+        workflow = DummyCommonWorkflow()
+
+        self.assertIsNone(await workflow.prefetch_routing_details(INTERACTION_DETAILS))
+
     @async_test
     async def test_extract_endpoint_url_no_endpoints_returned(self):
         endpoint_details = {MHS_END_POINT_KEY: []}
@@ -17,7 +17,11 @@ INTERACTION_DETAILS = {
     'action': ACTION
 }
 
-EXPECTED_RELIABILITY_DETAILS = {
+ROUTING_AND_RELIABILITY_DETAILS = {
+    "nhsMHSEndPoint": ["http://www.example.com"],
+    "nhsMHSPartyKey": "party-key",
+    "nhsMhsCPAId": "cpa-id",
+    "uniqueIdentifier": ["asid"],
     "nhsMHSSyncReplyMode": "MSHSignalsOnly"
 }
 
@@ -59,18 +63,26 @@ class TestCommonAsynchronousWorkflow(unittest.TestCase):
                                                         self.mock_routing_reliability)
 
     @async_test
-    async def test_lookup_reliability_details(self):
-        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable(
-            EXPECTED_RELIABILITY_DETAILS)
-
-        reliability_details = await self.workflow._lookup_reliability_details(INTERACTION_DETAILS, ODS_CODE)
-
-        self.mock_routing_reliability.get_reliability.assert_called_with(SERVICE_ID, ODS_CODE)
-        self.assertEqual(reliability_details, EXPECTED_RELIABILITY_DETAILS)
+    async def test_lookup_endpoint_and_reliability_details(self):
+        self.mock_routing_reliability.get_routing_and_reliability.return_value = test_utilities.awaitable(
+            ROUTING_AND_RELIABILITY_DETAILS)
+
+        details = await self.workflow._lookup_endpoint_and_reliability_details({**INTERACTION_DETAILS,
+                                                                                'ods-code': ODS_CODE})
+
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.assertEqual({
+            'service_id': SERVICE_ID,
+            'url': 'http://www.example.com',
+            'party_key': 'party-key',
+            'cpa_id': 'cpa-id',
+            'to_asid': 'asid',
+            'reliability': ROUTING_AND_RELIABILITY_DETAILS
+        }, details)
 
     @async_test
-    async def test_lookup_reliability_details_error(self):
-        self.mock_routing_reliability.get_reliability.side_effect = Exception()
+    async def test_lookup_endpoint_and_reliability_details_error(self):
+        self.mock_routing_reliability.get_routing_and_reliability.side_effect = Exception()
 
         with self.assertRaises(Exception):
-            await self.workflow._lookup_reliability_details(INTERACTION_DETAILS)
+            await self.workflow._lookup_endpoint_and_reliability_details(INTERACTION_DETAILS)
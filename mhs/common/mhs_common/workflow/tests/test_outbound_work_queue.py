@@ -0,0 +1,279 @@
+import asyncio
+import time
+from typing import Dict, List
+from unittest import TestCase
+
+from mhs_common.workflow import outbound_work_queue
+from mhs_common.workflow.outbound_work_queue import OutboundWorkQueue, WorkItem
+from persistence.large_item_persistence_adaptor import LargeItemPersistenceAdaptor
+from persistence.persistence_adaptor import DuplicatePrimaryKeyError
+from utilities import test_utilities
+
+MESSAGE_ID = 'message-id'
+WORKFLOW_NAME = 'async-reliable'
+
+
+class FakeStore(object):
+
+    def __init__(self, items: Dict[str, dict] = None):
+        self.items = items or {}
+
+    async def add(self, key: str, data: dict):
+        if key in self.items:
+            raise DuplicatePrimaryKeyError(f'{key} already exists')
+        self.items[key] = dict(data)
+
+    async def update(self, key: str, data: dict):
+        self.items[key].update(data)
+        return self.items[key]
+
+    async def get(self, key: str, **kwargs):
+        return self.items.get(key)
+
+    async def get_many(self, keys: List[str], **kwargs):
+        return {key: self.items[key] for key in keys if key in self.items}
+
+    async def get_all(self, fields: List[str] = None):
+        return {key: {name: value for name, value in item.items() if fields is None or name in fields}
+                for key, item in self.items.items()}
+
+    async def add_many(self, items: Dict[str, dict]):
+        for key, data in items.items():
+            self.items[key] = dict(data)
+
+    async def delete_many(self, keys: List[str]):
+        for key in keys:
+            self.items.pop(key, None)
+
+
+def build_item(retries: int = 2) -> WorkItem:
+    return WorkItem(message_id=MESSAGE_ID, workflow=WORKFLOW_NAME, url='url', http_headers={'header': 'value'},
+                    message='message', max_retries=retries, retries_remaining=retries, retry_interval=0)
+
+
+async def wait_until_idle(queue: OutboundWorkQueue):
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if not queue._scheduled and not queue._in_progress:
+            return
+
+
+class TestOutboundWorkQueue(TestCase):
+
+    def setUp(self):
+        self.store = FakeStore()
+        self.queue = OutboundWorkQueue(self.store, max_workers=2, poll_interval=60, lease_timeout=60)
+        self.transmitted = []
+        self.retries_wanted = 0
+
+        async def handler(item: WorkItem):
+            self.transmitted.append((item.attempt, item.retries_remaining))
+            if self.retries_wanted:
+                self.retries_wanted -= 1
+                return True
+            return False
+
+        self.queue.register_handler(WORKFLOW_NAME, handler)
+
+    @test_utilities.async_test
+    async def test_enqueue_transmits_item_and_removes_it(self):
+        await self.queue.enqueue(build_item())
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(0, 2)], self.transmitted)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_item_is_retried_until_handler_succeeds(self):
+        self.retries_wanted = 1
+
+        await self.queue.enqueue(build_item())
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(0, 2), (1, 1)], self.transmitted)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_item_is_not_retried_once_retries_are_used_up(self):
+        self.retries_wanted = 5
+
+        await self.queue.enqueue(build_item(retries=1))
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(0, 1), (1, 0)], self.transmitted)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_poll_schedules_items_left_in_store(self):
+        self.store.items[MESSAGE_ID] = build_item().to_store_data()
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(0, 2)], self.transmitted)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_poll_does_not_read_messages(self):
+        self.queue.store = LargeItemPersistenceAdaptor(self.store, outbound_work_queue.MESSAGE, chunk_size=10)
+        await self.queue.store.add(MESSAGE_ID, build_item().to_store_data())
+        read_fields = []
+        get_all = self.store.get_all
+
+        async def recording_get_all(fields=None):
+            read_fields.append(fields)
+            return await get_all(fields)
+
+        self.store.get_all = recording_get_all
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertNotIn(outbound_work_queue.MESSAGE, read_fields[0])
+        self.assertEqual([(0, 2)], self.transmitted)
+
+    @test_utilities.async_test
+    async def test_attempt_claimed_by_another_process_is_not_transmitted(self):
+        self.store.items[MESSAGE_ID] = build_item().to_store_data()
+        self.store.items[f'{MESSAGE_ID}#claim-0'] = {outbound_work_queue.CLAIMED: str(time.time())}
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([], self.transmitted)
+        self.assertIn(MESSAGE_ID, self.store.items)
+
+    @test_utilities.async_test
+    async def test_expired_claim_moves_on_to_next_attempt(self):
+        self.store.items[MESSAGE_ID] = build_item().to_store_data()
+        self.store.items[f'{MESSAGE_ID}#claim-0'] = {outbound_work_queue.CLAIMED: str(time.time() - 120)}
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(1, 1)], self.transmitted)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_expired_claim_without_retries_remaining_is_given_up_on(self):
+        given_up = []
+
+        async def handler(item: WorkItem):
+            self.transmitted.append((item.attempt, item.retries_remaining))
+            return False
+
+        async def failure_handler(item: WorkItem):
+            given_up.append(item.message_id)
+
+        self.queue.register_handler(WORKFLOW_NAME, handler, failure_handler)
+        item = build_item(retries=1)
+        item.attempt = 1
+        item.retries_remaining = 0
+        self.store.items[MESSAGE_ID] = item.to_store_data()
+        self.store.items[f'{MESSAGE_ID}#claim-0'] = {outbound_work_queue.CLAIMED: str(time.time() - 240)}
+        self.store.items[f'{MESSAGE_ID}#claim-1'] = {outbound_work_queue.CLAIMED: str(time.time() - 120)}
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([], self.transmitted)
+        self.assertEqual([MESSAGE_ID], given_up)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_handler_error_is_retried_then_item_is_given_up_on(self):
+        attempts = []
+        given_up = []
+
+        async def failing_handler(item: WorkItem):
+            attempts.append(item.attempt)
+            raise RuntimeError('failed')
+
+        async def failure_handler(item: WorkItem):
+            given_up.append(item.message_id)
+
+        self.queue.register_handler(WORKFLOW_NAME, failing_handler, failure_handler)
+
+        await self.queue.enqueue(build_item(retries=1))
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([0, 1], attempts)
+        self.assertEqual([MESSAGE_ID], given_up)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_handler_error_is_retried_until_handler_succeeds(self):
+        given_up = []
+
+        async def flaky_handler(item: WorkItem):
+            self.transmitted.append((item.attempt, item.retries_remaining))
+            if item.attempt == 0:
+                raise RuntimeError('State store unavailable')
+            return False
+
+        async def failure_handler(item: WorkItem):
+            given_up.append(item.message_id)
+
+        self.queue.register_handler(WORKFLOW_NAME, flaky_handler, failure_handler)
+
+        await self.queue.enqueue(build_item())
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([(0, 2), (1, 1)], self.transmitted)
+        self.assertEqual([], given_up)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_claim_error_leaves_item_in_store(self):
+        async def add(key: str, data: dict):
+            raise RuntimeError('State store unavailable')
+
+        self.store.add = add
+        self.store.items[MESSAGE_ID] = build_item().to_store_data()
+
+        await self.queue.poll()
+        await wait_until_idle(self.queue)
+
+        self.assertEqual([], self.transmitted)
+        self.assertIn(MESSAGE_ID, self.store.items)
+
+    @test_utilities.async_test
+    async def test_message_larger_than_chunk_size_is_queued(self):
+        messages = []
+
+        async def handler(item: WorkItem):
+            messages.append(item.message)
+            # Retried once, so that the claim of the second attempt is made alongside the message's chunks
+            return len(messages) == 1
+
+        self.queue.store = LargeItemPersistenceAdaptor(self.store, outbound_work_queue.MESSAGE, chunk_size=10)
+        self.queue.register_handler(WORKFLOW_NAME, handler)
+        item = build_item()
+        item.message = 'a' * 25
+
+        await self.queue.enqueue(item)
+        self.assertEqual({MESSAGE_ID, f'{MESSAGE_ID}#1', f'{MESSAGE_ID}#2'}, set(self.store.items))
+        await wait_until_idle(self.queue)
+
+        self.assertEqual(['a' * 25, 'a' * 25], messages)
+        self.assertEqual({}, self.store.items)
+
+    @test_utilities.async_test
+    async def test_close_leaves_scheduled_items_in_store(self):
+        item = build_item()
+        item.due = time.time() + 60
+
+        await self.queue.enqueue(item)
+        await self.queue.close()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual([], self.transmitted)
+        self.assertIn(MESSAGE_ID, self.store.items)
+
+
+class TestWorkItem(TestCase):
+
+    def test_store_data_round_trip(self):
+        item = build_item()
+
+        self.assertEqual(item, WorkItem.from_store_data(MESSAGE_ID, item.to_store_data()))
@@ -49,6 +49,23 @@ class TestSyncAsyncWorkflowOutbound(TestCase):
         self.assertEqual(code, 200)
         self.assertEqual(body, 'data')
         self.assertEqual(actual_wdo, wdo)
+        self.assertTrue(wdo.defer_status_updates)
+        wdo.publish.assert_not_called()
+        self.resync.pause_request.assert_called_once_with('id123', None)
+
+    @patch('mhs_common.state.work_description.create_new_work_description')
+    @test_utilities.async_test
+    async def test_sync_async_passes_expected_response_time_to_resynchroniser(self, wd_mock):
+        wd_mock.return_value = MagicMock()
+        async_workflow = MagicMock()
+        self.resync.pause_request.return_value = test_utilities.awaitable({sync_async.MESSAGE_DATA: 'data'})
+        async_workflow.handle_outbound_message.return_value = test_utilities.awaitable((202, {}, None))
+
+        await self.workflow.handle_sync_async_outbound_message(None, 'id123', 'cor123',
+                                                               {sync_async.EXPECTED_RESPONSE_TIME: 0.5},
+                                                               'payload', async_workflow)
+
+        self.resync.pause_request.assert_called_once_with('id123', 0.5)
 
     @patch('mhs_common.state.work_description.create_new_work_description')
     @test_utilities.async_test
@@ -71,7 +88,7 @@ class TestSyncAsyncWorkflowOutbound(TestCase):
     @patch('mhs_common.state.work_description.create_new_work_description')
     @test_utilities.async_test
     async def test_resync_failure(self, wd_mock):
-        async def resync_raises_exception(fake_key):
+        async def resync_raises_exception(fake_key, expected_response_time):
             raise resynchroniser.SyncAsyncResponseException()
 
         wdo = MagicMock()
@@ -97,10 +114,10 @@ class TestSyncAsyncWorkflowOutbound(TestCase):
         wdo = MagicMock()
         wdo.update.return_value = test_utilities.awaitable(None)
         wdo.publish.return_value = test_utilities.awaitable(None)
-        wdo.set_outbound_status.return_value = test_utilities.awaitable(None)
+        wdo.set_final_outbound_status.return_value = test_utilities.awaitable(None)
 
         await self.workflow.set_successful_message_response(wdo)
-        wdo.set_outbound_status.assert_called_once_with(
+        wdo.set_final_outbound_status.assert_called_once_with(
             wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
 
     @test_utilities.async_test
@@ -108,10 +125,105 @@ class TestSyncAsyncWorkflowOutbound(TestCase):
         wdo = MagicMock()
         wdo.update.return_value = test_utilities.awaitable(None)
         wdo.publish.return_value = test_utilities.awaitable(None)
-        wdo.set_outbound_status.return_value = test_utilities.awaitable(None)
+        wdo.set_final_outbound_status.return_value = test_utilities.awaitable(None)
 
         await self.workflow.set_failure_message_response(wdo)
-        wdo.set_outbound_status.assert_called_once_with(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_FAILED_TO_RESPOND)
+        wdo.set_final_outbound_status.assert_called_once_with(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_FAILED_TO_RESPOND)
+
+
+class TestSyncAsyncWorkflowDeferredResponse(TestCase):
+
+    def setUp(self):
+        self.work_description_store = MagicMock()
+        self.resync = MagicMock()
+        self.workflow = sync_async.SyncAsyncWorkflow(work_description_store=self.work_description_store,
+                                                     resynchroniser=self.resync)
+
+    @patch('mhs_common.state.work_description.create_new_work_description')
+    @test_utilities.async_test
+    async def test_submit_does_not_wait_for_response(self, wd_mock):
+        wdo = MagicMock()
+        wdo.defer_status_updates = False
+        wd_mock.return_value = wdo
+        async_workflow = MagicMock()
+        async_workflow.handle_outbound_message.return_value = test_utilities.awaitable((202, '', None))
+
+        status, response, actual_wdo = await self.workflow.submit_sync_async_outbound_message(
+            None, 'id123', 'cor123', {}, 'payload', async_workflow)
+
+        self.assertEqual(202, status)
+        self.assertIs(wdo, actual_wdo)
+        self.assertFalse(wdo.defer_status_updates)
+        wd_mock.assert_called_with(self.work_description_store, 'id123', workflow.SYNC_ASYNC,
+                                   outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+        self.resync.pause_request.assert_not_called()
+
+    @patch('mhs_common.state.work_description.get_work_description_from_store', new_callable=MagicMock)
+    @test_utilities.async_test
+    async def test_retrieve_response(self, wd_mock):
+        wdo = MagicMock(workflow=workflow.SYNC_ASYNC)
+        wd_mock.return_value = test_utilities.awaitable(wdo)
+        self.resync.wait_for_response.return_value = test_utilities.awaitable({sync_async.MESSAGE_DATA: 'data'})
+
+        result = await self.workflow.retrieve_sync_async_response('id123', 5)
+
+        self.assertEqual((200, 'data', wdo), result)
+        self.resync.wait_for_response.assert_called_once_with('id123', 5)
+
+    @patch('mhs_common.state.work_description.get_work_description_from_store', new_callable=MagicMock)
+    @test_utilities.async_test
+    async def test_retrieve_response_not_received_yet(self, wd_mock):
+        wd_mock.return_value = test_utilities.awaitable(MagicMock(workflow=workflow.SYNC_ASYNC))
+        self.resync.wait_for_response.return_value = test_utilities.awaitable(None)
+
+        status, _, wdo = await self.workflow.retrieve_sync_async_response('id123', 5)
+
+        self.assertEqual(202, status)
+        self.assertIsNone(wdo)
+
+    @patch('mhs_common.state.work_description.get_work_description_from_store', new_callable=MagicMock)
+    @test_utilities.async_test
+    async def test_retrieve_response_delivered_whilst_waiting(self, wd_mock):
+        wd_mock.side_effect = [
+            test_utilities.awaitable(MagicMock(workflow=workflow.SYNC_ASYNC,
+                                               outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)),
+            test_utilities.awaitable(MagicMock(
+                workflow=workflow.SYNC_ASYNC,
+                outbound_status=wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED))]
+        self.resync.wait_for_response.return_value = test_utilities.awaitable(None)
+
+        status, _, wdo = await self.workflow.retrieve_sync_async_response('id123', 5)
+
+        self.assertEqual(410, status)
+        self.assertIsNone(wdo)
+
+    @patch('mhs_common.state.work_description.get_work_description_from_store', new_callable=MagicMock)
+    @test_utilities.async_test
+    async def test_retrieve_response_already_delivered_does_not_wait(self, wd_mock):
+        wd_mock.side_effect = lambda store, message_id: test_utilities.awaitable(MagicMock(
+            workflow=workflow.SYNC_ASYNC,
+            outbound_status=wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED))
+        self.resync.wait_for_response.return_value = test_utilities.awaitable(None)
+
+        status, _, _ = await self.workflow.retrieve_sync_async_response('id123', 5)
+
+        self.assertEqual(410, status)
+        self.resync.wait_for_response.assert_called_once_with('id123', 0)
+
+    def test_consume_response(self):
+        self.workflow.consume_sync_async_response('id123')
+
+        self.resync.consume.assert_called_once_with('id123')
+
+    @patch('mhs_common.state.work_description.get_work_description_from_store', new_callable=MagicMock)
+    @test_utilities.async_test
+    async def test_retrieve_response_for_message_not_sent_with_sync_async(self, wd_mock):
+        wd_mock.return_value = test_utilities.awaitable(MagicMock(workflow=workflow.ASYNC_EXPRESS))
+
+        status, _, wdo = await self.workflow.retrieve_sync_async_response('id123', 5)
+
+        self.assertEqual(404, status)
+        self.resync.wait_for_response.assert_not_called()
 
 
 class TestSyncAsyncWorkflowInbound(TestCase):
@@ -139,3 +251,15 @@ class TestSyncAsyncWorkflowInbound(TestCase):
         })
 
         self.work_description.set_inbound_status.assert_called_with(wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_STORED)
+
+    @test_utilities.async_test
+    async def test_inbound_workflow_notifies_waiting_request(self):
+        notifier = MagicMock()
+        notifier.notify.return_value = test_utilities.awaitable(None)
+        self.workflow.notifier = notifier
+        self.workflow.sync_async_store.add.return_value = test_utilities.awaitable(True)
+        self.work_description.set_inbound_status.return_value = test_utilities.awaitable(True)
+
+        await self.workflow.handle_inbound_message('1', 'cor_id', self.work_description, self.message_data)
+
+        notifier.notify.assert_called_once_with('1')
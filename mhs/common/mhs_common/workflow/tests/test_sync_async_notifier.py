@@ -0,0 +1,142 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from mhs_common.workflow import sync_async_notifier
+from persistence.mongo_persistence_adaptor import MongoPersistenceAdaptor
+from utilities import test_utilities
+
+MESSAGE_ID = 'message-id'
+OTHER_MESSAGE_ID = 'other-message-id'
+
+
+class FakeChangeStream(object):
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.changes:
+            # Wait as a change stream does until the next change is made
+            await asyncio.Future()
+        return self.changes.pop(0)
+
+
+class TestInMemorySyncAsyncNotifier(TestCase):
+
+    @test_utilities.async_test
+    async def test_notify_wakes_subscriber(self):
+        notifier = sync_async_notifier.InMemorySyncAsyncNotifier()
+        event = notifier.subscribe(MESSAGE_ID)
+        other_event = notifier.subscribe(OTHER_MESSAGE_ID)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertTrue(event.is_set())
+        self.assertFalse(other_event.is_set())
+
+    @test_utilities.async_test
+    async def test_notify_without_subscriber_does_nothing(self):
+        notifier = sync_async_notifier.InMemorySyncAsyncNotifier()
+        event = notifier.subscribe(MESSAGE_ID)
+        notifier.unsubscribe(MESSAGE_ID, event)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertFalse(event.is_set())
+        self.assertEqual({}, notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_notify_wakes_every_subscriber_to_message(self):
+        notifier = sync_async_notifier.InMemorySyncAsyncNotifier()
+        event = notifier.subscribe(MESSAGE_ID)
+        other_event = notifier.subscribe(MESSAGE_ID)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertTrue(event.is_set())
+        self.assertTrue(other_event.is_set())
+
+    @test_utilities.async_test
+    async def test_unsubscribe_leaves_other_subscribers_to_message(self):
+        notifier = sync_async_notifier.InMemorySyncAsyncNotifier()
+        event = notifier.subscribe(MESSAGE_ID)
+        other_event = notifier.subscribe(MESSAGE_ID)
+        notifier.unsubscribe(MESSAGE_ID, event)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertFalse(event.is_set())
+        self.assertTrue(other_event.is_set())
+
+
+class TestMongoSyncAsyncNotifier(TestCase):
+
+    @test_utilities.async_test
+    async def test_inserted_document_wakes_subscriber(self):
+        stream = FakeChangeStream([{'documentKey': {'_id': OTHER_MESSAGE_ID}}, {'documentKey': {'_id': MESSAGE_ID}}])
+        collection = MagicMock()
+        collection.watch.return_value = stream
+        notifier = sync_async_notifier.MongoSyncAsyncNotifier(collection)
+
+        event = notifier.subscribe(MESSAGE_ID)
+        await asyncio.wait_for(event.wait(), 1)
+
+        collection.watch.assert_called_once_with([{'$match': {'operationType': 'insert'}}])
+        await notifier.close()
+        await asyncio.sleep(0)
+        self.assertTrue(stream.closed)
+
+    @test_utilities.async_test
+    async def test_watches_again_after_error(self):
+        collection = MagicMock()
+        collection.watch.side_effect = [ValueError(), FakeChangeStream([{'documentKey': {'_id': MESSAGE_ID}}])]
+        notifier = sync_async_notifier.MongoSyncAsyncNotifier(collection, reconnect_delay=0)
+
+        event = notifier.subscribe(MESSAGE_ID)
+        await asyncio.wait_for(event.wait(), 1)
+
+        self.assertEqual(2, collection.watch.call_count)
+        await notifier.close()
+
+
+class TestGetSyncAsyncNotifier(TestCase):
+
+    def test_no_notifier(self):
+        self.assertIsNone(sync_async_notifier.get_sync_async_notifier(None, MagicMock()))
+
+    def test_in_memory_notifier(self):
+        notifier = sync_async_notifier.get_sync_async_notifier('memory', MagicMock())
+
+        self.assertIsInstance(notifier, sync_async_notifier.InMemorySyncAsyncNotifier)
+
+    def test_in_memory_notifier_is_rejected_for_outbound(self):
+        with self.assertRaises(ValueError):
+            sync_async_notifier.get_sync_async_notifier('memory', MagicMock(), outbound=True)
+
+    def test_mongo_notifier(self):
+        store = MagicMock(spec=MongoPersistenceAdaptor)
+        store.collection = MagicMock()
+
+        notifier = sync_async_notifier.get_sync_async_notifier('MongoDB', store)
+
+        self.assertIsInstance(notifier, sync_async_notifier.MongoSyncAsyncNotifier)
+        self.assertIs(store.collection, notifier.collection)
+
+    def test_mongo_notifier_requires_mongo_store(self):
+        with self.assertRaises(ValueError):
+            sync_async_notifier.get_sync_async_notifier('mongodb', MagicMock())
+
+    def test_unknown_notifier(self):
+        with self.assertRaises(ValueError):
+            sync_async_notifier.get_sync_async_notifier('unknown', MagicMock())
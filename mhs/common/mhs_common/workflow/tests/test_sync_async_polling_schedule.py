@@ -0,0 +1,75 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from mhs_common.workflow.sync_async_polling_schedule import BackoffPollingSchedule
+from utilities import config
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBackoffPollingSchedule(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch('time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _take(self, intervals, count):
+        taken = []
+        for interval in intervals:
+            taken.append(interval)
+            self.clock.now += interval
+            if len(taken) == count:
+                break
+        return taken
+
+    def test_polls_densely_until_expected_response_time_then_backs_off(self):
+        schedule = BackoffPollingSchedule(10, expected_response_time=0.375, initial_interval=0.125, max_interval=1,
+                                          backoff_multiplier=2, jitter=0)
+
+        intervals = self._take(schedule.intervals(), 7)
+
+        self.assertEqual([0.125, 0.125, 0.125, 0.25, 0.5, 1, 1], intervals)
+
+    def test_interaction_expected_response_time_overrides_default(self):
+        schedule = BackoffPollingSchedule(10, expected_response_time=0.375, initial_interval=0.125, max_interval=1,
+                                          backoff_multiplier=2, jitter=0)
+
+        intervals = self._take(schedule.intervals(0.625), 7)
+
+        self.assertEqual([0.125, 0.125, 0.125, 0.125, 0.125, 0.25, 0.5], intervals)
+
+    def test_schedule_ends_at_deadline(self):
+        schedule = BackoffPollingSchedule(1.5, expected_response_time=0, initial_interval=0.5, max_interval=0.5,
+                                          jitter=0)
+
+        intervals = self._take(schedule.intervals(), 10)
+
+        self.assertEqual([0.5, 0.5, 0.5], intervals)
+
+    def test_intervals_are_jittered(self):
+        schedule = BackoffPollingSchedule(100, expected_response_time=100, initial_interval=1, jitter=0.2)
+
+        intervals = self._take(schedule.intervals(), 50)
+
+        self.assertTrue(all(0.8 <= i <= 1.2 for i in intervals))
+        self.assertGreater(len(set(intervals)), 1)
+
+    def test_from_config(self):
+        with patch.dict(config.config, {'RESYNC_DEADLINE': '30', 'RESYNC_INITIAL_INTERVAL': '0.02'}):
+            schedule = BackoffPollingSchedule.from_config()
+
+        self.assertEqual(30, schedule.deadline)
+        self.assertEqual(0.02, schedule.initial_interval)
+
+    def test_from_config_without_deadline(self):
+        with patch.dict(config.config, {}, clear=True):
+            self.assertIsNone(BackoffPollingSchedule.from_config())
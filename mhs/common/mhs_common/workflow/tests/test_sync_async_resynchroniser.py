@@ -1,9 +1,11 @@
+import asyncio
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from utilities import test_utilities
 
 from mhs_common.workflow import sync_async_resynchroniser as resync
+from mhs_common.workflow.sync_async_notifier import InMemorySyncAsyncNotifier
 
 PARTY_ID = "PARTY-ID"
 
@@ -90,3 +92,197 @@ class TestSyncAsyncReSynchroniser(TestCase):
         # Assert
         self.assertEqual(sleep_mock.call_count, 1)
         self.assertEqual(sleep_mock.call_args[0][0], 5)
+
+
+class TestSyncAsyncReSynchroniserWithNotifier(TestCase):
+
+    def setUp(self):
+        self.store = MagicMock()
+        self.notifier = InMemorySyncAsyncNotifier()
+
+    @test_utilities.async_test
+    async def test_should_return_result_when_notified(self):
+        self.store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(True)]
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 60, 0, notifier=self.notifier)
+
+        pause = asyncio.ensure_future(resynchroniser.pause_request('Message'))
+        await asyncio.sleep(0)
+        await self.notifier.notify('Message')
+        result = await asyncio.wait_for(pause, 1)
+
+        self.assertTrue(result)
+        self.assertEqual(2, self.store.get.call_count)
+        self.assertEqual({}, self.notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_should_wake_every_request_waiting_for_message(self):
+        self.store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(None),
+                                      test_utilities.awaitable(True), test_utilities.awaitable(True)]
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 60, 0, notifier=self.notifier)
+
+        waits = [asyncio.ensure_future(resynchroniser.wait_for_response('Message', 60)) for _ in range(2)]
+        await asyncio.sleep(0)
+        await self.notifier.notify('Message')
+        results = await asyncio.wait_for(asyncio.gather(*waits), 1)
+
+        self.assertEqual([True, True], results)
+        self.assertEqual({}, self.notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_should_poll_store_if_not_notified(self):
+        self.store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(True)]
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 0.01, 0, notifier=self.notifier)
+
+        result = await resynchroniser.pause_request('Message')
+
+        self.assertTrue(result)
+        self.assertEqual(2, self.store.get.call_count)
+
+    @test_utilities.async_test
+    async def test_should_respect_max_retries_while_waiting_for_notification(self):
+        self.store.get.side_effect = lambda key: test_utilities.awaitable(None)
+        max_retries = 3
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, max_retries, 0.01, 0, notifier=self.notifier)
+
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual(1 + max_retries, self.store.get.call_count)
+        self.assertEqual({}, self.notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_should_raise_exception_if_store_errors(self):
+        self.store.get.side_effect = ValueError()
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 0.01, 0, notifier=self.notifier)
+
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual(1, self.store.get.call_count)
+
+
+class TestSyncAsyncReSynchroniserWithPollingSchedule(TestCase):
+
+    def setUp(self):
+        self.store = MagicMock()
+        self.schedule = MagicMock()
+
+    @patch('asyncio.sleep')
+    @test_utilities.async_test
+    async def test_should_poll_on_schedule(self, sleep_mock):
+        sleep_mock.side_effect = lambda delay: test_utilities.awaitable(None)
+        self.schedule.intervals.return_value = iter([0.05, 0.1])
+        self.store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(None),
+                                      test_utilities.awaitable(True)]
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 1, 5, polling_schedule=self.schedule)
+
+        result = await resynchroniser.pause_request('Message', 0.5)
+
+        self.assertTrue(result)
+        self.schedule.intervals.assert_called_once_with(0.5)
+        self.assertEqual([call(0.05), call(0.1)], sleep_mock.call_args_list)
+        self.assertEqual(3, self.store.get.call_count)
+
+    @patch('asyncio.sleep')
+    @test_utilities.async_test
+    async def test_should_time_out_when_schedule_ends(self, sleep_mock):
+        sleep_mock.side_effect = lambda delay: test_utilities.awaitable(None)
+        self.schedule.intervals.return_value = iter([0.05, 0.1])
+        self.store.get.side_effect = lambda key: test_utilities.awaitable(None)
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 1, 0, polling_schedule=self.schedule)
+
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual(3, self.store.get.call_count)
+
+    @patch('asyncio.sleep')
+    @test_utilities.async_test
+    async def test_should_record_polls_per_response(self, sleep_mock):
+        sleep_mock.side_effect = lambda delay: test_utilities.awaitable(None)
+        self.schedule.intervals.side_effect = lambda expected_response_time: iter([0.05, 0.1])
+        self.store.get.side_effect = [test_utilities.awaitable(True),
+                                      test_utilities.awaitable(None), test_utilities.awaitable(True),
+                                      test_utilities.awaitable(None), test_utilities.awaitable(None),
+                                      test_utilities.awaitable(None)]
+        resynchroniser = resync.SyncAsyncResynchroniser(self.store, 20, 1, 0, polling_schedule=self.schedule)
+
+        await resynchroniser.pause_request('Message')
+        await resynchroniser.pause_request('Message')
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual({'responses_total': 2, 'timeouts_total': 1, 'polls_total': 6, 'mean_polls': 2.0,
+                          'max_polls': 3}, resynchroniser.get_metrics())
+
+
+class TestSyncAsyncReSynchroniserWaitForResponse(TestCase):
+
+    @test_utilities.async_test
+    async def test_should_return_response(self):
+        store = MagicMock()
+        store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(True)]
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 0.01, 0)
+
+        self.assertTrue(await resynchroniser.wait_for_response('Message', 1))
+        self.assertEqual(2, store.get.call_count)
+
+    @test_utilities.async_test
+    async def test_should_return_none_after_timeout(self):
+        store = MagicMock()
+        store.get.side_effect = lambda key: test_utilities.awaitable(None)
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 0.02, 0)
+
+        self.assertIsNone(await resynchroniser.wait_for_response('Message', 0.05))
+        self.assertLessEqual(store.get.call_count, 5)
+
+
+class TestSyncAsyncReSynchroniserDeleteOnConsume(TestCase):
+
+    @test_utilities.async_test
+    async def test_should_delete_response_once_retrieved(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(True)
+        store.delete.return_value = test_utilities.awaitable(None)
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 1, 0, delete_on_consume=True)
+
+        await resynchroniser.pause_request('Message')
+        await asyncio.sleep(0)
+
+        store.delete.assert_called_once_with('Message')
+
+    @test_utilities.async_test
+    async def test_should_only_delete_waited_for_response_once_consumed(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(True)
+        store.delete.return_value = test_utilities.awaitable(None)
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 1, 0, delete_on_consume=True)
+
+        await resynchroniser.wait_for_response('Message', 1)
+        await asyncio.sleep(0)
+        store.delete.assert_not_called()
+
+        resynchroniser.consume('Message')
+        await asyncio.sleep(0)
+        store.delete.assert_called_once_with('Message')
+
+    @test_utilities.async_test
+    async def test_should_not_delete_response_by_default(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(True)
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 1, 0)
+
+        await resynchroniser.pause_request('Message')
+        await asyncio.sleep(0)
+
+        store.delete.assert_not_called()
+
+    @test_utilities.async_test
+    async def test_failure_to_delete_response_is_not_raised(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(True)
+        store.delete.side_effect = ValueError()
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 1, 0, delete_on_consume=True)
+
+        self.assertTrue(await resynchroniser.pause_request('Message'))
+        await asyncio.sleep(0)
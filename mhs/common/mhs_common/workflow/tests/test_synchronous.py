@@ -51,7 +51,8 @@ class TestSynchronousWorkflow(unittest.TestCase):
 
         wd_mock.assert_called_with(self.wd_store, "123", workflow.SYNC,
                                    outbound_status=work_description.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
-        wdo_mock.publish.assert_called_once()
+        # Only written to the store along with a later status
+        wdo_mock.publish.assert_not_called()
 
     @mock.patch.object(sync, 'logger')
     @mock.patch('mhs_common.state.work_description.create_new_work_description')
@@ -125,6 +126,24 @@ class TestSynchronousWorkflow(unittest.TestCase):
         self.assertEqual(error, 400)
         self.assertIn('Request to send to Spine is too large', text)
 
+    @mock.patch('mhs_common.state.work_description.create_new_work_description')
+    @async_test
+    async def test_work_description_is_published_before_sending(self, wd_mock):
+        wdo = mock.MagicMock()
+        wdo.publish.side_effect = ValueError('Message id already used')
+        wd_mock.return_value = wdo
+        self.wf._lookup_endpoint_details = mock.MagicMock()
+        self.wf._lookup_endpoint_details.return_value = test_utilities.awaitable(LOOKUP_RESPONSE)
+        self.wf._prepare_outbound_message = mock.MagicMock()
+        self.wf._prepare_outbound_message.return_value = test_utilities.awaitable(("123", {"qwe": "qwe"}, "message"))
+
+        with self.assertRaises(ValueError):
+            await self.wf.handle_outbound_message(from_asid="202020", message_id="123", correlation_id="qwe",
+                                                  interaction_details={'action': ''}, payload="nice message",
+                                                  work_description_object=None)
+
+        self.wf.transmission.make_request.assert_not_called()
+
     @mock.patch.object(sync, 'logger')
     @mock.patch('mhs_common.state.work_description.create_new_work_description')
     @async_test
@@ -137,7 +156,7 @@ class TestSynchronousWorkflow(unittest.TestCase):
         self.wf._prepare_outbound_message = mock.MagicMock()
         self.wf._prepare_outbound_message.return_value = test_utilities.awaitable(("123", {"qwe": "qwe"}, "message"))
         self.wf.transmission.make_request.side_effect = Exception("failed")
-        wdo.set_outbound_status.return_value = test_utilities.awaitable(None)
+        wdo.set_final_outbound_status.return_value = test_utilities.awaitable(None)
 
         error, text, work_description_response = await self.wf.handle_outbound_message(
             from_asid="202020",
@@ -147,7 +166,8 @@ class TestSynchronousWorkflow(unittest.TestCase):
             payload="nice message",
             work_description_object=None)
 
-        wdo.set_outbound_status.assert_called_with(work_description.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
+        wdo.set_final_outbound_status.assert_called_with(
+            work_description.MessageStatus.OUTBOUND_MESSAGE_TRANSMISSION_FAILED)
         self.assertEqual(error, 500)
         self.assertEqual(text, 'Error making outbound request')
 
@@ -293,6 +313,7 @@ class TestSynchronousWorkflow(unittest.TestCase):
 
         self.assertEqual(error, 400)
         self.assertEqual(text, '`from_asid` header field required for sync messages')
+        wd_mock.assert_not_called()
 
     @async_test
     async def test_no_inbound(self):
@@ -340,19 +361,19 @@ class TestSynchronousWorkflow(unittest.TestCase):
     async def test_success_response(self):
         wdo = mock.MagicMock()
         wdo.publish.return_value = test_utilities.awaitable(None)
-        wdo.set_outbound_status.return_value = test_utilities.awaitable(None)
+        wdo.set_final_outbound_status.return_value = test_utilities.awaitable(None)
 
         await self.wf.set_successful_message_response(wdo)
-        wdo.set_outbound_status.assert_called_once_with(work_description.MessageStatus.SYNC_RESPONSE_SUCCESSFUL)
+        wdo.set_final_outbound_status.assert_called_once_with(work_description.MessageStatus.SYNC_RESPONSE_SUCCESSFUL)
 
     @async_test
     async def test_failure_response(self):
         wdo = mock.MagicMock()
         wdo.publish.return_value = test_utilities.awaitable(None)
-        wdo.set_outbound_status.return_value = test_utilities.awaitable(None)
+        wdo.set_final_outbound_status.return_value = test_utilities.awaitable(None)
 
         await self.wf.set_failure_message_response(wdo)
-        wdo.set_outbound_status.assert_called_once_with(work_description.MessageStatus.SYNC_RESPONSE_FAILED)
+        wdo.set_final_outbound_status.assert_called_once_with(work_description.MessageStatus.SYNC_RESPONSE_FAILED)
 
     def _setup_success_workflow(self):
         self.wf._lookup_endpoint_details = mock.MagicMock()
@@ -1,20 +1,30 @@
 import pathlib
+import socket
 import ssl
-from typing import Dict
+from typing import Dict, List, Optional
 
 import definitions
 import tornado.httpserver
 import tornado.ioloop
+import tornado.netutil
 import tornado.web
 import utilities.config as config
 import utilities.integration_adaptors_logger as log
+from builder import pystache_message_builder
 from comms import proton_queue_adaptor
 from mhs_common import workflow
+from mhs_common.messages import envelope
 from mhs_common.configuration import configuration_manager
+from mhs_common.workflow import sync_async
+from mhs_common.workflow.claim_check import ClaimCheck
+from mhs_common.workflow.sync_async_notifier import get_sync_async_notifier
 from handlers import healthcheck_handler
 from persistence import persistence_adaptor
+from persistence.blob_store_factory import get_blob_store
+from persistence.buffered_persistence_adaptor import BufferedPersistenceAdaptor
+from persistence.large_item_persistence_adaptor import LargeItemPersistenceAdaptor
 from persistence.persistence_adaptor_factory import get_persistence_adaptor
-from utilities import secrets, certs
+from utilities import secrets, certs, worker_processes
 
 import inbound.request.handler as async_request_handler
 from utilities.string_utilities import str2bool
@@ -44,12 +54,16 @@ def build_ssl_context(local_certs_file: str, ca_certs_file: str, key_file: str,
     return ssl_ctx
 
 
-def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: str, party_key: str,
+def start_inbound_server(inbound_sockets: List[socket.socket], healthcheck_sockets: List[socket.socket],
+                         local_certs_file: str, ca_certs_file: str, key_file: str, party_key: str,
                          workflows: Dict[str, workflow.CommonWorkflow],
                          persistence_store: persistence_adaptor.PersistenceAdaptor,
-                         config_manager: configuration_manager.ConfigurationManager
+                         config_manager: configuration_manager.ConfigurationManager,
+                         persistence_stores: List[persistence_adaptor.PersistenceAdaptor]
                          ) -> None:
     """
+    :param inbound_sockets: The bound sockets to accept requests from Spine from.
+    :param healthcheck_sockets: The bound sockets to accept healthcheck requests from.
     :param persistence_store: persistence store adaptor for message information
     :param local_certs_file: The filename of the certificate to present for authentication.
     :param ca_certs_file: The filename of the CA certificates as passed to ssl.SSLContext.load_verify_locations
@@ -57,6 +71,8 @@ def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: st
     :param workflows: The workflows to be used to handle messages.
     :param config_manager: The config manager used to obtain interaction details
     :param party_key: The party key to use to identify this MHS.
+    :param persistence_stores: The persistence adaptors used by the workflows, which are closed when the server shuts
+    down.
     """
 
     inbound_application = tornado.web.Application(
@@ -69,17 +85,15 @@ def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: st
         else None
 
     inbound_server = tornado.httpserver.HTTPServer(inbound_application, ssl_options=ssl_ctx)
-    inbound_server_port = int(config.get_config('INBOUND_SERVER_PORT', default='443'))
-    inbound_server.listen(inbound_server_port)
+    inbound_server.add_sockets(inbound_sockets)
 
     healthcheck_application = tornado.web.Application([
         ("/healthcheck", healthcheck_handler.HealthcheckHandler)
     ])
-    healthcheck_server_port = int(config.get_config('INBOUND_HEALTHCHECK_SERVER_PORT', default='80'))
-    healthcheck_application.listen(healthcheck_server_port)
+    healthcheck_server = tornado.httpserver.HTTPServer(healthcheck_application)
+    healthcheck_server.add_sockets(healthcheck_sockets)
 
-    logger.info('Starting inbound server at port {server_port} and healthcheck at {healthcheck_server_port}',
-                fparams={'server_port': inbound_server_port, 'healthcheck_server_port': healthcheck_server_port})
+    logger.info('Starting inbound server')
     tornado_io_loop = tornado.ioloop.IOLoop.current()
     try:
         tornado_io_loop.start()
@@ -87,6 +101,8 @@ def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: st
         logger.warning('Keyboard interrupt')
         pass
     finally:
+        for store in persistence_stores:
+            tornado_io_loop.run_sync(store.close)
         tornado_io_loop.stop()
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
@@ -100,7 +116,32 @@ def create_queue_adaptor():
         password=secrets.get_secret_config('INBOUND_QUEUE_PASSWORD', default=None),
         max_retries=int(config.get_config('INBOUND_QUEUE_MAX_RETRIES', default='3')),
         retry_delay=int(config.get_config('INBOUND_QUEUE_RETRY_DELAY', default='100')) / 1000,
-        ttl_in_seconds=int(config.get_config('INBOUND_QUEUE_MESSAGE_TTL_IN_SECONDS', default='0')))
+        ttl_in_seconds=int(config.get_config('INBOUND_QUEUE_MESSAGE_TTL_IN_SECONDS', default='0')),
+        initial_probe_delay=float(config.get_config('INBOUND_QUEUE_BROKER_PROBE_INITIAL_DELAY', default='1')),
+        max_probe_delay=float(config.get_config('INBOUND_QUEUE_BROKER_PROBE_MAX_DELAY', default='60')))
+
+
+def start_queue_adaptor_metrics(queue_adaptor: proton_queue_adaptor.ProtonQueueAdaptor) -> None:
+    """
+    Periodically log the health and counters of each inbound queue broker.
+    :param queue_adaptor: The queue adaptor to log metrics for.
+    """
+    interval = float(config.get_config('INBOUND_QUEUE_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(queue_adaptor.log_metrics, interval * 1000).start()
+
+
+def create_claim_check() -> Optional[ClaimCheck]:
+    threshold = config.get_config('INBOUND_QUEUE_CLAIM_CHECK_THRESHOLD', default=None)
+    if not threshold:
+        return None
+
+    blob_store_directory = config.get_config('BLOB_STORE_DIRECTORY', default=None)
+    if not blob_store_directory:
+        raise ValueError('MHS_BLOB_STORE_DIRECTORY must be set when MHS_INBOUND_QUEUE_CLAIM_CHECK_THRESHOLD is set')
+
+    logger.info('Writing inbound payloads and attachments larger than {threshold} characters to the blob store',
+                fparams={'threshold': threshold})
+    return ClaimCheck(get_blob_store(blob_store_directory), int(threshold))
 
 
 def create_sync_async_store():
@@ -111,32 +152,62 @@ def create_sync_async_store():
 
 
 def create_work_description_store():
-    return get_persistence_adaptor(
+    store = get_persistence_adaptor(
         table_name=config.get_config('STATE_TABLE_NAME'),
         max_retries=int(config.get_config('STATE_STORE_MAX_RETRIES', default='3')),
         retry_delay=int(config.get_config('STATE_STORE_RETRY_DELAY', default='100')) / 1000)
+    if str2bool(config.get_config('STATE_STORE_WRITE_BEHIND', default=str(False))):
+        store = BufferedPersistenceAdaptor.from_config(store, 'state-store')
+    return store
 
 
 def main():
+    pystache_message_builder.use_compiled_templates(
+        str2bool(config.get_config('COMPILED_TEMPLATES', default=str(False))))
+    envelope.preload_templates()
+
     certificates = certs.Certs.create_certs_files(definitions.ROOT_DIR,
                                                   private_key=secrets.get_secret_config('CLIENT_KEY'),
                                                   local_cert=secrets.get_secret_config('CLIENT_CERT'),
                                                   ca_certs=secrets.get_secret_config('CA_CERTS'))
     party_key = secrets.get_secret_config('PARTY_KEY')
 
+    # The sockets are bound before any worker processes are forked so that they all accept requests from them. The
+    # queue adaptor, persistence adaptors and everything else holding connections are then created separately by each
+    # worker
+    inbound_server_port = int(config.get_config('INBOUND_SERVER_PORT', default='443'))
+    healthcheck_server_port = int(config.get_config('INBOUND_HEALTHCHECK_SERVER_PORT', default='80'))
+    inbound_sockets = tornado.netutil.bind_sockets(inbound_server_port)
+    healthcheck_sockets = tornado.netutil.bind_sockets(healthcheck_server_port)
+    logger.info('Bound inbound server to port {server_port} and healthcheck to {healthcheck_server_port}',
+                fparams={'server_port': inbound_server_port, 'healthcheck_server_port': healthcheck_server_port})
+    worker_processes.start_worker_processes(worker_processes.get_worker_process_count())
+
     queue_adaptor = create_queue_adaptor()
+    start_queue_adaptor_metrics(queue_adaptor)
     work_description_store = create_work_description_store()
     sync_async_store = create_sync_async_store()
+    sync_async_notifier = get_sync_async_notifier(config.get_config('SYNC_ASYNC_NOTIFIER', default=None),
+                                                  sync_async_store)
+    sync_async_store = LargeItemPersistenceAdaptor.from_config(sync_async_store, sync_async.MESSAGE_DATA,
+                                                               'sync-async-store')
 
     workflows = workflow.get_workflow_map(inbound_async_queue=queue_adaptor,
                                           work_description_store=work_description_store,
-                                          sync_async_store=sync_async_store)
+                                          sync_async_store=sync_async_store,
+                                          inbound_claim_check=create_claim_check(),
+                                          sync_async_notifier=sync_async_notifier)
 
     interactions_config_file = pathlib.Path(definitions.ROOT_DIR) / 'data' / "interactions" / "interactions.json"
     config_manager = configuration_manager.ConfigurationManager(str(interactions_config_file))
 
-    start_inbound_server(certificates.local_cert_path, certificates.ca_certs_path, certificates.private_key_path,
-                         party_key, workflows, work_description_store, config_manager)
+    try:
+        start_inbound_server(inbound_sockets, healthcheck_sockets, certificates.local_cert_path,
+                             certificates.ca_certs_path, certificates.private_key_path,
+                             party_key, workflows, work_description_store, config_manager,
+                             [work_description_store, sync_async_store])
+    finally:
+        queue_adaptor.close()
 
 
 if __name__ == "__main__":
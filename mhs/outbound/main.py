@@ -1,24 +1,41 @@
 import pathlib
-from typing import Dict
+import socket
+from typing import Dict, List, Optional
 
 import tornado.httpclient
 import tornado.httpserver
 import tornado.ioloop
+import tornado.netutil
 import tornado.web
 
 import definitions
+from builder import pystache_message_builder
 import mhs_common.configuration.configuration_manager as configuration_manager
+import outbound.request.admission_control as admission_control
+import outbound.request.batch.handler as batch_request_handler
+import outbound.request.response.handler as response_request_handler
 import outbound.request.synchronous.handler as client_request_handler
+import outbound.route_warm_up as route_warm_up
 import utilities.integration_adaptors_logger as log
-from handlers import healthcheck_handler
+from comms.http_client_pool import HttpClientPool
+from handlers import healthcheck_handler, readiness_handler
 from mhs_common import workflow
-from mhs_common.routing import routing_reliability
+from mhs_common.messages import envelope
+from mhs_common.routing import route_cache, routing_reliability
 from persistence import persistence_adaptor
+from persistence.buffered_persistence_adaptor import BufferedPersistenceAdaptor
+from persistence.large_item_persistence_adaptor import LargeItemPersistenceAdaptor
 from persistence.persistence_adaptor_factory import get_persistence_adaptor
+from mhs_common.workflow import sync_async
 from mhs_common.workflow import sync_async_resynchroniser as resync
+import mhs_common.workflow.outbound_work_queue as work_queue
+from mhs_common.workflow.outbound_work_queue import OutboundWorkQueue
+from mhs_common.workflow.sync_async_notifier import SyncAsyncNotifier, get_sync_async_notifier
+from mhs_common.workflow.sync_async_polling_schedule import BackoffPollingSchedule
 from outbound.transmission import outbound_transmission
 from utilities import config, certs
 from utilities import secrets
+from utilities import worker_processes
 from utilities.string_utilities import str2bool
 
 logger = log.IntegrationAdaptorsLogger(__name__)
@@ -35,7 +52,9 @@ def initialise_workflows(transmission: outbound_transmission.OutboundTransmissio
                          work_description_store: persistence_adaptor.PersistenceAdaptor,
                          sync_async_store: persistence_adaptor.PersistenceAdaptor,
                          max_request_size: int,
-                         routing: routing_reliability.RoutingAndReliability) \
+                         routing: routing_reliability.RoutingAndReliability,
+                         sync_async_notifier: Optional[SyncAsyncNotifier] = None,
+                         outbound_work_queue: Optional[OutboundWorkQueue] = None) \
         -> Dict[str, workflow.CommonWorkflow]:
     """Initialise the workflows
     :param transmission: The transmission object to be used to make requests to the spine endpoints
@@ -47,24 +66,34 @@ def initialise_workflows(transmission: outbound_transmission.OutboundTransmissio
     databases.
     :param routing: The routing and reliability component to use to request routing/reliability details
     from.
+    :param sync_async_notifier: The notifier used to wake requests waiting for a sync-async response. If None, the
+    sync-async store is only polled.
+    :param outbound_work_queue: The queue used to send reliable messages in the background. If None, reliable
+    messages are sent (and retried) while the supplier's request waits.
     :return: The workflows that can be used to handle messages.
     """
 
+    delete_on_consume = str2bool(config.get_config('SYNC_ASYNC_STORE_DELETE_ON_CONSUME', default=str(False)))
     resynchroniser = resync.SyncAsyncResynchroniser(sync_async_store,
                                                     int(config.get_config('RESYNC_RETRIES', '20')),
                                                     float(config.get_config('RESYNC_INTERVAL', '1.0')),
-                                                    float(config.get_config('RESYNC_INITIAL_DELAY', '0')))
+                                                    float(config.get_config('RESYNC_INITIAL_DELAY', '0')),
+                                                    notifier=sync_async_notifier,
+                                                    polling_schedule=BackoffPollingSchedule.from_config(),
+                                                    delete_on_consume=delete_on_consume)
+    start_resync_metrics(resynchroniser)
 
     return workflow.get_workflow_map(party_key,
                                      work_description_store=work_description_store,
                                      transmission=transmission,
                                      resynchroniser=resynchroniser,
                                      max_request_size=max_request_size,
-                                     routing=routing
+                                     routing=routing,
+                                     outbound_work_queue=outbound_work_queue
                                      )
 
 
-def initialise_routing():
+def initialise_routing(client_pool: HttpClientPool, cache: Optional[route_cache.RouteCache]):
     spine_route_lookup_url = config.get_config('SPINE_ROUTE_LOOKUP_URL')
     spine_org_code = config.get_config('SPINE_ORG_CODE')
 
@@ -86,37 +115,161 @@ def initialise_routing():
                                                      client_cert=certificates.local_cert_path,
                                                      client_key=certificates.private_key_path,
                                                      ca_certs=certificates.ca_certs_path,
-                                                     http_proxy_host=route_proxy_host, http_proxy_port=route_proxy_port)
+                                                     http_proxy_host=route_proxy_host, http_proxy_port=route_proxy_port,
+                                                     client_pool=client_pool, cache=cache)
 
 
-def start_tornado_server(data_dir: pathlib.Path, workflows: Dict[str, workflow.CommonWorkflow]) -> None:
+def create_route_cache() -> Optional[route_cache.RouteCache]:
+    cache = route_cache.RouteCache.from_config()
+    if cache.max_size <= 0:
+        logger.info('Route lookup details will not be cached')
+        return None
+    return cache
+
+
+def start_route_cache_metrics(cache: route_cache.RouteCache) -> None:
+    """
+    Periodically log the hits, misses and evictions of the route cache.
+    :param cache: The route cache to log metrics for.
+    """
+    interval = float(config.get_config('ROUTE_CACHE_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(cache.log_metrics, interval * 1000).start()
+
+
+def start_http_client_pool_metrics(client_pools: List[HttpClientPool]) -> None:
+    """
+    Periodically log the metrics of each HTTP client pool.
+    :param client_pools: The HTTP client pools to log metrics for.
+    """
+    interval = float(config.get_config('HTTP_POOL_METRICS_INTERVAL', default='60'))
+
+    def log_metrics():
+        for client_pool in client_pools:
+            client_pool.log_metrics()
+
+    tornado.ioloop.PeriodicCallback(log_metrics, interval * 1000).start()
+
+
+def start_resync_metrics(resynchroniser: resync.SyncAsyncResynchroniser) -> None:
+    """
+    Periodically log how many polls of the sync-async store responses needed.
+    :param resynchroniser: The resynchroniser to log metrics for.
+    """
+    interval = float(config.get_config('RESYNC_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(resynchroniser.log_metrics, interval * 1000).start()
+
+
+def initialise_outbound_work_queue() -> Optional[OutboundWorkQueue]:
+    """Build the queue used to send reliable messages in the background, if `OUTBOUND_QUEUE_TABLE_NAME` is set.
+
+    :return: The outbound work queue, or None if reliable messages should be sent while the supplier's request waits.
+    """
+    table_name = config.get_config('OUTBOUND_QUEUE_TABLE_NAME', default=None)
+    if not table_name:
+        return None
+
+    queue_store = get_persistence_adaptor(
+        table_name=table_name,
+        max_retries=int(config.get_config('OUTBOUND_QUEUE_STORE_MAX_RETRIES', default='3')),
+        retry_delay=int(config.get_config('OUTBOUND_QUEUE_STORE_RETRY_DELAY', default='100')) / 1000)
+    # Queued messages can be far larger than a DynamoDB item, so each message is split across items
+    queue_store = LargeItemPersistenceAdaptor.from_config(queue_store, work_queue.MESSAGE, 'outbound-queue-store')
+    return OutboundWorkQueue.from_config(queue_store)
+
+
+def start_admission_metrics(admission_controller: admission_control.AdmissionController) -> None:
+    """
+    Periodically log how many supplier requests are in flight and how many have been rejected.
+    :param admission_controller: The admission controller to log metrics for.
+    """
+    interval = float(config.get_config('ADMISSION_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(admission_controller.log_metrics, interval * 1000).start()
+
+
+def create_route_warm_up(config_manager: configuration_manager.ConfigurationManager,
+                         workflows: Dict[str, workflow.CommonWorkflow],
+                         transmission: Optional[outbound_transmission.OutboundTransmission]) \
+        -> Optional[route_warm_up.RouteWarmUp]:
+    if not str2bool(config.get_config('OUTBOUND_WARM_UP', default=str(False))):
+        return None
+    logger.info('Routing details will be warmed up before reporting ready')
+    return route_warm_up.RouteWarmUp.from_config(config_manager, workflows, transmission)
+
+
+def start_tornado_server(data_dir: pathlib.Path, server_sockets: List[socket.socket],
+                         workflows: Dict[str, workflow.CommonWorkflow],
+                         client_pools: List[HttpClientPool],
+                         persistence_stores: List[persistence_adaptor.PersistenceAdaptor],
+                         sync_async_notifier: Optional[SyncAsyncNotifier] = None,
+                         outbound_work_queue: Optional[OutboundWorkQueue] = None,
+                         transmission: Optional[outbound_transmission.OutboundTransmission] = None) -> None:
     """
     Start Tornado server
     :param data_dir: The directory to load interactions configuration from.
+    :param server_sockets: The bound sockets to accept supplier requests from.
     :param workflows: The workflows to be used to handle messages.
+    :param client_pools: The HTTP client pools used to make requests, which are closed when the server shuts down.
+    :param persistence_stores: The persistence adaptors used by the workflows, which are closed when the server shuts
+    down.
+    :param sync_async_notifier: The sync-async notifier used by the workflows, if any, which is closed when the server
+    shuts down.
+    :param outbound_work_queue: The outbound work queue used by the workflows, if any, which is started along with the
+    server and closed when the server shuts down.
+    :param transmission: The transmission used to send messages to Spine, which connections are opened with when
+    warming up.
     """
     interactions_config_file = str(data_dir / "interactions" / "interactions.json")
     config_manager = configuration_manager.ConfigurationManager(interactions_config_file)
+    admission_controller = admission_control.AdmissionController.from_config()
+    warm_up = create_route_warm_up(config_manager, workflows, transmission)
 
     # Note that the paths in generate_openapi.py should be updated if these
     # paths are changed
     supplier_application = tornado.web.Application(
         [
-            (r"/", client_request_handler.SynchronousHandler, dict(config_manager=config_manager, workflows=workflows)),
-            (r"/healthcheck", healthcheck_handler.HealthcheckHandler)
+            (r"/", client_request_handler.SynchronousHandler,
+             dict(config_manager=config_manager, workflows=workflows, admission_controller=admission_controller)),
+            (r"/batch", batch_request_handler.BatchHandler,
+             dict(config_manager=config_manager, workflows=workflows, admission_controller=admission_controller,
+                  max_batch_size=int(config.get_config('BATCH_MAX_SIZE',
+                                                       default=str(batch_request_handler.DEFAULT_MAX_BATCH_SIZE))),
+                  max_parallelism=int(config.get_config('BATCH_MAX_PARALLELISM',
+                                                        default=str(batch_request_handler.DEFAULT_MAX_PARALLELISM))))),
+            (r"/messages/([^/]+)/response", response_request_handler.ResponseHandler,
+             dict(config_manager=config_manager, workflows=workflows,
+                  max_wait=float(config.get_config('ASYNC_RESPONSE_MAX_WAIT', default='20')))),
+            (r"/healthcheck", healthcheck_handler.HealthcheckHandler),
+            (r"/readiness", readiness_handler.ReadinessHandler,
+             dict(is_ready=warm_up.is_warm if warm_up else lambda: True))
         ])
     supplier_server = tornado.httpserver.HTTPServer(supplier_application)
-    server_port = int(config.get_config('OUTBOUND_SERVER_PORT', default='80'))
-    supplier_server.listen(server_port)
+    supplier_server.add_sockets(server_sockets)
 
-    logger.info('Starting outbound server at port {server_port}', fparams={'server_port': server_port})
+    logger.info('Starting outbound server')
+    start_http_client_pool_metrics(client_pools)
+    start_admission_metrics(admission_controller)
     tornado_io_loop = tornado.ioloop.IOLoop.current()
+    if outbound_work_queue:
+        outbound_work_queue.start()
+    if warm_up:
+        warm_up.start()
     try:
         tornado_io_loop.start()
     except KeyboardInterrupt:
         logger.warning('Keyboard interrupt')
         pass
     finally:
+        if warm_up:
+            warm_up.stop()
+        for client_pool in client_pools:
+            client_pool.close()
+        if outbound_work_queue:
+            tornado_io_loop.run_sync(outbound_work_queue.close)
+            tornado_io_loop.run_sync(outbound_work_queue.store.close)
+        if sync_async_notifier:
+            tornado_io_loop.run_sync(sync_async_notifier.close)
+        for persistence_store in persistence_stores:
+            tornado_io_loop.run_sync(persistence_store.close)
         tornado_io_loop.stop()
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
@@ -130,8 +283,14 @@ def main():
     data_dir = pathlib.Path(definitions.ROOT_DIR) / "data"
 
     configure_http_client()
+    pystache_message_builder.use_compiled_templates(
+        str2bool(config.get_config('COMPILED_TEMPLATES', default=str(False))))
+    envelope.preload_templates()
 
-    routing = initialise_routing()
+    spine_client_pool = HttpClientPool.from_config('spine')
+    route_lookup_client_pool = HttpClientPool.from_config('route-lookup')
+    route_lookup_cache = create_route_cache()
+    routing = initialise_routing(route_lookup_client_pool, route_lookup_cache)
 
     certificates = certs.Certs.create_certs_files(data_dir / '..',
                                                   private_key=secrets.get_secret_config('CLIENT_KEY'),
@@ -147,24 +306,45 @@ def main():
     transmission = outbound_transmission.OutboundTransmission(certificates.local_cert_path,
                                                               certificates.private_key_path, certificates.ca_certs_path,
                                                               max_retries, retry_delay, validate_cert, http_proxy_host,
-                                                              http_proxy_port)
+                                                              http_proxy_port,
+                                                              client_pool=spine_client_pool)
 
     party_key = secrets.get_secret_config('PARTY_KEY')
 
+    # The socket is bound before any worker processes are forked so that they all accept requests from it. The
+    # persistence adaptors and everything else holding connections are then created separately by each worker
+    server_port = int(config.get_config('OUTBOUND_SERVER_PORT', default='80'))
+    server_sockets = tornado.netutil.bind_sockets(server_port)
+    logger.info('Bound outbound server to port {server_port}', fparams={'server_port': server_port})
+    worker_processes.start_worker_processes(worker_processes.get_worker_process_count())
+
     work_description_store = get_persistence_adaptor(
         table_name=config.get_config('STATE_TABLE_NAME'),
         max_retries=int(config.get_config('STATE_STORE_MAX_RETRIES', default='3')),
         retry_delay=int(config.get_config('STATE_STORE_RETRY_DELAY', default='100')) / 1000)
+    if str2bool(config.get_config('STATE_STORE_WRITE_BEHIND', default=str(False))):
+        work_description_store = BufferedPersistenceAdaptor.from_config(work_description_store, 'state-store')
 
     sync_async_store = get_persistence_adaptor(
         table_name=config.get_config('SYNC_ASYNC_STATE_TABLE_NAME'),
         max_retries=int(config.get_config('SYNC_ASYNC_STORE_MAX_RETRIES', default='3')),
         retry_delay=int(config.get_config('SYNC_ASYNC_STORE_RETRY_DELAY', default='100')) / 1000)
 
+    sync_async_notifier = get_sync_async_notifier(config.get_config('SYNC_ASYNC_NOTIFIER', default=None),
+                                                  sync_async_store, outbound=True)
+    sync_async_store = LargeItemPersistenceAdaptor.from_config(sync_async_store, sync_async.MESSAGE_DATA,
+                                                               'sync-async-store')
+
+    outbound_work_queue = initialise_outbound_work_queue()
+
     max_request_size = int(config.get_config('SPINE_REQUEST_MAX_SIZE'))
     workflows = initialise_workflows(transmission, party_key, work_description_store, sync_async_store,
-                                     max_request_size, routing)
-    start_tornado_server(data_dir, workflows)
+                                     max_request_size, routing, sync_async_notifier, outbound_work_queue)
+    if route_lookup_cache:
+        start_route_cache_metrics(route_lookup_cache)
+    start_tornado_server(data_dir, server_sockets, workflows, [spine_client_pool, route_lookup_client_pool],
+                         [work_description_store, sync_async_store], sync_async_notifier, outbound_work_queue,
+                         transmission)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""This module defines the admission control applied to requests made to the outbound service by supplier systems."""
+from collections import defaultdict
+from typing import Dict, Optional, Union
+
+import tornado.web
+
+import utilities.config as config
+from utilities import integration_adaptors_logger as log
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_RETRY_AFTER = 1
+
+
+class RequestRejectedError(tornado.web.HTTPError):
+    """Raised when a request is not admitted because the outbound service is at one of its limits."""
+
+    def __init__(self, reason: str, retry_after: int):
+        """
+        :param reason: Which limit the request was rejected by.
+        :param retry_after: The time (in seconds) after which the supplier system should try the request again.
+        """
+        super().__init__(503, reason, reason=reason)
+        self.retry_after = retry_after
+
+
+class AdmissionController(object):
+    """Limits the number of supplier requests, and the total size of their bodies, in flight at once, both across all
+    interactions and for each interaction.
+
+    A request over any of the limits is rejected straight away rather than waiting, so that when the service is
+    overloaded some requests fail quickly instead of every request slowing until it times out. Limits that are None
+    are not applied. The number of requests in flight, the deepest this has been and the number of requests rejected
+    are logged and reported by `get_metrics`.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None, max_bytes: Optional[int] = None,
+                 max_interaction_requests: Optional[int] = None, max_interaction_bytes: Optional[int] = None,
+                 retry_after: int = DEFAULT_RETRY_AFTER):
+        """
+        :param max_requests: The maximum number of requests in flight across all interactions.
+        :param max_bytes: The maximum total size (in bytes) of the bodies of the requests in flight across all
+        interactions.
+        :param max_interaction_requests: The maximum number of requests in flight for any one interaction.
+        :param max_interaction_bytes: The maximum total size (in bytes) of the bodies of the requests in flight for any
+        one interaction.
+        :param retry_after: The time (in seconds) a rejected supplier system is told to wait before trying again.
+        """
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.max_interaction_requests = max_interaction_requests
+        self.max_interaction_bytes = max_interaction_bytes
+        self.retry_after = retry_after
+
+        self._in_flight = 0
+        self._in_flight_bytes = 0
+        self._interaction_in_flight: Dict[str, int] = defaultdict(int)
+        self._interaction_in_flight_bytes: Dict[str, int] = defaultdict(int)
+        self._max_in_flight = 0
+        self._admitted_total = 0
+        self._rejected_total = 0
+
+    @classmethod
+    def from_config(cls) -> 'AdmissionController':
+        """Create a new AdmissionController configured from the `OUTBOUND_MAX_*` config values.
+
+        :return: A new AdmissionController.
+        """
+        return cls(max_requests=_optional_int_config('OUTBOUND_MAX_IN_FLIGHT_REQUESTS'),
+                   max_bytes=_optional_int_config('OUTBOUND_MAX_IN_FLIGHT_BYTES'),
+                   max_interaction_requests=_optional_int_config('OUTBOUND_MAX_INTERACTION_IN_FLIGHT_REQUESTS'),
+                   max_interaction_bytes=_optional_int_config('OUTBOUND_MAX_INTERACTION_IN_FLIGHT_BYTES'),
+                   retry_after=int(config.get_config('OUTBOUND_RETRY_AFTER', default=str(DEFAULT_RETRY_AFTER))))
+
+    def admit(self, interaction_id: str, size: int) -> None:
+        """Admit a request, counting it as in flight until `release` is called for it.
+
+        :param interaction_id: The interaction the request is for.
+        :param size: The size (in bytes) of the request's body.
+        :raises RequestRejectedError: if admitting the request would go over one of the limits.
+        """
+        reason = self._check_limits(interaction_id, size)
+        if reason:
+            self._rejected_total += 1
+            logger.warning('Rejecting request for {InteractionId} as {Reason}. {InFlight} requests in flight',
+                           fparams={'InteractionId': interaction_id, 'Reason': reason, 'InFlight': self._in_flight})
+            raise RequestRejectedError(reason, self.retry_after)
+
+        self._admitted_total += 1
+        self._in_flight += 1
+        self._in_flight_bytes += size
+        self._interaction_in_flight[interaction_id] += 1
+        self._interaction_in_flight_bytes[interaction_id] += size
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def release(self, interaction_id: str, size: int) -> None:
+        """Stop counting an admitted request as in flight.
+
+        :param interaction_id: The interaction the request is for.
+        :param size: The size (in bytes) of the request's body.
+        """
+        self._in_flight -= 1
+        self._in_flight_bytes -= size
+        self._interaction_in_flight[interaction_id] -= 1
+        self._interaction_in_flight_bytes[interaction_id] -= size
+        if not self._interaction_in_flight[interaction_id]:
+            del self._interaction_in_flight[interaction_id]
+            del self._interaction_in_flight_bytes[interaction_id]
+
+    def get_metrics(self) -> Dict[str, Union[int, Dict[str, int]]]:
+        """Get the current metrics for admission control.
+
+        :return: A dictionary of the number and total size of requests in flight, the number in flight for each
+        interaction, the maximum number that have been in flight, and the total number of requests admitted and
+        rejected.
+        """
+        return {
+            'in_flight': self._in_flight,
+            'in_flight_bytes': self._in_flight_bytes,
+            'interaction_in_flight': dict(self._interaction_in_flight),
+            'max_in_flight': self._max_in_flight,
+            'admitted_total': self._admitted_total,
+            'rejected_total': self._rejected_total
+        }
+
+    def log_metrics(self) -> None:
+        """Log the current metrics for admission control."""
+        logger.info('Outbound service has {in_flight} requests in flight ({in_flight_bytes} bytes, max '
+                    '{max_in_flight} requests). By interaction {interaction_in_flight}. {admitted_total} requests '
+                    'admitted, {rejected_total} rejected', fparams=self.get_metrics())
+
+    def _check_limits(self, interaction_id: str, size: int) -> Optional[str]:
+        interaction_in_flight = self._interaction_in_flight.get(interaction_id, 0)
+        interaction_in_flight_bytes = self._interaction_in_flight_bytes.get(interaction_id, 0)
+
+        if self.max_requests is not None and self._in_flight >= self.max_requests:
+            return 'too many requests are in flight'
+        if self.max_interaction_requests is not None and interaction_in_flight >= self.max_interaction_requests:
+            return 'too many requests for this interaction are in flight'
+        # A request larger than a byte limit is still admitted when nothing else is in flight, so that it is not
+        # rejected however long the supplier system waits
+        if self.max_bytes is not None and self._in_flight and self._in_flight_bytes + size > self.max_bytes:
+            return 'too many request bytes are in flight'
+        if self.max_interaction_bytes is not None and interaction_in_flight \
+                and interaction_in_flight_bytes + size > self.max_interaction_bytes:
+            return 'too many request bytes for this interaction are in flight'
+        return None
+
+
+def _optional_int_config(key: str) -> Optional[int]:
+    value = config.get_config(key, default=None)
+    return int(value) if value else None
@@ -0,0 +1 @@
+"""Modules related to the handling of batches of requests from a supplier system."""
@@ -0,0 +1,181 @@
+"""This module defines the outbound batch request handler component."""
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import marshmallow
+import mhs_common.workflow as workflow
+import tornado.web
+
+from comms.http_headers import HttpHeaders
+from mhs_common.configuration import configuration_manager
+from outbound.request import admission_control, request_body_schema
+from outbound.request.synchronous import handler as synchronous_handler
+from utilities import integration_adaptors_logger as log, mdc, message_utilities, timing
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_PARALLELISM = 10
+
+
+class BatchHandler(synchronous_handler.SynchronousHandler):
+    """A Tornado request handler that sends a batch of messages from a supplier system in a single request, returning
+    the outcome of each message in one multi-status response."""
+
+    def initialize(self, workflows: Dict[str, workflow.CommonWorkflow],
+                   config_manager: configuration_manager.ConfigurationManager,
+                   admission_controller: Optional[admission_control.AdmissionController] = None,
+                   max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_parallelism: int = DEFAULT_MAX_PARALLELISM):
+        """Initialise this request handler with the provided dependencies.
+
+        :param workflows: The workflows to use to send messages.
+        :param config_manager: The object that can be used to obtain configuration details.
+        :param admission_controller: The admission controller that limits the messages in flight. If None, messages
+        are not limited.
+        :param max_batch_size: The maximum number of messages in a batch.
+        :param max_parallelism: The maximum number of messages from a batch that are sent at once.
+        """
+        super().initialize(workflows, config_manager, admission_controller)
+        self.max_batch_size = max_batch_size
+        self.max_parallelism = max_parallelism
+
+    @timing.time_request
+    async def post(self):
+        """
+        ---
+        summary: Make a batch of requests to the MHS
+        description: >-
+          Send a batch of messages, each of which is handled as if it had been
+          sent in its own request to POST /, with the values of that request's
+          headers given alongside each payload. The outcome of each message is
+          returned in the same order as the messages in the batch.
+        operationId: postMHSBatch
+        parameters:
+          - name: Correlation-Id
+            in: header
+            required: false
+            schema:
+              type: string
+            description: Correlation ID that is used when logging the batch as a whole.
+        responses:
+          207:
+            description: >-
+              The outcome of each message. Each has the status code, body and
+              headers that would have been returned for the message if it had
+              been sent in its own request.
+            content:
+              application/json: {}
+          400:
+            description: The batch is invalid or holds too many messages.
+        requestBody:
+          required: true
+          content:
+            application/json:
+              schema:
+                $ref: '#/definitions/BatchRequestBody'
+          description: The messages to be sent to Spine.
+        """
+        correlation_id = self._extract_correlation()
+        mdc.correlation_id.set(correlation_id)
+        messages = self._parse_batch_body()
+        logger.info('Outbound batch POST received with {MessageCount} messages',
+                    fparams={'MessageCount': len(messages)})
+
+        parallelism = asyncio.Semaphore(self.max_parallelism)
+        results = await asyncio.gather(*(self._send_message(message, parallelism) for message in messages))
+
+        logger.info('Returning batch response with {HttpStatus}', fparams={'HttpStatus': 207})
+        self.set_status(207)
+        self.set_header(HttpHeaders.CONTENT_TYPE, 'application/json')
+        self.set_header(HttpHeaders.CORRELATION_ID, correlation_id)
+        self.write(json.dumps({'responses': results}))
+
+    def _parse_batch_body(self) -> List[request_body_schema.BatchRequestItem]:
+        content_type = self.request.headers.get(HttpHeaders.CONTENT_TYPE, None)
+        if content_type != 'application/json':
+            logger.error('Unsupported content type in batch request. {ExpectedContentType} {ActualContentType}',
+                         fparams={'ExpectedContentType': 'application/json', 'ActualContentType': content_type})
+            raise tornado.web.HTTPError(415,
+                                        'Unsupported content type. Only application/json request bodies are supported.',
+                                        reason='Unsupported content type. Only application/json request bodies are '
+                                               'supported.')
+        try:
+            messages = request_body_schema.BatchRequestBodySchema().loads(self.request.body.decode())['messages']
+        except json.JSONDecodeError as e:
+            logger.error('Invalid JSON batch request body')
+            raise tornado.web.HTTPError(400, 'Invalid JSON request body', reason='Invalid JSON request body') from e
+        except marshmallow.ValidationError as e:
+            validation_errors = str(e.messages)
+            logger.error('Invalid batch request. {ValidationErrors}', fparams={'ValidationErrors': validation_errors})
+            raise tornado.web.HTTPError(400, f'Invalid request. Validation errors: {validation_errors}',
+                                        reason=f'Invalid request. Validation errors: {validation_errors}') from e
+
+        if len(messages) > self.max_batch_size:
+            logger.error('Batch request is too large. {MessageCount} {MaxBatchSize}',
+                         fparams={'MessageCount': len(messages), 'MaxBatchSize': self.max_batch_size})
+            raise tornado.web.HTTPError(400, f'Batch is too large. MaxBatchSize={self.max_batch_size}',
+                                        reason=f'Batch is too large. MaxBatchSize={self.max_batch_size}')
+        return messages
+
+    async def _send_message(self, message: request_body_schema.BatchRequestItem,
+                            parallelism: asyncio.Semaphore) -> dict:
+        # Each message is sent in its own task, so the logging context set here only applies to this message
+        message_id = message.message_id or message_utilities.get_uuid()
+        correlation_id = message.correlation_id or message_utilities.get_uuid()
+        mdc.message_id.set(message_id)
+        mdc.correlation_id.set(correlation_id)
+        mdc.interaction_id.set(message.interaction_id)
+
+        request_size = len(message.payload)
+        headers = {HttpHeaders.MESSAGE_ID: message_id, HttpHeaders.CORRELATION_ID: correlation_id}
+        async with parallelism:
+            try:
+                if self.admission_controller:
+                    self.admission_controller.admit(message.interaction_id, request_size)
+                try:
+                    status, response = await self._invoke_workflow(message, message_id, correlation_id)
+                finally:
+                    if self.admission_controller:
+                        self.admission_controller.release(message.interaction_id, request_size)
+            except admission_control.RequestRejectedError as e:
+                status, response = e.status_code, e.log_message
+                headers[HttpHeaders.RETRY_AFTER] = str(e.retry_after)
+            except tornado.web.HTTPError as e:
+                status, response = e.status_code, e.log_message
+            except Exception:
+                logger.exception('Failed to send message from batch')
+                status, response = 500, 'Error sending message'
+
+        logger.info('Message from batch completed with {HttpStatus}', fparams={'HttpStatus': status})
+        headers[HttpHeaders.CONTENT_TYPE] = 'text/plain' if status >= 400 else 'text/xml'
+        return {'status': status, 'headers': headers, 'body': response}
+
+    async def _invoke_workflow(self, message: request_body_schema.BatchRequestItem, message_id: str,
+                               correlation_id: str):
+        interaction_details = self._retrieve_interaction_details(message.interaction_id)
+        wf = self._extract_default_workflow(interaction_details, message.interaction_id)
+        self._extend_interaction_details(wf, interaction_details)
+
+        interaction_details['ods-code'] = message.ods_code
+        sync_async_interaction_config = self._extract_sync_async_from_interaction_details(interaction_details)
+
+        if self._should_invoke_sync_async_workflow(sync_async_interaction_config, message.wait_for_response):
+            sync_async_workflow: workflow.SyncAsyncWorkflow = self.workflows[workflow.SYNC_ASYNC]
+            status, response, wdo = await sync_async_workflow.handle_sync_async_outbound_message(
+                message.from_asid, message_id, correlation_id, interaction_details, message.payload, wf)
+            response_workflow = sync_async_workflow
+        elif self._should_store_response(sync_async_interaction_config, message.store_response):
+            sync_async_workflow: workflow.SyncAsyncWorkflow = self.workflows[workflow.SYNC_ASYNC]
+            status, response, wdo = await sync_async_workflow.submit_sync_async_outbound_message(
+                message.from_asid, message_id, correlation_id, interaction_details, message.payload, wf)
+            response_workflow = wf
+        else:
+            status, response, wdo = await wf.handle_outbound_message(message.from_asid, message_id, correlation_id,
+                                                                     interaction_details, message.payload, None)
+            response_workflow = wf
+
+        # The response is returned along with the rest of the batch, so is treated as returned once it is ready
+        if wdo:
+            await response_workflow.set_successful_message_response(wdo)
+        return status, response
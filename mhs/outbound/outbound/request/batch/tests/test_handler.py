@@ -0,0 +1,149 @@
+import asyncio
+import json
+import unittest.mock
+
+import tornado.testing
+import tornado.web
+
+from outbound.request import admission_control
+from outbound.request.batch import handler
+from utilities import mdc, test_utilities
+
+INTERACTION_NAME = 'interaction'
+WORKFLOW_NAME = 'workflow name'
+SYNC_ASYNC_WORKFLOW = 'sync-async'
+INTERACTION_DETAILS = {'workflow': WORKFLOW_NAME, 'sync_async': True}
+CORRELATION_ID = '12345'
+
+
+def build_message(message_id: str, payload: str = 'A request', **kwargs) -> dict:
+    message = {'interaction-id': INTERACTION_NAME, 'message-id': message_id, 'correlation-id': CORRELATION_ID,
+               'payload': payload}
+    message.update(kwargs)
+    return message
+
+
+class TestBatchHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.workflow = unittest.mock.Mock()
+        self.workflow.workflow_specific_interaction_details = dict()
+        self.sync_async_workflow = unittest.mock.MagicMock()
+        self.config_manager = unittest.mock.Mock()
+        self.config_manager.get_interaction_details.side_effect = \
+            lambda interaction_id: dict(INTERACTION_DETAILS) if interaction_id == INTERACTION_NAME else None
+        self.admission_controller = admission_control.AdmissionController()
+        return tornado.web.Application([
+            (r"/batch", handler.BatchHandler,
+             dict(config_manager=self.config_manager, admission_controller=self.admission_controller,
+                  workflows={WORKFLOW_NAME: self.workflow, SYNC_ASYNC_WORKFLOW: self.sync_async_workflow},
+                  max_batch_size=3, max_parallelism=2))
+        ])
+
+    def tearDown(self):
+        mdc.message_id.set(None)
+        mdc.correlation_id.set(None)
+        mdc.interaction_id.set(None)
+
+    def call_handler(self, messages, content_type='application/json') -> tornado.httpclient.HTTPResponse:
+        return self.fetch('/batch', method='POST',
+                          headers={'Content-Type': content_type, 'Correlation-Id': CORRELATION_ID},
+                          body=json.dumps({'messages': messages}))
+
+    def test_post_batch(self):
+        self.workflow.handle_outbound_message.side_effect = \
+            lambda from_asid, message_id, *args: test_utilities.awaitable((202, message_id, None))
+
+        response = self.call_handler([build_message('1', **{'from-asid': 'asid'}),
+                                      build_message('2'),
+                                      build_message('3', **{'interaction-id': 'unknown'})])
+
+        self.assertEqual(response.code, 207)
+        self.assertEqual(response.headers['Content-Type'], 'application/json')
+        self.assertEqual(response.headers['Correlation-Id'], CORRELATION_ID)
+        responses = json.loads(response.body.decode())['responses']
+        self.assertEqual([202, 202, 404], [item['status'] for item in responses])
+        self.assertEqual(['1', '2'], [item['body'] for item in responses[:2]])
+        self.assertEqual({'Message-Id': '1', 'Correlation-Id': CORRELATION_ID, 'Content-Type': 'text/xml'},
+                         responses[0]['headers'])
+        self.assertEqual('Unknown interaction ID: unknown', responses[2]['body'])
+        self.assertEqual(2, self.workflow.handle_outbound_message.call_count)
+        self.workflow.handle_outbound_message.assert_any_call('asid', '1', CORRELATION_ID, unittest.mock.ANY,
+                                                              'A request', None)
+
+    def test_post_batch_limits_parallelism(self):
+        in_flight = []
+        max_in_flight = []
+
+        async def handle_outbound_message(*args):
+            in_flight.append(None)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return 202, '', None
+
+        self.workflow.handle_outbound_message.side_effect = handle_outbound_message
+
+        response = self.call_handler([build_message(str(i)) for i in range(3)])
+
+        self.assertEqual(response.code, 207)
+        self.assertEqual(2, max(max_in_flight))
+
+    def test_post_batch_wait_for_response(self):
+        wdo = unittest.mock.MagicMock()
+        self.sync_async_workflow.handle_sync_async_outbound_message.return_value = \
+            test_utilities.awaitable((200, 'response', wdo))
+        self.sync_async_workflow.set_successful_message_response.return_value = test_utilities.awaitable(None)
+
+        response = self.call_handler([build_message('1', **{'wait-for-response': True})])
+
+        responses = json.loads(response.body.decode())['responses']
+        self.assertEqual(200, responses[0]['status'])
+        self.assertEqual('response', responses[0]['body'])
+        self.sync_async_workflow.set_successful_message_response.assert_called_once_with(wdo)
+        self.workflow.handle_outbound_message.assert_not_called()
+
+    def test_post_batch_workflow_error(self):
+        self.workflow.handle_outbound_message.side_effect = RuntimeError('failed')
+
+        response = self.call_handler([build_message('1')])
+
+        responses = json.loads(response.body.decode())['responses']
+        self.assertEqual(500, responses[0]['status'])
+        self.assertEqual('text/plain', responses[0]['headers']['Content-Type'])
+
+    def test_post_batch_rejected_message(self):
+        self.admission_controller.max_interaction_requests = 1
+        self.admission_controller.admit(INTERACTION_NAME, 10)
+
+        response = self.call_handler([build_message('1')])
+
+        responses = json.loads(response.body.decode())['responses']
+        self.assertEqual(503, responses[0]['status'])
+        self.assertEqual('1', responses[0]['headers']['Retry-After'])
+        self.workflow.handle_outbound_message.assert_not_called()
+
+    def test_post_batch_releases_admitted_messages(self):
+        self.workflow.handle_outbound_message.return_value = test_utilities.awaitable((202, '', None))
+
+        self.call_handler([build_message('1')])
+
+        self.assertEqual(0, self.admission_controller.get_metrics()['in_flight'])
+
+    def test_post_batch_invalid(self):
+        sub_tests = [
+            ('too many messages', [build_message(str(i)) for i in range(4)]),
+            ('no messages', []),
+            ('missing payload', [{'interaction-id': INTERACTION_NAME}])
+        ]
+        for description, messages in sub_tests:
+            with self.subTest(description):
+                response = self.call_handler(messages)
+
+                self.assertEqual(response.code, 400)
+                self.workflow.handle_outbound_message.assert_not_called()
+
+    def test_post_batch_unsupported_content_type(self):
+        response = self.call_handler([build_message('1')], content_type='text/plain')
+
+        self.assertEqual(response.code, 415)
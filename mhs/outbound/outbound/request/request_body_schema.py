@@ -1,5 +1,5 @@
 """
-Schema definition for the request body that MHS accepts. To use this module, simply do:
+Schema definitions for the request bodies that MHS accepts. To use this module, simply do:
 
 .. code-block:: python
 
@@ -11,7 +11,7 @@ Schema definition for the request body that MHS accepts. To use this module, sim
         ... # handle validation errors
 """
 import dataclasses
-from typing import List
+from typing import List, Optional
 
 import marshmallow.validate
 
@@ -82,3 +82,57 @@ class RequestBodySchema(marshmallow.Schema):
     @marshmallow.post_load
     def make_request_body(self, data, **kwargs):
         return RequestBody(data['payload'], data['attachments'])
+
+
+@dataclasses.dataclass
+class BatchRequestItem:
+    """
+    Dataclass representing one message in the batch request body that MHS accepts.
+    `BatchRequestItemSchema` deserialises to this class.
+    """
+    interaction_id: str
+    message_id: Optional[str]
+    correlation_id: Optional[str]
+    from_asid: Optional[str]
+    ods_code: Optional[str]
+    wait_for_response: bool
+    store_response: bool
+    payload: str
+    attachments: List[Attachment]
+
+
+class BatchRequestItemSchema(RequestBodySchema):
+    """Schema for one message in the batch request body that MHS accepts. Each message takes the values that are
+    passed as headers to a single request."""
+    interaction_id = marshmallow.fields.Str(required=True, data_key='interaction-id',
+                                            description='ID of the interaction that you want to invoke. '
+                                                        'e.g. QUPC_IN160101UK05')
+    message_id = marshmallow.fields.Str(missing=None, data_key='message-id',
+                                        description='Message ID of the message to send to Spine. If not sent, the '
+                                                    'MHS generates a random message ID.')
+    correlation_id = marshmallow.fields.Str(missing=None, data_key='correlation-id',
+                                            description='Correlation ID that is used when logging. If not sent, a '
+                                                        'random correlation ID is generated.')
+    from_asid = marshmallow.fields.Str(missing=None, data_key='from-asid',
+                                       description='The ASID of the sending system.')
+    ods_code = marshmallow.fields.Str(missing=None, data_key='ods-code',
+                                      description='ODS Code of the receiving system.')
+    wait_for_response = marshmallow.fields.Bool(missing=False, data_key='wait-for-response',
+                                                description='As the wait-for-response header of a single request.',
+                                                truthy={True}, falsy={False})
+    store_response = marshmallow.fields.Bool(missing=False, data_key='store-response',
+                                             description='As the store-response header of a single request.',
+                                             truthy={True}, falsy={False})
+
+    @marshmallow.post_load
+    def make_request_body(self, data, **kwargs):
+        return BatchRequestItem(data['interaction_id'], data['message_id'], data['correlation_id'],
+                                data['from_asid'], data['ods_code'], data['wait_for_response'],
+                                data['store_response'], data['payload'], data['attachments'])
+
+
+class BatchRequestBodySchema(marshmallow.Schema):
+    """Schema for the batch request body that MHS accepts"""
+    messages = marshmallow.fields.Nested(BatchRequestItemSchema, many=True, required=True,
+                                         description='The messages to send to Spine.',
+                                         validate=marshmallow.validate.Length(min=1))
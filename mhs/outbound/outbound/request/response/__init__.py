@@ -0,0 +1 @@
+"""Modules related to the retrieval of asynchronous responses by a supplier system."""
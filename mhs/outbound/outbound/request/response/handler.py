@@ -0,0 +1,123 @@
+"""This module defines the outbound asynchronous response retrieval request handler component."""
+import math
+from typing import Dict
+
+import mhs_common.workflow as workflow
+import tornado.web
+
+from comms.http_headers import HttpHeaders
+from mhs_common.configuration import configuration_manager
+from mhs_common.handler import base_handler
+from utilities import integration_adaptors_logger as log, mdc, timing
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+WAIT = 'wait'
+
+
+class ResponseHandler(base_handler.BaseHandler):
+    """A Tornado request handler that lets a supplier system fetch the asynchronous response to a message it sent
+    with the store-response header set, waiting for the response to be received if it has not been already."""
+
+    def initialize(self, workflows: Dict[str, workflow.CommonWorkflow],
+                   config_manager: configuration_manager.ConfigurationManager, max_wait: float):
+        """Initialise this request handler with the provided dependencies.
+
+        :param workflows: The workflows to use to send messages.
+        :param config_manager: The object that can be used to obtain configuration details.
+        :param max_wait: The longest time (in seconds) a request waits for a response to be received.
+        """
+        super().initialize(workflows, config_manager)
+        self.max_wait = max_wait
+
+    @timing.time_request
+    async def get(self, message_id: str):
+        """
+        ---
+        summary: Fetch the asynchronous response to a message
+        description: >-
+          Fetch the asynchronous response to a message sent to the MHS with the
+          store-response header set to true. If the response has not been
+          received yet, the request waits for it for up to the given time.
+        operationId: getMHSResponse
+        parameters:
+          - name: message_id
+            in: path
+            required: true
+            schema:
+              type: string
+            description: The Message-Id of the message the response is to.
+          - name: wait
+            in: query
+            required: false
+            schema:
+              type: number
+            description: >-
+              The longest time (in seconds) to wait for the response to be
+              received. Defaults to, and cannot be more than, the maximum wait
+              configured for the MHS.
+          - name: Correlation-Id
+            in: header
+            required: false
+            schema:
+              type: string
+            description: Correlation ID that is used when logging.
+        responses:
+          200:
+            description: The response from Spine.
+            content:
+              text/xml: {}
+          202:
+            description: >-
+              The response has not been received yet. The request can be made
+              again to carry on waiting for it.
+          404:
+            description: No message was sent with the store-response header set to true with this message ID.
+          410:
+            description: >-
+              The response has already been retrieved and is no longer held by
+              the MHS.
+        """
+        mdc.message_id.set(message_id)
+        correlation_id = self._extract_correlation()
+        mdc.correlation_id.set(correlation_id)
+        wait = self._extract_wait()
+        logger.info('Async response GET received. {Request}', fparams={'Request': str(self.request)})
+
+        sync_async_workflow: workflow.SyncAsyncWorkflow = self.workflows[workflow.SYNC_ASYNC]
+        status, response, wdo = await sync_async_workflow.retrieve_sync_async_response(message_id, wait)
+
+        try:
+            if wdo:
+                await sync_async_workflow.set_successful_message_response(wdo)
+            self._write_response(status, response, message_id, correlation_id)
+            if wdo:
+                sync_async_workflow.consume_sync_async_response(message_id)
+        except Exception:
+            logger.exception('Failed to respond to supplier system')
+            if wdo:
+                await sync_async_workflow.set_failure_message_response(wdo)
+
+    def _extract_wait(self) -> float:
+        wait = self.get_query_argument(WAIT, default=None)
+        if wait is None:
+            return self.max_wait
+        try:
+            wait = float(wait)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, 'wait should be a number of seconds',
+                                        reason=f'wait is set to {wait}') from e
+        if not math.isfinite(wait):
+            raise tornado.web.HTTPError(400, 'wait should be a finite number of seconds',
+                                        reason=f'wait is set to {wait}')
+        if wait < 0:
+            raise tornado.web.HTTPError(400, 'wait should not be negative', reason=f'wait is set to {wait}')
+        return min(wait, self.max_wait)
+
+    def _write_response(self, status: int, message: str, message_id: str, correlation_id: str) -> None:
+        logger.info('Returning response with {HttpStatus}', fparams={'HttpStatus': status})
+        self.set_status(status)
+        self.set_header(HttpHeaders.CONTENT_TYPE, 'text/xml' if status == 200 else 'text/plain')
+        self.set_header(HttpHeaders.CORRELATION_ID, correlation_id)
+        self.set_header(HttpHeaders.MESSAGE_ID, message_id)
+        self.write(message)
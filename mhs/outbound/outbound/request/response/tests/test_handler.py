@@ -0,0 +1,90 @@
+import unittest.mock
+
+import tornado.testing
+import tornado.web
+
+from mhs_common import workflow
+from outbound.request.response import handler
+from utilities import mdc, test_utilities
+
+MESSAGE_ID = 'message-id'
+CORRELATION_ID = 'correlation-id'
+RESPONSE = '<response/>'
+
+
+class TestResponseHandler(tornado.testing.AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.sync_async_workflow = unittest.mock.MagicMock()
+        self.sync_async_workflow.set_successful_message_response.return_value = test_utilities.awaitable(None)
+        return tornado.web.Application([
+            (r"/messages/([^/]+)/response", handler.ResponseHandler,
+             dict(config_manager=unittest.mock.Mock(), workflows={workflow.SYNC_ASYNC: self.sync_async_workflow},
+                  max_wait=20))
+        ])
+
+    def tearDown(self):
+        mdc.message_id.set(None)
+        mdc.correlation_id.set(None)
+
+    def call_handler(self, query='') -> tornado.httpclient.HTTPResponse:
+        return self.fetch(f'/messages/{MESSAGE_ID}/response{query}', method='GET',
+                          headers={'Correlation-Id': CORRELATION_ID})
+
+    def test_get_response(self):
+        wdo = unittest.mock.MagicMock()
+        self.sync_async_workflow.retrieve_sync_async_response.return_value = \
+            test_utilities.awaitable((200, RESPONSE, wdo))
+
+        response = self.call_handler()
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(RESPONSE, response.body.decode())
+        self.assertEqual('text/xml', response.headers['Content-Type'])
+        self.assertEqual(MESSAGE_ID, response.headers['Message-Id'])
+        self.assertEqual(CORRELATION_ID, response.headers['Correlation-Id'])
+        self.sync_async_workflow.retrieve_sync_async_response.assert_called_once_with(MESSAGE_ID, 20)
+        self.sync_async_workflow.set_successful_message_response.assert_called_once_with(wdo)
+        self.sync_async_workflow.consume_sync_async_response.assert_called_once_with(MESSAGE_ID)
+
+    def test_get_response_not_received_yet(self):
+        self.sync_async_workflow.retrieve_sync_async_response.return_value = \
+            test_utilities.awaitable((202, 'No async response received yet', None))
+
+        response = self.call_handler('?wait=5')
+
+        self.assertEqual(202, response.code)
+        self.sync_async_workflow.retrieve_sync_async_response.assert_called_once_with(MESSAGE_ID, 5)
+        self.sync_async_workflow.set_successful_message_response.assert_not_called()
+        self.sync_async_workflow.consume_sync_async_response.assert_not_called()
+
+    def test_wait_is_limited_to_max_wait(self):
+        self.sync_async_workflow.retrieve_sync_async_response.return_value = \
+            test_utilities.awaitable((202, 'No async response received yet', None))
+
+        self.call_handler('?wait=60')
+
+        self.sync_async_workflow.retrieve_sync_async_response.assert_called_once_with(MESSAGE_ID, 20)
+
+    def test_invalid_wait(self):
+        response = self.call_handler('?wait=soon')
+
+        self.assertEqual(400, response.code)
+        self.sync_async_workflow.retrieve_sync_async_response.assert_not_called()
+
+    def test_wait_that_is_not_finite(self):
+        for wait in ['nan', 'inf']:
+            with self.subTest(wait=wait):
+                response = self.call_handler(f'?wait={wait}')
+
+                self.assertEqual(400, response.code)
+                self.sync_async_workflow.retrieve_sync_async_response.assert_not_called()
+
+    def test_unknown_message(self):
+        self.sync_async_workflow.retrieve_sync_async_response.return_value = \
+            test_utilities.awaitable((404, 'No sync-async message was sent with message id message-id', None))
+
+        response = self.call_handler()
+
+        self.assertEqual(404, response.code)
+        self.assertEqual('text/plain', response.headers['Content-Type'])
@@ -1,5 +1,6 @@
 """This module defines the outbound synchronous request handler component."""
 import json
+from typing import Any, Dict, Optional
 
 import marshmallow
 import mhs_common.state.work_description as wd
@@ -10,11 +11,12 @@ import tornado.web
 
 from comms.http_headers import HttpHeaders
 from utilities import mdc
+from mhs_common.configuration import configuration_manager
 from mhs_common.handler import base_handler
 from mhs_common.messages import ebxml_envelope
 from utilities import integration_adaptors_logger as log, message_utilities, timing
 
-from outbound.request import request_body_schema
+from outbound.request import admission_control, request_body_schema
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -22,6 +24,19 @@ logger = log.IntegrationAdaptorsLogger(__name__)
 class SynchronousHandler(base_handler.BaseHandler):
     """A Tornado request handler intended to handle incoming HTTP requests from a supplier system."""
 
+    def initialize(self, workflows: Dict[str, workflow.CommonWorkflow],
+                   config_manager: configuration_manager.ConfigurationManager,
+                   admission_controller: Optional[admission_control.AdmissionController] = None):
+        """Initialise this request handler with the provided dependencies.
+
+        :param workflows: The workflows to use to send messages.
+        :param config_manager: The object that can be used to obtain configuration details.
+        :param admission_controller: The admission controller that limits the requests in flight. If None, requests
+        are not limited.
+        """
+        super().initialize(workflows, config_manager)
+        self.admission_controller = admission_controller
+
     @timing.time_request
     async def post(self):
         """
@@ -56,6 +71,20 @@ class SynchronousHandler(base_handler.BaseHandler):
 
               For sync interactions or async interactions that don't support
               sync-async, this header must be set to false.
+          - name: store-response
+            in: header
+            required: false
+            schema:
+              type: string
+              enum: ["true", "false"]
+            description: >-
+              If set to true, wait-for-response is set to false and the
+              interaction ID is for an async interaction that supports
+              sync-async, then the HTTP response will just acknowledge sending
+              the request successfully to Spine. The response from Spine will be
+              held by the MHS, to be fetched with
+              GET /messages/{message_id}/response, and will not be put onto
+              the inbound queue.
           - name: from-asid
             in: header
             required: false
@@ -116,7 +145,14 @@ class SynchronousHandler(base_handler.BaseHandler):
           202:
             description: >-
               Acknowledgement that we successfully sent the message to Spine
-              (response will come asynchronously on the inbound queue).
+              (response will come asynchronously on the inbound queue, or can be
+              fetched from /messages/{message_id}/response if store-response was
+              set to true).
+          503:
+            description: >-
+              The MHS is handling too many requests, or too large requests, to
+              accept this one. The request can be made again after the number of
+              seconds given in the Retry-After header.
         requestBody:
           required: true
           content:
@@ -128,25 +164,42 @@ class SynchronousHandler(base_handler.BaseHandler):
         message_id = self._extract_message_id()
         correlation_id = self._extract_correlation_id()
         interaction_id = self._extract_interaction_id()
-        wait_for_response_header = self._extract_wait_for_response_header()
-        from_asid = self._extract_from_asid()
-        ods_code = self._extract_ods_code()
-
-        logger.info('Outbound POST received. {Request}', fparams={'Request': str(self.request)})
-
-        body = self._parse_body()
+        request_size = len(self.request.body)
+        if self.admission_controller:
+            self.admission_controller.admit(interaction_id, request_size)
 
-        interaction_details = self._retrieve_interaction_details(interaction_id)
-        wf = self._extract_default_workflow(interaction_details, interaction_id)
-        self._extend_interaction_details(wf, interaction_details)
-
-        interaction_details['ods-code'] = ods_code
-        sync_async_interaction_config = self._extract_sync_async_from_interaction_details(interaction_details)
-
-        if self._should_invoke_sync_async_workflow(sync_async_interaction_config, wait_for_response_header):
-            await self._invoke_sync_async(from_asid, message_id, correlation_id, interaction_details, body, wf)
-        else:
-            await self.invoke_default_workflow(from_asid, message_id, correlation_id, interaction_details, body, wf)
+        try:
+            wait_for_response_header = self._extract_wait_for_response_header()
+            store_response_header = self._extract_store_response_header()
+            from_asid = self._extract_from_asid()
+            ods_code = self._extract_ods_code()
+
+            logger.info('Outbound POST received. {Request}', fparams={'Request': str(self.request)})
+
+            body = self._parse_body()
+
+            interaction_details = self._retrieve_interaction_details(interaction_id)
+            wf = self._extract_default_workflow(interaction_details, interaction_id)
+            self._extend_interaction_details(wf, interaction_details)
+
+            interaction_details['ods-code'] = ods_code
+            sync_async_interaction_config = self._extract_sync_async_from_interaction_details(interaction_details)
+
+            if self._should_invoke_sync_async_workflow(sync_async_interaction_config, wait_for_response_header):
+                await self._invoke_sync_async(from_asid, message_id, correlation_id, interaction_details, body, wf)
+            elif self._should_store_response(sync_async_interaction_config, store_response_header):
+                await self._submit_sync_async(from_asid, message_id, correlation_id, interaction_details, body, wf)
+            else:
+                await self.invoke_default_workflow(from_asid, message_id, correlation_id, interaction_details, body, wf)
+        finally:
+            if self.admission_controller:
+                self.admission_controller.release(interaction_id, request_size)
+
+    def write_error(self, status_code: int, **kwargs: Any):
+        exc_info = kwargs.get('exc_info')
+        if exc_info and isinstance(exc_info[1], admission_control.RequestRejectedError):
+            self.set_header(HttpHeaders.RETRY_AFTER, str(exc_info[1].retry_after))
+        super().write_error(status_code, **kwargs)
 
     def _parse_body(self):
         try:
@@ -193,6 +246,16 @@ class SynchronousHandler(base_handler.BaseHandler):
             raise tornado.web.HTTPError(400, 'wait for response should be set to true or false',
                                         reason=f'wait-for-response is set to {wait_for_response_header}')
 
+    def _extract_store_response_header(self):
+        store_response_header = self.request.headers.get(HttpHeaders.STORE_RESPONSE, None)
+        if not store_response_header or store_response_header.lower() == 'false':
+            return False
+        elif store_response_header.lower() == 'true':
+            return True
+        else:
+            raise tornado.web.HTTPError(400, 'store-response should be set to true or false',
+                                        reason=f'store-response is set to {store_response_header}')
+
     def _extract_from_asid(self):
         return self.request.headers.get(HttpHeaders.FROM_ASID, None)
 
@@ -256,6 +319,26 @@ class SynchronousHandler(base_handler.BaseHandler):
         else:
             return False
 
+    def _should_store_response(self, interaction_config, store_response_header):
+        if store_response_header and not interaction_config:
+            logger.error('Message header requested store-response for unsupported sync-async')
+            raise tornado.web.HTTPError(400, 'Message header requested store-response for unsupported sync-async',
+                                        reason='Message header requested store-response for a message pattern '
+                                               'that does not support sync-async')
+        return store_response_header
+
+    async def _submit_sync_async(self, from_asid, message_id, correlation_id, interaction_details, body,
+                                 async_workflow):
+        sync_async_workflow: workflow.SyncAsyncWorkflow = self.workflows[workflow.SYNC_ASYNC]
+        status, response, wdo = await sync_async_workflow.submit_sync_async_outbound_message(from_asid,
+                                                                                             message_id,
+                                                                                             correlation_id,
+                                                                                             interaction_details,
+                                                                                             body,
+                                                                                             async_workflow)
+        await self.write_response_with_store_updates(status, response, wdo, async_workflow, message_id,
+                                                     correlation_id)
+
     async def _invoke_sync_async(self, from_asid, message_id, correlation_id, interaction_details, body, async_workflow):
         sync_async_workflow: workflow.SyncAsyncWorkflow = self.workflows[workflow.SYNC_ASYNC]
         status, response, wdo = await sync_async_workflow.handle_sync_async_outbound_message(from_asid,
@@ -14,6 +14,7 @@ from mhs_common.workflow import synchronous
 from utilities import test_utilities
 from utilities import message_utilities
 
+from outbound.request import admission_control
 from outbound.request.synchronous import handler
 
 MOCK_UUID = "5BB171D4-53B2-4986-90CF-428BE6D157F5"
@@ -448,6 +449,37 @@ class TestSynchronousHandler(BaseHandlerTest):
         self.sync_async_workflow.handle_sync_async_outbound_message.assert_not_called()
         self.workflow.handle_outbound_message.assert_called_once()
 
+    def test_sync_async_response_stored_when_store_response_header_is_true(self):
+        wdo = unittest.mock.MagicMock()
+        self.sync_async_workflow.submit_sync_async_outbound_message.return_value = \
+            test_utilities.awaitable((202, '', wdo))
+        self.workflow.set_successful_message_response.return_value = test_utilities.awaitable(None)
+        self.config_manager.get_interaction_details.return_value = {'sync_async': True, 'workflow': WORKFLOW_NAME}
+
+        response = self.fetch("/", method="POST",
+                              headers={"Content-Type": "application/json", "Interaction-Id": INTERACTION_NAME,
+                                       'wait-for-response': 'false', 'store-response': 'true'},
+                              body=REQUEST_BODY)
+
+        self.assertEqual(202, response.code)
+        self.sync_async_workflow.submit_sync_async_outbound_message.assert_called_once()
+        self.sync_async_workflow.handle_sync_async_outbound_message.assert_not_called()
+        self.workflow.handle_outbound_message.assert_not_called()
+        self.workflow.set_successful_message_response.assert_called_once_with(wdo)
+
+    def test_error_when_store_response_header_is_true_for_unsupported_sync_async(self):
+        self.setup_workflows()
+        self.config_manager.get_interaction_details.return_value = {'sync_async': False, 'workflow': WORKFLOW_NAME}
+
+        response = self.fetch("/", method="POST",
+                              headers={"Content-Type": "application/json", "Interaction-Id": INTERACTION_NAME,
+                                       'wait-for-response': 'false', 'store-response': 'true'},
+                              body=REQUEST_BODY)
+
+        self.assertEqual(400, response.code)
+        self.sync_async_workflow.submit_sync_async_outbound_message.assert_not_called()
+        self.workflow.handle_outbound_message.assert_not_called()
+
     def setup_workflows(self):
         expected_response = "Hello world!"
         wdo = unittest.mock.MagicMock()
@@ -458,6 +490,40 @@ class TestSynchronousHandler(BaseHandlerTest):
         self.workflow.handle_outbound_message.return_value = test_utilities.awaitable((200, "Success"))
 
 
+class TestSynchronousHandlerAdmissionControl(BaseHandlerTest):
+
+    def get_app(self):
+        self.workflow = unittest.mock.Mock()
+        self.workflow.workflow_specific_interaction_details = dict()
+        self.config_manager = unittest.mock.Mock()
+        self.config_manager.get_interaction_details.return_value = INTERACTION_DETAILS
+        self.admission_controller = admission_control.AdmissionController(max_requests=1, retry_after=3)
+        return tornado.web.Application([
+            (r"/", handler.SynchronousHandler,
+             dict(config_manager=self.config_manager, workflows={WORKFLOW_NAME: self.workflow},
+                  admission_controller=self.admission_controller))
+        ])
+
+    def test_post_message_releases_admitted_request(self):
+        self.workflow.handle_outbound_message.return_value = test_utilities.awaitable((202, '', None))
+
+        response = self.call_handler()
+
+        self.assertEqual(response.code, 202)
+        self.assertEqual(0, self.admission_controller.get_metrics()['in_flight'])
+        self.assertEqual(1, self.admission_controller.get_metrics()['admitted_total'])
+
+    def test_post_message_rejected_when_at_limit(self):
+        self.admission_controller.admit(INTERACTION_NAME, 10)
+
+        response = self.call_handler()
+
+        self.assertEqual(response.code, 503)
+        self.assertEqual(response.headers["Retry-After"], "3")
+        self.assertEqual(response.headers["Correlation-Id"], CORRELATION_ID)
+        self.workflow.handle_outbound_message.assert_not_called()
+
+
 class TestSynchronousHandlerRequestBodyValidation(BaseHandlerTest):
 
     def get_app(self):
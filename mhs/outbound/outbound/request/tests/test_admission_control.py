@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+from outbound.request import admission_control
+from outbound.request.admission_control import AdmissionController
+
+INTERACTION_ID = 'interaction'
+OTHER_INTERACTION_ID = 'other-interaction'
+
+
+class TestAdmissionController(TestCase):
+
+    def test_admits_requests_without_limits(self):
+        controller = AdmissionController()
+
+        for _ in range(100):
+            controller.admit(INTERACTION_ID, 1000)
+
+        self.assertEqual(100, controller.get_metrics()['in_flight'])
+
+    def test_rejects_requests_over_global_request_limit(self):
+        controller = AdmissionController(max_requests=2, retry_after=5)
+        controller.admit(INTERACTION_ID, 10)
+        controller.admit(OTHER_INTERACTION_ID, 10)
+
+        with self.assertRaises(admission_control.RequestRejectedError) as e:
+            controller.admit(INTERACTION_ID, 10)
+
+        self.assertEqual(503, e.exception.status_code)
+        self.assertEqual(5, e.exception.retry_after)
+
+    def test_release_allows_further_requests(self):
+        controller = AdmissionController(max_requests=1)
+        controller.admit(INTERACTION_ID, 10)
+        controller.release(INTERACTION_ID, 10)
+
+        controller.admit(INTERACTION_ID, 10)
+
+        self.assertEqual(1, controller.get_metrics()['in_flight'])
+
+    def test_rejects_requests_over_interaction_request_limit(self):
+        controller = AdmissionController(max_interaction_requests=1)
+        controller.admit(INTERACTION_ID, 10)
+
+        with self.assertRaises(admission_control.RequestRejectedError):
+            controller.admit(INTERACTION_ID, 10)
+        controller.admit(OTHER_INTERACTION_ID, 10)
+
+    def test_rejects_requests_over_byte_limits(self):
+        sub_tests = [
+            ('global', AdmissionController(max_bytes=100), OTHER_INTERACTION_ID),
+            ('interaction', AdmissionController(max_interaction_bytes=100), INTERACTION_ID)
+        ]
+        for description, controller, second_interaction_id in sub_tests:
+            with self.subTest(description):
+                controller.admit(INTERACTION_ID, 60)
+
+                with self.assertRaises(admission_control.RequestRejectedError):
+                    controller.admit(second_interaction_id, 50)
+                controller.admit(second_interaction_id, 40)
+
+    def test_admits_large_request_when_nothing_in_flight(self):
+        controller = AdmissionController(max_bytes=100, max_interaction_bytes=100)
+
+        controller.admit(INTERACTION_ID, 1000)
+
+        self.assertEqual(1000, controller.get_metrics()['in_flight_bytes'])
+
+    def test_get_metrics(self):
+        controller = AdmissionController(max_requests=2)
+        controller.admit(INTERACTION_ID, 10)
+        controller.admit(OTHER_INTERACTION_ID, 20)
+        controller.release(OTHER_INTERACTION_ID, 20)
+        controller.admit(INTERACTION_ID, 30)
+        with self.assertRaises(admission_control.RequestRejectedError):
+            controller.admit(INTERACTION_ID, 10)
+
+        self.assertEqual({
+            'in_flight': 2,
+            'in_flight_bytes': 40,
+            'interaction_in_flight': {INTERACTION_ID: 2},
+            'max_in_flight': 2,
+            'admitted_total': 3,
+            'rejected_total': 1
+        }, controller.get_metrics())
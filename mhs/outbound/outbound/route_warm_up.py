@@ -0,0 +1,136 @@
+"""This module defines the component that looks up the routing details of every configured interaction in advance,
+so that they are cached before the first messages are sent."""
+import asyncio
+from typing import Dict, Optional, Set
+
+import mhs_common.workflow as workflow
+import tornado.ioloop
+
+from mhs_common.configuration import configuration_manager
+from mhs_common.messages import ebxml_envelope
+from outbound.transmission import outbound_transmission
+from utilities import config
+from utilities import integration_adaptors_logger as log
+from utilities.string_utilities import str2bool
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_CONCURRENCY = 5
+
+
+class RouteWarmUp:
+    """Looks up the routing and reliability details used by every interaction in the interactions configuration, for
+    the Spine org code, so that they are cached (and connections to the Spine Route Lookup service are open) before
+    the first messages are sent. Optionally, connections are also opened to the endpoints messages will be sent to."""
+
+    def __init__(self, config_manager: configuration_manager.ConfigurationManager,
+                 workflows: Dict[str, workflow.CommonWorkflow],
+                 transmission: Optional[outbound_transmission.OutboundTransmission] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, interval: Optional[float] = None):
+        """Create a new RouteWarmUp.
+
+        :param config_manager: The configuration manager holding the interactions to warm up.
+        :param workflows: The workflows used to send messages, by name.
+        :param transmission: The transmission used to send messages to Spine. If provided, a connection is opened to
+        each endpoint messages will be sent to.
+        :param concurrency: The maximum number of lookups (or connections being opened) at once.
+        :param interval: The interval (in seconds) at which the warm-up is repeated, so that expired routing details
+        are looked up again before messages need them. If None, the warm-up is only done once.
+        """
+        self.config_manager = config_manager
+        self.workflows = workflows
+        self.transmission = transmission
+        self.concurrency = concurrency
+        self.interval = interval
+        self._warm = False
+        self._periodic_callback: Optional[tornado.ioloop.PeriodicCallback] = None
+
+    @classmethod
+    def from_config(cls, config_manager: configuration_manager.ConfigurationManager,
+                    workflows: Dict[str, workflow.CommonWorkflow],
+                    transmission: outbound_transmission.OutboundTransmission) -> 'RouteWarmUp':
+        """Create a new RouteWarmUp configured from the `OUTBOUND_WARM_UP_*` config values.
+
+        :param config_manager: The configuration manager holding the interactions to warm up.
+        :param workflows: The workflows used to send messages, by name.
+        :param transmission: The transmission used to send messages to Spine.
+        :return: A new RouteWarmUp.
+        """
+        interval = config.get_config('OUTBOUND_WARM_UP_INTERVAL', default=None)
+        open_connections = str2bool(config.get_config('OUTBOUND_WARM_UP_SPINE_CONNECTIONS', default=str(False)))
+        return cls(config_manager, workflows,
+                   transmission=transmission if open_connections else None,
+                   concurrency=int(config.get_config('OUTBOUND_WARM_UP_CONCURRENCY',
+                                                     default=str(DEFAULT_CONCURRENCY))),
+                   interval=float(interval) if interval else None)
+
+    def is_warm(self) -> bool:
+        """Whether the first warm-up has completed.
+
+        :return: True once every interaction has been warmed up (or failed to be) at least once.
+        """
+        return self._warm
+
+    def start(self) -> None:
+        """Start warming up in the background, repeating every `interval` seconds if an interval has been given."""
+        tornado.ioloop.IOLoop.current().spawn_callback(self._initial_warm_up)
+        if self.interval:
+            self._periodic_callback = tornado.ioloop.PeriodicCallback(self.warm_up, self.interval * 1000)
+            self._periodic_callback.start()
+
+    def stop(self) -> None:
+        """Stop repeating the warm-up."""
+        if self._periodic_callback:
+            self._periodic_callback.stop()
+            self._periodic_callback = None
+
+    async def warm_up(self) -> None:
+        """Look up the routing details of every configured interaction, then open connections to their endpoints if a
+        transmission was provided. Failures are logged and do not stop the other interactions being warmed up."""
+        logger.info('Warming up routing details for {InteractionCount} interactions',
+                    fparams={'InteractionCount': len(self.config_manager.interactions)})
+        limit = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._prefetch_routing_details(interaction_id, limit)
+                                         for interaction_id in self.config_manager.interactions),
+                                       return_exceptions=True)
+        urls: Set[str] = {result for result in results if isinstance(result, str)}
+        failed = sum(1 for result in results if isinstance(result, Exception))
+
+        if self.transmission:
+            await asyncio.gather(*(self._open_connection(url, limit) for url in urls))
+
+        logger.info('Warmed up routing details for {InteractionCount} interactions with {EndpointCount} endpoints. '
+                    '{FailedCount} failed',
+                    fparams={'InteractionCount': len(results), 'EndpointCount': len(urls), 'FailedCount': failed})
+
+    async def _initial_warm_up(self) -> None:
+        try:
+            await self.warm_up()
+        except Exception:
+            logger.exception('Failed to warm up routing details')
+        finally:
+            self._warm = True
+
+    async def _prefetch_routing_details(self, interaction_id: str, limit: asyncio.Semaphore) -> Optional[str]:
+        interaction_details = self.config_manager.get_interaction_details(interaction_id)
+        wf = self.workflows.get(interaction_details.get('workflow'))
+        if wf is None:
+            logger.warning('Not warming up routing details for {InteractionId} as it has no known workflow',
+                           fparams={'InteractionId': interaction_id})
+            return None
+
+        interaction_details[ebxml_envelope.ACTION] = interaction_id
+        async with limit:
+            try:
+                return await wf.prefetch_routing_details(interaction_details)
+            except Exception:
+                logger.warning('Failed to warm up routing details for {InteractionId}',
+                               fparams={'InteractionId': interaction_id}, exc_info=True)
+                raise
+
+    async def _open_connection(self, url: str, limit: asyncio.Semaphore) -> None:
+        async with limit:
+            try:
+                await self.transmission.open_connection(url)
+            except Exception:
+                logger.warning('Failed to open connection to {url}', fparams={'url': url}, exc_info=True)
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from utilities import test_utilities
+
+from outbound import route_warm_up
+
+SYNC_WORKFLOW = 'sync'
+RELIABLE_WORKFLOW = 'async-reliable'
+INTERACTIONS = {
+    'QUPA_IN040000UK32': {'service': 'urn:nhs:names:services:pdsquery', 'workflow': SYNC_WORKFLOW},
+    'REPC_IN150016UK05': {'service': 'urn:nhs:names:services:psis', 'workflow': RELIABLE_WORKFLOW},
+    'PORX_IN080101UK31': {'service': 'urn:nhs:names:services:mm', 'workflow': RELIABLE_WORKFLOW},
+    'UNKNOWN_WORKFLOW': {'service': 'urn:nhs:names:services:other', 'workflow': 'unknown'}
+}
+SYNC_URL = 'https://sync.example.com'
+RELIABLE_URL = 'https://reliable.example.com'
+
+
+class FakeWorkflow:
+    def __init__(self, url):
+        self.url = url
+        self.prefetched = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.error = None
+
+    async def prefetch_routing_details(self, interaction_details):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.prefetched.append(interaction_details)
+        if self.error:
+            raise self.error
+        return self.url
+
+
+class TestRouteWarmUp(unittest.TestCase):
+
+    def setUp(self):
+        self.config_manager = mock.Mock()
+        self.config_manager.interactions = INTERACTIONS
+        self.config_manager.get_interaction_details.side_effect = lambda name: dict(INTERACTIONS[name])
+        self.sync_workflow = FakeWorkflow(SYNC_URL)
+        self.reliable_workflow = FakeWorkflow(RELIABLE_URL)
+        self.workflows = {SYNC_WORKFLOW: self.sync_workflow, RELIABLE_WORKFLOW: self.reliable_workflow}
+        self.transmission = mock.Mock()
+        self.transmission.open_connection.side_effect = lambda url: test_utilities.awaitable(None)
+
+    @test_utilities.async_test
+    async def test_warm_up_prefetches_routing_details_of_every_interaction(self):
+        warm_up = route_warm_up.RouteWarmUp(self.config_manager, self.workflows)
+
+        await warm_up.warm_up()
+
+        self.assertEqual([{'service': 'urn:nhs:names:services:pdsquery', 'workflow': SYNC_WORKFLOW,
+                           'action': 'QUPA_IN040000UK32'}], self.sync_workflow.prefetched)
+        self.assertEqual({'REPC_IN150016UK05', 'PORX_IN080101UK31'},
+                         {details['action'] for details in self.reliable_workflow.prefetched})
+
+    @test_utilities.async_test
+    async def test_warm_up_limits_concurrency(self):
+        warm_up = route_warm_up.RouteWarmUp(self.config_manager, self.workflows, concurrency=1)
+
+        await warm_up.warm_up()
+
+        self.assertEqual(1, self.reliable_workflow.max_in_flight)
+
+    @test_utilities.async_test
+    async def test_warm_up_opens_connection_to_each_endpoint(self):
+        warm_up = route_warm_up.RouteWarmUp(self.config_manager, self.workflows, transmission=self.transmission)
+
+        await warm_up.warm_up()
+
+        self.assertEqual({SYNC_URL, RELIABLE_URL},
+                         {call[0][0] for call in self.transmission.open_connection.call_args_list})
+        self.assertEqual(2, self.transmission.open_connection.call_count)
+
+    @test_utilities.async_test
+    async def test_warm_up_continues_after_failures(self):
+        self.sync_workflow.error = IOError('Lookup failed')
+        self.transmission.open_connection.side_effect = IOError('Connection failed')
+        warm_up = route_warm_up.RouteWarmUp(self.config_manager, self.workflows, transmission=self.transmission)
+
+        await warm_up.warm_up()
+
+        self.assertEqual(2, len(self.reliable_workflow.prefetched))
+        self.transmission.open_connection.assert_called_once_with(RELIABLE_URL)
+
+    @test_utilities.async_test
+    async def test_is_warm_once_initial_warm_up_completes(self):
+        warm_up = route_warm_up.RouteWarmUp(self.config_manager, self.workflows)
+
+        warm_up.start()
+        self.assertFalse(warm_up.is_warm())
+
+        while not warm_up.is_warm():
+            await asyncio.sleep(0.01)
+        self.assertEqual(2, len(self.reliable_workflow.prefetched))
+        warm_up.stop()
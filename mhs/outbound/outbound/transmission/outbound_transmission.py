@@ -4,6 +4,7 @@ from ssl import SSLError
 from typing import Dict
 
 from comms.common_https import CommonHttps
+from comms.http_client_pool import HttpClientPool
 from retry import retriable_action
 from mhs_common.transmission import transmission_adaptor
 from tornado import httpclient
@@ -25,7 +26,8 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
     """A component that sends HTTP requests to a remote MHS."""
 
     def __init__(self, client_cert: str, client_key: str, ca_certs: str, max_retries: int,
-                 retry_delay: int, validate_cert: bool, http_proxy_host: str = None, http_proxy_port: int = None):
+                 retry_delay: int, validate_cert: bool, http_proxy_host: str = None, http_proxy_port: int = None,
+                 client_pool: HttpClientPool = None):
         """Create a new OutboundTransmission that loads certificates from the specified directory.
 
         :param client_cert: A string containing the filepath of the client certificate file.
@@ -35,6 +37,8 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
         :param retry_delay: An integer representing the delay (in milliseconds) to use between retry attempts.
         :param http_proxy_host The hostname of the HTTP proxy to be used.
         :param http_proxy_port The port of the HTTP proxy to be used.
+        :param client_pool: The HTTP client pool to send requests to Spine from. If not provided, the shared
+        `AsyncHTTPClient` is used.
         """
         self._client_cert = client_cert
         self._client_key = client_key
@@ -45,6 +49,7 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
 
         self._proxy_host = http_proxy_host
         self._proxy_port = http_proxy_port
+        self._client_pool = client_pool
 
     async def make_request(self, url: str, headers: Dict[str, str], message: str,
                            raise_error_response: bool = True) -> httpclient.HTTPResponse:
@@ -62,7 +67,8 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
                                                       ca_certs=self._ca_certs, validate_cert=self._validate_cert,
                                                       http_proxy_host=self._proxy_host,
                                                       http_proxy_port=self._proxy_port,
-                                                      raise_error_response=raise_error_response)
+                                                      raise_error_response=raise_error_response,
+                                                      client_pool=self._client_pool)
             logger.info("Sent message with {headers} to {url} using {proxy_host} & {proxy_port} and "
                         "received status code {code}",
                         fparams={
@@ -91,6 +97,23 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
 
         return retry_result.result
 
+    async def open_connection(self, url: str) -> None:
+        """Open a connection to the remote MHS at the given URL, so that it is already established (and kept alive)
+        when the first message is sent to it. This is done by making a HEAD request, the response to which is ignored.
+
+        :param url: The URL messages are sent to.
+        """
+        logger.info("Opening connection to {url}", fparams={"url": url})
+        response = await CommonHttps.make_request(url=url, method="HEAD", headers=None, body=None,
+                                                  client_cert=self._client_cert, client_key=self._client_key,
+                                                  ca_certs=self._ca_certs, validate_cert=self._validate_cert,
+                                                  http_proxy_host=self._proxy_host,
+                                                  http_proxy_port=self._proxy_port,
+                                                  raise_error_response=False,
+                                                  client_pool=self._client_pool)
+        if response.code == 599:
+            raise OutboundTransmissionError(f"Failed to open connection to {url}") from response.error
+
     def _is_tornado_network_error(self, e: Exception) -> bool:
         return isinstance(e, httpclient.HTTPClientError) and e.code == 599
 
@@ -1,7 +1,7 @@
 import ssl
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import patch, sentinel, call
+from unittest.mock import Mock, patch, sentinel, call
 
 import definitions
 from tornado import httpclient
@@ -159,3 +159,32 @@ class TestOutboundTransmission(TestCase):
             self.assertEqual(mock_fetch.call_count, EXPECTED_MAX_HTTP_REQUESTS)
             expected_sleep_arguments = [call(RETRY_DELAY_IN_SECONDS) for _ in range(MAX_RETRIES)]
             self.assertEqual(expected_sleep_arguments, mock_sleep.call_args_list)
+
+    @async_test
+    async def test_should_open_connection_with_HEAD_request(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            sentinel.result.code = 405
+            mock_fetch.return_value = awaitable(sentinel.result)
+
+            await self.transmission.open_connection(URL_VALUE)
+
+            mock_fetch.assert_called_once_with(URL_VALUE,
+                                               method="HEAD",
+                                               raise_error=False,
+                                               body=None,
+                                               headers=None,
+                                               client_cert=CLIENT_CERT_PATH,
+                                               client_key=CLIENT_KEY_PATH,
+                                               ca_certs=CA_CERTS_PATH,
+                                               validate_cert=VALIDATE_CERT,
+                                               proxy_host=None,
+                                               proxy_port=None
+                                               )
+
+    @async_test
+    async def test_should_raise_error_if_connection_cannot_be_opened(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            mock_fetch.return_value = awaitable(Mock(code=599, error=Exception()))
+
+            with self.assertRaises(outbound_transmission.OutboundTransmissionError):
+                await self.transmission.open_connection(URL_VALUE)
@@ -26,3 +26,9 @@ class CacheAdaptor(abc.ABC):
         Adds a value to the cache, recording the input time used to determine when values have expired
         """
         raise NotImplementedError()
+
+    async def close(self) -> None:
+        """
+        Releases any connections held by this cache. The cache must not be used after it has been closed.
+        """
+        pass
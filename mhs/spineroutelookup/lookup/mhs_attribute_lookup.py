@@ -4,6 +4,7 @@ information for a remote MHS."""
 from typing import Dict
 
 from utilities import integration_adaptors_logger as log
+from utilities.single_flight import SingleFlight
 
 import lookup.cache_adaptor as cache_adaptor
 import lookup.sds_client as sds_client
@@ -26,6 +27,8 @@ class MHSAttributeLookup(object):
             raise ValueError('No cache supplied')
         self.cache = cache
         self.sds_client = client
+        # Concurrent requests for the same details share a single cache lookup and, on a miss, a single SDS lookup
+        self._single_flight = SingleFlight()
 
     async def retrieve_mhs_attributes(self, ods_code, interaction_id) -> Dict:
         """Obtains the attributes of the MHS registered for the given ODS code and interaction ID. These details will
@@ -36,6 +39,13 @@ class MHSAttributeLookup(object):
         :param interaction_id:
         :return:
         """
+        key = (ods_code, interaction_id)
+        if self._single_flight.in_flight(key):
+            logger.info('Waiting for in-flight retrieval of MHS details for {ods_code} & {interaction_id}',
+                        fparams={'ods_code': ods_code, 'interaction_id': interaction_id})
+        return await self._single_flight.run(key, lambda: self._retrieve_mhs_attributes(ods_code, interaction_id))
+
+    async def _retrieve_mhs_attributes(self, ods_code, interaction_id) -> Dict:
         try:
             cache_value = await self.cache.retrieve_mhs_attributes_value(ods_code, interaction_id)
             if cache_value:
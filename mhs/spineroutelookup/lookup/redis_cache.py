@@ -1,34 +1,72 @@
-import asyncio
 import json
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Union
 
-import redis
+import redis.asyncio as redis
 from utilities import integration_adaptors_logger as log, timing
 
 from lookup import cache_adaptor
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
+DEFAULT_MAX_CONNECTIONS = 50
+DEFAULT_SOCKET_TIMEOUT = 5.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+class _OperationMetrics(object):
+    """The counters and latencies of a single type of Redis operation."""
+
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record_success(self, latency: float) -> None:
+        self.successes += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
 
 class RedisCache(cache_adaptor.CacheAdaptor):
 
     def __init__(self, redis_host: str, redis_port: int, expiry_time: float = cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS,
-                 use_tls: bool = True):
+                 use_tls: bool = True, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 socket_timeout: float = DEFAULT_SOCKET_TIMEOUT,
+                 socket_connect_timeout: float = DEFAULT_CONNECT_TIMEOUT):
         """Initialise a new RedisCache.
 
         :param redis_host: The Redis host to use for caching.
         :param redis_port: The port on which to connect to the Redis host.
         :param expiry_time: The expiry time (in seconds) to set for cache entries.
         :param use_tls: Whether or not to use TLS when connecting to the Redis host.
+        :param max_connections: The maximum number of connections to the Redis host held in the connection pool.
+        :param socket_timeout: The time (in seconds) to wait for a response from the Redis host before giving up.
+        :param socket_connect_timeout: The time (in seconds) to wait for a connection to the Redis host to be
+        established before giving up.
         """
         if expiry_time < 0:
             raise ValueError('Expiry time must not be non-negative')
 
         self.expiry_time = expiry_time
 
-        self._redis_client = redis.Redis(host=redis_host, port=redis_port, ssl=use_tls)
-        logger.info("Redis client configured. {host}, {port}, {ssl}",
-                    fparams={"host": redis_host, "port": redis_port, "ssl": use_tls})
+        # Requests are made on the event loop rather than in the default executor, which is shared with the LDAP
+        # queries made to SDS. Connections are taken from, and returned to, the client's connection pool
+        self._redis_client_params = {"host": redis_host, "port": redis_port, "ssl": use_tls,
+                                     "max_connections": max_connections, "socket_timeout": socket_timeout,
+                                     "socket_connect_timeout": socket_connect_timeout}
+        self._redis_client: Optional[redis.Redis] = None
+        self._get_metrics = _OperationMetrics()
+        self._set_metrics = _OperationMetrics()
+        logger.info("Redis client configured. {host}, {port}, {ssl}, {max_connections}, {socket_timeout}, "
+                    "{socket_connect_timeout}",
+                    fparams={"host": redis_host, "port": redis_port, "ssl": use_tls,
+                             "max_connections": max_connections, "socket_timeout": socket_timeout,
+                             "socket_connect_timeout": socket_connect_timeout})
 
     @timing.time_function
     async def retrieve_mhs_attributes_value(self, ods_code: str, interaction_id: str) -> Optional[Dict]:
@@ -42,10 +80,11 @@ class RedisCache(cache_adaptor.CacheAdaptor):
         """
         key = RedisCache._generate_key(ods_code, interaction_id)
 
-        event_loop = asyncio.get_event_loop()
         try:
             logger.info("Attempting to retrieve cache entry for {key}", fparams={"key": key})
-            cached_json_value = await event_loop.run_in_executor(None, self._redis_client.get, key)
+            start_time = time.perf_counter()
+            cached_json_value = await self._get_redis_client().get(key)
+            self._get_metrics.record_success(time.perf_counter() - start_time)
 
             if cached_json_value is None:
                 logger.info("No cache entry found for {key}.", fparams={"key": key})
@@ -57,6 +96,7 @@ class RedisCache(cache_adaptor.CacheAdaptor):
 
             return value
         except redis.RedisError as re:
+            self._get_metrics.record_failure()
             logger.exception("An error occurred when attempting to load {key}.", fparams={"key": key})
             raise re
 
@@ -74,17 +114,49 @@ class RedisCache(cache_adaptor.CacheAdaptor):
         # Store the dictionary as a JSON string, since Redis doesn't support maps with non-string values.
         json_value = json.dumps(value)
 
-        event_loop = asyncio.get_event_loop()
         try:
             logger.info("Attempting to store {value} in the cache using {key}",
                         fparams={"value": json_value, "key": key})
-            await event_loop.run_in_executor(None, self._redis_client.setex, key, self.expiry_time, json_value)
+            start_time = time.perf_counter()
+            await self._get_redis_client().setex(key, self.expiry_time, json_value)
+            self._set_metrics.record_success(time.perf_counter() - start_time)
             logger.info("Successfully stored {value} in the cache using {key}",
                         fparams={"value": json_value, "key": key})
         except redis.RedisError as re:
+            self._set_metrics.record_failure()
             logger.exception("An error occurred when caching {value}.", fparams={"value": json_value})
             raise re
 
+    def get_metrics(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Get the current counters for requests made to the Redis host.
+
+        :return: A dictionary, keyed by `get` and `set`, of the number of successful and failed requests, and the mean
+        and maximum latency (in seconds) of successful requests.
+        """
+        return {operation: {'successes': metrics.successes,
+                            'failures': metrics.failures,
+                            'mean_latency': metrics.total_latency / metrics.successes if metrics.successes else 0.0,
+                            'max_latency': metrics.max_latency}
+                for operation, metrics in (('get', self._get_metrics), ('set', self._set_metrics))}
+
+    def log_metrics(self) -> None:
+        """Log the current counters for requests made to the Redis host."""
+        for operation, metrics in self.get_metrics().items():
+            logger.info('Redis cache {operation}: {successes} successful requests (mean latency {mean_latency}s, max '
+                        '{max_latency}s), {failures} failed requests', fparams={'operation': operation, **metrics})
+
+    async def close(self) -> None:
+        """Close the connections in the Redis client's connection pool."""
+        if self._redis_client is not None:
+            await self._redis_client.close(close_connection_pool=True)
+            self._redis_client = None
+
+    def _get_redis_client(self) -> redis.Redis:
+        # The client is created on first use, as its connection pool must be created on the event loop it is used from
+        if self._redis_client is None:
+            self._redis_client = redis.Redis(**self._redis_client_params)
+        return self._redis_client
+
     @staticmethod
     def _generate_key(ods_code: str, interaction_id: str) -> str:
         return ods_code + '-' + interaction_id
@@ -44,3 +44,15 @@ class RoutingAndReliability(object):
 
         reliability = {item: endpoint_details[item] for item in RELIABILITY_KEYS}
         return reliability
+
+    async def get_routing_and_reliability(self, org_code, service_id):
+        """Get both the endpoint and the reliability information for the MHS registered for the specified org code and
+        service ID, from a single lookup.
+
+        :param org_code:
+        :param service_id:
+        :return:
+        """
+        endpoint_details = await self.lookup.retrieve_mhs_attributes(org_code, service_id)
+
+        return {item: endpoint_details[item] for item in ROUTING_KEYS + RELIABILITY_KEYS}
@@ -1,3 +1,4 @@
+import asyncio
 from unittest import TestCase
 from unittest import mock
 
@@ -104,3 +105,18 @@ class TestMHSAttributeLookup(TestCase):
         attributes = await handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
 
         self.assertEqual(expected_mhs_attributes, attributes)
+
+    @async_test
+    async def test_concurrent_retrievals_share_one_sds_lookup(self):
+        self.cache.retrieve_mhs_attributes_value.side_effect = lambda *args: test_utilities.awaitable(None)
+        self.cache.add_cache_value.side_effect = lambda *args: test_utilities.awaitable(None)
+        sds_client = mocks.mocked_sds_client()
+        sds_client.get_mhs_details = mock.Mock(wraps=sds_client.get_mhs_details)
+        handler = mhs_attribute_lookup.MHSAttributeLookup(sds_client, self.cache)
+
+        results = await asyncio.gather(handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID),
+                                       handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+
+        self.assertEqual([expected_mhs_attributes, expected_mhs_attributes], results)
+        sds_client.get_mhs_details.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+        self.cache.retrieve_mhs_attributes_value.assert_called_once_with(ODS_CODE, INTERACTION_ID)
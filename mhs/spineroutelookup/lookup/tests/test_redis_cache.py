@@ -1,13 +1,16 @@
 import unittest.mock
 
-import redis
-from utilities.test_utilities import async_test
+import redis.asyncio as redis
+from utilities.test_utilities import async_test, awaitable
 
 from lookup import redis_cache
 
 REDIS_HOST = "host"
 REDIS_PORT = 1234
 USE_TLS = False
+MAX_CONNECTIONS = 10
+SOCKET_TIMEOUT = 2.0
+CONNECT_TIMEOUT = 3.0
 
 ODS_CODE = "ods"
 INTERACTION_ID = "interaction-id"
@@ -31,7 +34,7 @@ FIFTEEN_MINUTES_IN_SECONDS = 900
 class TestRedisCache(unittest.TestCase):
 
     def setUp(self) -> None:
-        # Mock the redis.Redis() constructor
+        # Mock the redis.asyncio.Redis() constructor
         patcher = unittest.mock.patch.object(redis, "Redis")
         self.mock_redis_constructor = patcher.start()
         self.addCleanup(patcher.stop)
@@ -39,21 +42,63 @@ class TestRedisCache(unittest.TestCase):
         # Mock the Redis client class itself
         self.mock_redis = unittest.mock.MagicMock()
         self.mock_redis_constructor.return_value = self.mock_redis
+        self.mock_redis.get.side_effect = lambda key: awaitable(None)
+        self.mock_redis.setex.side_effect = lambda key, expiry_time, value: awaitable(None)
 
-    def test_redis_params_are_passed(self):
-        redis_cache.RedisCache(REDIS_HOST, REDIS_PORT, use_tls=USE_TLS)
+    @async_test
+    async def test_redis_params_are_passed(self):
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT, use_tls=USE_TLS, max_connections=MAX_CONNECTIONS,
+                                       socket_timeout=SOCKET_TIMEOUT, socket_connect_timeout=CONNECT_TIMEOUT)
+
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.mock_redis_constructor.assert_called_with(host=REDIS_HOST, port=REDIS_PORT, ssl=USE_TLS,
+                                                       max_connections=MAX_CONNECTIONS, socket_timeout=SOCKET_TIMEOUT,
+                                                       socket_connect_timeout=CONNECT_TIMEOUT)
+
+    @async_test
+    async def test_tls_is_enabled_by_default(self):
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.mock_redis_constructor.assert_called_with(host=REDIS_HOST, port=REDIS_PORT, ssl=True,
+                                                       max_connections=redis_cache.DEFAULT_MAX_CONNECTIONS,
+                                                       socket_timeout=redis_cache.DEFAULT_SOCKET_TIMEOUT,
+                                                       socket_connect_timeout=redis_cache.DEFAULT_CONNECT_TIMEOUT)
 
-        self.mock_redis_constructor.assert_called_with(host=REDIS_HOST, port=REDIS_PORT, ssl=USE_TLS)
+    @async_test
+    async def test_client_is_created_once(self):
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.mock_redis_constructor.assert_called_once()
+
+    @async_test
+    async def test_close_closes_connection_pool(self):
+        self.mock_redis.close.side_effect = lambda **kwargs: awaitable(None)
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
 
-    def test_tls_is_enabled_by_default(self):
-        redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+        await cache.close()
+        await cache.close()
 
-        self.mock_redis_constructor.assert_called_with(host=REDIS_HOST, port=REDIS_PORT, ssl=True)
+        self.mock_redis.close.assert_called_once_with(close_connection_pool=True)
+
+    @async_test
+    async def test_close_before_use(self):
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+
+        await cache.close()
+
+        self.mock_redis_constructor.assert_not_called()
 
     @async_test
     async def test_should_retrieve_value_from_store_if_exists(self):
         cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
-        self.mock_redis.get.return_value = VALUE_DICTIONARY_JSON.encode()
+        self.mock_redis.get.side_effect = lambda key: awaitable(VALUE_DICTIONARY_JSON.encode())
 
         value = await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
 
@@ -63,7 +108,6 @@ class TestRedisCache(unittest.TestCase):
     @async_test
     async def test_should_return_none_if_value_does_not_exist(self):
         cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
-        self.mock_redis.get.return_value = None
 
         value = await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
 
@@ -107,3 +151,22 @@ class TestRedisCache(unittest.TestCase):
     async def test_should_only_accept_positive_expiry_times(self):
         with self.assertRaises(ValueError):
             redis_cache.RedisCache(REDIS_HOST, REDIS_PORT, -1)
+
+    @async_test
+    async def test_latency_of_requests_is_tracked(self):
+        cache = redis_cache.RedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.get.side_effect = lambda key: awaitable(VALUE_DICTIONARY_JSON.encode())
+
+        await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+        await cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE_DICTIONARY)
+        self.mock_redis.setex.side_effect = redis.RedisError()
+        with self.assertRaises(redis.RedisError):
+            await cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE_DICTIONARY)
+
+        metrics = cache.get_metrics()
+        self.assertEqual(1, metrics["get"]["successes"])
+        self.assertEqual(0, metrics["get"]["failures"])
+        self.assertEqual(1, metrics["set"]["successes"])
+        self.assertEqual(1, metrics["set"]["failures"])
+        self.assertGreaterEqual(metrics["set"]["max_latency"], metrics["set"]["mean_latency"])
+        self.assertGreater(metrics["set"]["mean_latency"], 0)
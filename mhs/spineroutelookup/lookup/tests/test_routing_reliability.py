@@ -77,6 +77,23 @@ class TestRoutingAndReliability(unittest.TestCase):
         with self.assertRaises(sds_exception.SDSException):
             await router.get_reliability(ODS_CODE, "whew")
 
+    @async_test
+    async def test_get_routing_and_reliability(self):
+        router = self._configure_routing_and_reliability()
+        router.lookup.retrieve_mhs_attributes = mock.Mock(wraps=router.lookup.retrieve_mhs_attributes)
+
+        details = await router.get_routing_and_reliability(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(details, {**EXPECTED_ROUTING, **EXPECTED_RELIABILITY})
+        router.lookup.retrieve_mhs_attributes.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+
+    @async_test
+    async def test_get_routing_and_reliability_bad_ods_code(self):
+        router = self._configure_routing_and_reliability()
+
+        with self.assertRaises(sds_exception.SDSException):
+            await router.get_routing_and_reliability("bad code", INTERACTION_ID)
+
     @async_test
     async def test_empty_handler(self):
         with self.assertRaises(ValueError):
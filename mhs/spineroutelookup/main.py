@@ -1,9 +1,13 @@
+import socket
+from typing import List
+
 import tornado.httpserver
 import tornado.ioloop
+import tornado.netutil
 import tornado.web
 
 from handlers import healthcheck_handler
-from utilities import config, secrets
+from utilities import config, secrets, worker_processes
 from utilities import integration_adaptors_logger as log
 
 from lookup import cache_adaptor, redis_cache, sds_client, mhs_attribute_lookup, \
@@ -20,6 +24,10 @@ def load_cache_implementation():
     redis_port = int(config.get_config("SDS_REDIS_CACHE_PORT", "6379"))
     disable_tls_flag = config.get_config("SDS_REDIS_DISABLE_TLS", None)
     use_tls = disable_tls_flag != "True"
+    max_connections = int(config.get_config("SDS_REDIS_MAX_CONNECTIONS",
+                                            str(redis_cache.DEFAULT_MAX_CONNECTIONS)))
+    socket_timeout = float(config.get_config("SDS_REDIS_SOCKET_TIMEOUT", str(redis_cache.DEFAULT_SOCKET_TIMEOUT)))
+    connect_timeout = float(config.get_config("SDS_REDIS_CONNECT_TIMEOUT", str(redis_cache.DEFAULT_CONNECT_TIMEOUT)))
 
     logger.info('Using the Redis cache with {redis_host}, {redis_port}, {cache_expiry_time}, {use_tls}',
                 fparams={
@@ -28,18 +36,28 @@ def load_cache_implementation():
                     'cache_expiry_time': cache_expiry_time,
                     'use_tls': use_tls
                 })
-    return redis_cache.RedisCache(redis_host, redis_port, cache_expiry_time, use_tls)
+    return redis_cache.RedisCache(redis_host, redis_port, cache_expiry_time, use_tls,
+                                  max_connections=max_connections, socket_timeout=socket_timeout,
+                                  socket_connect_timeout=connect_timeout)
+
+
+def start_cache_metrics(cache: redis_cache.RedisCache) -> None:
+    """
+    Periodically log the number and latency of requests made to the Redis cache.
+    :param cache: The Redis cache to log metrics for.
+    """
+    interval = float(config.get_config('SDS_REDIS_METRICS_INTERVAL', default='60'))
+    tornado.ioloop.PeriodicCallback(cache.log_metrics, interval * 1000).start()
 
 
-def initialise_routing(search_base: str) -> routing_reliability.RoutingAndReliability:
+def initialise_routing(search_base: str,
+                       cache: cache_adaptor.CacheAdaptor) -> routing_reliability.RoutingAndReliability:
     """Initialise the routing and reliability component to be used for SDS queries.
 
     :param search_base: The LDAP location to use as the base of SDS searched. e.g. ou=services,o=nhs.
+    :param cache: The cache to hold the results of SDS queries in.
     :return:
     """
-
-    cache = load_cache_implementation()
-
     sds_connection = sds_connection_factory.create_connection()
 
     client = sds_client.SDSClient(sds_connection, search_base)
@@ -48,10 +66,14 @@ def initialise_routing(search_base: str) -> routing_reliability.RoutingAndReliab
     return routing
 
 
-def start_tornado_server(routing: routing_reliability.RoutingAndReliability) -> None:
+def start_tornado_server(server_sockets: List[socket.socket],
+                         routing: routing_reliability.RoutingAndReliability,
+                         cache: cache_adaptor.CacheAdaptor) -> None:
     """Start the Tornado server
 
+    :param server_sockets: The bound sockets to accept requests from.
     :param routing: The routing/reliability component to be used when servicing requests.
+    :param cache: The cache used by the routing/reliability component, which is closed when the server shuts down.
     """
     handler_dependencies = {"routing": routing}
     application = tornado.web.Application([
@@ -61,10 +83,9 @@ def start_tornado_server(routing: routing_reliability.RoutingAndReliability) ->
         ("/healthcheck", healthcheck_handler.HealthcheckHandler)
     ])
     server = tornado.httpserver.HTTPServer(application)
-    server_port = int(config.get_config('SPINE_ROUTE_LOOKUP_SERVER_PORT', default='80'))
-    server.listen(server_port)
+    server.add_sockets(server_sockets)
 
-    logger.info('Starting router server at port {server_port}', fparams={'server_port': server_port})
+    logger.info('Starting router server')
     tornado_io_loop = tornado.ioloop.IOLoop.current()
     try:
         tornado_io_loop.start()
@@ -72,6 +93,7 @@ def start_tornado_server(routing: routing_reliability.RoutingAndReliability) ->
         logger.warning('Keyboard interrupt')
         pass
     finally:
+        tornado_io_loop.run_sync(cache.close)
         tornado_io_loop.stop()
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
@@ -82,8 +104,17 @@ def main():
     secrets.setup_secret_config("MHS")
     log.configure_logging('spineroutelookup')
 
-    routing = initialise_routing(search_base=config.get_config("SDS_SEARCH_BASE"))
-    start_tornado_server(routing)
+    # The socket is bound before any worker processes are forked so that they all accept requests from it. The Redis
+    # and LDAP connections are then created separately by each worker
+    server_port = int(config.get_config('SPINE_ROUTE_LOOKUP_SERVER_PORT', default='80'))
+    server_sockets = tornado.netutil.bind_sockets(server_port)
+    logger.info('Bound router server to port {server_port}', fparams={'server_port': server_port})
+    worker_processes.start_worker_processes(worker_processes.get_worker_process_count())
+
+    cache = load_cache_implementation()
+    start_cache_metrics(cache)
+    routing = initialise_routing(search_base=config.get_config("SDS_SEARCH_BASE"), cache=cache)
+    start_tornado_server(server_sockets, routing, cache)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,6 @@ from utilities import test_utilities
 from request import routing_reliability_handler
 from request.tests import test_request_handler
 
-END_POINT_DETAILS = {"end_point": "http://www.example.com"}
-RELIABILITY_DETAILS = {"retries": 7}
 COMBINED_DETAILS = {"end_point": "http://www.example.com", "retries": 7}
 
 
@@ -22,30 +20,21 @@ class TestRoutingReliabilityRequestHandler(tornado.testing.AsyncHTTPTestCase):
         ])
 
     def test_get(self):
-        self.routing.get_end_point.return_value = test_utilities.awaitable(END_POINT_DETAILS)
-        self.routing.get_reliability.return_value = test_utilities.awaitable(RELIABILITY_DETAILS)
+        self.routing.get_routing_and_reliability.return_value = test_utilities.awaitable(COMBINED_DETAILS)
 
         response = self.fetch(test_request_handler.build_url(), method="GET")
 
         self.assertEqual(response.code, 200)
         self.assertEqual(COMBINED_DETAILS, json.loads(response.body))
-        self.routing.get_end_point.assert_called_with(test_request_handler.ORG_CODE, test_request_handler.SERVICE_ID)
-        self.routing.get_reliability.assert_called_with(test_request_handler.ORG_CODE, test_request_handler.SERVICE_ID)
+        self.routing.get_routing_and_reliability.assert_called_once_with(test_request_handler.ORG_CODE,
+                                                                         test_request_handler.SERVICE_ID)
 
     def test_get_returns_error(self):
-        with self.subTest("Routing lookup error"):
-            self.routing.get_end_point.side_effect = Exception
+        self.routing.get_routing_and_reliability.side_effect = Exception
 
-            response = self.fetch(test_request_handler.build_url(), method="GET")
-
-            self.assertEqual(response.code, 500)
-
-        with self.subTest("Reliability lookup error"):
-            self.routing.get_reliability.side_effect = Exception
-
-            response = self.fetch(test_request_handler.build_url(), method="GET")
+        response = self.fetch(test_request_handler.build_url(), method="GET")
 
-            self.assertEqual(response.code, 500)
+        self.assertEqual(response.code, 500)
 
     def test_get_handles_missing_params(self):
         with self.subTest("Missing Org Code"):